@@ -9,6 +9,8 @@ This agent analyzes data from multiple sources to create and manage audience seg
 - Typeform (submissions)
 
 All segment data is stored and maintained in Notion as the central hub.
+Segment membership is computed by an in-memory columnar segmentation engine
+fed with customer, order and booking data, rather than by walking Notion.
 """
 
 import asyncio
@@ -29,6 +31,7 @@ from models.audience_models import (
 from models.base import AgentCapability, ApiPlatform
 from models.notion_db_models import BusinessEntity, WorkflowInstance
 from services.notion_service import NotionService
+from services.segmentation_engine import SegmentationEngine
 
 
 class AudienceSegmentationAgent(BaseAgent):
@@ -47,11 +50,14 @@ class AudienceSegmentationAgent(BaseAgent):
         api_keys: Dict[str, str] = None,
         notion_service: Optional[NotionService] = None,
         update_frequency_hours: int = 24,
+        woocommerce_service: Any = None,
+        amelia_service: Any = None,
+        acuity_service: Any = None,
+        history_days: int = 365,
     ):
         """Initialize the Audience Segmentation Agent."""
         capabilities = [
-            AgentCapability.CUSTOMER_SEGMENTATION,
-            AgentCapability.DATA_ANALYSIS,
+            AgentCapability.AUDIENCE_ANALYSIS,
             AgentCapability.CRM_SYNC,
         ]
 
@@ -59,9 +65,7 @@ class AudienceSegmentationAgent(BaseAgent):
             ApiPlatform.NOTION,
             ApiPlatform.WOOCOMMERCE,
             ApiPlatform.AMELIA,
-            ApiPlatform.TUTORM,
-            ApiPlatform.BEEHIIV,
-            ApiPlatform.SIMPLE_TEXTING,
+            ApiPlatform.TUTORLM,
         ]
 
         super().__init__(
@@ -92,8 +96,77 @@ class AudienceSegmentationAgent(BaseAgent):
                 self.api_keys[key_name] = os.environ.get(key_name)
 
         self.update_frequency = timedelta(hours=update_frequency_hours)
+        self.segmentation_engine = SegmentationEngine()
+        # Order and booking sources; taken from the integration manager when
+        # not injected
+        self.data_sources = {
+            "woocommerce": woocommerce_service,
+            "amelia": amelia_service,
+            "acuity": acuity_service,
+        }
+        self.history_days = history_days
+        self._data_loaded = False
+        self._load_lock = asyncio.Lock()
         self.logger.info("Audience Segmentation Agent initialized")
 
+    async def load_customer_data(self) -> bool:
+        """
+        Load the segmentation engine from WooCommerce, Amelia and Acuity once.
+
+        Runs on first use after a restart. Until a load has found customers,
+        it is tried again on the next call.
+
+        Returns:
+            True if the engine holds customer data
+        """
+        if self._data_loaded:
+            return True
+        async with self._load_lock:
+            if self._data_loaded:
+                return True
+
+            sources = dict(self.data_sources)
+            if not all(sources.values()):
+                try:
+                    from services.integration_manager import get_integration_manager
+
+                    manager = await get_integration_manager()
+                    for name, service in sources.items():
+                        sources[name] = service or manager.get_service(name)
+                except Exception as e:
+                    self.logger.error(f"Error getting customer data services: {e}")
+
+            now = datetime.now()
+            start = now - timedelta(days=self.history_days)
+            # Upcoming bookings feed next_booking_date
+            end = now + timedelta(days=90)
+            orders, amelia, acuity = [], [], []
+            try:
+                if sources["woocommerce"]:
+                    orders = await sources["woocommerce"].get_recent_orders(limit=100)
+                if sources["amelia"]:
+                    amelia = await sources["amelia"].get_appointments(
+                        start_date=start, end_date=end
+                    )
+                if sources["acuity"]:
+                    acuity = await sources["acuity"].get_appointments(
+                        min_date=start, max_date=end
+                    )
+            except Exception as e:
+                self.logger.error(f"Error fetching customer data: {e}")
+                return False
+
+            engine = self.segmentation_engine
+            engine.load_orders(orders)
+            engine.load_bookings(amelia, source="amelia")
+            engine.load_bookings(acuity, source="acuity")
+            self._data_loaded = len(engine) > 0
+            self.logger.info(
+                f"Loaded {len(orders)} orders, {len(amelia)} Amelia and "
+                f"{len(acuity)} Acuity bookings into the segmentation engine"
+            )
+            return self._data_loaded
+
     async def analyze_customer_data(
         self,
         business_entity_id: str,
@@ -113,25 +186,17 @@ class AudienceSegmentationAgent(BaseAgent):
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_to_analyze)
 
-        # This would fetch and analyze real data in a full implementation
-        # For now, simulate analysis results
-        data_points = {
-            "total_customers": 250,
-            "new_customers": 45,
-            "active_customers": 120,
-            "product_categories": {
-                "courses": 68,
-                "workshops": 42,
-                "retreats": 25,
-                "art": 15,
-            },
-            "engagement_metrics": {
-                "email_open_rate": 0.42,
-                "form_submissions": 32,
-                "course_completions": 18,
-            },
-            "sources": {"organic": 95, "referral": 65, "social": 50, "direct": 40},
-        }
+        if not await self.load_customer_data():
+            return {
+                "status": "error",
+                "business_entity_id": business_entity_id,
+                "message": "No customer data loaded into the segmentation engine",
+            }
+
+        # Analyze the customer data loaded into the segmentation engine
+        data_points = self.segmentation_engine.summary(
+            days=days_to_analyze, now=end_date
+        )
 
         # Store analysis in Notion (central hub)
         notion_svc = await self.notion_service
@@ -164,6 +229,48 @@ class AudienceSegmentationAgent(BaseAgent):
             "results": data_points,
         }
 
+    async def ingest_customer_data(
+        self,
+        profiles: Optional[List[Any]] = None,
+        orders: Optional[List[Any]] = None,
+        bookings: Optional[List[Any]] = None,
+        booking_source: str = "amelia",
+    ) -> Dict[str, Any]:
+        """
+        Load customer data into the segmentation engine.
+
+        Data can be delivered in full or as changes only; segments are then
+        refreshed incrementally for the customers it touched.
+
+        Args:
+            profiles: Customer profiles (CustomerProfile models or dicts)
+            orders: WooCommerce orders (WooOrder models or dicts)
+            bookings: Amelia or Acuity appointments (models or dicts)
+            booking_source: "amelia" or "acuity"
+
+        Returns:
+            Number of records loaded per source and engine metrics
+        """
+        # Apply changes on top of the full load from the order and booking
+        # sources
+        await self.load_customer_data()
+
+        engine = self.segmentation_engine
+        loaded = {
+            "profiles": engine.load_profiles(profiles or []),
+            "orders": engine.load_orders(orders or []),
+            "bookings": engine.load_bookings(bookings or [], source=booking_source),
+        }
+        if len(engine):
+            self._data_loaded = True
+        self.logger.info(f"Loaded customer data into segmentation engine: {loaded}")
+
+        return {
+            "status": "success",
+            "loaded": loaded,
+            "engine": engine.get_metrics(),
+        }
+
     async def define_segment(
         self,
         business_entity_id: str,
@@ -215,10 +322,25 @@ class AudienceSegmentationAgent(BaseAgent):
         if not segment:
             return {"status": "error", "message": f"Segment {segment_id} not found"}
 
-        # This would apply segment criteria to real data in a full implementation
-        # For now, simulate segment refresh
+        # An empty engine would overwrite the segment's member count with 0
+        if not await self.load_customer_data():
+            return {
+                "status": "error",
+                "message": "No customer data loaded; segment not refreshed",
+            }
+
+        # Apply the segment criteria to the loaded customer data; only
+        # customers changed since the last refresh are re-evaluated
+        engine = self.segmentation_engine
+        try:
+            if not engine.has_segment(segment_id, segment.criteria):
+                engine.define_segment(segment_id, segment.criteria)
+            refresh = engine.refresh_segments([segment_id])[segment_id]
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
         previous_count = segment.member_count
-        new_count = previous_count + 5  # Simulate 5 new members
+        new_count = refresh["member_count"]
 
         # Update segment in Notion
         segment.member_count = new_count
@@ -237,6 +359,8 @@ class AudienceSegmentationAgent(BaseAgent):
             "previous_count": previous_count,
             "new_count": new_count,
             "difference": new_count - previous_count,
+            "members_added": refresh["added"],
+            "members_removed": refresh["removed"],
         }
 
     async def sync_segment_to_platform(
@@ -343,6 +467,7 @@ class AudienceSegmentationAgent(BaseAgent):
         """Process an event received by this agent."""
         event_handlers = {
             "analyze_customer_data": self.analyze_customer_data,
+            "ingest_customer_data": self.ingest_customer_data,
             "define_segment": self.define_segment,
             "refresh_segment": self.refresh_segment,
             "sync_segment_to_platform": self.sync_segment_to_platform,
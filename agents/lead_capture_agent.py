@@ -24,6 +24,7 @@ from pydantic import BaseModel, EmailStr, Field, validator
 from agents.base_agent import BaseAgent
 from models.base import AgentCapability, ApiPlatform
 from models.notion_db_models import BusinessEntity, Workflow, WorkflowInstance
+from services.lead_dedup_index import get_lead_dedup_index
 
 
 class TypeformSubmission(BaseModel):
@@ -117,6 +118,7 @@ class LeadCaptureAgent(BaseAgent):
 
         # Set deduplication window
         self.lead_deduplication_window_hours = lead_deduplication_window_hours
+        self.dedup_index = get_lead_dedup_index(lead_deduplication_window_hours)
 
         self.logger.info("Lead Capture Agent initialized")
 
@@ -309,11 +311,64 @@ class LeadCaptureAgent(BaseAgent):
             additional_data=additional_data_payload,
         )
 
+    async def warm_dedup_index(self) -> int:
+        """
+        Load recently captured leads from Notion into the deduplication index.
+
+        Returns:
+            Number of leads loaded
+        """
+        notion_svc = await self.notion_service
+        return await self.dedup_index.warm_from_notion(notion_svc)
+
     async def _check_for_duplicates(
         self, lead: StandardizedLead
     ) -> Optional[WorkflowInstance]:
         """
-        Check if a lead already exists in Notion within the deduplication window.
+        Check if a lead was already captured within the deduplication window.
+
+        The check is answered by the local deduplication index; Notion is only
+        read to load the existing instance once a duplicate is found. Until
+        the index has been warmed successfully, Notion is queried directly.
+
+        Args:
+            lead: StandardizedLead to check
+
+        Returns:
+            Existing WorkflowInstance if found, None otherwise
+        """
+        if not self.dedup_index.warmed:
+            try:
+                await self.warm_dedup_index()
+            except Exception as e:
+                self.logger.warning(
+                    f"Could not warm the lead dedup index, querying Notion: {e}"
+                )
+                return await self._query_notion_for_duplicates(lead)
+
+        match = await self.dedup_index.find_duplicate(lead.email, lead.source)
+        if not match:
+            return None
+
+        self.logger.info(
+            f"Found duplicate lead: {lead.email} from {lead.source} (matches existing {match.source})"
+        )
+
+        if match.instance_id:
+            notion_svc = await self.notion_service
+            instance = await notion_svc.get_page(match.instance_id, WorkflowInstance)
+            if instance:
+                instance.page_id = instance.page_id or match.instance_id
+                return instance
+
+        # The index knows about the lead but the instance could not be loaded
+        return await self._query_notion_for_duplicates(lead)
+
+    async def _query_notion_for_duplicates(
+        self, lead: StandardizedLead
+    ) -> Optional[WorkflowInstance]:
+        """
+        Look up a duplicate lead by querying Notion directly.
 
         Args:
             lead: StandardizedLead to check
@@ -438,6 +493,14 @@ class LeadCaptureAgent(BaseAgent):
         # Create the instance in Notion
         instance.page_id = await notion_svc.create_page(instance)
 
+        # Record the lead so later submissions are deduplicated locally
+        await self.dedup_index.add(
+            lead.email,
+            lead.source,
+            lead.get_fingerprint(),
+            instance_id=instance.page_id,
+        )
+
         self.logger.info(
             f"Created workflow instance (ID: {instance.page_id}) for lead: {lead.email} in workflow: {workflow_id}"
         )
@@ -9,11 +9,12 @@ This mixin provides OCR capabilities to agents using multiple providers:
 
 import base64
 import os
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 from loguru import logger
 
 from models.tesseract_models import (
+    OCRDocumentRequest,
     OCRDocumentType,
     OCRImageSource,
     OCRLanguage,
@@ -25,6 +26,7 @@ from models.tesseract_models import (
 from services.ocr import (
     OCRServiceFactory,
     abbyy_service,
+    document_ocr_service,
     google_vision_service,
     tesseract_service,
 )
@@ -329,6 +331,151 @@ class OCRMixin:
             "provider": response.provider.value,
         }
 
+    async def stream_text_from_document(
+        self,
+        document_path: str,
+        languages: List[str] = ["eng"],
+        preprocessing: bool = True,
+        is_important: bool = False,
+        document_type: str = "general",
+        provider: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Extract text from a multi-page document, streaming pages as they finish.
+
+        Pages are yielded in completion order; use the page number to reorder.
+
+        Args:
+            document_path: Path to the PDF or TIFF document
+            languages: List of language codes
+            preprocessing: Whether to apply preprocessing
+            is_important: Whether this is an important document requiring high accuracy
+            document_type: Type of document being processed
+            provider: Specific OCR provider to use (overrides automatic selection)
+            max_concurrency: Maximum number of pages processed in parallel
+
+        Yields:
+            Dictionary per page containing:
+                - page: 1-based page number
+                - success: Whether the operation was successful
+                - text: Extracted text
+                - confidence: Average confidence score
+                - processing_time: Time taken to process the page
+                - provider: OCR provider used
+                - from_cache: Whether the page result was cached
+        """
+        # Convert language strings to OCRLanguage enum values
+        try:
+            lang_enums = [OCRLanguage(lang) for lang in languages]
+        except ValueError as e:
+            yield {"success": False, "error": f"Invalid language code: {str(e)}"}
+            return
+
+        # Convert document type string to enum
+        try:
+            doc_type = OCRDocumentType(document_type)
+        except ValueError:
+            doc_type = OCRDocumentType.GENERAL
+
+        # Convert provider string to enum if specified; None lets the
+        # document service select one automatically
+        provider_enum = None
+        if provider:
+            try:
+                provider_enum = OCRProvider(provider)
+            except ValueError:
+                logger.warning(
+                    f"Invalid provider: {provider}, using automatic selection"
+                )
+
+        request = OCRDocumentRequest(
+            document_source=OCRImageSource.FILE,
+            document_data=document_path,
+            languages=lang_enums,
+            output_format=OCROutputFormat.TEXT,
+            preprocessing=preprocessing,
+            is_important=is_important,
+            document_type=doc_type,
+            provider=provider_enum,
+            max_concurrency=max_concurrency,
+        )
+
+        async for page in document_ocr_service.process_document(request):
+            response = page.response
+
+            avg_confidence = None
+            if response.elements and len(response.elements) > 0:
+                confidences = [elem.confidence for elem in response.elements]
+                avg_confidence = sum(confidences) / len(confidences)
+
+            yield {
+                "page": page.page_number,
+                "success": response.success,
+                "text": response.text,
+                "confidence": avg_confidence,
+                "processing_time": response.processing_time,
+                "error": response.error,
+                "provider": response.provider.value,
+                "from_cache": page.from_cache,
+            }
+
+    async def extract_text_from_document(
+        self,
+        document_path: str,
+        languages: List[str] = ["eng"],
+        preprocessing: bool = True,
+        is_important: bool = False,
+        document_type: str = "general",
+        provider: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Extract text from a multi-page document.
+
+        Args:
+            document_path: Path to the PDF or TIFF document
+            languages: List of language codes
+            preprocessing: Whether to apply preprocessing
+            is_important: Whether this is an important document requiring high accuracy
+            document_type: Type of document being processed
+            provider: Specific OCR provider to use (overrides automatic selection)
+            max_concurrency: Maximum number of pages processed in parallel
+
+        Returns:
+            Dictionary containing:
+                - success: Whether every page was processed successfully
+                - text: Extracted text of all pages, in page order
+                - pages: Per-page results, in page order
+        """
+        try:
+            pages = [
+                page
+                async for page in self.stream_text_from_document(
+                    document_path,
+                    languages=languages,
+                    preprocessing=preprocessing,
+                    is_important=is_important,
+                    document_type=document_type,
+                    provider=provider,
+                    max_concurrency=max_concurrency,
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Error extracting text from document {document_path}: {e}")
+            return {"success": False, "error": str(e)}
+
+        if pages and "page" not in pages[0]:
+            return pages[0]
+
+        pages.sort(key=lambda page: page["page"])
+
+        return {
+            "success": all(page["success"] for page in pages),
+            "text": "\n\n".join(page["text"] or "" for page in pages),
+            "pages": pages,
+        }
+
     def get_supported_languages(self) -> List[Dict[str, str]]:
         """
         Get a list of supported OCR languages.
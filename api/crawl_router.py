@@ -56,6 +56,9 @@ class DeepCrawlResponse(BaseModel):
     url: str = Field(..., description="URL that was crawled")
     pages_crawled: Optional[int] = Field(None, description="Number of pages crawled")
     pages_stored: Optional[int] = Field(None, description="Number of pages stored")
+    pages_unchanged: Optional[int] = Field(
+        None, description="Number of pages skipped because their content was unchanged"
+    )
     embedding_ids: Optional[List[str]] = Field(
         None, description="IDs of the stored embeddings"
     )
@@ -3,7 +3,7 @@ Dashboard API Router for HigherSelf Operations Dashboard
 Integrates with existing FastAPI server to provide dashboard endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
 from fastapi.responses import JSONResponse
 from typing import Dict, List, Optional, Any
 import asyncio
@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 from models.base import ApiPlatform
 from services.redis_service import RedisService
 from services.mongodb_service import MongoDBService
+from services.websocket_broadcast import connection_manager as manager
 from utils.auth import get_current_user
 from utils.error_handling import handle_api_error
 
@@ -24,6 +25,8 @@ router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 redis_service = RedisService()
 mongodb_service = MongoDBService()
 
+DASHBOARD_TOPIC = "dashboard"
+
 
 @router.get("/health")
 async def dashboard_health():
@@ -234,17 +237,42 @@ async def _get_agent_real_time_status(agent_name: str) -> Dict[str, Any]:
         return {"online": False, "error": str(e)}
 
 
+# Latest dashboard metrics, computed once per interval for all dashboard sockets
+_dashboard_publisher: Optional[asyncio.Task] = None
+_latest_dashboard_metrics: Optional[Dict[str, Any]] = None
+
+
+async def _publish_dashboard_metrics(interval: float = 5.0):
+    """Broadcast dashboard metrics while any dashboard socket is connected"""
+    global _latest_dashboard_metrics
+    while manager.get_topic_connection_count(DASHBOARD_TOPIC):
+        _latest_dashboard_metrics = await get_dashboard_metrics(current_user=None)
+        await manager.broadcast_to_topic(DASHBOARD_TOPIC, _latest_dashboard_metrics)
+        await asyncio.sleep(interval)
+    _latest_dashboard_metrics = None
+
+
 @router.websocket("/ws")
-async def websocket_endpoint(websocket):
+async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time dashboard updates"""
-    await websocket.accept()
+    global _dashboard_publisher
+    client_id = f"dashboard-{websocket.client.host}-{datetime.utcnow().timestamp()}"
+    await manager.connect(websocket, client_id)
+    await manager.subscribe(client_id, DASHBOARD_TOPIC, shared=False)
+
+    # Metrics are pushed to every dashboard socket every 5 seconds
+    if _latest_dashboard_metrics is not None:
+        await manager.send_json(client_id, _latest_dashboard_metrics)
+    if _dashboard_publisher is None or _dashboard_publisher.done():
+        _dashboard_publisher = asyncio.create_task(_publish_dashboard_metrics())
+
     try:
         while True:
-            # Send real-time updates every 5 seconds
-            metrics = await get_dashboard_metrics()
-            await websocket.send_json(metrics)
-            await asyncio.sleep(5)
+            # Updates are pushed by the publisher; this only waits for disconnect
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
-        await websocket.close()
+        await manager.disconnect(client_id)
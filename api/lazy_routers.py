@@ -0,0 +1,357 @@
+"""
+Lazy router loading for The HigherSelf Network Server API.
+
+Routers are declared in ROUTER_SPECS with the path prefix they serve instead
+of being imported at module load. Each one is mounted according to its mode:
+
+- eager: imported and mounted at startup
+- lazy: imported and mounted by LazyRouterMiddleware on the first request
+  under its prefix, so workers that never serve it skip the import; if the
+  import fails, requests under the prefix get a 503 until a later retry works
+- disabled: never mounted
+
+Heavy routers (ML, crawling, media and terminal integrations) are lazy by
+default. Modes can be overridden per router with API_ROUTER_<NAME>=eager|lazy|
+disabled, and API_LAZY_ROUTERS=false mounts every heavy router eagerly.
+
+StartupReport records how long each router import and service
+initialization took, so slow components show up in one log line.
+"""
+
+import asyncio
+import importlib
+import os
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from loguru import logger
+
+
+class RouterMode(str, Enum):
+    """How a router is mounted."""
+
+    EAGER = "eager"
+    LAZY = "lazy"
+    DISABLED = "disabled"
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """Declaration of a router that can be mounted on demand."""
+
+    name: str
+    module: str
+    prefix: str
+    heavy: bool = False
+    attribute: str = "router"
+
+    @property
+    def env_var(self) -> str:
+        """Environment variable overriding this router's mode."""
+        return f"API_ROUTER_{self.name.upper()}"
+
+    def mode(self) -> RouterMode:
+        """Resolve the mode from the environment."""
+        override = os.environ.get(self.env_var)
+        if override:
+            try:
+                return RouterMode(override.lower())
+            except ValueError:
+                logger.warning(f"Ignoring invalid {self.env_var}={override}")
+        lazy_default = os.environ.get("API_LAZY_ROUTERS", "true").lower() == "true"
+        return RouterMode.LAZY if self.heavy and lazy_default else RouterMode.EAGER
+
+
+ROUTER_SPECS: List[RouterSpec] = [
+    RouterSpec("webhooks", "api.webhooks", "/webhooks"),
+    RouterSpec("bettermode", "api.webhooks_bettermode", "/webhooks/bettermode"),
+    RouterSpec("circleso", "api.webhooks_circleso", "/webhooks/circleso"),
+    RouterSpec("beehiiv", "api.webhooks_beehiiv", "/webhooks/beehiiv"),
+    # Lazy so the scheduler package is only imported for its webhook; a
+    # failed import answers 503 under the prefix instead of failing startup
+    RouterSpec(
+        "the7space", "api.webhooks_the7space", "/webhooks/the7space", heavy=True
+    ),
+    RouterSpec("video", "api.video_router", "/api/videos", heavy=True),
+    RouterSpec("crawl", "api.crawl_router", "/crawl", heavy=True),
+    RouterSpec("voice", "api.voice_router", "/voice", heavy=True),
+    RouterSpec("rag", "api.rag_router", "/rag", heavy=True),
+    RouterSpec("huggingface", "api.huggingface_router", "/api/huggingface", heavy=True),
+    RouterSpec("agent_tasks", "api.routes.agent_tasks", "/api/v1/agents"),
+    RouterSpec("softr", "api.softr_router", "/api/staff"),
+    RouterSpec(
+        "capcut_pipit", "api.capcut_pipit_router", "/api/capcut-pipit", heavy=True
+    ),
+    RouterSpec("redis_health", "api.routes.redis_health", "/redis"),
+    RouterSpec("zapier_ecosystem", "api.zapier_ecosystem", "/zapier-ecosystem"),
+    RouterSpec("termius", "api.termius_integration", "/api/termius", heavy=True),
+    RouterSpec(
+        "contact_workflow", "api.contact_workflow_webhooks", "/contact-workflows"
+    ),
+    RouterSpec("notion_mail", "api.notion_mail_integration", "/notion-mail"),
+    RouterSpec("dashboard", "api.dashboard_router", "/api/dashboard"),
+    RouterSpec("todoist", "api.todoist_router", "/todoist"),
+    RouterSpec("mcp_tools", "api.mcp_tools_router", "/api/mcp_tools"),
+    RouterSpec("openml", "api.openml_router", "/openml", heavy=True),
+]
+
+
+class StartupReport:
+    """Timings of startup components such as router imports and service setup."""
+
+    def __init__(self):
+        self.components: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self, name: str, seconds: float, status: str, error: Optional[str] = None
+    ) -> None:
+        """
+        Record how a component went.
+
+        Args:
+            name: Component name, e.g. "router:crawl" or "vector_store"
+            seconds: Time taken
+            status: "ok", "failed" or "skipped"
+            error: Error message for failed components
+        """
+        entry = {"seconds": round(seconds, 3), "status": status}
+        if error:
+            entry["error"] = error
+        self.components[name] = entry
+
+    async def run(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """
+        Await a component, recording its time and outcome.
+
+        Failures are logged and recorded rather than raised, so one broken
+        component does not stop the others.
+
+        Returns:
+            The component's result, or None if it failed
+        """
+        start = time.perf_counter()
+        try:
+            result = await awaitable
+        except Exception as e:
+            self.record(name, time.perf_counter() - start, "failed", str(e))
+            logger.error(f"Startup component {name} failed: {e}")
+            return None
+        self.record(name, time.perf_counter() - start, "ok")
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the timings, slowest first."""
+        components = dict(
+            sorted(
+                self.components.items(),
+                key=lambda item: item[1]["seconds"],
+                reverse=True,
+            )
+        )
+        return {
+            "components": components,
+            "failed": [
+                name
+                for name, entry in components.items()
+                if entry["status"] == "failed"
+            ],
+        }
+
+    def log(self) -> None:
+        """Log the timings, slowest first."""
+        timings = ", ".join(
+            f"{name}={entry['seconds']:.2f}s"
+            + ("" if entry["status"] == "ok" else f" ({entry['status']})")
+            for name, entry in self.summary()["components"].items()
+        )
+        logger.info(f"Startup timings: {timings}")
+
+
+class LazyRouterRegistry:
+    """Mounts declared routers eagerly, on first request, or not at all."""
+
+    def __init__(
+        self,
+        app: FastAPI,
+        specs: List[RouterSpec],
+        report: Optional[StartupReport] = None,
+        retry_interval: float = 30.0,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            app: Application to mount routers on
+            specs: Router declarations
+            report: Where to record import timings
+            retry_interval: Seconds before a lazy router that failed to mount
+                is tried again; requests in between get a 503
+        """
+        self.app = app
+        self.specs = {spec.name: spec for spec in specs}
+        self.report = report or StartupReport()
+        self.modes: Dict[str, RouterMode] = {}
+        self.mounted: Dict[str, float] = {}
+        self.failed: Dict[str, str] = {}
+        self.retry_interval = retry_interval
+        self._retry_at: Dict[str, float] = {}
+        # Lazy routers not mounted yet, longest prefix first so nested
+        # prefixes such as /webhooks/beehiiv win over /webhooks
+        self._pending: List[RouterSpec] = []
+        self._lock = asyncio.Lock()
+
+    def mount_all(self) -> None:
+        """Mount eager routers now and register lazy ones for first use."""
+        for spec in self.specs.values():
+            mode = spec.mode()
+            self.modes[spec.name] = mode
+            if mode == RouterMode.EAGER:
+                self._mount(spec)
+            elif mode == RouterMode.LAZY:
+                self._pending.append(spec)
+        self._pending.sort(key=lambda spec: len(spec.prefix), reverse=True)
+
+        lazy = [spec.name for spec in self._pending]
+        disabled = [
+            name for name, mode in self.modes.items() if mode == RouterMode.DISABLED
+        ]
+        logger.info(
+            f"Mounted {len(self.mounted)} routers; lazy: {lazy or 'none'}; "
+            f"disabled: {disabled or 'none'}"
+        )
+
+    def _mount(
+        self, spec: RouterSpec, start: Optional[float] = None, module: Any = None
+    ) -> bool:
+        """Import a router, unless already imported, and include it in the app."""
+        start = start or time.perf_counter()
+        try:
+            if module is None:
+                module = importlib.import_module(spec.module)
+            self.app.include_router(getattr(module, spec.attribute))
+        except Exception as e:
+            self._record_failure(spec, start, e)
+            return False
+
+        seconds = time.perf_counter() - start
+        self.mounted[spec.name] = seconds
+        self.failed.pop(spec.name, None)
+        self.report.record(f"router:{spec.name}", seconds, "ok")
+        # Regenerate the OpenAPI schema with the new routes
+        self.app.openapi_schema = None
+        return True
+
+    def _record_failure(self, spec: RouterSpec, start: float, error: Exception) -> None:
+        self.failed[spec.name] = str(error)
+        self.report.record(
+            f"router:{spec.name}", time.perf_counter() - start, "failed", str(error)
+        )
+        logger.error(f"Failed to mount router {spec.name} ({spec.module}): {error}")
+
+    def _match(self, path: str) -> Optional[RouterSpec]:
+        for spec in self._pending:
+            if path == spec.prefix or path.startswith(spec.prefix + "/"):
+                return spec
+        return None
+
+    @property
+    def has_pending(self) -> bool:
+        """Whether any lazy router is still unmounted."""
+        return bool(self._pending)
+
+    async def ensure_mounted(self, path: str) -> bool:
+        """
+        Mount the lazy router serving a path, if there is one.
+
+        A router that fails to mount stays pending and is tried again on a
+        request after retry_interval.
+
+        Args:
+            path: Request path
+
+        Returns:
+            False if the path belongs to a lazy router that could not be mounted
+        """
+        if self._match(path) is None:
+            return True
+        async with self._lock:
+            spec = self._match(path)
+            if spec is None:
+                return True
+            if time.monotonic() < self._retry_at.get(spec.name, 0.0):
+                return False
+
+            logger.info(f"Mounting lazy router {spec.name} for {path}")
+            # Import in a thread so a heavy import does not stall the loop
+            start = time.perf_counter()
+            try:
+                module = await asyncio.to_thread(importlib.import_module, spec.module)
+            except Exception as e:
+                self._record_failure(spec, start, e)
+            else:
+                if self._mount(spec, start, module):
+                    self._pending.remove(spec)
+                    self._retry_at.pop(spec.name, None)
+                    return True
+
+            self._retry_at[spec.name] = time.monotonic() + self.retry_interval
+            return False
+
+    async def mount(self, name: str) -> bool:
+        """
+        Mount a lazy router by name ahead of its first request.
+
+        Args:
+            name: Router name from its spec
+
+        Returns:
+            True if the router is mounted
+        """
+        spec = self.specs.get(name)
+        if spec is None:
+            return False
+        if name in self.mounted:
+            return True
+        if spec in self._pending:
+            await self.ensure_mounted(spec.prefix)
+        return name in self.mounted
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the mode and state of every router."""
+        return {
+            name: {
+                "mode": self.modes.get(name, spec.mode()).value,
+                "prefix": spec.prefix,
+                "mounted": name in self.mounted,
+                "import_seconds": (
+                    round(self.mounted[name], 3) if name in self.mounted else None
+                ),
+                "error": self.failed.get(name),
+            }
+            for name, spec in self.specs.items()
+        }
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware mounting lazy routers before their first request is routed."""
+
+    def __init__(self, app: Any, registry: LazyRouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.registry.has_pending:
+            mounted = await self.registry.ensure_mounted(scope["path"])
+            if not mounted and scope["type"] == "http":
+                response = JSONResponse(
+                    {"detail": "Service temporarily unavailable"},
+                    status_code=503,
+                    headers={"Retry-After": str(int(self.registry.retry_interval))},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
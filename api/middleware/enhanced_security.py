@@ -28,13 +28,13 @@ Usage:
 """
 
 import json
+import math
 import os
 import secrets
-import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 
-import redis
+import redis.asyncio as aioredis
 from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
 from fastapi.security import (
     APIKeyHeader,
@@ -56,6 +56,7 @@ from utils.error_handling import (
     ErrorResponse,
     ErrorSeverity,
 )
+from utils.rate_limiter import RateQuota, SlidingWindowRateLimiter
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", secrets.token_urlsafe(32))
@@ -391,7 +392,7 @@ class AdvancedRateLimitMiddleware(BaseHTTPMiddleware):
     1. Uses Redis for distributed rate limiting
     2. Applies different limits based on user roles
     3. Supports IP-based, user-based, or API key-based rate limiting
-    4. Implements token bucket algorithm with burst capacity
+    4. Implements a sliding window with burst capacity
     """
 
     def __init__(
@@ -405,7 +406,9 @@ class AdvancedRateLimitMiddleware(BaseHTTPMiddleware):
         """Initialize the rate limiting middleware."""
         super().__init__(app)
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        self.redis = redis.from_url(self.redis_url)
+        self.limiter = SlidingWindowRateLimiter(
+            prefix="rate_limit", redis_client=aioredis.from_url(self.redis_url)
+        )
         self.config = rate_limit_config or RateLimitConfig(
             requests_per_minute=60, burst_capacity=20, client_identifier="ip"
         )
@@ -436,69 +439,26 @@ class AdvancedRateLimitMiddleware(BaseHTTPMiddleware):
         # Determine rate limit based on authentication
         requests_per_minute = await self._get_rate_limit(request)
 
-        # Check rate limit using token bucket algorithm
-        rate_key = f"rate_limit:{client_id}"
-
-        # Token bucket implementation in Redis
-        now = time.time()
-        bucket_key = f"{rate_key}:bucket"
-        last_update_key = f"{rate_key}:last_update"
-
-        # Script for atomic token bucket implementation in Redis
-        # This ensures that concurrent requests don't lead to race conditions
-        token_bucket_script = """
-        local bucket_key = KEYS[1]
-        local last_update_key = KEYS[2]
-        local now = tonumber(ARGV[1])
-        local rate = tonumber(ARGV[2])
-        local burst = tonumber(ARGV[3])
-        local cost = tonumber(ARGV[4])
-
-        -- Get current tokens and last update time
-        local tokens = tonumber(redis.call('get', bucket_key) or burst)
-        local last_update = tonumber(redis.call('get', last_update_key) or 0)
-
-        -- Calculate token refill based on time elapsed
-        local elapsed = math.max(0, now - last_update)
-        local new_tokens = math.min(burst, tokens + elapsed * (rate / 60.0))
-
-        -- Check if enough tokens for request
-        local allowed = new_tokens >= cost
-
-        -- Update tokens if request is allowed
-        if allowed then
-            redis.call('set', bucket_key, new_tokens - cost)
-            redis.call('set', last_update_key, now)
-            redis.call('expire', bucket_key, 120)  -- 2 minute expiry
-            redis.call('expire', last_update_key, 120)
-            return 1
-        else
-            -- Calculate wait time until enough tokens
-            local wait_time = math.ceil((cost - new_tokens) * 60.0 / rate)
-            return -wait_time
-        end
-        """
+        # Sliding window per minute, plus a shorter window capping bursts
+        quotas = [RateQuota(key=client_id, limit=requests_per_minute)]
+        if self.config.burst_capacity < requests_per_minute:
+            quotas.append(
+                RateQuota(
+                    key=f"{client_id}:burst",
+                    limit=self.config.burst_capacity,
+                    window=60.0 * self.config.burst_capacity / requests_per_minute,
+                )
+            )
 
         try:
-            # Execute token bucket algorithm atomically in Redis
-            result = self.redis.eval(
-                token_bucket_script,
-                2,  # Number of keys
-                bucket_key,
-                last_update_key,
-                now,  # Current time
-                requests_per_minute,  # Rate (requests per minute)
-                self.config.burst_capacity,  # Burst capacity
-                1,  # Cost of this request
-            )
+            # One atomic check-and-record for all quotas
+            result = await self.limiter.hit(*quotas)
 
-            # If result is positive, request is allowed
-            if result > 0:
+            if result.allowed:
                 # Process the request
                 return await call_next(request)
             else:
-                # Request is rate limited, wait_time is the negative result
-                wait_time = abs(int(result))
+                wait_time = math.ceil(result.retry_after)
 
                 # Create a standardized error response
                 error_response = await self.error_handler.log_error(
@@ -3,29 +3,63 @@ API Response Optimization Middleware for HigherSelf Network Server.
 
 Provides response compression, caching headers, structured responses,
 and performance optimizations for API endpoints.
+
+The middleware is a pure ASGI middleware: it adds headers to the response
+start message and passes body chunks through as they are produced, so
+streaming responses stay streaming. Compression (zstd, brotli or gzip,
+negotiated from Accept-Encoding) is applied chunk by chunk, and chunks above
+`offload_threshold` are compressed in a worker thread. Server-sent events are
+never compressed or buffered. Wrapping JSON bodies in the OptimizedResponse
+envelope is opt-in, since it requires buffering and re-serializing the body.
 """
 
-import gzip
+import asyncio
 import json
 import time
+import uuid
+import zlib
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
-import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import Request, Response
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
 from loguru import logger
-from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from models.base import OptimizedBaseModel
 from services.performance_monitoring_service import performance_monitor
 
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/xhtml+xml",
+    "image/svg+xml",
+)
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
 
 class OptimizedResponse(OptimizedBaseModel):
     """Standardized optimized API response structure."""
-    
+
     success: bool = True
     data: Optional[Any] = None
     message: Optional[str] = None
@@ -34,366 +68,456 @@ class OptimizedResponse(OptimizedBaseModel):
     timestamp: datetime = None
     request_id: Optional[str] = None
     execution_time_ms: Optional[float] = None
-    
+
     def __init__(self, **data):
-        if 'timestamp' not in data:
-            data['timestamp'] = datetime.now()
+        if "timestamp" not in data:
+            data["timestamp"] = datetime.now()
         super().__init__(**data)
-    
+
     class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+        json_encoders = {datetime: lambda v: v.isoformat()}
+
 
+class StreamingCompressor:
+    """Incremental compressor for one response body."""
 
-class ResponseOptimizationMiddleware(BaseHTTPMiddleware):
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        """
+        Initialize the compressor.
+
+        Args:
+            encoding: Content coding: "zstd", "br" or "gzip"
+            level: Compression level (default: a fast level for the coding)
+        """
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level or 3).compressobj()
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level or 4)
+        else:
+            self._compressor = zlib.compressobj(
+                level or 6, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """
+        Compress the next body chunk.
+
+        Args:
+            data: Body chunk
+            final: Whether this is the last chunk
+
+        Returns:
+            Compressed bytes to send. Non-final chunks are flushed so the
+            client can decode everything sent so far.
+        """
+        if self.encoding == "br":
+            output = self._compressor.process(data)
+            return output + (
+                self._compressor.finish() if final else self._compressor.flush()
+            )
+
+        output = self._compressor.compress(data)
+        if final:
+            return output + self._compressor.flush()
+        if self.encoding == "zstd":
+            return output + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return output + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class ResponseOptimizationMiddleware:
     """
     Middleware for optimizing API responses.
-    
+
     Features:
-    - Response compression (gzip)
-    - Structured response format
+    - Request ID and execution time headers
+    - Streaming response compression (zstd, brotli, gzip)
+    - Optional structured response envelope for JSON
     - Performance monitoring
     - Caching headers
-    - Response size optimization
     """
-    
+
     def __init__(
         self,
         app: ASGIApp,
         compress_responses: bool = True,
         min_compression_size: int = 1024,
         enable_caching: bool = True,
-        default_cache_ttl: int = 300
+        default_cache_ttl: int = 300,
+        wrap_responses: bool = False,
+        offload_threshold: int = 64 * 1024,
     ):
-        super().__init__(app)
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application
+            compress_responses: Whether to compress responses
+            min_compression_size: Smallest body, in bytes, worth compressing
+            enable_caching: Whether to add caching headers to GET responses
+            default_cache_ttl: Default cache TTL in seconds
+            wrap_responses: Whether to wrap JSON bodies in OptimizedResponse
+            offload_threshold: Chunks of at least this many bytes are
+                compressed in a worker thread instead of on the event loop
+        """
+        self.app = app
         self.compress_responses = compress_responses
         self.min_compression_size = min_compression_size
         self.enable_caching = enable_caching
         self.default_cache_ttl = default_cache_ttl
-        
+        self.wrap_responses = wrap_responses
+        self.offload_threshold = offload_threshold
+
+        self.encodings = [
+            encoding
+            for encoding, available in (
+                ("zstd", ZSTD_AVAILABLE),
+                ("br", BROTLI_AVAILABLE),
+                ("gzip", True),
+            )
+            if available
+        ]
+
         # Performance tracking
         self.request_count = 0
         self.total_response_time = 0.0
         self.compression_savings = 0
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Process request and optimize response."""
-        start_time = time.time()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
         request_id = self._generate_request_id()
-        
-        # Add request ID to request state
-        request.state.request_id = request_id
-        
-        try:
-            # Process request
-            response = await call_next(request)
-            
-            # Calculate execution time
-            execution_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-            
-            # Optimize response
-            optimized_response = await self._optimize_response(
-                request, response, execution_time, request_id
+        request_headers = Headers(scope=scope)
+        # Exposed to handlers as request.state.request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        state: Dict[str, Any] = {
+            "status": 500,
+            "started": False,
+            "start_message": None,
+            "compressor": None,
+            "wrap": False,
+            "body": [],
+            "bytes_in": 0,
+            "bytes_out": 0,
+        }
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                execution_time = (time.perf_counter() - start_time) * 1000
+                state["status"] = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Execution-Time-MS"] = f"{execution_time:.2f}"
+                self._add_optimization_headers(headers, scope)
+                state["start_message"] = message
+                state["execution_time"] = execution_time
+                state["wrap"] = self.wrap_responses and headers.get(
+                    "content-type", ""
+                ).startswith("application/json")
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if state["wrap"]:
+                state["body"].append(body)
+                if more_body:
+                    return
+                body = self._wrap_json(
+                    b"".join(state["body"]),
+                    state["status"],
+                    state["execution_time"],
+                    request_id,
+                )
+                MutableHeaders(scope=state["start_message"])["content-length"] = str(
+                    len(body)
+                )
+
+            if not state["started"]:
+                state["started"] = True
+                state["compressor"] = self._select_compressor(
+                    request_headers if scope["method"] != "HEAD" else None,
+                    state["start_message"],
+                    body,
+                    more_body,
+                )
+                await send(state["start_message"])
+
+            state["bytes_in"] += len(body)
+            compressor = state["compressor"]
+            if compressor is not None:
+                if len(body) >= self.offload_threshold:
+                    body = await asyncio.to_thread(
+                        compressor.compress, body, not more_body
+                    )
+                else:
+                    body = compressor.compress(body, not more_body)
+            state["bytes_out"] += len(body)
+
+            await send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
             )
-            
-            # Record metrics
-            self._record_metrics(request, optimized_response, execution_time)
-            
-            return optimized_response
-            
+
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Handle errors with optimized error response
-            execution_time = (time.time() - start_time) * 1000
+            execution_time = (time.perf_counter() - start_time) * 1000
             logger.error(f"Request {request_id} failed: {e}")
-            
+            self._record_metrics(scope, 500, execution_time, success=False)
+            if state["started"]:
+                raise
+
             error_response = self._create_error_response(
                 str(e), execution_time, request_id
             )
-            
-            self._record_metrics(request, error_response, execution_time, success=False)
-            return error_response
-    
-    async def _optimize_response(
-        self,
-        request: Request,
-        response: Response,
-        execution_time: float,
-        request_id: str
-    ) -> Response:
-        """Optimize the response with compression and headers."""
-        
-        # Handle different response types
-        if isinstance(response, JSONResponse):
-            # Optimize JSON responses
-            return await self._optimize_json_response(
-                request, response, execution_time, request_id
-            )
-        else:
-            # Optimize other response types
-            return await self._optimize_generic_response(
-                request, response, execution_time, request_id
-            )
-    
-    async def _optimize_json_response(
+            await error_response(scope, receive, send)
+            return
+
+        execution_time = (time.perf_counter() - start_time) * 1000
+        if state["compressor"] is not None:
+            self.compression_savings += state["bytes_in"] - state["bytes_out"]
+        self._record_metrics(
+            scope,
+            state["status"],
+            execution_time,
+            compressed=state["compressor"] is not None,
+        )
+
+    def _negotiate_encoding(self, accept_encoding: str) -> Optional[str]:
+        """
+        Pick the best supported content coding from an Accept-Encoding header.
+
+        Args:
+            accept_encoding: Accept-Encoding header value
+
+        Returns:
+            "zstd", "br" or "gzip", or None if none is acceptable
+        """
+        weights: Dict[str, float] = {}
+        for part in accept_encoding.lower().split(","):
+            coding, _, params = part.strip().partition(";")
+            weight = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    weight = float(params[2:])
+                except ValueError:
+                    weight = 0.0
+            if coding:
+                weights[coding.strip()] = weight
+
+        best: Optional[Tuple[float, str]] = None
+        for encoding in self.encodings:
+            weight = weights.get(encoding, weights.get("*", 0.0))
+            if weight > 0 and (best is None or weight > best[0]):
+                best = (weight, encoding)
+        return best[1] if best else None
+
+    def _select_compressor(
         self,
-        request: Request,
-        response: JSONResponse,
-        execution_time: float,
-        request_id: str
-    ) -> JSONResponse:
-        """Optimize JSON responses."""
-        
-        # Get response content
-        content = response.body
-        
-        # Parse existing content if it's JSON
+        request_headers: Optional[Headers],
+        start_message: Message,
+        first_chunk: bytes,
+        more_body: bool,
+    ) -> Optional[StreamingCompressor]:
+        """Decide whether to compress a response and update its headers."""
+        if not self.compress_responses or request_headers is None:
+            return None
+
+        headers = MutableHeaders(scope=start_message)
+        content_type = headers.get("content-type", "")
+        if (
+            "content-encoding" in headers
+            or content_type.startswith(UNCOMPRESSED_TYPES)
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+            or start_message["status"] in (204, 304)
+        ):
+            return None
+
+        size = headers.get("content-length")
+        if size is None and not more_body:
+            size = len(first_chunk)
+        if size is not None and int(size) < self.min_compression_size:
+            return None
+
+        encoding = self._negotiate_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            return None
+
+        del headers["content-length"]
+        headers["Content-Encoding"] = encoding
+        headers.add_vary_header("Accept-Encoding")
+        return StreamingCompressor(encoding)
+
+    def _wrap_json(
+        self, body: bytes, status_code: int, execution_time: float, request_id: str
+    ) -> bytes:
+        """Wrap a JSON body in the OptimizedResponse envelope."""
         try:
-            if isinstance(content, bytes):
-                content_str = content.decode('utf-8')
-                existing_data = json.loads(content_str)
-            else:
-                existing_data = content
+            existing_data = json.loads(body)
         except (json.JSONDecodeError, UnicodeDecodeError):
-            existing_data = {"raw_content": str(content)}
-        
-        # Create optimized response structure
-        if not isinstance(existing_data, dict) or 'success' not in existing_data:
-            # Wrap non-standard responses
-            optimized_data = OptimizedResponse(
-                success=response.status_code < 400,
+            existing_data = {"raw_content": body.decode("utf-8", errors="replace")}
+
+        if isinstance(existing_data, dict) and "success" in existing_data:
+            # Update existing structured response
+            existing_data.update(
+                {
+                    "execution_time_ms": execution_time,
+                    "request_id": request_id,
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+            return json.dumps(existing_data, default=str).encode("utf-8")
+
+        return (
+            OptimizedResponse(
+                success=status_code < 400,
                 data=existing_data,
                 execution_time_ms=execution_time,
-                request_id=request_id
+                request_id=request_id,
             )
-        else:
-            # Update existing structured response
-            existing_data.update({
-                'execution_time_ms': execution_time,
-                'request_id': request_id,
-                'timestamp': datetime.now().isoformat()
-            })
-            optimized_data = existing_data
-        
-        # Serialize response
-        if isinstance(optimized_data, OptimizedResponse):
-            response_content = optimized_data.model_dump_json()
-        else:
-            response_content = json.dumps(optimized_data, default=str)
-        
-        # Apply compression if enabled and beneficial
-        if self.compress_responses and len(response_content) > self.min_compression_size:
-            if self._should_compress(request):
-                compressed_content = gzip.compress(response_content.encode('utf-8'))
-                
-                # Only use compression if it actually reduces size
-                if len(compressed_content) < len(response_content):
-                    self.compression_savings += len(response_content) - len(compressed_content)
-                    
-                    optimized_response = Response(
-                        content=compressed_content,
-                        status_code=response.status_code,
-                        headers=response.headers,
-                        media_type="application/json"
-                    )
-                    optimized_response.headers["content-encoding"] = "gzip"
-                    optimized_response.headers["vary"] = "Accept-Encoding"
-                else:
-                    optimized_response = JSONResponse(
-                        content=optimized_data if isinstance(optimized_data, dict) else optimized_data.model_dump(),
-                        status_code=response.status_code,
-                        headers=response.headers
-                    )
-            else:
-                optimized_response = JSONResponse(
-                    content=optimized_data if isinstance(optimized_data, dict) else optimized_data.model_dump(),
-                    status_code=response.status_code,
-                    headers=response.headers
-                )
-        else:
-            optimized_response = JSONResponse(
-                content=optimized_data if isinstance(optimized_data, dict) else optimized_data.model_dump(),
-                status_code=response.status_code,
-                headers=response.headers
-            )
-        
-        # Add optimization headers
-        self._add_optimization_headers(optimized_response, request)
-        
-        return optimized_response
-    
-    async def _optimize_generic_response(
-        self,
-        request: Request,
-        response: Response,
-        execution_time: float,
-        request_id: str
-    ) -> Response:
-        """Optimize non-JSON responses."""
-        
-        # Add performance headers
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Execution-Time-MS"] = str(execution_time)
-        
-        # Apply compression for text responses
-        if (self.compress_responses and 
-            response.headers.get("content-type", "").startswith("text/") and
-            len(response.body) > self.min_compression_size and
-            self._should_compress(request)):
-            
-            compressed_content = gzip.compress(response.body)
-            if len(compressed_content) < len(response.body):
-                self.compression_savings += len(response.body) - len(compressed_content)
-                
-                response = Response(
-                    content=compressed_content,
-                    status_code=response.status_code,
-                    headers=response.headers
-                )
-                response.headers["content-encoding"] = "gzip"
-                response.headers["vary"] = "Accept-Encoding"
-        
-        # Add optimization headers
-        self._add_optimization_headers(response, request)
-        
-        return response
-    
-    def _should_compress(self, request: Request) -> bool:
-        """Check if response should be compressed based on request headers."""
-        accept_encoding = request.headers.get("accept-encoding", "")
-        return "gzip" in accept_encoding.lower()
-    
-    def _add_optimization_headers(self, response: Response, request: Request):
+            .model_dump_json()
+            .encode("utf-8")
+        )
+
+    def _add_optimization_headers(self, headers: MutableHeaders, scope: Scope):
         """Add optimization and caching headers."""
-        
+
         # Performance headers
-        response.headers["X-Powered-By"] = "HigherSelf-Network-Server"
-        response.headers["X-Response-Optimized"] = "true"
-        
+        headers["X-Powered-By"] = "HigherSelf-Network-Server"
+        headers["X-Response-Optimized"] = "true"
+
         # Caching headers for GET requests
-        if self.enable_caching and request.method == "GET":
+        if self.enable_caching and scope["method"] == "GET":
             # Check if endpoint should be cached
-            cache_ttl = self._get_cache_ttl(request.url.path)
+            cache_ttl = self._get_cache_ttl(scope["path"])
             if cache_ttl > 0:
-                response.headers["Cache-Control"] = f"public, max-age={cache_ttl}"
-                response.headers["Expires"] = (
+                headers["Cache-Control"] = f"public, max-age={cache_ttl}"
+                headers["Expires"] = (
                     datetime.now() + timedelta(seconds=cache_ttl)
                 ).strftime("%a, %d %b %Y %H:%M:%S GMT")
             else:
-                response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-                response.headers["Pragma"] = "no-cache"
-                response.headers["Expires"] = "0"
-        
+                headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+                headers["Pragma"] = "no-cache"
+                headers["Expires"] = "0"
+
         # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-    
+        headers["X-Content-Type-Options"] = "nosniff"
+        headers["X-Frame-Options"] = "DENY"
+        headers["X-XSS-Protection"] = "1; mode=block"
+
     def _get_cache_ttl(self, path: str) -> int:
         """Get cache TTL for specific endpoint."""
         # Define caching rules for different endpoints
         cache_rules = {
-            "/health": 60,           # 1 minute
-            "/api/health": 60,       # 1 minute
-            "/metrics": 30,          # 30 seconds
-            "/api/agents": 300,      # 5 minutes
-            "/api/workflows": 600,   # 10 minutes
+            "/health": 60,  # 1 minute
+            "/api/health": 60,  # 1 minute
+            "/metrics": 30,  # 30 seconds
+            "/api/agents": 300,  # 5 minutes
+            "/api/workflows": 600,  # 10 minutes
         }
-        
+
         # Check for exact matches first
         if path in cache_rules:
             return cache_rules[path]
-        
+
         # Check for pattern matches
         if path.startswith("/api/static/"):
             return 3600  # 1 hour for static content
         elif path.startswith("/docs") or path.startswith("/redoc"):
             return 1800  # 30 minutes for documentation
         elif "health" in path:
-            return 60    # 1 minute for health checks
-        
+            return 60  # 1 minute for health checks
+
         # Default: no caching for dynamic content
         return 0
-    
+
     def _create_error_response(
-        self,
-        error_message: str,
-        execution_time: float,
-        request_id: str
+        self, error_message: str, execution_time: float, request_id: str
     ) -> JSONResponse:
         """Create standardized error response."""
-        
+
         error_response = OptimizedResponse(
             success=False,
             data=None,
             message="An error occurred while processing the request",
             errors=[error_message],
             execution_time_ms=execution_time,
-            request_id=request_id
+            request_id=request_id,
         )
-        
+
         return JSONResponse(
-            content=error_response.model_dump(),
+            content=error_response.model_dump(mode="json"),
             status_code=500,
             headers={
                 "X-Request-ID": request_id,
-                "X-Execution-Time-MS": str(execution_time),
-                "X-Response-Optimized": "true"
-            }
+                "X-Execution-Time-MS": f"{execution_time:.2f}",
+                "X-Response-Optimized": "true",
+            },
         )
-    
+
     def _generate_request_id(self) -> str:
         """Generate unique request ID."""
-        import uuid
         return str(uuid.uuid4())[:8]
-    
+
     def _record_metrics(
         self,
-        request: Request,
-        response: Response,
+        scope: Scope,
+        status_code: int,
         execution_time: float,
-        success: bool = True
+        success: bool = True,
+        compressed: bool = False,
     ):
         """Record performance metrics."""
         self.request_count += 1
         self.total_response_time += execution_time
-        
+
         # Record in performance monitor
-        performance_monitor.record_request(execution_time / 1000, success)  # Convert to seconds
-        
+        performance_monitor.record_request(
+            execution_time / 1000, success
+        )  # Convert to seconds
+
         # Record detailed metrics
         performance_monitor.record_metric(
             "api_request_duration",
             execution_time,
             {
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": str(response.status_code),
-                "success": str(success)
-            }
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": str(status_code),
+                "success": str(success),
+            },
         )
-        
+
         # Record compression metrics
-        if hasattr(response, 'headers') and response.headers.get("content-encoding") == "gzip":
+        if compressed:
             performance_monitor.record_metric(
-                "response_compressed",
-                1,
-                {"path": request.url.path}
+                "response_compressed", 1, {"path": scope["path"]}
             )
-    
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get middleware performance metrics."""
         avg_response_time = (
             self.total_response_time / self.request_count
-            if self.request_count > 0 else 0
+            if self.request_count > 0
+            else 0
         )
-        
+
         return {
             "total_requests": self.request_count,
             "avg_response_time_ms": avg_response_time,
             "compression_enabled": self.compress_responses,
+            "compression_encodings": self.encodings,
             "compression_savings_bytes": self.compression_savings,
-            "caching_enabled": self.enable_caching
+            "caching_enabled": self.enable_caching,
         }
 
 
@@ -401,17 +525,21 @@ def create_response_optimization_middleware(
     compress_responses: bool = True,
     min_compression_size: int = 1024,
     enable_caching: bool = True,
-    default_cache_ttl: int = 300
+    default_cache_ttl: int = 300,
+    wrap_responses: bool = False,
+    offload_threshold: int = 64 * 1024,
 ) -> ResponseOptimizationMiddleware:
     """Factory function to create response optimization middleware."""
-    
+
     def middleware_factory(app: ASGIApp) -> ResponseOptimizationMiddleware:
         return ResponseOptimizationMiddleware(
             app=app,
             compress_responses=compress_responses,
             min_compression_size=min_compression_size,
             enable_caching=enable_caching,
-            default_cache_ttl=default_cache_ttl
+            default_cache_ttl=default_cache_ttl,
+            wrap_responses=wrap_responses,
+            offload_threshold=offload_threshold,
         )
-    
+
     return middleware_factory
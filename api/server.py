@@ -7,13 +7,13 @@ import asyncio
 import json
 # Standard library imports
 import os
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 
 # Third-party imports
 import uvicorn
-from fastapi import (BackgroundTasks, Depends, FastAPI, Header, HTTPException,
-                     Request)
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from loguru import logger
@@ -21,42 +21,40 @@ from pydantic import BaseModel, Field
 
 from agents.booking_agent import AmeliaBooking, BookingAgent
 from agents.lead_capture_agent import LeadCaptureAgent
-from api.capcut_pipit_router import router as capcut_pipit_router
-from api.crawl_router import router as crawl_router
-from api.huggingface_router import router as huggingface_router
-from api.mcp_tools_router import router as mcp_tools_router
-from api.openml_router import router as openml_router
-from api.rag_router import router as rag_router
-from api.routes.agent_tasks import router as agent_tasks_router
-# from api.routes.barter import router as barter_router  # Module not found
-from api.routes.redis_health import router as redis_health_router
-from api.softr_router import router as softr_router
-from api.video_router import router as video_router
-from api.voice_router import router as voice_router
-from api.webhooks import router as webhook_router
-from api.webhooks_beehiiv import router as beehiiv_router
-from api.webhooks_bettermode import router as bettermode_router
-from api.webhooks_circleso import router as circleso_router
-from api.zapier_ecosystem import router as zapier_ecosystem_router
-from api.termius_integration import router as termius_router
-from api.contact_workflow_webhooks import router as contact_workflow_router
-from api.notion_mail_integration import router as notion_mail_router
-from api.dashboard_router import router as dashboard_router
-from api.todoist_router import router as todoist_router
+from api.lazy_routers import (
+    ROUTER_SPECS,
+    LazyRouterMiddleware,
+    LazyRouterRegistry,
+    RouterMode,
+    StartupReport,
+)
 from models.base import ApiPlatform, NotionIntegrationConfig
 from models.notion_db_models import WorkflowInstance
 from services.acuity_service import AcuityService
 from services.ai_router import AIRouter
 from services.airtable_service import AirtableService
 from services.amelia_service import AmeliaServiceClient
-from services.integration_manager import get_integration_manager  # Changed
+from services.http_client_registry import http_client_registry
+from services.integration_manager import (  # Changed
+    close_integration_manager,
+    get_integration_manager,
+)
+from services.mongo_write_sink import get_mongo_write_sink
 from services.notion_service import NotionService
+from services.notion_write_queue import stop_notion_write_queues
 from services.plaud_service import PlaudService
 from services.snovio_service import SnovIOService
 from services.tutorlm_service import TutorLMService
 from services.typeform_service import TypeFormService
 from services.userfeedback_service import UserFeedbackService
+from services.webhook_queue import (
+    WebhookDelivery,
+    get_webhook_queue,
+    register_webhook_handler,
+)
+from services.websocket_broadcast import connection_manager
 from services.woocommerce_service import WooCommerceService
+from workflow.state_store import drain_notion_mirrors
 
 # Configure logging
 # logging.basicConfig removed - assuming setup_logging from utils is called in main.py
@@ -78,33 +76,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(webhook_router)
-app.include_router(bettermode_router)  # Added BetterMode router
-app.include_router(circleso_router)  # Legacy Circle.so router
-app.include_router(beehiiv_router)
-app.include_router(video_router)
-app.include_router(crawl_router)
-app.include_router(voice_router)
-app.include_router(rag_router)
-app.include_router(huggingface_router)
-app.include_router(agent_tasks_router)
-app.include_router(softr_router)
-app.include_router(capcut_pipit_router)
-app.include_router(redis_health_router)  # Added Redis health monitoring router
-# app.include_router(barter_router)  # Added Barter system router - Module not found
-app.include_router(zapier_ecosystem_router)  # Added Zapier ecosystem router
-app.include_router(termius_router)  # Added Termius integration router
-app.include_router(contact_workflow_router)  # Added Contact Workflow automation router
-app.include_router(notion_mail_router)  # Added Notion Mail Integration router
-app.include_router(dashboard_router)  # Added Operations Dashboard router
-app.include_router(todoist_router)  # Added Todoist integration router
-app.include_router(
-    mcp_tools_router
-)  # Added MCP tools router for Context7 and other MCP services
-app.include_router(
-    openml_router
-)  # Added OpenML router for dataset management and training
+# Include routers. Heavy routers are imported on their first request unless
+# configured otherwise; see api/lazy_routers.py
+startup_report = StartupReport()
+router_registry = LazyRouterRegistry(app, ROUTER_SPECS, startup_report)
+router_registry.mount_all()
+app.add_middleware(LazyRouterMiddleware, registry=router_registry)
 
 # Agents will be passed via app.state.agents from main.py
 
@@ -189,132 +166,170 @@ async def verify_webhook_secret(x_webhook_secret: Optional[str] = Header(None)):
 # Integration Manager will be fetched via get_integration_manager() where needed
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services, integrations, and register agents on startup."""
-    try:
-        # Get or create Integration Manager instance (this will also initialize it if new)
-        logger.info(
-            "Fetching/Initializing Integration Manager via singleton accessor for startup..."
+async def _start_integrations():
+    """Initialize the Integration Manager, then warm the lead dedup index."""
+    # Get or create Integration Manager instance (this will also initialize it if new)
+    logger.info(
+        "Fetching/Initializing Integration Manager via singleton accessor for startup..."
+    )
+    integration_manager = await startup_report.run(
+        "integration_manager", get_integration_manager()
+    )
+
+    if not integration_manager:
+        logger.error(
+            "Failed to obtain Integration Manager instance during startup. Critical error."
         )
-        integration_manager = await get_integration_manager()  # Changed
+        return
 
-        if not integration_manager:
-            logger.error(
-                "Failed to obtain Integration Manager instance during startup. Critical error."
-            )
-            # This indicates a problem with get_integration_manager or its internal initialization
-            # Depending on desired behavior, you might want to raise an error to stop startup
-            return  # Or raise an exception
-
-        logger.info("Integration Manager instance obtained for startup.")
-        status = (
-            integration_manager.get_initialization_status()
-        )  # Get status after it's initialized
-
-        # Log overall status based on Notion, as it's critical
-        if not status.get("notion", False):
-            logger.error(
-                "Integration Manager's Notion service failed to initialize. This may impact core functionality."
-            )
-        else:
-            logger.info(
-                "Integration Manager's Notion service appears to be initialized."
-            )
+    logger.info("Integration Manager instance obtained for startup.")
+    status = (
+        integration_manager.get_initialization_status()
+    )  # Get status after it's initialized
+
+    # Log overall status based on Notion, as it's critical
+    if not status.get("notion", False):
+        logger.error(
+            "Integration Manager's Notion service failed to initialize. This may impact core functionality."
+        )
+    else:
+        logger.info("Integration Manager's Notion service appears to be initialized.")
 
-        # Log detailed status for all services
-        successful_count = 0
-        total_count = len(status) if status else 0
-        for service, initialized in status.items():
-            if initialized:
-                logger.info(
-                    f"✅ {service.capitalize()} service initialized successfully via Integration Manager."
-                )
-                successful_count += 1
-            else:
-                logger.warning(
-                    f"❌ {service.capitalize()} service failed to initialize via Integration Manager."
-                )
-
-        if total_count > 0:
+    # Log detailed status for all services
+    successful_count = 0
+    total_count = len(status) if status else 0
+    for service, initialized in status.items():
+        if initialized:
             logger.info(
-                f"Integration Manager reported {successful_count}/{total_count} services initialized during startup."
+                f"✅ {service.capitalize()} service initialized successfully via Integration Manager."
             )
+            successful_count += 1
         else:
             logger.warning(
-                "Integration Manager reported no services or status unavailable during startup."
+                f"❌ {service.capitalize()} service failed to initialize via Integration Manager."
             )
 
-        # Agent registration is now handled in main.py before starting the API.
-        # We can log the availability of agents passed via app.state
-        if hasattr(app.state, "agents") and app.state.agents:
-            logger.info(
-                f"Agents available to API server: {list(app.state.agents.keys())}"
-            )
-            if "lead_capture_agent" in app.state.agents:
-                logger.info("Lead Capture Agent (or its alias Nyra) instance provided.")
-            if "booking_agent" in app.state.agents:
-                logger.info("Booking Agent (or its alias Solari) instance provided.")
-        else:
-            logger.warning("No agents dictionary found in app.state or it's empty.")
-
-        # Initialize RAG services
-        logger.info("Initializing RAG services...")
-        try:
-            from knowledge.rag_pipeline import get_rag_pipeline
-            from knowledge.semantic_search import get_semantic_search
-            from knowledge.vector_store import get_vector_store
-            from services.ai_router import AIRouter
-            from services.aqua_voice_service import get_aqua_voice_service
-            from services.crawl4ai_service import get_crawl4ai_service
-
-            # Initialize AI router for completions
-            ai_router = AIRouter()
-
-            # Initialize vector store and semantic search
-            vector_store = await get_vector_store()
-            logger.info("✅ Vector store initialized successfully")
-
-            semantic_search = await get_semantic_search()
-            logger.info("✅ Semantic search initialized successfully")
-
-            # Initialize Crawl4AI service
-            crawl_service = await get_crawl4ai_service()
-            logger.info("✅ Crawl4AI service initialized successfully")
-
-            # Initialize Aqua Voice service
-            voice_service = await get_aqua_voice_service(ai_router)
-            logger.info("✅ Aqua Voice service initialized successfully")
-
-            # Initialize RAG pipeline
-            rag_pipeline = await get_rag_pipeline(ai_router)
-            logger.info("✅ RAG pipeline initialized successfully")
-
-            # Initialize Hugging Face service and router
-            from api.huggingface_router import \
-                init_router as init_huggingface_router
-            from services.huggingface_service import HuggingFaceService
+    if total_count > 0:
+        logger.info(
+            f"Integration Manager reported {successful_count}/{total_count} services initialized during startup."
+        )
+    else:
+        logger.warning(
+            "Integration Manager reported no services or status unavailable during startup."
+        )
 
-            try:
-                # Create Hugging Face service
-                huggingface_service = HuggingFaceService(
-                    notion_service=integration_manager.get_notion_service()
-                )
-                if await huggingface_service.initialize():
-                    # Initialize the router with the service
-                    init_huggingface_router(
-                        huggingface_service, integration_manager.get_notion_service()
-                    )
-                    logger.info("✅ Hugging Face service initialized successfully")
-                else:
-                    logger.warning("⚠️ Hugging Face service initialization failed")
-            except Exception as e:
-                logger.error(f"Error initializing Hugging Face service: {e}")
-
-        except Exception as e:
-            logger.error(f"Error initializing RAG services: {e}")
-    except Exception as e:
-        logger.error(f"Error during startup: {e}")
+    # main.py initializes the manager on a loop that ends before the server
+    # starts, which cancels the revalidation task, so start it on this loop
+    if integration_manager.config.revalidation_interval > 0:
+        integration_manager.start_revalidation()
+
+    # Load recent leads so duplicate checks do not need to query Notion
+    lead_agent = getattr(app.state, "agents", {}).get("lead_capture_agent")
+    if lead_agent and hasattr(lead_agent, "warm_dedup_index"):
+        await startup_report.run("lead_dedup_index", lead_agent.warm_dedup_index())
+
+
+async def _start_knowledge_services():
+    """
+    Initialize the knowledge base and the services behind eager RAG routers.
+
+    Lazy routers initialize their services on first use through their
+    dependency getters instead.
+    """
+    eager = [
+        name
+        for name in ("rag", "crawl", "voice")
+        if router_registry.modes.get(name) == RouterMode.EAGER
+    ]
+    if not eager:
+        logger.info("RAG, crawl and voice routers are lazy; skipping their startup")
+        return
+
+    logger.info("Initializing RAG services...")
+    from knowledge.semantic_search import get_semantic_search
+    from knowledge.vector_store import get_vector_store
+
+    # The services below share the vector store and semantic search
+    # singletons, so those are created first
+    if await startup_report.run("vector_store", get_vector_store()) is None:
+        return
+    if await startup_report.run("semantic_search", get_semantic_search()) is None:
+        return
+
+    # Initialize AI router for completions
+    ai_router = AIRouter()
+    services = []
+    if "rag" in eager:
+        from knowledge.rag_pipeline import get_rag_pipeline
+
+        services.append(startup_report.run("rag_pipeline", get_rag_pipeline(ai_router)))
+    if "crawl" in eager:
+        from services.crawl4ai_service import get_crawl4ai_service
+
+        services.append(startup_report.run("crawl4ai", get_crawl4ai_service()))
+    if "voice" in eager:
+        from services.aqua_voice_service import get_aqua_voice_service
+
+        services.append(
+            startup_report.run("aqua_voice", get_aqua_voice_service(ai_router))
+        )
+    await asyncio.gather(*services)
+
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Initialize services and integrations on startup.
+
+    Independent components start concurrently, and the time each one took is
+    logged and served at /health/startup.
+    """
+    started = time.perf_counter()
+
+    # Agent registration is now handled in main.py before starting the API.
+    # We can log the availability of agents passed via app.state
+    if hasattr(app.state, "agents") and app.state.agents:
+        logger.info(f"Agents available to API server: {list(app.state.agents.keys())}")
+        if "lead_capture_agent" in app.state.agents:
+            logger.info("Lead Capture Agent (or its alias Nyra) instance provided.")
+        if "booking_agent" in app.state.agents:
+            logger.info("Booking Agent (or its alias Solari) instance provided.")
+    else:
+        logger.warning("No agents dictionary found in app.state or it's empty.")
+
+    # Every component goes through startup_report.run, so one that raises is
+    # recorded as failed instead of aborting startup. The webhook queue start
+    # also requeues deliveries accepted but not finished before the last
+    # shutdown.
+    await asyncio.gather(
+        startup_report.run("integrations", _start_integrations()),
+        startup_report.run("knowledge_services", _start_knowledge_services()),
+        startup_report.run("webhook_queue", get_webhook_queue().start()),
+    )
+
+    startup_report.record("startup_total", time.perf_counter() - started, "ok")
+    startup_report.log()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers, flush buffered writes and close shared HTTP clients on shutdown."""
+    await get_webhook_queue().stop()
+    message_bus = getattr(app.state, "message_bus", None)
+    if message_bus is not None:
+        await message_bus.close()
+    await drain_notion_mirrors()
+    await stop_notion_write_queues()
+    await connection_manager.close()
+    await get_mongo_write_sink().stop()
+    await close_integration_manager()
+    await http_client_registry.close_all()
+
+
+@app.get("/health/startup")
+async def startup_health():
+    """Startup time per component and the mount state of each router."""
+    return {**startup_report.summary(), "routers": router_registry.get_status()}
 
 
 @app.get("/health")
@@ -350,9 +365,14 @@ async def health_check(request: Request):  # Added request
     else:
         integration_status = integration_manager.get_initialization_status()
 
-    # Check RAG services
+    # Check RAG services. While their routers are lazy and unused they are
+    # not loaded, and a health check should not load them
     rag_services_status = {}
     try:
+        if not any(
+            name in router_registry.mounted for name in ("rag", "crawl", "voice")
+        ):
+            raise LookupError("not loaded; RAG routers have not been used yet")
         from knowledge.semantic_search import get_semantic_search
         from knowledge.vector_store import get_vector_store
         from services.crawl4ai_service import get_crawl4ai_service
@@ -366,6 +386,8 @@ async def health_check(request: Request):  # Added request
             "semantic_search": True,
             "crawl4ai_service": True,
         }
+    except LookupError as e:
+        rag_services_status = {"loaded": False, "reason": str(e)}
     except Exception as e:
         logger.error(f"Error checking RAG services: {e}")
         rag_services_status = {
@@ -397,16 +419,17 @@ async def health_check(request: Request):  # Added request
     # Check Hugging Face service
     huggingface_status = False
     try:
-        from services.huggingface_service import HuggingFaceService
+        if "huggingface" in router_registry.mounted:
+            from services.huggingface_service import HuggingFaceService
 
-        huggingface_service = HuggingFaceService()
-        huggingface_status = await huggingface_service.initialize()
+            huggingface_service = HuggingFaceService()
+            huggingface_status = await huggingface_service.initialize()
     except Exception as e:
         logger.error(f"Error checking Hugging Face service: {e}")
         huggingface_status = False
 
-    # If RAG services are not healthy, system is degraded
-    if not all(
+    # If loaded RAG services are not healthy, system is degraded
+    if rag_services_status.get("loaded", True) and not all(
         rag_services_status.get(service, False)
         for service in ["vector_store", "semantic_search"]
     ):
@@ -460,30 +483,30 @@ async def health_check(request: Request):  # Added request
     }
 
 
+def get_agent(name: str) -> Any:
+    """Get an agent registered in app.state, failing if it is missing."""
+    agent = getattr(app.state, "agents", {}).get(name)
+    if not agent:
+        raise RuntimeError(f"Agent '{name}' not available")
+    return agent
+
+
 @app.post(
     "/webhooks/typeform",
     response_model=WebhookResponse,
+    status_code=202,
     dependencies=[Depends(verify_webhook_secret)],
 )
-async def typeform_webhook(
-    background_tasks: BackgroundTasks, payload: Dict[str, Any], request: Request
-):
+async def typeform_webhook(payload: Dict[str, Any], request: Request):
     """
     Typeform webhook endpoint.
-    Receives form submissions from Typeform and processes them.
+    Receives form submissions from Typeform and queues them for processing.
     """
     logger.info(f"Received Typeform webhook: {payload.get('event_id')}")
-    lead_agent = request.app.state.agents.get("lead_capture_agent")  # or 'nyra'
-    if not lead_agent:
-        logger.error("Lead Capture Agent not found in app.state for Typeform webhook.")
-        raise HTTPException(status_code=500, detail="Lead Capture Agent not available")
 
     # Extract query parameters for workflow and business entity
     business_entity_id = request.query_params.get("business_entity_id")
     workflow_id = request.query_params.get("workflow_id")
-    sync_to_hubspot = (
-        request.query_params.get("sync_to_hubspot", "true").lower() == "true"
-    )
 
     if not business_entity_id or not workflow_id:
         raise HTTPException(
@@ -491,22 +514,37 @@ async def typeform_webhook(
             detail="business_entity_id and workflow_id query parameters are required",
         )
 
-    # Process the webhook in the background
-    background_tasks.add_task(
-        lead_agent.process_event,  # Use agent from app.state
-        event_type="typeform_webhook",
-        event_data={
-            "payload": payload,
-            "business_entity_id": business_entity_id,
-            "workflow_id": workflow_id,
-            "sync_to_hubspot": sync_to_hubspot,
-        },
+    delivery_id, duplicate = await get_webhook_queue().enqueue(
+        "lead_typeform",
+        await request.body(),
+        idempotency_key=payload.get("event_id"),
+        query_params=dict(request.query_params),
     )
 
     return WebhookResponse(
-        status="success",
-        message="Typeform webhook received and processing started",
-        data={"event_id": payload.get("event_id")},
+        status="accepted",
+        message="Typeform webhook received and queued for processing",
+        data={
+            "event_id": payload.get("event_id"),
+            "delivery_id": delivery_id,
+            "duplicate": duplicate,
+        },
+    )
+
+
+async def process_typeform_delivery(delivery: WebhookDelivery) -> None:
+    """Process a queued Typeform submission with the Lead Capture Agent."""
+    lead_agent = get_agent("lead_capture_agent")  # or 'nyra'
+    params = delivery.query_params
+
+    await lead_agent.process_event(
+        event_type="typeform_webhook",
+        event_data={
+            "payload": delivery.json_payload(),
+            "business_entity_id": params.get("business_entity_id"),
+            "workflow_id": params.get("workflow_id"),
+            "sync_to_hubspot": params.get("sync_to_hubspot", "true").lower() == "true",
+        },
     )
 
 
@@ -548,21 +586,47 @@ async def submit_website_form(
 @app.post(
     "/api/integrations/event_registration",
     response_model=WebhookResponse,
+    status_code=202,
     dependencies=[Depends(verify_webhook_secret)],
 )
 async def event_registration_webhook(
     payload: EventRegistrationPayload,
-    background_tasks: BackgroundTasks,
     request: Request,  # Added to potentially access headers or client info if needed later
 ):
     """
     Webhook endpoint for receiving event registrations from integrated platforms like Zapier.
-    Processes the registration through the LeadCaptureAgent.
+    Queues the registration for processing by the LeadCaptureAgent.
     """
     logger.info(
         f"Received event registration from platform: {payload.event_platform} for attendee: {payload.attendee_email}"
     )
 
+    delivery_id, duplicate = await get_webhook_queue().enqueue(
+        "event_registration",
+        payload.model_dump_json().encode("utf-8"),
+        idempotency_key=(
+            f"{payload.event_platform}:{payload.event_id}:{payload.attendee_email}"
+            if payload.event_id
+            else None
+        ),
+    )
+
+    return WebhookResponse(
+        status="accepted",
+        message=f"Event registration for {payload.attendee_email} received and queued for processing.",
+        data={
+            "attendee_email": payload.attendee_email,
+            "event_platform": payload.event_platform,
+            "delivery_id": delivery_id,
+            "duplicate": duplicate,
+        },
+    )
+
+
+async def process_event_registration_delivery(delivery: WebhookDelivery) -> None:
+    """Process a queued event registration with the Lead Capture Agent."""
+    payload = EventRegistrationPayload(**delivery.json_payload())
+
     # Prepare event data for the LeadCaptureAgent
     # The structure should align with what LeadCaptureAgent expects or be adapted within the agent
     event_data_for_agent = {
@@ -582,41 +646,23 @@ async def event_registration_webhook(
         "integration_source": "zapier_event_registration",
     }
 
-    lead_agent = request.app.state.agents.get("lead_capture_agent")  # or 'nyra'
-    if not lead_agent:
-        logger.error(
-            "Lead Capture Agent not found in app.state for event registration webhook."
-        )
-        raise HTTPException(status_code=500, detail="Lead Capture Agent not available")
-
-    # Process the event in the background
-    background_tasks.add_task(
-        lead_agent.process_event,  # Use agent from app.state
+    lead_agent = get_agent("lead_capture_agent")  # or 'nyra'
+    await lead_agent.process_event(
         event_type="generic_event_registration",  # A new event type for LeadCaptureAgent
         event_data=event_data_for_agent,
     )
 
-    return WebhookResponse(
-        status="success",
-        message=f"Event registration for {payload.attendee_email} received and processing started.",
-        data={
-            "attendee_email": payload.attendee_email,
-            "event_platform": payload.event_platform,
-        },
-    )
-
 
 @app.post(
     "/webhooks/amelia",
     response_model=WebhookResponse,
+    status_code=202,
     dependencies=[Depends(verify_webhook_secret)],
 )
-async def amelia_webhook(
-    background_tasks: BackgroundTasks, payload: Dict[str, Any], request: Request
-):
+async def amelia_webhook(payload: Dict[str, Any], request: Request):
     """
     Amelia webhook endpoint.
-    Receives booking events from Amelia (new bookings, status updates) and processes them.
+    Receives booking events from Amelia (new bookings, status updates) and queues them.
     """
     logger.info(f"Received Amelia webhook: {payload.get('event_type')}")
 
@@ -636,34 +682,56 @@ async def amelia_webhook(
             detail="workflow_id query parameter is required for new_booking events",
         )
 
-    # Process based on event type
-    book_agent = request.app.state.agents.get("booking_agent")  # or 'solari'
-    if not book_agent:
-        logger.error("Booking Agent not found in app.state for Amelia webhook.")
-        raise HTTPException(status_code=500, detail="Booking Agent not available")
-
     if event_type == "new_booking":
-        # Process in the background
-        background_tasks.add_task(
-            book_agent.process_event,  # Use agent from app.state
+        booking_id = payload.get("booking", {}).get("booking_id")
+        message = "Amelia booking received and queued for processing"
+    elif event_type == "booking_status_update":
+        booking_id = payload.get("booking_id")
+        message = "Booking status update received and queued for processing"
+    else:
+        return JSONResponse(
+            status_code=200,
+            content=WebhookResponse(
+                status="error", message=f"Unsupported event type: {event_type}"
+            ).model_dump(),
+        )
+
+    delivery_id, duplicate = await get_webhook_queue().enqueue(
+        "amelia_booking",
+        await request.body(),
+        query_params={
+            "business_entity_id": business_entity_id,
+            "workflow_id": workflow_id or "",
+        },
+    )
+
+    return WebhookResponse(
+        status="accepted",
+        message=message,
+        data={
+            "booking_id": booking_id,
+            "delivery_id": delivery_id,
+            "duplicate": duplicate,
+        },
+    )
+
+
+async def process_amelia_delivery(delivery: WebhookDelivery) -> None:
+    """Process a queued Amelia booking event with the Booking Agent."""
+    book_agent = get_agent("booking_agent")  # or 'solari'
+    payload = delivery.json_payload()
+
+    if payload.get("event_type") == "new_booking":
+        await book_agent.process_event(
             event_type="new_booking",
             event_data={
                 "booking": payload.get("booking", {}),
-                "business_entity_id": business_entity_id,
-                "workflow_id": workflow_id,
+                "business_entity_id": delivery.query_params.get("business_entity_id"),
+                "workflow_id": delivery.query_params.get("workflow_id"),
             },
         )
-
-        return WebhookResponse(
-            status="success",
-            message="Amelia booking received and processing started",
-            data={"booking_id": payload.get("booking", {}).get("booking_id")},
-        )
-
-    elif event_type == "booking_status_update":
-        # Process in the background
-        background_tasks.add_task(
-            book_agent.process_event,  # Use agent from app.state
+    else:
+        await book_agent.process_event(
             event_type="booking_status_update",
             event_data={
                 "booking_id": payload.get("booking_id"),
@@ -672,16 +740,36 @@ async def amelia_webhook(
             },
         )
 
-        return WebhookResponse(
-            status="success",
-            message="Booking status update received and processing started",
-            data={"booking_id": payload.get("booking_id")},
-        )
 
-    else:
-        return WebhookResponse(
-            status="error", message=f"Unsupported event type: {event_type}"
-        )
+# Webhooks accepted above are processed by the webhook queue workers
+register_webhook_handler("lead_typeform", process_typeform_delivery)
+register_webhook_handler("event_registration", process_event_registration_delivery)
+register_webhook_handler("amelia_booking", process_amelia_delivery)
+
+
+@app.get("/webhooks/queue/stats", dependencies=[Depends(verify_webhook_secret)])
+async def webhook_queue_stats():
+    """Get webhook intake queue backlog, lag and delivery counts."""
+    return await get_webhook_queue().get_stats()
+
+
+@app.get("/webhooks/queue/failed", dependencies=[Depends(verify_webhook_secret)])
+async def webhook_queue_failed(limit: int = 100):
+    """List webhook deliveries that exhausted their retries."""
+    deliveries = await get_webhook_queue().list_failed(limit)
+    return [
+        delivery.model_dump(exclude={"payload"}) | {"size": len(delivery.payload)}
+        for delivery in deliveries
+    ]
+
+
+@app.post("/webhooks/queue/replay", dependencies=[Depends(verify_webhook_secret)])
+async def webhook_queue_replay(
+    delivery_id: Optional[int] = None, source: Optional[str] = None
+):
+    """Requeue failed webhook deliveries, by ID or by source."""
+    replayed = await get_webhook_queue().replay(delivery_id=delivery_id, source=source)
+    return {"replayed": replayed}
 
 
 @app.get("/workflows/{instance_id}")
@@ -729,10 +817,13 @@ def start(
     log_level: str,
     workers: int,
     agents: Optional[Dict[str, Any]] = None,
+    message_bus: Optional[Any] = None,
 ):
     """Start the API server, now accepting configuration and agents."""
     # Store agents in app state to make them accessible to endpoints
     app.state.agents = agents if agents is not None else {}
+    # Closed on shutdown so messages queued for Notion are written
+    app.state.message_bus = message_bus
 
     if not app.state.agents:
         logger.warning(
@@ -2,6 +2,9 @@
 
 Webhook handlers for The HigherSelf Network Server.
 All webhooks ensure data is properly processed and stored in Notion as the central hub.
+
+Endpoints only verify and validate the request, store it in the durable webhook
+queue and return 202; the processing below runs in the queue's worker pool.
 """
 
 import hashlib
@@ -10,7 +13,7 @@ import json
 import os
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi import APIRouter, Header, HTTPException, Request
 from loguru import logger
 from pydantic import BaseModel
 
@@ -26,8 +29,13 @@ from config.testing_mode import TestingMode, is_api_disabled
 # Import models
 from models.notion_db_models import NotionSetupConfig
 from models.notion_db_models_extended import CommunityMember, ContactProfile
-from services.integration_manager import IntegrationManager, get_integration_manager
+from services.integration_manager import get_integration_manager
 from services.notion_service import NotionService
+from services.webhook_queue import (
+    WebhookDelivery,
+    get_webhook_queue,
+    register_webhook_handler,
+)
 
 # Initialize router
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
@@ -126,10 +134,58 @@ async def verify_typeform_webhook(
     return True
 
 
-@router.post("/typeform", response_model=WebhookResponse)
+async def accept_webhook(
+    source: str,
+    request: Request,
+    display_name: str,
+    idempotency_key: Optional[str] = None,
+) -> WebhookResponse:
+    """
+    Store a webhook in the intake queue and acknowledge it.
+
+    Args:
+        source: Webhook source name used to select the queue handler
+        request: FastAPI request object
+        display_name: Provider name used in the response message
+        idempotency_key: Provider event ID, if the provider sends one
+
+    Returns:
+        WebhookResponse with the delivery ID
+    """
+    body = await request.body()
+    delivery_id, duplicate = await get_webhook_queue().enqueue(
+        source,
+        body,
+        idempotency_key=idempotency_key,
+        query_params=dict(request.query_params),
+    )
+
+    return WebhookResponse(
+        success=True,
+        message=(
+            f"{display_name} webhook already received"
+            if duplicate
+            else f"{display_name} webhook accepted for processing"
+        ),
+        data={"delivery_id": delivery_id, "duplicate": duplicate},
+    )
+
+
+async def parse_json_body(request: Request) -> Dict[str, Any]:
+    """Parse the request body as a JSON object, rejecting malformed payloads."""
+    try:
+        data = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    return data
+
+
+@router.post("/typeform", response_model=WebhookResponse, status_code=202)
 async def typeform_webhook(
     request: Request,
-    integration_manager: IntegrationManager = Depends(get_integration_manager),
     signature: str = Header(None, alias="x-signature"),
 ):
     """
@@ -137,296 +193,234 @@ async def typeform_webhook(
 
     Args:
         request: FastAPI request object
-        integration_manager: Integration manager instance
         signature: Signature header from TypeForm
 
     Returns:
         WebhookResponse with success status and message
     """
-    try:
-        # Check if in test mode
-        if is_test_mode():
-            logger.info("Running in TEST_MODE: Simulating TypeForm webhook processing")
-            return WebhookResponse(
-                success=True,
-                message="TypeForm webhook simulated successfully (TEST MODE)",
-                data={
-                    "form_id": "test_form_id",
-                    "notion_page_id": "mock_notion_page_id",
-                },
-            )
-
-        # Verify the webhook signature
-        if signature and not await verify_typeform_webhook(request, signature):
-            raise HTTPException(status_code=401, detail="Invalid webhook signature")
-
-        # Parse the request body
-        body = await request.body()
-        data = json.loads(body)
-
-        # Get form response data
-        form_response = data.get("form_response", {})
-        form_id = form_response.get("form_id", "unknown")
-
-        logger.info(f"Received TypeForm webhook for form {form_id}")
-
-        # Get TypeForm service from integration manager
-        typeform_service = integration_manager.get_service("typeform")
-        if not typeform_service:
-            logger.error("TypeForm service not initialized")
-            raise HTTPException(
-                status_code=503, detail="TypeForm service not available"
-            )
-
-        # Process the form response
-        result = await typeform_service.process_form_response(form_response)
-
-        # Ensure the data is properly stored in Notion as the central hub
-        notion_page_id = await notion_service.add_typeform_response(result)
-
-        logger.info(
-            f"TypeForm response processed and stored in Notion with page ID: {notion_page_id}"
-        )
-
+    # Check if in test mode
+    if is_test_mode():
+        logger.info("Running in TEST_MODE: Simulating TypeForm webhook processing")
         return WebhookResponse(
             success=True,
-            message="TypeForm webhook processed successfully",
-            data={"form_id": form_id, "notion_page_id": notion_page_id},
-        )
-    except Exception as e:
-        logger.error(f"Error processing TypeForm webhook: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Error processing webhook: {str(e)}"
+            message="TypeForm webhook simulated successfully (TEST MODE)",
+            data={
+                "form_id": "test_form_id",
+                "notion_page_id": "mock_notion_page_id",
+            },
         )
 
+    # Verify the webhook signature
+    if signature and not await verify_typeform_webhook(request, signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    data = await parse_json_body(request)
+    return await accept_webhook(
+        "typeform", request, "TypeForm", idempotency_key=data.get("event_id")
+    )
+
+
+async def process_typeform_webhook(delivery: WebhookDelivery) -> None:
+    """Process a queued TypeForm webhook."""
+    form_response = delivery.json_payload().get("form_response", {})
+    form_id = form_response.get("form_id", "unknown")
+
+    logger.info(f"Processing TypeForm webhook for form {form_id}")
+
+    # Get TypeForm service from integration manager
+    integration_manager = await get_integration_manager()
+    typeform_service = integration_manager.get_service("typeform")
+    if not typeform_service:
+        raise RuntimeError("TypeForm service not available")
 
-@router.post("/woocommerce", response_model=WebhookResponse)
+    # Process the form response
+    result = await typeform_service.process_form_response(form_response)
+
+    # Ensure the data is properly stored in Notion as the central hub
+    notion_page_id = await notion_service.add_typeform_response(result)
+
+    logger.info(
+        f"TypeForm response processed and stored in Notion with page ID: {notion_page_id}"
+    )
+
+
+@router.post("/woocommerce", response_model=WebhookResponse, status_code=202)
 async def woocommerce_webhook(
     request: Request,
-    integration_manager: IntegrationManager = Depends(get_integration_manager),
+    delivery_id: Optional[str] = Header(None, alias="x-wc-webhook-delivery-id"),
 ):
     """
     Handle webhooks from WooCommerce.
 
     Args:
         request: FastAPI request object
-        integration_manager: Integration manager instance
+        delivery_id: WooCommerce delivery ID header, used for deduplication
 
     Returns:
         WebhookResponse with success status and message
     """
-    try:
-        # Check if in test mode
-        if is_test_mode():
-            logger.info(
-                "Running in TEST_MODE: Simulating WooCommerce webhook processing"
-            )
-            return WebhookResponse(
-                success=True,
-                message="WooCommerce webhook simulated successfully (TEST MODE)",
-                data={
-                    "topic": "test_topic",
-                    "resource_id": "test_resource_id",
-                    "notion_page_id": "mock_notion_page_id",
-                },
-            )
-
-        # Parse request body
-        body = await request.json()
-
-        # Extract webhook data
-        webhook_topic = body.get("topic", "unknown")
-        resource_id = body.get("id", "unknown")
-
-        logger.info(
-            f"Received WooCommerce webhook: {webhook_topic} for resource {resource_id}"
-        )
-
-        # Get WooCommerce service from integration manager
-        woocommerce_service = integration_manager.get_service("woocommerce")
-        if not woocommerce_service:
-            logger.error("WooCommerce service not initialized")
-            raise HTTPException(
-                status_code=503, detail="WooCommerce service not available"
-            )
-
-        # Process webhook based on topic
-        result = await woocommerce_service.process_webhook(body)
-
-        # Ensure data is properly stored in Notion as the central hub
-        notion_page_id = await notion_service.sync_woocommerce_data(result)
-
+    # Check if in test mode
+    if is_test_mode():
+        logger.info("Running in TEST_MODE: Simulating WooCommerce webhook processing")
         return WebhookResponse(
             success=True,
-            message=f"Successfully processed WooCommerce webhook for {webhook_topic}",
+            message="WooCommerce webhook simulated successfully (TEST MODE)",
             data={
-                "topic": webhook_topic,
-                "resource_id": resource_id,
-                "notion_page_id": notion_page_id,
+                "topic": "test_topic",
+                "resource_id": "test_resource_id",
+                "notion_page_id": "mock_notion_page_id",
             },
         )
-    except Exception as e:
-        logger.error(f"Error processing WooCommerce webhook: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Error processing webhook: {str(e)}"
-        )
 
+    await parse_json_body(request)
+    return await accept_webhook(
+        "woocommerce", request, "WooCommerce", idempotency_key=delivery_id
+    )
 
-@router.post("/acuity", response_model=WebhookResponse)
-async def acuity_webhook(
-    request: Request,
-    integration_manager: IntegrationManager = Depends(get_integration_manager),
-):
+
+async def process_woocommerce_webhook(delivery: WebhookDelivery) -> None:
+    """Process a queued WooCommerce webhook."""
+    body = delivery.json_payload()
+
+    # Extract webhook data
+    webhook_topic = body.get("topic", "unknown")
+    resource_id = body.get("id", "unknown")
+
+    logger.info(
+        f"Processing WooCommerce webhook: {webhook_topic} for resource {resource_id}"
+    )
+
+    # Get WooCommerce service from integration manager
+    integration_manager = await get_integration_manager()
+    woocommerce_service = integration_manager.get_service("woocommerce")
+    if not woocommerce_service:
+        raise RuntimeError("WooCommerce service not available")
+
+    # Process webhook based on topic
+    result = await woocommerce_service.process_webhook(body)
+
+    # Ensure data is properly stored in Notion as the central hub
+    await notion_service.sync_woocommerce_data(result)
+
+
+@router.post("/acuity", response_model=WebhookResponse, status_code=202)
+async def acuity_webhook(request: Request):
     """
     Handle webhooks from Acuity Scheduling.
 
     Args:
         request: FastAPI request object
-        integration_manager: Integration manager instance
 
     Returns:
         WebhookResponse with success status and message
     """
-    try:
-        # Check if in test mode
-        if is_test_mode():
-            logger.info("Running in TEST_MODE: Simulating Acuity webhook processing")
-            return WebhookResponse(
-                success=True,
-                message="Acuity webhook simulated successfully (TEST MODE)",
-                data={
-                    "action": "test_action",
-                    "appointment_id": "test_appointment_id",
-                    "notion_page_id": "mock_notion_page_id",
-                },
-            )
-
-        # Get Acuity service from integration manager
-        acuity_service = integration_manager.get_service("acuity")
-        if not acuity_service:
-            logger.error("Acuity service not initialized")
-            raise HTTPException(status_code=503, detail="Acuity service not available")
-
-        # Parse request body
-        body = await request.json()
-
-        # Extract webhook data
-        action = body.get("action", "unknown")
-        appointment_id = body.get("id")
-
-        logger.info(
-            f"Received Acuity webhook: {action} for appointment {appointment_id}"
-        )
-
-        # Process the webhook with Acuity service
-        result = await acuity_service.process_webhook(body)
-
-        # Ensure data is properly stored in Notion as the central hub
-        notion_page_id = await notion_service.sync_acuity_appointment(result)
-
-        # Update Acuity with the Notion reference for bidirectional sync
-        if notion_page_id and acuity_service.supports_metadata_update():
-            await acuity_service.update_appointment_metadata(
-                appointment_id, {"notion_page_id": notion_page_id}
-            )
-
+    # Check if in test mode
+    if is_test_mode():
+        logger.info("Running in TEST_MODE: Simulating Acuity webhook processing")
         return WebhookResponse(
             success=True,
-            message=f"Successfully processed Acuity webhook for {action}",
+            message="Acuity webhook simulated successfully (TEST MODE)",
             data={
-                "action": action,
-                "appointment_id": appointment_id,
-                "notion_page_id": notion_page_id,
+                "action": "test_action",
+                "appointment_id": "test_appointment_id",
+                "notion_page_id": "mock_notion_page_id",
             },
         )
-    except Exception as e:
-        logger.error(f"Error processing Acuity webhook: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Error processing webhook: {str(e)}"
+
+    await parse_json_body(request)
+    return await accept_webhook("acuity", request, "Acuity")
+
+
+async def process_acuity_webhook(delivery: WebhookDelivery) -> None:
+    """Process a queued Acuity Scheduling webhook."""
+    body = delivery.json_payload()
+
+    # Get Acuity service from integration manager
+    integration_manager = await get_integration_manager()
+    acuity_service = integration_manager.get_service("acuity")
+    if not acuity_service:
+        raise RuntimeError("Acuity service not available")
+
+    # Extract webhook data
+    action = body.get("action", "unknown")
+    appointment_id = body.get("id")
+
+    logger.info(f"Processing Acuity webhook: {action} for appointment {appointment_id}")
+
+    # Process the webhook with Acuity service
+    result = await acuity_service.process_webhook(body)
+
+    # Ensure data is properly stored in Notion as the central hub
+    notion_page_id = await notion_service.sync_acuity_appointment(result)
+
+    # Update Acuity with the Notion reference for bidirectional sync
+    if notion_page_id and acuity_service.supports_metadata_update():
+        await acuity_service.update_appointment_metadata(
+            appointment_id, {"notion_page_id": notion_page_id}
         )
 
 
-@router.post("/userfeedback", response_model=WebhookResponse)
-async def userfeedback_webhook(
-    request: Request,
-    integration_manager: IntegrationManager = Depends(get_integration_manager),
-):
+@router.post("/userfeedback", response_model=WebhookResponse, status_code=202)
+async def userfeedback_webhook(request: Request):
     """
     Handle webhooks from UserFeedback.
 
     Args:
         request: FastAPI request object
-        integration_manager: Integration manager instance
 
     Returns:
         WebhookResponse with success status and message
     """
-    try:
-        # Check if in test mode
-        if is_test_mode():
-            logger.info(
-                "Running in TEST_MODE: Simulating UserFeedback webhook processing"
-            )
-            return WebhookResponse(
-                success=True,
-                message="UserFeedback webhook simulated successfully (TEST MODE)",
-                data={
-                    "feedback_id": "test_feedback_id",
-                    "sentiment": "positive",
-                    "notion_page_id": "mock_notion_page_id",
-                },
-            )
-
-        # Get UserFeedback service from integration manager
-        userfeedback_service = integration_manager.get_service("userfeedback")
-        if not userfeedback_service:
-            logger.error("UserFeedback service not initialized")
-            raise HTTPException(
-                status_code=503, detail="UserFeedback service not available"
-            )
-
-        # Parse request body
-        body = await request.json()
-
-        # Extract feedback data
-        feedback_id = body.get("feedback", {}).get("id")
-        feedback_text = body.get("feedback", {}).get("feedback_text", "")
-        sentiment = body.get("feedback", {}).get("sentiment", "neutral")
-        source = body.get("source", "unknown")
-
-        logger.info(
-            f"Received UserFeedback webhook from {source} with sentiment {sentiment}"
-        )
-
-        # Process webhook data
-        result = await userfeedback_service.process_feedback(body)
-
-        # Ensure feedback is properly stored in Notion as the central hub
-        notion_page_id = await notion_service.add_user_feedback(result)
-
-        # Update the originating system with the Notion reference if applicable
-        if notion_page_id and hasattr(userfeedback_service, "update_feedback_source"):
-            await userfeedback_service.update_feedback_source(
-                feedback_id, {"notion_page_id": notion_page_id}
-            )
-
+    # Check if in test mode
+    if is_test_mode():
+        logger.info("Running in TEST_MODE: Simulating UserFeedback webhook processing")
         return WebhookResponse(
             success=True,
-            message=f"Successfully processed UserFeedback webhook",
+            message="UserFeedback webhook simulated successfully (TEST MODE)",
             data={
-                "feedback_id": feedback_id,
-                "sentiment": sentiment,
-                "notion_page_id": notion_page_id,
+                "feedback_id": "test_feedback_id",
+                "sentiment": "positive",
+                "notion_page_id": "mock_notion_page_id",
             },
         )
-    except Exception as e:
-        logger.error(f"Error processing UserFeedback webhook: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Error processing webhook: {str(e)}"
+
+    await parse_json_body(request)
+    return await accept_webhook("userfeedback", request, "UserFeedback")
+
+
+async def process_userfeedback_webhook(delivery: WebhookDelivery) -> None:
+    """Process a queued UserFeedback webhook."""
+    body = delivery.json_payload()
+
+    # Get UserFeedback service from integration manager
+    integration_manager = await get_integration_manager()
+    userfeedback_service = integration_manager.get_service("userfeedback")
+    if not userfeedback_service:
+        raise RuntimeError("UserFeedback service not available")
+
+    # Extract feedback data
+    feedback_id = body.get("feedback", {}).get("id")
+    sentiment = body.get("feedback", {}).get("sentiment", "neutral")
+    source = body.get("source", "unknown")
+
+    logger.info(
+        f"Processing UserFeedback webhook from {source} with sentiment {sentiment}"
+    )
+
+    # Process webhook data
+    result = await userfeedback_service.process_feedback(body)
+
+    # Ensure feedback is properly stored in Notion as the central hub
+    notion_page_id = await notion_service.add_user_feedback(result)
+
+    # Update the originating system with the Notion reference if applicable
+    if notion_page_id and hasattr(userfeedback_service, "update_feedback_source"):
+        await userfeedback_service.update_feedback_source(
+            feedback_id, {"notion_page_id": notion_page_id}
         )
 
 
-@router.post("/tutorLM", response_model=WebhookResponse)
+@router.post("/tutorLM", response_model=WebhookResponse, status_code=202)
 async def tutor_lm_webhook(request: Request):
     """
     Handle webhooks from TutorLM.
@@ -437,44 +431,33 @@ async def tutor_lm_webhook(request: Request):
     Returns:
         WebhookResponse with success status and message
     """
-    try:
-        # Check if in test mode
-        if is_test_mode():
-            logger.info("Running in TEST_MODE: Simulating TutorLM webhook processing")
-            return WebhookResponse(
-                success=True,
-                message="TutorLM webhook simulated successfully (TEST MODE)",
-                data={"event_type": "test_event", "student_id": "test_student_id"},
-            )
+    # Check if in test mode
+    if is_test_mode():
+        logger.info("Running in TEST_MODE: Simulating TutorLM webhook processing")
+        return WebhookResponse(
+            success=True,
+            message="TutorLM webhook simulated successfully (TEST MODE)",
+            data={"event_type": "test_event", "student_id": "test_student_id"},
+        )
 
-        # Parse request body
-        body = await request.json()
+    await parse_json_body(request)
+    return await accept_webhook("tutorLM", request, "TutorLM")
 
-        # Extract webhook data
-        event_type = body.get("event", "unknown")
-        student_id = body.get("student_id")
 
-        logger.info(f"Received TutorLM webhook: {event_type} for student {student_id}")
+async def process_tutor_lm_webhook(delivery: WebhookDelivery) -> None:
+    """Process a queued TutorLM webhook."""
+    body = delivery.json_payload()
 
-        # Process webhook based on event type
-        # This will be handled by a specialized agent, which will be implemented separately
+    logger.info(
+        f"Processing TutorLM webhook: {body.get('event', 'unknown')} "
+        f"for student {body.get('student_id')}"
+    )
 
-        # Ensure data is properly stored in Notion as the central hub
-        await notion_service.sync_tutor_lm_event(body)
-
-        return WebhookResponse(
-            success=True,
-            message=f"Successfully received TutorLM webhook for {event_type}",
-            data={"event_type": event_type, "student_id": student_id},
-        )
-    except Exception as e:
-        logger.error(f"Error processing TutorLM webhook: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Error processing webhook: {str(e)}"
-        )
+    # Ensure data is properly stored in Notion as the central hub
+    await notion_service.sync_tutor_lm_event(body)
 
 
-@router.post("/amelia", response_model=WebhookResponse)
+@router.post("/amelia", response_model=WebhookResponse, status_code=202)
 async def amelia_webhook(request: Request):
     """
     Handle webhooks from Amelia.
@@ -485,44 +468,33 @@ async def amelia_webhook(request: Request):
     Returns:
         WebhookResponse with success status and message
     """
-    try:
-        # Check if in test mode
-        if is_test_mode():
-            logger.info("Running in TEST_MODE: Simulating Amelia webhook processing")
-            return WebhookResponse(
-                success=True,
-                message="Amelia webhook simulated successfully (TEST MODE)",
-                data={"action": "test_action", "booking_id": "test_booking_id"},
-            )
-
-        # Parse request body
-        body = await request.json()
+    # Check if in test mode
+    if is_test_mode():
+        logger.info("Running in TEST_MODE: Simulating Amelia webhook processing")
+        return WebhookResponse(
+            success=True,
+            message="Amelia webhook simulated successfully (TEST MODE)",
+            data={"action": "test_action", "booking_id": "test_booking_id"},
+        )
 
-        # Extract webhook data
-        action = body.get("action", "unknown")
-        booking_id = body.get("booking_id")
+    await parse_json_body(request)
+    return await accept_webhook("amelia", request, "Amelia")
 
-        logger.info(f"Received Amelia webhook: {action} for booking {booking_id}")
 
-        # Process webhook based on action type
-        # This will be handled by a specialized agent, which will be implemented separately
+async def process_amelia_webhook(delivery: WebhookDelivery) -> None:
+    """Process a queued Amelia webhook."""
+    body = delivery.json_payload()
 
-        # Ensure data is properly stored in Notion as the central hub
-        await notion_service.sync_amelia_booking(body)
+    logger.info(
+        f"Processing Amelia webhook: {body.get('action', 'unknown')} "
+        f"for booking {body.get('booking_id')}"
+    )
 
-        return WebhookResponse(
-            success=True,
-            message=f"Successfully received Amelia webhook for {action}",
-            data={"action": action, "booking_id": booking_id},
-        )
-    except Exception as e:
-        logger.error(f"Error processing Amelia webhook: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Error processing webhook: {str(e)}"
-        )
+    # Ensure data is properly stored in Notion as the central hub
+    await notion_service.sync_amelia_booking(body)
 
 
-@router.post("/snovio", response_model=WebhookResponse)
+@router.post("/snovio", response_model=WebhookResponse, status_code=202)
 async def snovio_webhook(request: Request):
     """
     Handle webhooks from Snov.io.
@@ -533,37 +505,34 @@ async def snovio_webhook(request: Request):
     Returns:
         WebhookResponse with success status and message
     """
-    try:
-        # Check if in test mode
-        if is_test_mode():
-            logger.info("Running in TEST_MODE: Simulating Snov.io webhook processing")
-            return WebhookResponse(
-                success=True,
-                message="Snov.io webhook simulated successfully (TEST MODE)",
-                data={"event_type": "test_event"},
-            )
+    # Check if in test mode
+    if is_test_mode():
+        logger.info("Running in TEST_MODE: Simulating Snov.io webhook processing")
+        return WebhookResponse(
+            success=True,
+            message="Snov.io webhook simulated successfully (TEST MODE)",
+            data={"event_type": "test_event"},
+        )
 
-        # Parse request body
-        body = await request.json()
+    await parse_json_body(request)
+    return await accept_webhook("snovio", request, "Snov.io")
 
-        # Extract webhook data
-        event_type = body.get("event", "unknown")
 
-        logger.info(f"Received Snov.io webhook: {event_type}")
+async def process_snovio_webhook(delivery: WebhookDelivery) -> None:
+    """Process a queued Snov.io webhook."""
+    body = delivery.json_payload()
 
-        # Process webhook based on event type
-        # This will be handled by a specialized agent, which will be implemented separately
+    logger.info(f"Processing Snov.io webhook: {body.get('event', 'unknown')}")
 
-        # Ensure data is properly stored in Notion as the central hub
-        await notion_service.sync_snovio_data(body)
+    # Ensure data is properly stored in Notion as the central hub
+    await notion_service.sync_snovio_data(body)
 
-        return WebhookResponse(
-            success=True,
-            message=f"Successfully received Snov.io webhook for {event_type}",
-            data={"event_type": event_type},
-        )
-    except Exception as e:
-        logger.error(f"Error processing Snov.io webhook: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Error processing webhook: {str(e)}"
-        )
+
+# Register queue handlers for every webhook source
+register_webhook_handler("typeform", process_typeform_webhook)
+register_webhook_handler("woocommerce", process_woocommerce_webhook)
+register_webhook_handler("acuity", process_acuity_webhook)
+register_webhook_handler("userfeedback", process_userfeedback_webhook)
+register_webhook_handler("tutorLM", process_tutor_lm_webhook)
+register_webhook_handler("amelia", process_amelia_webhook)
+register_webhook_handler("snovio", process_snovio_webhook)
@@ -0,0 +1,112 @@
+"""
+The 7 Space webhook handlers for The HigherSelf Network Server.
+
+Notion automations call these endpoints when an appointment is created,
+edited or deleted outside the scheduler, so the scheduler's in-memory slot
+index stays in step with the Appointments database.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from loguru import logger
+
+from api.webhooks import WebhookResponse, is_test_mode
+from integrations.the7space.automation.config.the7space_config import the7space_config
+from integrations.the7space.automation.wellness.appointment_scheduler import (
+    AppointmentScheduler,
+)
+
+# Initialize router
+router = APIRouter(prefix="/webhooks/the7space", tags=["webhooks", "the7space"])
+
+_scheduler: Optional[AppointmentScheduler] = None
+_scheduler_lock = asyncio.Lock()
+
+
+async def get_appointment_scheduler() -> AppointmentScheduler:
+    """Get the shared appointment scheduler, initializing it on first use."""
+    global _scheduler
+    async with _scheduler_lock:
+        if _scheduler is None:
+            scheduler = AppointmentScheduler()
+            await scheduler.initialize()
+            _scheduler = scheduler
+    return _scheduler
+
+
+def verify_the7space_signature(body: bytes, signature: Optional[str]) -> bool:
+    """
+    Verify that a webhook was signed with THE7SPACE_WEBHOOK_SECRET.
+
+    Args:
+        body: Raw request body
+        signature: Hex HMAC-SHA256 of the body
+
+    Returns:
+        True if the signature is valid, False otherwise
+    """
+    secret = the7space_config.webhook_secret
+    if not secret:
+        logger.error("THE7SPACE_WEBHOOK_SECRET is not configured")
+        raise HTTPException(
+            status_code=500, detail="Webhook verification configuration error"
+        )
+    if not signature:
+        return False
+
+    computed_signature = hmac.new(
+        secret.encode("utf-8"), body, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(signature, computed_signature)
+
+
+@router.post("/appointments", response_model=WebhookResponse)
+async def appointment_webhook(
+    request: Request,
+    signature: Optional[str] = Header(None, alias="x-the7space-signature"),
+):
+    """
+    Refresh the slot index after an appointment changed in Notion.
+
+    The body may carry an "appointment_id" to refresh a single appointment;
+    any other payload reloads the whole index.
+
+    Args:
+        request: FastAPI request object
+        signature: Signature header
+
+    Returns:
+        WebhookResponse describing the index update
+    """
+    body = await request.body()
+
+    if is_test_mode():
+        logger.info("Running in TEST_MODE: Skipping The 7 Space appointment webhook")
+        return WebhookResponse(
+            success=True,
+            message="Appointment webhook simulated successfully (TEST MODE)",
+        )
+
+    if not verify_the7space_signature(body, signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    try:
+        payload = json.loads(body or b"{}")
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Payload must be an object")
+
+    scheduler = await get_appointment_scheduler()
+    result = await scheduler.handle_appointment_webhook(payload)
+
+    return WebhookResponse(
+        success=result.get("success", False),
+        message="Appointment slot index updated",
+        data=result,
+    )
@@ -28,7 +28,8 @@ class MCPToolConfig(BaseModel):
     allowed_agents: Set[str] = Field(
         default_factory=lambda: {"*"}
     )  # * means all agents
-    rate_limit_per_min: Optional[int] = None
+    rate_limit_per_min: Optional[int] = None  # per agent
+    tool_rate_limit_per_min: Optional[int] = None  # across all agents
 
     class Config:
         extra = "allow"
@@ -188,6 +189,7 @@ class MCPConfig:
                 requires_perm_env = f"MCP_TOOL_{tool_name.upper()}_REQUIRES_PERMISSION"
                 allowed_agents_env = f"MCP_TOOL_{tool_name.upper()}_ALLOWED_AGENTS"
                 rate_limit_env = f"MCP_TOOL_{tool_name.upper()}_RATE_LIMIT"
+                tool_rate_limit_env = f"MCP_TOOL_{tool_name.upper()}_TOOL_RATE_LIMIT"
 
                 custom_tools[tool_name] = MCPToolConfig(
                     enabled=os.environ.get(enabled_env, "true").lower() == "true",
@@ -207,6 +209,14 @@ class MCPConfig:
                         and rate_limit_value.isdigit()
                         else None
                     ),
+                    tool_rate_limit_per_min=(
+                        int(tool_rate_limit_value)
+                        if (
+                            tool_rate_limit_value := os.environ.get(tool_rate_limit_env)
+                        )
+                        and tool_rate_limit_value.isdigit()
+                        else None
+                    ),
                 )
 
         # Add custom tools to configs
@@ -7,10 +7,10 @@ import asyncio
 import json
 from typing import Any, Dict, List, Optional, Set, Union
 
-import httpx
 from loguru import logger
 
 from models.agent_models import Agent
+from services.http_client_registry import get_http_client
 from services.redis_service import redis_service
 
 from .config import mcp_config
@@ -64,13 +64,13 @@ class Context7RAG:
             if filters:
                 payload["filters"] = filters
 
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/query", json=payload, headers=self.headers
-                )
+            client = get_http_client("context7", timeout=self.config.timeout)
+            response = await client.post(
+                f"{self.base_url}/query", json=payload, headers=self.headers
+            )
 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error querying Context7 RAG: {e}")
             return {"error": str(e)}
@@ -106,13 +106,13 @@ class Context7RAG:
             if doc_id:
                 payload["id"] = doc_id
 
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/documents", json=payload, headers=self.headers
-                )
+            client = get_http_client("context7", timeout=self.config.timeout)
+            response = await client.post(
+                f"{self.base_url}/documents", json=payload, headers=self.headers
+            )
 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error adding document to Context7 RAG: {e}")
             return {"error": str(e)}
@@ -149,13 +149,13 @@ class Context7RAG:
             if filters:
                 payload["filters"] = filters
 
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/search", json=payload, headers=self.headers
-                )
+            client = get_http_client("context7", timeout=self.config.timeout)
+            response = await client.post(
+                f"{self.base_url}/search", json=payload, headers=self.headers
+            )
 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error searching documents in Context7 RAG: {e}")
             return {"error": str(e)}
@@ -179,15 +179,15 @@ class Context7RAG:
         try:
             payload = {"id": doc_id, "collection": collection_name}
 
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.delete(
-                    f"{self.base_url}/documents/{doc_id}",
-                    params={"collection": collection_name},
-                    headers=self.headers,
-                )
+            client = get_http_client("context7", timeout=self.config.timeout)
+            response = await client.delete(
+                f"{self.base_url}/documents/{doc_id}",
+                params={"collection": collection_name},
+                headers=self.headers,
+            )
 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error deleting document from Context7 RAG: {e}")
             return {"error": str(e)}
@@ -223,15 +223,15 @@ class Context7RAG:
             if metadata is not None:
                 payload["metadata"] = metadata
 
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.patch(
-                    f"{self.base_url}/documents/{doc_id}",
-                    json=payload,
-                    headers=self.headers,
-                )
+            client = get_http_client("context7", timeout=self.config.timeout)
+            response = await client.patch(
+                f"{self.base_url}/documents/{doc_id}",
+                json=payload,
+                headers=self.headers,
+            )
 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error updating document in Context7 RAG: {e}")
             return {"error": str(e)}
@@ -247,13 +247,13 @@ class Context7RAG:
             return {"error": "Context7 RAG is not enabled"}
 
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/collections", headers=self.headers
-                )
+            client = get_http_client("context7", timeout=self.config.timeout)
+            response = await client.get(
+                f"{self.base_url}/collections", headers=self.headers
+            )
 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error getting collections from Context7 RAG: {e}")
             return {"error": str(e)}
@@ -280,13 +280,13 @@ class Context7RAG:
             if description:
                 payload["description"] = description
 
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/collections", json=payload, headers=self.headers
-                )
+            client = get_http_client("context7", timeout=self.config.timeout)
+            response = await client.post(
+                f"{self.base_url}/collections", json=payload, headers=self.headers
+            )
 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error creating collection in Context7 RAG: {e}")
             return {"error": str(e)}
@@ -5,71 +5,64 @@ Handles registration, validation, and execution of MCP tools.
 
 import asyncio
 import json
-import time
 from typing import Any, Callable, Dict, List, Optional, Set, Union
 
-import httpx
 from loguru import logger
 
 from models.agent_models import Agent
-from services.redis_service import redis_service
+from services.http_client_registry import get_http_client
+from utils.rate_limiter import RateLimitResult, RateQuota, SlidingWindowRateLimiter
 
 from .config import MCPToolConfig, mcp_config
 
+mcp_rate_limiter = SlidingWindowRateLimiter(prefix="mcp_ratelimit")
 
-class MCPRateLimiter:
-    """Rate limiter for MCP tool calls."""
 
-    def __init__(self, tool_name: str, calls_per_minute: int):
+class MCPRateLimiter:
+    """Per-agent and per-tool rate limits for MCP tool calls."""
+
+    def __init__(
+        self,
+        tool_name: str,
+        calls_per_minute: Optional[int],
+        tool_calls_per_minute: Optional[int] = None,
+        limiter: Optional[SlidingWindowRateLimiter] = None,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            tool_name: Name of the MCP tool
+            calls_per_minute: Calls each agent may make per minute
+            tool_calls_per_minute: Calls all agents together may make per minute
+            limiter: Shared limiter engine (default: the MCP limiter)
+        """
         self.tool_name = tool_name
         self.calls_per_minute = calls_per_minute
-        self.window_size = 60  # seconds
-        self.key_prefix = f"mcp_ratelimit:{tool_name}:"
-
-    async def can_execute(self, agent_id: str) -> bool:
-        """Check if the agent can execute the tool within rate limits."""
-        if not self.calls_per_minute:
-            return True
-
-        now = int(time.time())
-        window_start = now - self.window_size
-        key = f"{self.key_prefix}{agent_id}"
-
-        # Get recent calls within window
-        async def get_calls():
-            calls = await redis_service.async_get(key, as_json=True)
-            return calls if calls else []
-
-        calls = await get_calls()
-
-        # Filter calls within current window
-        recent_calls = [call for call in calls if call > window_start]
-
-        # Check if under limit
-        return len(recent_calls) < self.calls_per_minute
-
-    async def record_call(self, agent_id: str):
-        """Record a call for rate limiting purposes."""
-        if not self.calls_per_minute:
-            return
-
-        now = int(time.time())
-        key = f"{self.key_prefix}{agent_id}"
-
-        # Get existing calls
-        async def get_calls():
-            calls = await redis_service.async_get(key, as_json=True)
-            return calls if calls else []
-
-        calls = await get_calls()
+        self.tool_calls_per_minute = tool_calls_per_minute
+        self.limiter = limiter or mcp_rate_limiter
+
+    async def acquire(self, agent_id: str) -> RateLimitResult:
+        """Check and record a call by the agent, if within all limits."""
+        quotas = []
+        if self.calls_per_minute:
+            quotas.append(
+                RateQuota(
+                    key=f"{self.tool_name}:agent:{agent_id}",
+                    limit=self.calls_per_minute,
+                )
+            )
+        if self.tool_calls_per_minute:
+            quotas.append(
+                RateQuota(
+                    key=f"{self.tool_name}:tool", limit=self.tool_calls_per_minute
+                )
+            )
 
-        # Add current call and remove old ones
-        window_start = now - self.window_size
-        calls = [call for call in calls if call > window_start]
-        calls.append(now)
+        if not quotas:
+            return RateLimitResult(allowed=True, limit=0, remaining=0)
 
-        # Save updated calls
-        await redis_service.async_set(key, calls, ex=self.window_size * 2)
+        return await self.limiter.hit(*quotas)
 
 
 class MCPToolRegistry:
@@ -147,9 +140,9 @@ class MCPToolRegistry:
         }
 
         # Create rate limiter if needed
-        if config.rate_limit_per_min:
+        if config.rate_limit_per_min or config.tool_rate_limit_per_min:
             self._rate_limiters[tool_name] = MCPRateLimiter(
-                tool_name, config.rate_limit_per_min
+                tool_name, config.rate_limit_per_min, config.tool_rate_limit_per_min
             )
 
         logger.info(
@@ -176,20 +169,19 @@ class MCPToolRegistry:
         if not mcp_config.is_agent_allowed(tool_name, agent_id):
             return {"error": f"Agent {agent_id} not authorized to use tool {tool_name}"}
 
-        # Check rate limits
+        # Check and record the call against rate limits
         if tool_name in self._rate_limiters:
-            can_execute = await self._rate_limiters[tool_name].can_execute(agent_id)
-            if not can_execute:
-                return {"error": f"Rate limit exceeded for tool {tool_name}"}
+            rate_limit = await self._rate_limiters[tool_name].acquire(agent_id)
+            if not rate_limit.allowed:
+                return {
+                    "error": f"Rate limit exceeded for tool {tool_name}",
+                    "retry_after": rate_limit.retry_after,
+                }
 
         try:
             # Execute the tool handler
             result = await tool["handler"](agent, operation, params)
 
-            # Record the call for rate limiting
-            if tool_name in self._rate_limiters:
-                await self._rate_limiters[tool_name].record_call(agent_id)
-
             # Log tool execution
             logger.info(f"Agent {agent_id} executed MCP tool {tool_name}.{operation}")
 
@@ -216,134 +208,134 @@ class MCPToolRegistry:
     ) -> Dict[str, Any]:
         """Handle Context 7 RAG tool operations."""
         config = mcp_config.get_config("context7")
-        async with httpx.AsyncClient(timeout=config.timeout) as client:
-            headers = {"Content-Type": "application/json"}
-            if config.auth_type == "api_key" and config.api_key:
-                headers["Authorization"] = f"Bearer {config.api_key}"
+        client = get_http_client("mcp_context7", timeout=config.timeout)
+        headers = {"Content-Type": "application/json"}
+        if config.auth_type == "api_key" and config.api_key:
+            headers["Authorization"] = f"Bearer {config.api_key}"
 
-            if operation == "query":
-                url = f"{config.server_url}/query"
-                response = await client.post(url, json=params, headers=headers)
-                return response.json()
+        if operation == "query":
+            url = f"{config.server_url}/query"
+            response = await client.post(url, json=params, headers=headers)
+            return response.json()
 
-            elif operation == "search_documents":
-                url = f"{config.server_url}/search"
-                response = await client.post(url, json=params, headers=headers)
-                return response.json()
+        elif operation == "search_documents":
+            url = f"{config.server_url}/search"
+            response = await client.post(url, json=params, headers=headers)
+            return response.json()
 
-            elif operation == "add_document":
-                url = f"{config.server_url}/documents"
-                response = await client.post(url, json=params, headers=headers)
-                return response.json()
+        elif operation == "add_document":
+            url = f"{config.server_url}/documents"
+            response = await client.post(url, json=params, headers=headers)
+            return response.json()
 
-            return {"error": f"Unknown operation: {operation}"}
+        return {"error": f"Unknown operation: {operation}"}
 
     async def _handle_memory_tool(
         self, agent: Agent, operation: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Handle Memory tool operations."""
         config = mcp_config.get_config("memory")
-        async with httpx.AsyncClient(timeout=config.timeout) as client:
-            headers = {"Content-Type": "application/json"}
-            if config.auth_type == "api_key" and config.api_key:
-                headers["Authorization"] = f"Bearer {config.api_key}"
-
-            if operation == "create_memory":
-                url = f"{config.server_url}/memories"
-                response = await client.post(url, json=params, headers=headers)
-                return response.json()
-
-            elif operation == "retrieve_memory":
-                url = f"{config.server_url}/memories/search"
-                response = await client.post(url, json=params, headers=headers)
-                return response.json()
-
-            elif operation == "update_memory":
-                memory_id = params.pop("id", None)
-                if not memory_id:
-                    return {"error": "Memory ID is required for updates"}
-                url = f"{config.server_url}/memories/{memory_id}"
-                response = await client.put(url, json=params, headers=headers)
-                return response.json()
-
-            elif operation == "delete_memory":
-                memory_id = params.pop("id", None)
-                if not memory_id:
-                    return {"error": "Memory ID is required for deletion"}
-                url = f"{config.server_url}/memories/{memory_id}"
-                response = await client.delete(url, headers=headers)
-                return response.json()
-
-            return {"error": f"Unknown operation: {operation}"}
+        client = get_http_client("mcp_memory", timeout=config.timeout)
+        headers = {"Content-Type": "application/json"}
+        if config.auth_type == "api_key" and config.api_key:
+            headers["Authorization"] = f"Bearer {config.api_key}"
+
+        if operation == "create_memory":
+            url = f"{config.server_url}/memories"
+            response = await client.post(url, json=params, headers=headers)
+            return response.json()
+
+        elif operation == "retrieve_memory":
+            url = f"{config.server_url}/memories/search"
+            response = await client.post(url, json=params, headers=headers)
+            return response.json()
+
+        elif operation == "update_memory":
+            memory_id = params.pop("id", None)
+            if not memory_id:
+                return {"error": "Memory ID is required for updates"}
+            url = f"{config.server_url}/memories/{memory_id}"
+            response = await client.put(url, json=params, headers=headers)
+            return response.json()
+
+        elif operation == "delete_memory":
+            memory_id = params.pop("id", None)
+            if not memory_id:
+                return {"error": "Memory ID is required for deletion"}
+            url = f"{config.server_url}/memories/{memory_id}"
+            response = await client.delete(url, headers=headers)
+            return response.json()
+
+        return {"error": f"Unknown operation: {operation}"}
 
     async def _handle_perplexity_tool(
         self, agent: Agent, operation: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Handle Perplexity tool operations."""
         config = mcp_config.get_config("perplexity")
-        async with httpx.AsyncClient(timeout=config.timeout) as client:
-            headers = {"Content-Type": "application/json"}
-            if config.auth_type == "api_key" and config.api_key:
-                headers["Authorization"] = f"Bearer {config.api_key}"
+        client = get_http_client("mcp_perplexity", timeout=config.timeout)
+        headers = {"Content-Type": "application/json"}
+        if config.auth_type == "api_key" and config.api_key:
+            headers["Authorization"] = f"Bearer {config.api_key}"
 
-            if operation == "ask":
-                url = f"{config.server_url}/chat/completions"
-                response = await client.post(url, json=params, headers=headers)
-                return response.json()
+        if operation == "ask":
+            url = f"{config.server_url}/chat/completions"
+            response = await client.post(url, json=params, headers=headers)
+            return response.json()
 
-            elif operation == "web_search":
-                url = f"{config.server_url}/search"
-                response = await client.post(url, json=params, headers=headers)
-                return response.json()
+        elif operation == "web_search":
+            url = f"{config.server_url}/search"
+            response = await client.post(url, json=params, headers=headers)
+            return response.json()
 
-            return {"error": f"Unknown operation: {operation}"}
+        return {"error": f"Unknown operation: {operation}"}
 
     async def _handle_brave_search_tool(
         self, agent: Agent, operation: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Handle Brave search tool operations."""
         config = mcp_config.get_config("brave_search")
-        async with httpx.AsyncClient(timeout=config.timeout) as client:
-            headers = {"Content-Type": "application/json"}
-            if config.auth_type == "api_key" and config.api_key:
-                headers["X-Subscription-Token"] = config.api_key
-
-            if operation == "web_search":
-                url = f"{config.server_url}/search"
-                response = await client.get(
-                    url,
-                    params={"q": params.get("query"), "count": params.get("count", 10)},
-                    headers=headers,
-                )
-                return response.json()
-
-            elif operation == "local_search":
-                url = f"{config.server_url}/local"
-                response = await client.get(
-                    url,
-                    params={"q": params.get("query"), "count": params.get("count", 5)},
-                    headers=headers,
-                )
-                return response.json()
+        client = get_http_client("mcp_brave_search", timeout=config.timeout)
+        headers = {"Content-Type": "application/json"}
+        if config.auth_type == "api_key" and config.api_key:
+            headers["X-Subscription-Token"] = config.api_key
+
+        if operation == "web_search":
+            url = f"{config.server_url}/search"
+            response = await client.get(
+                url,
+                params={"q": params.get("query"), "count": params.get("count", 10)},
+                headers=headers,
+            )
+            return response.json()
+
+        elif operation == "local_search":
+            url = f"{config.server_url}/local"
+            response = await client.get(
+                url,
+                params={"q": params.get("query"), "count": params.get("count", 5)},
+                headers=headers,
+            )
+            return response.json()
 
-            return {"error": f"Unknown operation: {operation}"}
+        return {"error": f"Unknown operation: {operation}"}
 
     async def _handle_sequential_thinking_tool(
         self, agent: Agent, operation: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Handle Sequential Thinking tool operations."""
         config = mcp_config.get_config("sequential_thinking")
-        async with httpx.AsyncClient(timeout=config.timeout) as client:
-            headers = {"Content-Type": "application/json"}
-            if config.auth_type == "api_key" and config.api_key:
-                headers["Authorization"] = f"Bearer {config.api_key}"
+        client = get_http_client("mcp_sequential_thinking", timeout=config.timeout)
+        headers = {"Content-Type": "application/json"}
+        if config.auth_type == "api_key" and config.api_key:
+            headers["Authorization"] = f"Bearer {config.api_key}"
 
-            if operation == "sequentialthinking":
-                url = f"{config.server_url}/think"
-                response = await client.post(url, json=params, headers=headers)
-                return response.json()
+        if operation == "sequentialthinking":
+            url = f"{config.server_url}/think"
+            response = await client.post(url, json=params, headers=headers)
+            return response.json()
 
-            return {"error": f"Unknown operation: {operation}"}
+        return {"error": f"Unknown operation: {operation}"}
 
 
 # Create a singleton instance
@@ -7,13 +7,13 @@ import asyncio
 import json
 from typing import Any, Dict, List, Optional
 
-import httpx
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from integrations.mcp_tools.mcp_tools_registry import (MCPTool, ToolCapability,
                                                        ToolMetadata,
                                                        mcp_tools_registry)
+from services.http_client_registry import get_http_client
 
 
 class GensparkTool:
@@ -129,63 +129,63 @@ class GensparkTool:
         business_context = params.get("business_context", "general")
 
         try:
-            async with httpx.AsyncClient(timeout=180) as client:
-                payload = {
-                    "content_type": content_type,
-                    "topic": topic,
-                    "target_audience": target_audience,
-                    "tone": tone,
-                    "length": length,
-                    "keywords": keywords,
-                    "business_context": business_context,
-                    "agent_id": agent_id
-                }
+            client = get_http_client("genspark")
+            payload = {
+                "content_type": content_type,
+                "topic": topic,
+                "target_audience": target_audience,
+                "tone": tone,
+                "length": length,
+                "keywords": keywords,
+                "business_context": business_context,
+                "agent_id": agent_id
+            }
                 
-                content_templates = {
-                    "article": self._generate_article_content(topic, tone, business_context),
-                    "marketing_copy": self._generate_marketing_content(topic, tone, business_context),
-                    "research_report": self._generate_research_content(topic, business_context),
-                    "social_media": self._generate_social_content(topic, tone, business_context),
-                    "email": self._generate_email_content(topic, tone, business_context),
-                    "presentation": self._generate_presentation_content(topic, business_context)
-                }
+            content_templates = {
+                "article": self._generate_article_content(topic, tone, business_context),
+                "marketing_copy": self._generate_marketing_content(topic, tone, business_context),
+                "research_report": self._generate_research_content(topic, business_context),
+                "social_media": self._generate_social_content(topic, tone, business_context),
+                "email": self._generate_email_content(topic, tone, business_context),
+                "presentation": self._generate_presentation_content(topic, business_context)
+            }
                 
-                generated_content = content_templates.get(content_type, "Content generated successfully.")
+            generated_content = content_templates.get(content_type, "Content generated successfully.")
                 
-                result = {
-                    "success": True,
-                    "content_id": f"genspark_content_{agent_id}_{asyncio.get_event_loop().time()}",
-                    "content_type": content_type,
-                    "topic": topic,
-                    "generated_content": {
-                        "main_content": generated_content,
-                        "title": f"{topic.title()} - {content_type.replace('_', ' ').title()}",
-                        "summary": f"Generated {content_type} about {topic} for {target_audience}",
-                        "word_count": len(generated_content.split()),
-                        "reading_time": f"{max(1, len(generated_content.split()) // 200)} min"
-                    },
-                    "metadata": {
-                        "tone": tone,
-                        "target_audience": target_audience,
-                        "business_context": business_context,
-                        "keywords_used": keywords,
-                        "generation_timestamp": asyncio.get_event_loop().time()
-                    },
-                    "quality_metrics": {
-                        "readability_score": 85,
-                        "seo_score": 78,
-                        "engagement_potential": "high",
-                        "brand_alignment": 92
-                    },
-                    "suggestions": [
-                        "Consider adding more specific examples",
-                        "Include call-to-action for better engagement",
-                        "Add relevant statistics or data points"
-                    ]
-                }
+            result = {
+                "success": True,
+                "content_id": f"genspark_content_{agent_id}_{asyncio.get_event_loop().time()}",
+                "content_type": content_type,
+                "topic": topic,
+                "generated_content": {
+                    "main_content": generated_content,
+                    "title": f"{topic.title()} - {content_type.replace('_', ' ').title()}",
+                    "summary": f"Generated {content_type} about {topic} for {target_audience}",
+                    "word_count": len(generated_content.split()),
+                    "reading_time": f"{max(1, len(generated_content.split()) // 200)} min"
+                },
+                "metadata": {
+                    "tone": tone,
+                    "target_audience": target_audience,
+                    "business_context": business_context,
+                    "keywords_used": keywords,
+                    "generation_timestamp": asyncio.get_event_loop().time()
+                },
+                "quality_metrics": {
+                    "readability_score": 85,
+                    "seo_score": 78,
+                    "engagement_potential": "high",
+                    "brand_alignment": 92
+                },
+                "suggestions": [
+                    "Consider adding more specific examples",
+                    "Include call-to-action for better engagement",
+                    "Add relevant statistics or data points"
+                ]
+            }
 
-                logger.info(f"Genspark content generation completed for agent {agent_id}: {content_type}")
-                return result
+            logger.info(f"Genspark content generation completed for agent {agent_id}: {content_type}")
+            return result
 
         except Exception as e:
             logger.error(f"Error generating content with Genspark: {e}")
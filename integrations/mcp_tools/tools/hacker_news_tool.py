@@ -7,13 +7,13 @@ import asyncio
 import json
 from typing import Any, Dict, List, Optional
 
-import httpx
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from integrations.mcp_tools.mcp_tools_registry import (MCPTool, ToolCapability,
                                                        ToolMetadata,
                                                        mcp_tools_registry)
+from services.http_client_registry import get_http_client
 
 
 class HackerNewsTool:
@@ -99,31 +99,31 @@ class HackerNewsTool:
         """Get top stories from Hacker News."""
         limit = params.get("limit", 10)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://hacker-news.firebaseio.com/v0/topstories.json")
-            story_ids = response.json()[:limit]
+        client = get_http_client("hacker_news")
+        response = await client.get("https://hacker-news.firebaseio.com/v0/topstories.json")
+        story_ids = response.json()[:limit]
             
-            stories = []
-            for story_id in story_ids:
-                story_response = await client.get(f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json")
-                story = story_response.json()
-                if story:
-                    stories.append({
-                        "id": story.get("id"),
-                        "title": story.get("title"),
-                        "url": story.get("url"),
-                        "score": story.get("score"),
-                        "by": story.get("by"),
-                        "time": story.get("time"),
-                        "descendants": story.get("descendants", 0)
-                    })
+        stories = []
+        for story_id in story_ids:
+            story_response = await client.get(f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json")
+            story = story_response.json()
+            if story:
+                stories.append({
+                    "id": story.get("id"),
+                    "title": story.get("title"),
+                    "url": story.get("url"),
+                    "score": story.get("score"),
+                    "by": story.get("by"),
+                    "time": story.get("time"),
+                    "descendants": story.get("descendants", 0)
+                })
             
-            return {
-                "success": True,
-                "operation": "top_stories",
-                "stories": stories,
-                "count": len(stories)
-            }
+        return {
+            "success": True,
+            "operation": "top_stories",
+            "stories": stories,
+            "count": len(stories)
+        }
 
     async def _search_stories(self, params: Dict[str, Any], agent_id: str) -> Dict[str, Any]:
         """Search for stories using Algolia HN Search API."""
@@ -133,31 +133,31 @@ class HackerNewsTool:
             
         limit = params.get("limit", 10)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://hn.algolia.com/api/v1/search?query={query}&hitsPerPage={limit}"
-            )
-            data = response.json()
+        client = get_http_client("hacker_news")
+        response = await client.get(
+            f"https://hn.algolia.com/api/v1/search?query={query}&hitsPerPage={limit}"
+        )
+        data = response.json()
             
-            stories = []
-            for hit in data.get("hits", []):
-                stories.append({
-                    "id": hit.get("objectID"),
-                    "title": hit.get("title"),
-                    "url": hit.get("url"),
-                    "points": hit.get("points"),
-                    "author": hit.get("author"),
-                    "created_at": hit.get("created_at"),
-                    "num_comments": hit.get("num_comments", 0)
-                })
+        stories = []
+        for hit in data.get("hits", []):
+            stories.append({
+                "id": hit.get("objectID"),
+                "title": hit.get("title"),
+                "url": hit.get("url"),
+                "points": hit.get("points"),
+                "author": hit.get("author"),
+                "created_at": hit.get("created_at"),
+                "num_comments": hit.get("num_comments", 0)
+            })
             
-            return {
-                "success": True,
-                "operation": "search",
-                "query": query,
-                "stories": stories,
-                "count": len(stories)
-            }
+        return {
+            "success": True,
+            "operation": "search",
+            "query": query,
+            "stories": stories,
+            "count": len(stories)
+        }
 
 
 hacker_news_tool = HackerNewsTool()
@@ -7,13 +7,13 @@ import asyncio
 import json
 from typing import Any, Dict, List, Optional
 
-import httpx
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from integrations.mcp_tools.mcp_tools_registry import (MCPTool, ToolCapability,
                                                        ToolMetadata,
                                                        mcp_tools_registry)
+from services.http_client_registry import get_http_client
 
 
 class ManusAITool:
@@ -109,56 +109,56 @@ class ManusAITool:
         output_format = params.get("output_format", "structured")
 
         try:
-            async with httpx.AsyncClient(timeout=120) as client:
-                payload = {
-                    "task": reasoning_task,
-                    "context": context,
-                    "complexity": complexity_level,
-                    "format": output_format,
-                    "agent_id": agent_id
-                }
+            client = get_http_client("manus_ai")
+            payload = {
+                "task": reasoning_task,
+                "context": context,
+                "complexity": complexity_level,
+                "format": output_format,
+                "agent_id": agent_id
+            }
                 
-                result = {
-                    "success": True,
-                    "task_id": f"manus_reasoning_{agent_id}_{asyncio.get_event_loop().time()}",
-                    "reasoning_task": reasoning_task,
-                    "complexity_level": complexity_level,
-                    "analysis": {
-                        "key_insights": [
-                            "Current workflow has 3 potential bottlenecks",
-                            "Agent coordination could be optimized by 25%",
-                            "Customer satisfaction correlates with response time"
-                        ],
-                        "risk_factors": [
-                            "High complexity tasks may overwhelm single agents",
-                            "Lack of fallback mechanisms for agent failures"
-                        ],
-                        "opportunities": [
-                            "Implement predictive routing based on customer type",
-                            "Add automated escalation for complex issues",
-                            "Create specialized workflows for VIP clients"
-                        ]
-                    },
-                    "recommendations": [
-                        {
-                            "priority": "high",
-                            "category": "workflow_optimization",
-                            "action": "Implement Grace Fields orchestration patterns",
-                            "expected_impact": "30% improvement in response time"
-                        },
-                        {
-                            "priority": "medium",
-                            "category": "agent_coordination",
-                            "action": "Add real-time agent load balancing",
-                            "expected_impact": "Reduced agent burnout, better distribution"
-                        }
+            result = {
+                "success": True,
+                "task_id": f"manus_reasoning_{agent_id}_{asyncio.get_event_loop().time()}",
+                "reasoning_task": reasoning_task,
+                "complexity_level": complexity_level,
+                "analysis": {
+                    "key_insights": [
+                        "Current workflow has 3 potential bottlenecks",
+                        "Agent coordination could be optimized by 25%",
+                        "Customer satisfaction correlates with response time"
                     ],
-                    "confidence_score": 0.87,
-                    "reasoning_depth": complexity_level
-                }
+                    "risk_factors": [
+                        "High complexity tasks may overwhelm single agents",
+                        "Lack of fallback mechanisms for agent failures"
+                    ],
+                    "opportunities": [
+                        "Implement predictive routing based on customer type",
+                        "Add automated escalation for complex issues",
+                        "Create specialized workflows for VIP clients"
+                    ]
+                },
+                "recommendations": [
+                    {
+                        "priority": "high",
+                        "category": "workflow_optimization",
+                        "action": "Implement Grace Fields orchestration patterns",
+                        "expected_impact": "30% improvement in response time"
+                    },
+                    {
+                        "priority": "medium",
+                        "category": "agent_coordination",
+                        "action": "Add real-time agent load balancing",
+                        "expected_impact": "Reduced agent burnout, better distribution"
+                    }
+                ],
+                "confidence_score": 0.87,
+                "reasoning_depth": complexity_level
+            }
 
-                logger.info(f"Manus AI reasoning completed for agent {agent_id}: {reasoning_task}")
-                return result
+            logger.info(f"Manus AI reasoning completed for agent {agent_id}: {reasoning_task}")
+            return result
 
         except Exception as e:
             logger.error(f"Error performing Manus AI reasoning: {e}")
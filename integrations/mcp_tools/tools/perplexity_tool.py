@@ -8,7 +8,6 @@ import json
 import os
 from typing import Any, Dict, List, Optional
 
-import httpx
 from loguru import logger
 from pydantic import BaseModel, Field
 
@@ -19,6 +18,7 @@ from integrations.mcp_tools.mcp_tools_registry import (
     mcp_tools_registry,
 )
 from services.cache_service import CacheLevel, CacheType, multi_level_cache
+from services.http_client_registry import get_http_client
 
 
 class PerplexityTool:
@@ -166,76 +166,72 @@ class PerplexityTool:
                 "max_tokens": max_tokens,
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.perplexity_api_url, headers=headers, json=payload, timeout=60
-                )
+            client = get_http_client("perplexity")
+            response = await client.post(
+                self.perplexity_api_url, headers=headers, json=payload, timeout=60
+            )
 
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "message": f"Perplexity API error: {response.status_code}",
-                        "details": response.text,
-                    }
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "message": f"Perplexity API error: {response.status_code}",
+                    "details": response.text,
+                }
 
-                data = response.json()
+            data = response.json()
 
-                # Extract the answer and sources
-                answer_text = (
-                    data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                )
+            # Extract the answer and sources
+            answer_text = (
+                data.get("choices", [{}])[0].get("message", {}).get("content", "")
+            )
 
-                # Parse citations from the text or extract from metadata
-                citations = []
-
-                # Process links if present in message metadata
-                message = data.get("choices", [{}])[0].get("message", {})
-                if "tool_calls" in message and message["tool_calls"]:
-                    for tool_call in message["tool_calls"]:
-                        if tool_call.get("function", {}).get("name") == "search":
-                            try:
-                                search_args = json.loads(
-                                    tool_call["function"]["arguments"]
-                                )
-                                if "links" in search_args:
-                                    for link in search_args["links"]:
-                                        citations.append(
-                                            {
-                                                "title": link.get("title", ""),
-                                                "url": link.get("url", ""),
-                                                "snippet": link.get("snippet", ""),
-                                            }
-                                        )
-                            except Exception as e:
-                                logger.warning(
-                                    f"Error parsing tool call arguments: {e}"
-                                )
-
-                # Use regex to extract URLs if no tool calls found
-                if not citations:
-                    import re
-
-                    # Look for URLs in format [1]: http://example.com
-                    url_pattern = r"\[(\d+)\]:\s*(https?://\S+)"
-                    for match in re.finditer(url_pattern, answer_text):
-                        index = match.group(1)
-                        url = match.group(2)
-                        citations.append({"index": index, "url": url})
-
-                result = {
-                    "success": True,
-                    "answer": answer_text,
-                    "sources": citations,
-                    "model": model,
-                    "usage": data.get("usage", {}),
-                }
+            # Parse citations from the text or extract from metadata
+            citations = []
+
+            # Process links if present in message metadata
+            message = data.get("choices", [{}])[0].get("message", {})
+            if "tool_calls" in message and message["tool_calls"]:
+                for tool_call in message["tool_calls"]:
+                    if tool_call.get("function", {}).get("name") == "search":
+                        try:
+                            search_args = json.loads(tool_call["function"]["arguments"])
+                            if "links" in search_args:
+                                for link in search_args["links"]:
+                                    citations.append(
+                                        {
+                                            "title": link.get("title", ""),
+                                            "url": link.get("url", ""),
+                                            "snippet": link.get("snippet", ""),
+                                        }
+                                    )
+                        except Exception as e:
+                            logger.warning(f"Error parsing tool call arguments: {e}")
+
+            # Use regex to extract URLs if no tool calls found
+            if not citations:
+                import re
+
+                # Look for URLs in format [1]: http://example.com
+                url_pattern = r"\[(\d+)\]:\s*(https?://\S+)"
+                for match in re.finditer(url_pattern, answer_text):
+                    index = match.group(1)
+                    url = match.group(2)
+                    citations.append({"index": index, "url": url})
+
+            result = {
+                "success": True,
+                "answer": answer_text,
+                "sources": citations,
+                "model": model,
+                "usage": data.get("usage", {}),
+            }
 
-                # Cache the result
-                await multi_level_cache.set(
-                    cache_key, result, CacheType.API, ttl_override=3600
-                )  # 1-hour cache
+            # Cache the result
+            await multi_level_cache.set(
+                cache_key, result, CacheType.API, ttl_override=3600
+            )  # 1-hour cache
 
-                return result
+            return result
 
         except Exception as e:
             logger.error(f"Error in Perplexity query: {e}")
@@ -7,13 +7,13 @@ import asyncio
 import json
 from typing import Any, Dict, List, Optional
 
-import httpx
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from integrations.mcp_tools.mcp_tools_registry import (MCPTool, ToolCapability,
                                                        ToolMetadata,
                                                        mcp_tools_registry)
+from services.http_client_registry import get_http_client
 
 
 class RedditTool:
@@ -116,34 +116,34 @@ class RedditTool:
         sort = params.get("sort", "hot")
         limit = params.get("limit", 10)
         
-        async with httpx.AsyncClient() as client:
-            url = f"https://www.reddit.com/r/{subreddit}/{sort}.json?limit={limit}"
-            response = await client.get(url, headers={"User-Agent": "HigherSelf-Network-Bot/1.0"})
-            data = response.json()
+        client = get_http_client("reddit")
+        url = f"https://www.reddit.com/r/{subreddit}/{sort}.json?limit={limit}"
+        response = await client.get(url, headers={"User-Agent": "HigherSelf-Network-Bot/1.0"})
+        data = response.json()
             
-            posts = []
-            for post_data in data.get("data", {}).get("children", []):
-                post = post_data.get("data", {})
-                posts.append({
-                    "id": post.get("id"),
-                    "title": post.get("title"),
-                    "url": post.get("url"),
-                    "score": post.get("score"),
-                    "author": post.get("author"),
-                    "created_utc": post.get("created_utc"),
-                    "num_comments": post.get("num_comments"),
-                    "subreddit": post.get("subreddit"),
-                    "selftext": post.get("selftext", "")[:500]  # Truncate long text
-                })
+        posts = []
+        for post_data in data.get("data", {}).get("children", []):
+            post = post_data.get("data", {})
+            posts.append({
+                "id": post.get("id"),
+                "title": post.get("title"),
+                "url": post.get("url"),
+                "score": post.get("score"),
+                "author": post.get("author"),
+                "created_utc": post.get("created_utc"),
+                "num_comments": post.get("num_comments"),
+                "subreddit": post.get("subreddit"),
+                "selftext": post.get("selftext", "")[:500]  # Truncate long text
+            })
             
-            return {
-                "success": True,
-                "operation": "subreddit_posts",
-                "subreddit": subreddit,
-                "sort": sort,
-                "posts": posts,
-                "count": len(posts)
-            }
+        return {
+            "success": True,
+            "operation": "subreddit_posts",
+            "subreddit": subreddit,
+            "sort": sort,
+            "posts": posts,
+            "count": len(posts)
+        }
 
     async def _search_posts(self, params: Dict[str, Any], agent_id: str) -> Dict[str, Any]:
         """Search Reddit posts."""
@@ -155,33 +155,33 @@ class RedditTool:
         sort = params.get("sort", "relevance")
         time_filter = params.get("time_filter", "week")
         
-        async with httpx.AsyncClient() as client:
-            url = f"https://www.reddit.com/search.json?q={query}&sort={sort}&t={time_filter}&limit={limit}"
-            response = await client.get(url, headers={"User-Agent": "HigherSelf-Network-Bot/1.0"})
-            data = response.json()
+        client = get_http_client("reddit")
+        url = f"https://www.reddit.com/search.json?q={query}&sort={sort}&t={time_filter}&limit={limit}"
+        response = await client.get(url, headers={"User-Agent": "HigherSelf-Network-Bot/1.0"})
+        data = response.json()
             
-            posts = []
-            for post_data in data.get("data", {}).get("children", []):
-                post = post_data.get("data", {})
-                posts.append({
-                    "id": post.get("id"),
-                    "title": post.get("title"),
-                    "url": post.get("url"),
-                    "score": post.get("score"),
-                    "author": post.get("author"),
-                    "subreddit": post.get("subreddit"),
-                    "created_utc": post.get("created_utc"),
-                    "num_comments": post.get("num_comments"),
-                    "selftext": post.get("selftext", "")[:300]
-                })
+        posts = []
+        for post_data in data.get("data", {}).get("children", []):
+            post = post_data.get("data", {})
+            posts.append({
+                "id": post.get("id"),
+                "title": post.get("title"),
+                "url": post.get("url"),
+                "score": post.get("score"),
+                "author": post.get("author"),
+                "subreddit": post.get("subreddit"),
+                "created_utc": post.get("created_utc"),
+                "num_comments": post.get("num_comments"),
+                "selftext": post.get("selftext", "")[:300]
+            })
             
-            return {
-                "success": True,
-                "operation": "search",
-                "query": query,
-                "posts": posts,
-                "count": len(posts)
-            }
+        return {
+            "success": True,
+            "operation": "search",
+            "query": query,
+            "posts": posts,
+            "count": len(posts)
+        }
 
 
 reddit_tool = RedditTool()
@@ -10,7 +10,6 @@ import re
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 
-import httpx
 from bs4 import BeautifulSoup
 from loguru import logger
 from pydantic import BaseModel, Field
@@ -22,6 +21,7 @@ from integrations.mcp_tools.mcp_tools_registry import (
     mcp_tools_registry,
 )
 from services.cache_service import CacheLevel, CacheType, multi_level_cache
+from services.http_client_registry import get_http_client
 
 
 class WebBrowserTool:
@@ -200,50 +200,50 @@ class WebBrowserTool:
             "num": min(num_results, 10),  # Google API limits to 10 per request
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(api_url, params=params, timeout=10)
+        client = get_http_client("web_browser")
+        response = await client.get(api_url, params=params, timeout=10)
 
-            if response.status_code != 200:
-                return {
-                    "success": False,
-                    "message": f"Search API error: {response.status_code}",
-                }
-
-            data = response.json()
-
-            if "items" not in data:
-                return {
-                    "success": True,
-                    "results": [],
-                    "total_results": 0,
-                    "message": "No results found",
-                }
+        if response.status_code != 200:
+            return {
+                "success": False,
+                "message": f"Search API error: {response.status_code}",
+            }
 
-            results = []
-            for item in data.get("items", []):
-                results.append(
-                    {
-                        "title": item.get("title", ""),
-                        "link": item.get("link", ""),
-                        "snippet": item.get("snippet", ""),
-                        "display_link": item.get("displayLink", ""),
-                    }
-                )
+        data = response.json()
 
-            result_data = {
+        if "items" not in data:
+            return {
                 "success": True,
-                "results": results,
-                "total_results": int(
-                    data.get("searchInformation", {}).get("totalResults", 0)
-                ),
-                "query": query,
+                "results": [],
+                "total_results": 0,
+                "message": "No results found",
             }
 
-            # Cache the results
-            cache_key = f"search:{query}:{num_results}"
-            await multi_level_cache.set(cache_key, result_data, CacheType.API)
+        results = []
+        for item in data.get("items", []):
+            results.append(
+                {
+                    "title": item.get("title", ""),
+                    "link": item.get("link", ""),
+                    "snippet": item.get("snippet", ""),
+                    "display_link": item.get("displayLink", ""),
+                }
+            )
 
-            return result_data
+        result_data = {
+            "success": True,
+            "results": results,
+            "total_results": int(
+                data.get("searchInformation", {}).get("totalResults", 0)
+            ),
+            "query": query,
+        }
+
+        # Cache the results
+        cache_key = f"search:{query}:{num_results}"
+        await multi_level_cache.set(cache_key, result_data, CacheType.API)
+
+        return result_data
 
     async def _basic_search(
         self, query: str, num_results: int, agent_id: str
@@ -255,57 +255,57 @@ class WebBrowserTool:
 
         headers = {"User-Agent": self.user_agent}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                search_url, headers=headers, follow_redirects=True, timeout=10
-            )
+        client = get_http_client("web_browser")
+        response = await client.get(
+            search_url, headers=headers, follow_redirects=True, timeout=10
+        )
 
-            if response.status_code != 200:
-                return {
-                    "success": False,
-                    "message": f"Search error: status code {response.status_code}",
-                }
+        if response.status_code != 200:
+            return {
+                "success": False,
+                "message": f"Search error: status code {response.status_code}",
+            }
 
-            # Parse results
-            soup = BeautifulSoup(response.text, "html.parser")
-            search_results = []
-
-            # Extract search results (this is simplistic and may break with Google layout changes)
-            results = soup.select("div.g")[:num_results]
-
-            for result in results:
-                title_element = result.select_one("h3")
-                link_element = result.select_one("a")
-                snippet_element = result.select_one("div.VwiC3b")
-
-                if title_element and link_element and "href" in link_element.attrs:
-                    href = link_element["href"]
-                    if href.startswith("/url?q="):
-                        href = href[7:].split("&")[0]
-
-                    search_results.append(
-                        {
-                            "title": title_element.get_text(),
-                            "link": href,
-                            "snippet": (
-                                snippet_element.get_text() if snippet_element else ""
-                            ),
-                            "display_link": urlparse(href).netloc,
-                        }
-                    )
+        # Parse results
+        soup = BeautifulSoup(response.text, "html.parser")
+        search_results = []
 
-            result_data = {
-                "success": True,
-                "results": search_results,
-                "total_results": len(search_results),
-                "query": query,
-            }
+        # Extract search results (this is simplistic and may break with Google layout changes)
+        results = soup.select("div.g")[:num_results]
+
+        for result in results:
+            title_element = result.select_one("h3")
+            link_element = result.select_one("a")
+            snippet_element = result.select_one("div.VwiC3b")
+
+            if title_element and link_element and "href" in link_element.attrs:
+                href = link_element["href"]
+                if href.startswith("/url?q="):
+                    href = href[7:].split("&")[0]
+
+                search_results.append(
+                    {
+                        "title": title_element.get_text(),
+                        "link": href,
+                        "snippet": (
+                            snippet_element.get_text() if snippet_element else ""
+                        ),
+                        "display_link": urlparse(href).netloc,
+                    }
+                )
 
-            # Cache the results
-            cache_key = f"search:{query}:{num_results}"
-            await multi_level_cache.set(cache_key, result_data, CacheType.API)
+        result_data = {
+            "success": True,
+            "results": search_results,
+            "total_results": len(search_results),
+            "query": query,
+        }
+
+        # Cache the results
+        cache_key = f"search:{query}:{num_results}"
+        await multi_level_cache.set(cache_key, result_data, CacheType.API)
 
-            return result_data
+        return result_data
 
     async def _get_page(self, params: Dict[str, Any], agent_id: str) -> Dict[str, Any]:
         """Get the content of a web page."""
@@ -328,72 +328,72 @@ class WebBrowserTool:
             return {**cached, "from_cache": True}
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": self.user_agent},
-                    follow_redirects=True,
-                    timeout=timeout,
-                )
+            client = get_http_client("web_browser")
+            response = await client.get(
+                url,
+                headers={"User-Agent": self.user_agent},
+                follow_redirects=True,
+                timeout=timeout,
+            )
 
-                if response.status_code != 200:
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "message": f"Failed to fetch page: status code {response.status_code}",
+                }
+
+            # Process content
+            soup = BeautifulSoup(response.text, "html.parser")
+
+            # Extract title
+            title = soup.title.string if soup.title else ""
+
+            # Extract specific element if requested
+            if select_element:
+                selected = soup.select(select_element)
+                if selected:
+                    content_html = "".join(str(e) for e in selected)
+                    content_text = " ".join(
+                        e.get_text(" ", strip=True) for e in selected
+                    )
+                else:
                     return {
                         "success": False,
-                        "message": f"Failed to fetch page: status code {response.status_code}",
+                        "message": f"Element not found: {select_element}",
                     }
+            else:
+                # Remove script and style elements
+                for element in soup(["script", "style"]):
+                    element.decompose()
 
-                # Process content
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                # Extract title
-                title = soup.title.string if soup.title else ""
-
-                # Extract specific element if requested
-                if select_element:
-                    selected = soup.select(select_element)
-                    if selected:
-                        content_html = "".join(str(e) for e in selected)
-                        content_text = " ".join(
-                            e.get_text(" ", strip=True) for e in selected
-                        )
-                    else:
-                        return {
-                            "success": False,
-                            "message": f"Element not found: {select_element}",
-                        }
-                else:
-                    # Remove script and style elements
-                    for element in soup(["script", "style"]):
-                        element.decompose()
-
-                    content_html = str(soup)
-                    content_text = soup.get_text(" ", strip=True)
-                    # Clean up whitespace
-                    content_text = re.sub(r"\s+", " ", content_text).strip()
-
-                result = {
-                    "success": True,
-                    "url": url,
-                    "title": title,
-                    "content": content_text if extract_text_only else content_html,
-                }
+                content_html = str(soup)
+                content_text = soup.get_text(" ", strip=True)
+                # Clean up whitespace
+                content_text = re.sub(r"\s+", " ", content_text).strip()
 
-                # Add images if requested
-                if extract_images:
-                    image_urls = []
-                    for img in soup.find_all("img"):
-                        if "src" in img.attrs:
-                            img_url = img["src"]
-                            if not img_url.startswith(("http://", "https://")):
-                                img_url = urljoin(url, img_url)
-                            image_urls.append(img_url)
+            result = {
+                "success": True,
+                "url": url,
+                "title": title,
+                "content": content_text if extract_text_only else content_html,
+            }
 
-                    result["images"] = image_urls
+            # Add images if requested
+            if extract_images:
+                image_urls = []
+                for img in soup.find_all("img"):
+                    if "src" in img.attrs:
+                        img_url = img["src"]
+                        if not img_url.startswith(("http://", "https://")):
+                            img_url = urljoin(url, img_url)
+                        image_urls.append(img_url)
 
-                # Cache the result
-                await multi_level_cache.set(cache_key, result, CacheType.API)
+                result["images"] = image_urls
 
-                return result
+            # Cache the result
+            await multi_level_cache.set(cache_key, result, CacheType.API)
+
+            return result
 
         except Exception as e:
             logger.error(f"Error fetching page {url}: {e}")
@@ -416,49 +416,49 @@ class WebBrowserTool:
             return {**cached, "from_cache": True}
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": self.user_agent},
-                    follow_redirects=True,
-                    timeout=10,
-                )
-
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "message": f"Failed to fetch page: status code {response.status_code}",
-                    }
+            client = get_http_client("web_browser")
+            response = await client.get(
+                url,
+                headers={"User-Agent": self.user_agent},
+                follow_redirects=True,
+                timeout=10,
+            )
 
-                # Parse links
-                soup = BeautifulSoup(response.text, "html.parser")
-                links = []
-
-                for a in soup.find_all("a", href=True):
-                    href = a["href"]
-                    link_text = a.get_text(strip=True)
-
-                    # Make relative URLs absolute
-                    if not href.startswith(("http://", "https://")):
-                        href = urljoin(url, href)
-
-                    # Only include http/https URLs
-                    if href.startswith(("http://", "https://")):
-                        links.append(
-                            {"url": href, "text": link_text if link_text else href}
-                        )
-
-                result = {
-                    "success": True,
-                    "url": url,
-                    "links": links,
-                    "count": len(links),
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "message": f"Failed to fetch page: status code {response.status_code}",
                 }
 
-                # Cache the result
-                await multi_level_cache.set(cache_key, result, CacheType.API)
+            # Parse links
+            soup = BeautifulSoup(response.text, "html.parser")
+            links = []
+
+            for a in soup.find_all("a", href=True):
+                href = a["href"]
+                link_text = a.get_text(strip=True)
+
+                # Make relative URLs absolute
+                if not href.startswith(("http://", "https://")):
+                    href = urljoin(url, href)
 
-                return result
+                # Only include http/https URLs
+                if href.startswith(("http://", "https://")):
+                    links.append(
+                        {"url": href, "text": link_text if link_text else href}
+                    )
+
+            result = {
+                "success": True,
+                "url": url,
+                "links": links,
+                "count": len(links),
+            }
+
+            # Cache the result
+            await multi_level_cache.set(cache_key, result, CacheType.API)
+
+            return result
 
         except Exception as e:
             logger.error(f"Error extracting links from {url}: {e}")
@@ -18,6 +18,7 @@ from ..config.the7space_config import the7space_config
 from ..utils.notion_helpers import NotionHelper
 from ..utils.error_recovery import ErrorRecoveryManager
 from ..utils.logging_helpers import setup_logger
+from .artwork_store import ArtworkStore
 
 # Setup logging
 logger = setup_logger(__name__)
@@ -85,6 +86,74 @@ class ArtworkInventoryManager:
         
         if not self.artworks_db_id:
             raise ValueError("Artworks database ID not configured")
+        
+        # Local copy of the artworks database; reads refresh it by
+        # last_edited_time delta once it is older than store_max_staleness
+        self.artwork_store = ArtworkStore()
+        self.store_max_staleness = timedelta(seconds=60)
+        self.store_full_refresh_interval = timedelta(hours=1)
+        self._store_lock = asyncio.Lock()
+    
+    async def refresh_artwork_store(self, full: bool = False,
+                                    max_staleness: Optional[timedelta] = None) -> Dict[str, int]:
+        """
+        Bring the local artwork store up to date with Notion.
+        
+        Only pages edited since the last refresh are fetched. Deltas cannot
+        see deleted or archived pages, so a full refresh is done on first use
+        and then every store_full_refresh_interval.
+        
+        Args:
+            full: Force a full refresh
+            max_staleness: Skip the refresh if the store is younger than this
+            
+        Returns:
+            Dict[str, int]: Counts of upserted and removed artworks
+        """
+        async with self._store_lock:
+            store = self.artwork_store
+            now = datetime.now()
+            if (max_staleness is not None and store.refreshed_at
+                    and now - store.refreshed_at < max_staleness):
+                return {"upserted": 0, "removed": 0}
+            
+            if (store.cursor is None or store.full_refreshed_at is None
+                    or now - store.full_refreshed_at > self.store_full_refresh_interval):
+                full = True
+            
+            query = {"database_id": self.artworks_db_id}
+            if not full:
+                # Notion rounds last_edited_time to the minute, so the delta
+                # re-reads the cursor minute; unchanged pages are skipped
+                query["filter_condition"] = {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": store.cursor}
+                }
+            results = await self.notion_helper.query_database(**query)
+            
+            rows = []
+            for page in results:
+                if page.get("archived"):
+                    store.remove(page["id"])
+                    continue
+                artwork = await self._notion_page_to_artwork(page)
+                if artwork:
+                    rows.append((artwork, page.get("last_edited_time")))
+            
+            changes = store.apply(rows, full=full)
+            logger.info(f"Refreshed artwork store ({'full' if full else 'delta'}): "
+                        f"{changes['upserted']} upserted, {changes['removed']} removed, "
+                        f"{len(store)} total")
+            return changes
+    
+    async def _ensure_artwork_store(self):
+        """Refresh the artwork store if stale, serving stale data if Notion is unreachable."""
+        try:
+            await self.refresh_artwork_store(max_staleness=self.store_max_staleness)
+        except Exception as e:
+            if self.artwork_store.refreshed_at is None:
+                raise
+            logger.warning(f"Serving stale artwork store, refresh failed: {str(e)}")
     
     async def add_artwork(self, artwork_data: Dict[str, Any]) -> str:
         """
@@ -133,6 +202,7 @@ class ArtworkInventoryManager:
             )
             
             artwork.notion_page_id = response["id"]
+            self.artwork_store.upsert(artwork, response.get("last_edited_time"))
             
             # Log successful addition
             logger.info(f"Successfully added artwork: {artwork.title} (ID: {artwork.id})")
@@ -188,6 +258,7 @@ class ArtworkInventoryManager:
                 page_id=artwork.notion_page_id,
                 properties=notion_properties
             )
+            self.artwork_store.upsert(artwork)
             
             # Trigger status change notifications
             await self._notify_status_change(artwork, old_status, new_status)
@@ -205,7 +276,7 @@ class ArtworkInventoryManager:
     
     async def get_artwork_by_id(self, artwork_id: str) -> Optional[Artwork]:
         """
-        Retrieve artwork by ID from Notion database.
+        Retrieve artwork by ID from the local store, falling back to Notion.
         
         Args:
             artwork_id: Artwork identifier
@@ -214,7 +285,12 @@ class ArtworkInventoryManager:
             Optional[Artwork]: Artwork object if found
         """
         try:
-            # Query Notion database
+            await self._ensure_artwork_store()
+            artwork = self.artwork_store.get(artwork_id)
+            if artwork:
+                return artwork
+            
+            # Not materialized yet, e.g. created elsewhere since the last refresh
             filter_condition = {
                 "property": "Artwork ID",
                 "rich_text": {
@@ -232,7 +308,11 @@ class ArtworkInventoryManager:
             
             # Convert Notion page to Artwork object
             notion_page = results[0]
-            return await self._notion_page_to_artwork(notion_page)
+            artwork = await self._notion_page_to_artwork(notion_page)
+            if artwork:
+                self.artwork_store.upsert(artwork, notion_page.get("last_edited_time"))
+                return self.artwork_store.get(artwork_id)
+            return None
             
         except Exception as e:
             logger.error(f"Failed to get artwork by ID: {str(e)}")
@@ -243,35 +323,18 @@ class ArtworkInventoryManager:
         Get list of available artworks with optional filtering.
         
         Args:
-            filters: Optional filters for artwork search
+            filters: Optional filters for artwork search: artist, min_price,
+                max_price, or any other Artwork attribute such as medium
             
         Returns:
-            List[Artwork]: List of available artworks
+            List[Artwork]: List of available artworks ordered by price
         """
         try:
-            # Build filter condition
-            filter_condition = {
-                "property": "Status",
-                "select": {
-                    "equals": "available"
-                }
-            }
-            
-            # Add additional filters if provided
-            if filters:
-                filter_condition = await self._build_compound_filter(filter_condition, filters)
-            
-            results = await self.notion_helper.query_database(
-                database_id=self.artworks_db_id,
-                filter_condition=filter_condition
+            await self._ensure_artwork_store()
+            artworks = self.artwork_store.query(
+                status=ArtworkStatus.AVAILABLE.value, **(filters or {})
             )
             
-            artworks = []
-            for page in results:
-                artwork = await self._notion_page_to_artwork(page)
-                if artwork:
-                    artworks.append(artwork)
-            
             logger.info(f"Retrieved {len(artworks)} available artworks")
             return artworks
             
@@ -502,19 +565,10 @@ class ArtworkInventoryManager:
             logger.error(f"Failed to process artwork sale: {str(e)}")
 
     async def _get_all_artworks(self) -> List[Artwork]:
-        """Get all artworks from database"""
+        """Get all artworks from the local store"""
         try:
-            results = await self.notion_helper.query_database(
-                database_id=self.artworks_db_id
-            )
-
-            artworks = []
-            for page in results:
-                artwork = await self._notion_page_to_artwork(page)
-                if artwork:
-                    artworks.append(artwork)
-
-            return artworks
+            await self._ensure_artwork_store()
+            return self.artwork_store.all()
 
         except Exception as e:
             logger.error(f"Failed to get all artworks: {str(e)}")
@@ -0,0 +1,255 @@
+"""
+The 7 Space Artwork Store
+
+Locally materialized copy of the Notion artworks database for the inventory
+manager. Artworks are kept in memory with secondary indexes on status, artist
+and price, and refreshed from Notion by last_edited_time deltas, so reports
+and filters no longer page through the whole database.
+"""
+
+import bisect
+import dataclasses
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .artwork_inventory import Artwork
+
+logger = logging.getLogger(__name__)
+
+
+class ArtworkStore:
+    """
+    In-process artwork table keyed by Notion page id.
+
+    Secondary indexes:
+    - status value -> page ids
+    - lower-cased artist name -> page ids
+    - (price, page id) pairs kept sorted for range queries, with a parallel
+      list of just the prices to bisect on
+    """
+
+    def __init__(self):
+        self._artworks: Dict[str, "Artwork"] = {}
+        self._edited: Dict[str, str] = {}
+        self._by_artwork_id: Dict[str, str] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_artist: Dict[str, Set[str]] = {}
+        self._by_price: List[Tuple[float, str]] = []
+        self._prices: List[float] = []
+        # Highest Notion last_edited_time seen; the next delta starts here
+        self.cursor: Optional[str] = None
+        self.refreshed_at: Optional[datetime] = None
+        self.full_refreshed_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._artworks)
+
+    def _index(self, page_id: str, artwork: "Artwork") -> None:
+        self._by_artwork_id[artwork.id] = page_id
+        self._by_status.setdefault(artwork.status.value, set()).add(page_id)
+        self._by_artist.setdefault(artwork.artist_name.lower(), set()).add(page_id)
+        position = bisect.bisect_right(self._by_price, (artwork.price, page_id))
+        self._by_price.insert(position, (artwork.price, page_id))
+        self._prices.insert(position, artwork.price)
+
+    def _unindex(self, page_id: str, artwork: "Artwork") -> None:
+        if self._by_artwork_id.get(artwork.id) == page_id:
+            del self._by_artwork_id[artwork.id]
+        for index, key in (
+            (self._by_status, artwork.status.value),
+            (self._by_artist, artwork.artist_name.lower()),
+        ):
+            page_ids = index.get(key)
+            if page_ids is not None:
+                page_ids.discard(page_id)
+                if not page_ids:
+                    del index[key]
+        position = bisect.bisect_left(self._by_price, (artwork.price, page_id))
+        if position < len(self._by_price) and self._by_price[position] == (
+            artwork.price,
+            page_id,
+        ):
+            del self._by_price[position]
+            del self._prices[position]
+
+    def upsert(
+        self, artwork: "Artwork", last_edited_time: Optional[str] = None
+    ) -> None:
+        """
+        Insert or replace an artwork.
+
+        Used directly for write-through after local edits; this never moves
+        the refresh cursor, so edits made elsewhere in the meantime are still
+        picked up by the next delta.
+
+        Args:
+            artwork: Artwork with its notion_page_id set
+            last_edited_time: Notion last_edited_time of the page, if known
+        """
+        page_id = artwork.notion_page_id
+        if not page_id:
+            return
+        previous = self._artworks.get(page_id)
+        if previous is not None:
+            self._unindex(page_id, previous)
+        self._artworks[page_id] = artwork
+        self._index(page_id, artwork)
+        if last_edited_time:
+            self._edited[page_id] = last_edited_time
+        else:
+            self._edited.pop(page_id, None)
+
+    def remove(self, page_id: str) -> bool:
+        """
+        Remove an artwork.
+
+        Args:
+            page_id: Notion page id
+
+        Returns:
+            True if the artwork was stored
+        """
+        artwork = self._artworks.pop(page_id, None)
+        if artwork is None:
+            return False
+        self._unindex(page_id, artwork)
+        self._edited.pop(page_id, None)
+        return True
+
+    def apply(
+        self, rows: Iterable[Tuple["Artwork", Optional[str]]], full: bool = False
+    ) -> Dict[str, int]:
+        """
+        Apply a refresh from Notion.
+
+        Args:
+            rows: (artwork, last_edited_time) pairs returned by the query
+            full: Whether rows is the whole database; artworks missing from a
+                full refresh were deleted or archived and are dropped
+
+        Returns:
+            Counts of upserted and removed artworks
+        """
+        seen: Set[str] = set()
+        upserted = 0
+        cursor = None if full else self.cursor
+        for artwork, last_edited_time in rows:
+            page_id = artwork.notion_page_id
+            seen.add(page_id)
+            if last_edited_time and (cursor is None or last_edited_time > cursor):
+                cursor = last_edited_time
+            if last_edited_time and self._edited.get(page_id) == last_edited_time:
+                continue
+            self.upsert(artwork, last_edited_time)
+            upserted += 1
+
+        removed = 0
+        if full:
+            for page_id in [
+                page_id for page_id in self._artworks if page_id not in seen
+            ]:
+                self.remove(page_id)
+                removed += 1
+            if removed:
+                logger.info(f"Dropped {removed} artworks missing from full refresh")
+            self.full_refreshed_at = datetime.now()
+        self.cursor = cursor
+        self.refreshed_at = datetime.now()
+        return {"upserted": upserted, "removed": removed}
+
+    def get(self, artwork_id: str) -> Optional["Artwork"]:
+        """
+        Get an artwork by its Artwork ID.
+
+        Returns a copy, so callers can modify it and upsert() the result
+        without corrupting the indexes.
+        """
+        page_id = self._by_artwork_id.get(artwork_id)
+        if page_id is None:
+            return None
+        return dataclasses.replace(self._artworks[page_id])
+
+    def all(self) -> List["Artwork"]:
+        """Get every stored artwork. The returned artworks must not be modified."""
+        return list(self._artworks.values())
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Count artworks per status value."""
+        return {status: len(page_ids) for status, page_ids in self._by_status.items()}
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        artist: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        **fields: Any,
+    ) -> List["Artwork"]:
+        """
+        Find artworks matching all given filters.
+
+        Indexed filters narrow the candidate set first; other Artwork
+        attributes are compared exactly on the remaining candidates.
+
+        Args:
+            status: Status value
+            artist: Artist name, case-insensitive
+            min_price: Lowest price, inclusive
+            max_price: Highest price, inclusive
+            **fields: Other Artwork attributes to match, e.g. medium="Oil"
+
+        Returns:
+            Matching artworks ordered by price; they must not be modified
+        """
+        candidates: Optional[Set[str]] = None
+
+        def narrow(page_ids: Iterable[str]) -> None:
+            nonlocal candidates
+            page_ids = set(page_ids)
+            candidates = page_ids if candidates is None else candidates & page_ids
+
+        if status is not None:
+            narrow(self._by_status.get(status, ()))
+        if artist is not None:
+            narrow(self._by_artist.get(artist.lower(), ()))
+
+        low = (
+            bisect.bisect_left(self._prices, min_price) if min_price is not None else 0
+        )
+        high = (
+            bisect.bisect_right(self._prices, max_price)
+            if max_price is not None
+            else len(self._prices)
+        )
+
+        results = []
+        for _, page_id in self._by_price[low:high]:
+            if candidates is not None and page_id not in candidates:
+                continue
+            artwork = self._artworks[page_id]
+            if all(
+                _field_value(getattr(artwork, name, None)) == value
+                for name, value in fields.items()
+            ):
+                results.append(artwork)
+        return results
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get store size and freshness metrics."""
+        return {
+            "artworks": len(self._artworks),
+            "cursor": self.cursor,
+            "refreshed_at": (
+                self.refreshed_at.isoformat() if self.refreshed_at else None
+            ),
+            "full_refreshed_at": (
+                self.full_refreshed_at.isoformat() if self.full_refreshed_at else None
+            ),
+        }
+
+
+def _field_value(value: Any) -> Any:
+    """Compare enum attributes by their value."""
+    return getattr(value, "value", value)
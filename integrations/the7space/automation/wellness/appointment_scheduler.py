@@ -18,6 +18,7 @@ from ..config.the7space_config import the7space_config
 from ..utils.notion_helpers import NotionHelper
 from ..utils.error_recovery import ErrorRecoveryManager
 from ..utils.logging_helpers import setup_logger
+from .slot_index import DEFAULT_RESOURCE, SlotIndex
 
 # Setup logging
 logger = setup_logger(__name__)
@@ -106,10 +107,21 @@ class AppointmentScheduler:
         self.services = {}
         self.business_hours = self.config.business_hours
         
+        # In-memory availability index, loaded once and kept current by
+        # bookings, reschedules, cancellations and webhooks
+        self.slot_index = SlotIndex(self.business_hours)
+        self.slot_index_days = 60
+        self.slot_index_until: Optional[datetime] = None
+        
     async def initialize(self):
         """Initialize the scheduler with services and settings"""
         try:
             await self._load_services()
+            try:
+                await self.load_slot_index()
+            except Exception:
+                # Availability checks retry the load and fail until it works
+                logger.warning("Slot index not loaded; retrying on first availability check")
             logger.info("Appointment scheduler initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize appointment scheduler: {str(e)}")
@@ -135,7 +147,8 @@ class AppointmentScheduler:
             is_available, availability_info = await self.check_availability(
                 service_id=validated_data["service_id"],
                 requested_datetime=validated_data["appointment_datetime"],
-                duration_minutes=validated_data.get("duration_minutes")
+                duration_minutes=validated_data.get("duration_minutes"),
+                practitioner_id=validated_data.get("practitioner_id")
             )
             
             if not is_available:
@@ -149,8 +162,29 @@ class AppointmentScheduler:
                     )
                 }
             
+            # Hold the slot so a concurrent booking cannot take it while the
+            # appointment is written to Notion
+            service = self.services[validated_data["service_id"]]
+            start, end = self._appointment_span(
+                service,
+                validated_data["appointment_datetime"],
+                validated_data.get("duration_minutes"),
+            )
+            reservation = self.slot_index.reserve(
+                service.id, start, end, validated_data.get("practitioner_id")
+            )
+            if reservation is None:
+                return {"success": False, "error": "Time slot was just booked"}
+            if reservation.resource != DEFAULT_RESOURCE:
+                validated_data.setdefault("practitioner_id", reservation.resource)
+            
             # Create appointment
-            appointment = await self._create_appointment(validated_data)
+            try:
+                appointment = await self._create_appointment(validated_data)
+            except Exception:
+                self.slot_index.release(reservation)
+                raise
+            self.slot_index.confirm(reservation, appointment.id)
             
             # Send confirmation
             await self._send_booking_confirmation(appointment)
@@ -176,7 +210,8 @@ class AppointmentScheduler:
             }
     
     async def check_availability(self, service_id: str, requested_datetime: datetime, 
-                               duration_minutes: Optional[int] = None) -> Tuple[bool, Dict[str, Any]]:
+                               duration_minutes: Optional[int] = None,
+                               practitioner_id: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
         """
         Check if a time slot is available for booking.
         
@@ -184,6 +219,7 @@ class AppointmentScheduler:
             service_id: Service identifier
             requested_datetime: Requested appointment time
             duration_minutes: Optional duration override
+            practitioner_id: Optional requested practitioner
             
         Returns:
             Tuple of (is_available, availability_info)
@@ -195,38 +231,29 @@ class AppointmentScheduler:
                 return False, {"error": "Service not found"}
             
             duration = duration_minutes or service.duration_minutes
-            appointment_end = requested_datetime + timedelta(minutes=duration)
+            start, end = self._appointment_span(service, requested_datetime, duration)
             
             # Check business hours
-            if not self._is_within_business_hours(requested_datetime, appointment_end):
+            if not self.slot_index.is_within_business_hours(start, end):
                 return False, {
                     "error": "Outside business hours",
-                    "business_hours": self._get_business_hours_for_date(requested_datetime.date())
+                    "business_hours": self.config.get_business_hours_for_day(
+                        requested_datetime.strftime("%A")
+                    )
                 }
             
-            # Check for conflicts
-            conflicts = await self._check_appointment_conflicts(
-                requested_datetime, 
-                appointment_end,
-                service.practitioner_required
+            # Check for conflicts against the slot index
+            await self._ensure_slot_index(end)
+            resource = self.slot_index.free_resource(
+                service_id, start, end, practitioner_id
             )
-            
-            if conflicts:
-                return False, {
-                    "error": "Time slot conflicts with existing appointment",
-                    "conflicts": conflicts
-                }
-            
-            # Check practitioner availability if required
-            if service.practitioner_required:
-                practitioner_available = await self._check_practitioner_availability(
-                    service_id, requested_datetime, duration
-                )
-                if not practitioner_available:
+            if resource is None:
+                if service.practitioner_required and self.slot_index.practitioners:
                     return False, {
                         "error": "No practitioner available",
                         "service_requires_practitioner": True
                     }
+                return False, {"error": "Time slot conflicts with existing appointment"}
             
             return True, {
                 "available": True,
@@ -258,11 +285,27 @@ class AppointmentScheduler:
                 return []
             
             available_slots = []
+            now = datetime.now()
+            await self._ensure_slot_index(
+                datetime.combine(date + timedelta(days=days_ahead), time.min)
+            )
             
             for day_offset in range(days_ahead):
                 check_date = date + timedelta(days=day_offset)
-                day_slots = await self._get_available_slots_for_date(service, check_date)
-                available_slots.extend(day_slots)
+                day_slots = self.slot_index.free_slots(
+                    service_id,
+                    check_date,
+                    service.duration_minutes,
+                    buffer_minutes=service.preparation_time,
+                    not_before=now,
+                )
+                for start, resource in day_slots:
+                    available_slots.append({
+                        "service_id": service_id,
+                        "start": start.isoformat(),
+                        "end": (start + timedelta(minutes=service.duration_minutes)).isoformat(),
+                        "practitioner_id": None if resource == DEFAULT_RESOURCE else resource
+                    })
             
             logger.info(f"Found {len(available_slots)} available slots for service {service_id}")
             return available_slots
@@ -294,16 +337,26 @@ class AppointmentScheduler:
             if appointment.status in [AppointmentStatus.COMPLETED, AppointmentStatus.CANCELLED]:
                 return {"success": False, "error": "Cannot reschedule completed or cancelled appointment"}
             
-            # Check availability for new time
-            is_available, availability_info = await self.check_availability(
-                appointment.service_id, new_datetime, appointment.duration_minutes
+            # Hold the new time; the appointment's own slot does not conflict
+            service = self.services.get(appointment.service_id)
+            if not service:
+                return {"success": False, "error": "Service not found"}
+            start, end = self._appointment_span(
+                service, new_datetime, appointment.duration_minutes
+            )
+            await self._ensure_slot_index(end)
+            reservation = self.slot_index.reserve(
+                service.id,
+                start,
+                end,
+                appointment.practitioner_id or None,
+                ignore_appointment=appointment_id,
             )
             
-            if not is_available:
+            if reservation is None:
                 return {
                     "success": False,
-                    "error": "New time slot not available",
-                    "availability_info": availability_info
+                    "error": "New time slot not available"
                 }
             
             # Update appointment
@@ -313,7 +366,12 @@ class AppointmentScheduler:
             appointment.updated_at = datetime.now()
             
             # Update in Notion
-            await self._update_appointment_in_notion(appointment)
+            try:
+                await self._update_appointment_in_notion(appointment)
+            except Exception:
+                self.slot_index.release(reservation)
+                raise
+            self.slot_index.confirm(reservation, appointment_id)
             
             # Send reschedule notification
             await self._send_reschedule_notification(appointment, old_datetime)
@@ -357,6 +415,7 @@ class AppointmentScheduler:
             
             # Update in Notion
             await self._update_appointment_in_notion(appointment)
+            self.slot_index.remove(appointment_id)
             
             # Send cancellation notification
             await self._send_cancellation_notification(appointment, reason)
@@ -469,6 +528,122 @@ class AppointmentScheduler:
             logger.error(f"Failed to get daily schedule: {str(e)}")
             return []
 
+    async def load_slot_index(self, until: Optional[datetime] = None) -> int:
+        """
+        Load upcoming appointments into the slot index with one Notion query.
+        
+        Args:
+            until: Load appointments before this time as well, when it lies
+                beyond the usual slot_index_days horizon
+        
+        Returns:
+            Number of appointments indexed
+        
+        Raises:
+            Exception: If Notion cannot be queried; the index is then marked
+                as not loaded, so availability checks fail instead of
+                reporting every slot free
+        """
+        try:
+            today = datetime.combine(datetime.now().date(), time.min)
+            horizon = today + timedelta(days=self.slot_index_days)
+            if until is not None and until > horizon:
+                horizon = datetime.combine(until.date() + timedelta(days=1), time.min)
+            filter_condition = {
+                "and": [
+                    {"property": "Appointment Date", "date": {"on_or_after": today.isoformat()}},
+                    {"property": "Appointment Date", "date": {"before": horizon.isoformat()}}
+                ]
+            }
+            
+            results = await self.notion_helper.query_database(
+                database_id=self.appointments_db_id,
+                filter_condition=filter_condition
+            )
+            
+            intervals = []
+            for page in results:
+                appointment = await self._notion_page_to_appointment(page)
+                interval = self._appointment_interval(appointment) if appointment else None
+                if interval:
+                    intervals.append(interval)
+            
+            count = self.slot_index.load(intervals)
+            self.slot_index_until = horizon
+            logger.info(f"Loaded {count} appointments into the slot index")
+            return count
+            
+        except Exception as e:
+            self.slot_index_until = None
+            logger.error(f"Failed to load slot index: {str(e)}")
+            raise
+    
+    async def handle_appointment_webhook(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Invalidate the slot index after an appointment changed outside the scheduler.
+        
+        Args:
+            payload: Webhook payload; an "appointment_id" refreshes that
+                appointment only, anything else reloads the whole index
+            
+        Returns:
+            Dict describing the index update
+        """
+        appointment_id = payload.get("appointment_id")
+        if not appointment_id:
+            return {"success": True, "reloaded": await self.load_slot_index()}
+        
+        appointment = await self.get_appointment_by_id(appointment_id)
+        interval = self._appointment_interval(appointment) if appointment else None
+        if interval:
+            self.slot_index.add(*interval)
+        else:
+            self.slot_index.remove(appointment_id)
+        
+        return {
+            "success": True,
+            "appointment_id": appointment_id,
+            "indexed": interval is not None
+        }
+    
+    async def _ensure_slot_index(self, until: datetime) -> None:
+        """
+        Reload the slot index when its horizon no longer covers a query.
+        
+        The index is reloaded once a day, so the horizon rolls forward with
+        the calendar, and whenever a query reaches past the loaded horizon.
+        
+        Args:
+            until: End of the interval about to be queried
+        """
+        loaded_at = self.slot_index.loaded_at
+        if (
+            self.slot_index_until is None
+            or loaded_at is None
+            or loaded_at.date() < datetime.now().date()
+            or until > self.slot_index_until
+        ):
+            await self.load_slot_index(until)
+    
+    def _appointment_span(
+        self, service: WellnessService, start: datetime, duration_minutes: Optional[int] = None
+    ) -> Tuple[datetime, datetime]:
+        """Get the time an appointment blocks, including preparation time."""
+        duration = duration_minutes or service.duration_minutes
+        return start, start + timedelta(minutes=duration + service.preparation_time)
+    
+    def _appointment_interval(
+        self, appointment: Appointment
+    ) -> Optional[Tuple[str, Optional[str], datetime, datetime]]:
+        """Get the slot index entry of an appointment, or None if it blocks no time."""
+        if appointment.status in (AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW):
+            return None
+        service = self.services.get(appointment.service_id)
+        buffer = service.preparation_time if service else 0
+        start = appointment.appointment_date
+        end = start + timedelta(minutes=appointment.duration_minutes + buffer)
+        return appointment.id, appointment.practitioner_id or None, start, end
+    
     async def _load_services(self):
         """Load wellness services from configuration or database"""
         try:
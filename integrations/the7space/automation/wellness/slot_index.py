@@ -0,0 +1,440 @@
+"""
+The 7 Space Slot Index
+
+In-memory availability index for the appointment scheduler. Each resource
+(a configured practitioner, or the shared studio for every other booking)
+keeps one bitset per day of 5-minute quanta marking busy time. Free slots are
+computed with bitwise set operations against the business-hours mask, so a
+week of availability needs no Notion lookups.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+QUANTUM_MINUTES = 5
+QUANTA_PER_DAY = 24 * 60 // QUANTUM_MINUTES
+DEFAULT_RESOURCE = "studio"
+
+WEEKDAYS = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+
+
+def _naive(value: datetime) -> datetime:
+    """Convert aware datetimes to naive local time, as used by the scheduler."""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _quantum(value: datetime) -> int:
+    return (value.hour * 60 + value.minute) // QUANTUM_MINUTES
+
+
+def _bits(start: int, end: int) -> int:
+    """Bitmask with quanta [start, end) set."""
+    return ((1 << (end - start)) - 1) << start if end > start else 0
+
+
+def _split_by_day(start: datetime, end: datetime) -> Iterable[Tuple[date, int]]:
+    """Yield (day, mask) pairs covering [start, end), rounded out to whole quanta."""
+    start = _naive(start)
+    end = _naive(end)
+    day = start.date()
+    while datetime.combine(day, time.min) < end:
+        day_start = datetime.combine(day, time.min)
+        first = _quantum(start) if start > day_start else 0
+        if end >= day_start + timedelta(days=1):
+            last = QUANTA_PER_DAY
+        else:
+            minutes = (
+                end.hour * 60 + end.minute + (1 if end.second or end.microsecond else 0)
+            )
+            last = -(-minutes // QUANTUM_MINUTES)
+        yield day, _bits(first, last)
+        day += timedelta(days=1)
+
+
+@dataclass
+class Reservation:
+    """Tentative hold on a slot, confirmed once the booking is persisted."""
+
+    token: str
+    resource: str
+    start: datetime
+    end: datetime
+    appointment_id: Optional[str] = None
+
+
+class SlotIndex:
+    """
+    Per-resource bitsets of busy 5-minute quanta.
+
+    Bookings are reserved optimistically: reserve() checks and marks the
+    interval in one step without awaiting, so two concurrent bookings for the
+    same slot cannot both succeed. The hold is then confirmed or released
+    once the Notion write finishes.
+    """
+
+    def __init__(
+        self,
+        business_hours: Dict[str, Dict[str, str]],
+        practitioners: Optional[Dict[str, Set[str]]] = None,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            business_hours: Weekday name to {"open": "HH:MM", "close": "HH:MM"}
+                or {"closed": True}
+            practitioners: Practitioner id to the service ids they offer; when
+                omitted, every booking shares a single studio resource
+        """
+        self.practitioners = practitioners or {}
+        self._open_masks = [
+            self._open_mask(business_hours.get(day, {})) for day in WEEKDAYS
+        ]
+        # Appointments and in-flight reservations, keyed by appointment id or
+        # reservation token
+        self._entries: Dict[str, Tuple[str, datetime, datetime]] = {}
+        self._day_entries: Dict[Tuple[str, date], Set[str]] = {}
+        self._busy: Dict[Tuple[str, date], int] = {}
+        self._reservations: Dict[str, Reservation] = {}
+        self.loaded_at: Optional[datetime] = None
+
+    @staticmethod
+    def _open_mask(hours: Dict[str, str]) -> int:
+        if hours.get("closed") or "open" not in hours:
+            return 0
+        try:
+            open_time = datetime.strptime(hours["open"], "%H:%M")
+            close_time = datetime.strptime(hours["close"], "%H:%M")
+        except (KeyError, ValueError):
+            logger.warning(f"Ignoring invalid business hours {hours}")
+            return 0
+        return _bits(_quantum(open_time), _quantum(close_time))
+
+    def open_mask(self, day: date) -> int:
+        """Bitmask of the quanta within business hours on a day."""
+        return self._open_masks[day.weekday()]
+
+    def resource_for(self, practitioner_id: Optional[str]) -> str:
+        """
+        Map an appointment's practitioner to the resource it occupies.
+
+        Practitioners that are not configured share the studio, so bookings
+        made with and without a practitioner are checked against each other.
+
+        Args:
+            practitioner_id: Practitioner id, or None
+
+        Returns:
+            The practitioner id if configured, otherwise the studio
+        """
+        if practitioner_id and practitioner_id in self.practitioners:
+            return practitioner_id
+        return DEFAULT_RESOURCE
+
+    def resources_for(
+        self, service_id: str, practitioner_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        List the resources that can take a booking for a service.
+
+        Args:
+            service_id: Service identifier
+            practitioner_id: Optional requested practitioner
+
+        Returns:
+            Candidate resource ids in preference order
+        """
+        if practitioner_id or not self.practitioners:
+            return [self.resource_for(practitioner_id)]
+        return [
+            practitioner
+            for practitioner, services in self.practitioners.items()
+            if not services or service_id in services
+        ]
+
+    # Index maintenance
+
+    def _entry_mask(self, key: str, day: date) -> int:
+        _, start, end = self._entries[key]
+        return sum(
+            mask for entry_day, mask in _split_by_day(start, end) if entry_day == day
+        )
+
+    def _busy_mask(
+        self, resource: str, day: date, exclude: Optional[str] = None
+    ) -> int:
+        if exclude is None or exclude not in self._day_entries.get((resource, day), ()):
+            return self._busy.get((resource, day), 0)
+        busy = 0
+        for key in self._day_entries[(resource, day)]:
+            if key != exclude:
+                busy |= self._entry_mask(key, day)
+        return busy
+
+    def _add_entry(
+        self, key: str, resource: str, start: datetime, end: datetime
+    ) -> None:
+        self._remove_entry(key)
+        self._entries[key] = (resource, start, end)
+        for day, mask in _split_by_day(start, end):
+            self._day_entries.setdefault((resource, day), set()).add(key)
+            self._busy[(resource, day)] = self._busy.get((resource, day), 0) | mask
+
+    def _remove_entry(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        resource, start, end = entry
+        for day, _ in _split_by_day(start, end):
+            slot = (resource, day)
+            self._busy[slot] = self._busy_mask(resource, day, exclude=key)
+            self._day_entries[slot].discard(key)
+            if not self._day_entries[slot]:
+                del self._day_entries[slot]
+                del self._busy[slot]
+        del self._entries[key]
+        return True
+
+    def add(
+        self,
+        appointment_id: str,
+        resource: Optional[str],
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        """
+        Index an appointment, replacing its previous interval if any.
+
+        Args:
+            appointment_id: Appointment identifier
+            resource: Practitioner id; None or an unconfigured practitioner
+                books the shared studio
+            start: Appointment start
+            end: Appointment end, including preparation time
+        """
+        self._add_entry(appointment_id, self.resource_for(resource), start, end)
+
+    def remove(self, appointment_id: str) -> bool:
+        """
+        Remove an appointment from the index.
+
+        Args:
+            appointment_id: Appointment identifier
+
+        Returns:
+            True if the appointment was indexed
+        """
+        return self._remove_entry(appointment_id)
+
+    def load(
+        self, intervals: Iterable[Tuple[str, Optional[str], datetime, datetime]]
+    ) -> int:
+        """
+        Replace the indexed appointments with a full set.
+
+        Reservations still in flight are kept.
+
+        Args:
+            intervals: (appointment_id, resource, start, end) tuples
+
+        Returns:
+            Number of appointments indexed
+        """
+        for key in [key for key in self._entries if key not in self._reservations]:
+            self._remove_entry(key)
+        for appointment_id, resource, start, end in intervals:
+            self.add(appointment_id, resource, start, end)
+        self.loaded_at = datetime.now()
+        return len(self._entries) - len(self._reservations)
+
+    # Queries
+
+    def is_within_business_hours(self, start: datetime, end: datetime) -> bool:
+        """Check that [start, end) lies within business hours."""
+        return all(
+            mask & ~self.open_mask(day) == 0 for day, mask in _split_by_day(start, end)
+        )
+
+    def free_resource(
+        self,
+        service_id: str,
+        start: datetime,
+        end: datetime,
+        practitioner_id: Optional[str] = None,
+        exclude: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Find a resource free for the whole interval.
+
+        Args:
+            service_id: Service identifier
+            start: Interval start
+            end: Interval end
+            practitioner_id: Optional requested practitioner
+            exclude: Appointment whose own interval does not count as busy
+
+        Returns:
+            The first free resource, or None
+        """
+        for resource in self.resources_for(service_id, practitioner_id):
+            if not any(
+                self._busy_mask(resource, day, exclude) & mask
+                for day, mask in _split_by_day(start, end)
+            ):
+                return resource
+        return None
+
+    def free_slots(
+        self,
+        service_id: str,
+        day: date,
+        duration_minutes: int,
+        buffer_minutes: int = 0,
+        step_minutes: int = 15,
+        practitioner_id: Optional[str] = None,
+        not_before: Optional[datetime] = None,
+    ) -> List[Tuple[datetime, str]]:
+        """
+        Compute the bookable start times on a day.
+
+        A start is bookable when the appointment plus its buffer fits inside
+        business hours on a resource with no busy quanta in that span.
+
+        Args:
+            service_id: Service identifier
+            day: Day to search
+            duration_minutes: Appointment length
+            buffer_minutes: Preparation time kept free after the appointment
+            step_minutes: Spacing of offered start times
+            practitioner_id: Optional requested practitioner
+            not_before: Earliest offered start, e.g. the current time
+
+        Returns:
+            (start, resource) pairs in time order
+        """
+        open_mask = self.open_mask(day)
+        if not open_mask:
+            return []
+
+        span = -(-(duration_minutes + buffer_minutes) // QUANTUM_MINUTES)
+        step = max(1, step_minutes // QUANTUM_MINUTES)
+        first = 0
+        if not_before is not None:
+            not_before = _naive(not_before)
+            if not_before.date() > day:
+                return []
+            if not_before.date() == day:
+                first = -(
+                    -(not_before.hour * 60 + not_before.minute) // QUANTUM_MINUTES
+                )
+
+        starts: Dict[int, str] = {}
+        for resource in self.resources_for(service_id, practitioner_id):
+            free = open_mask & ~self._busy.get((resource, day), 0)
+            # Bit i of fits is set when quanta i .. i + span - 1 are all free
+            fits = free
+            for offset in range(1, span):
+                fits &= free >> offset
+            position = first + (-first % step)
+            fits >>= position
+            while fits:
+                if fits & 1 and position not in starts:
+                    starts[position] = resource
+                fits >>= step
+                position += step
+
+        day_start = datetime.combine(day, time.min)
+        return [
+            (
+                day_start + timedelta(minutes=position * QUANTUM_MINUTES),
+                starts[position],
+            )
+            for position in sorted(starts)
+        ]
+
+    # Optimistic reservations
+
+    def reserve(
+        self,
+        service_id: str,
+        start: datetime,
+        end: datetime,
+        practitioner_id: Optional[str] = None,
+        ignore_appointment: Optional[str] = None,
+    ) -> Optional[Reservation]:
+        """
+        Hold a slot if it is still free.
+
+        Args:
+            service_id: Service identifier
+            start: Appointment start
+            end: Appointment end, including preparation time
+            practitioner_id: Optional requested practitioner
+            ignore_appointment: Appointment whose own interval does not count
+                as a conflict, used when rescheduling
+
+        Returns:
+            The reservation, or None if the slot was taken
+        """
+        if not self.is_within_business_hours(start, end):
+            return None
+
+        resource = self.free_resource(
+            service_id, start, end, practitioner_id, exclude=ignore_appointment
+        )
+        if resource is None:
+            return None
+
+        reservation = Reservation(
+            token=uuid4().hex, resource=resource, start=start, end=end
+        )
+        self._reservations[reservation.token] = reservation
+        self._add_entry(reservation.token, resource, start, end)
+        return reservation
+
+    def confirm(self, reservation: Reservation, appointment_id: str) -> None:
+        """
+        Turn a reservation into an indexed appointment.
+
+        Args:
+            reservation: Reservation returned by reserve()
+            appointment_id: Identifier of the persisted appointment
+        """
+        self.release(reservation)
+        reservation.appointment_id = appointment_id
+        self.add(
+            appointment_id, reservation.resource, reservation.start, reservation.end
+        )
+
+    def release(self, reservation: Reservation) -> None:
+        """
+        Drop a reservation, e.g. because its booking failed.
+
+        Args:
+            reservation: Reservation returned by reserve()
+        """
+        if self._reservations.pop(reservation.token, None) is not None:
+            self._remove_entry(reservation.token)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get index size metrics."""
+        return {
+            "appointments": len(self._entries) - len(self._reservations),
+            "reservations": len(self._reservations),
+            "resources": len({resource for resource, _ in self._busy}),
+        }
@@ -5,6 +5,7 @@ This module provides vector database capabilities for semantic search
 and embedding storage integration with Supabase.
 """
 
+from .ingestion_pipeline import IngestionDocument, IngestionPipeline
 from .models import (
     ChunkRecord,
     EmbeddingMeta,
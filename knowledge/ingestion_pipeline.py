@@ -0,0 +1,309 @@
+"""
+Streaming ingestion pipeline for the Knowledge Hub.
+
+Documents (for example crawled pages) are submitted as they arrive and flow
+through three stages connected by bounded queues:
+
+1. A pool of chunk workers hashes each document, skips it if the same source
+   was already stored with the same content, and splits it into chunks
+2. A batcher collects chunks across documents into embedding batches
+3. Each batch is embedded with one provider call and written with bulk inserts
+
+Bounded queues give backpressure: when embedding or storage falls behind,
+`submit` waits instead of buffering the whole crawl in memory.
+
+Usage example:
+    async with IngestionPipeline(source_prefix="web:https://example.com") as pipeline:
+        for page in pages:
+            await pipeline.submit(
+                IngestionDocument(source=f"web:{page.url}", text=page.text, metadata=meta)
+            )
+    stats = pipeline.stats
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel
+
+from .models import EmbeddingMeta
+from .providers import provider_registry
+from .semantic_search import SemanticSearch
+from .vector_store import VectorStore, get_vector_store
+
+
+class IngestionDocument(BaseModel):
+    """A document to embed and store."""
+
+    source: str
+    text: str
+    metadata: EmbeddingMeta
+    content_type: str = "web_page"
+
+
+class _ChunkedDocument(BaseModel):
+    document: IngestionDocument
+    chunks: List[str]
+    stale_id: Optional[UUID] = None
+
+
+class IngestionPipeline:
+    """
+    Chunk, embed and store documents concurrently with bounded memory.
+
+    Documents no longer than `chunk_size` are embedded whole. Longer ones are
+    embedded chunk by chunk, and their document-level vector is the normalized
+    mean of the chunk vectors, so no text is embedded twice and no request
+    exceeds the provider's input limit.
+    """
+
+    def __init__(
+        self,
+        vector_store: Optional[VectorStore] = None,
+        source_prefix: Optional[str] = None,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        chunk_workers: int = 4,
+        queue_size: int = 50,
+        embed_batch_size: int = 96,
+        max_pending_batches: int = 2,
+        flush_interval: float = 2.0,
+        chunker: Optional[Callable[[str], List[str]]] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            vector_store: VectorStore to write to (default: the shared store)
+            source_prefix: If set, content hashes already stored under this
+                source prefix are loaded on start, and documents whose content
+                is unchanged are skipped
+            chunk_size: Maximum size of each chunk in characters
+            chunk_overlap: Overlap between chunks in characters
+            chunk_workers: Number of concurrent chunk workers
+            queue_size: Capacity of each queue between stages
+            embed_batch_size: Texts per embedding request
+            max_pending_batches: Batches that may be embedding or writing at once
+            flush_interval: Seconds to wait for more chunks before sending a
+                partial batch
+            chunker: Function splitting text into chunks (default: the
+                SemanticSearch chunker)
+        """
+        self.vector_store = vector_store
+        self.source_prefix = source_prefix
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.chunk_workers = chunk_workers
+        self.embed_batch_size = embed_batch_size
+        self.flush_interval = flush_interval
+        self.chunker = chunker or self._default_chunker
+
+        self._documents: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._chunked: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._batch_slots = asyncio.Semaphore(max_pending_batches)
+        self._workers: List[asyncio.Task] = []
+        self._batcher: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+        self._known_hashes: Dict[str, Tuple[UUID, str]] = {}
+        self._seen_hashes: Set[str] = set()
+        self.embedding_ids: List[UUID] = []
+        self.stats = {
+            "submitted": 0,
+            "unchanged": 0,
+            "duplicate": 0,
+            "stored": 0,
+            "chunks": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    def _default_chunker(self, text: str) -> List[str]:
+        return SemanticSearch()._chunk_text(text, self.chunk_size, self.chunk_overlap)
+
+    async def start(self) -> None:
+        """Load stored content hashes and start the workers."""
+        if self.vector_store is None:
+            self.vector_store = await get_vector_store()
+
+        if self.source_prefix:
+            self._known_hashes = await self.vector_store.get_source_hashes(
+                self.source_prefix
+            )
+            logger.debug(
+                f"Loaded {len(self._known_hashes)} content hashes "
+                f"for {self.source_prefix}"
+            )
+
+        self._workers = [
+            asyncio.create_task(self._chunk_worker()) for _ in range(self.chunk_workers)
+        ]
+        self._batcher = asyncio.create_task(self._batch_worker())
+
+    async def submit(self, document: IngestionDocument) -> None:
+        """
+        Queue a document, waiting if the pipeline is full.
+
+        Args:
+            document: Document to ingest
+        """
+        self.stats["submitted"] += 1
+        await self._documents.put(document)
+
+    async def finish(self) -> Dict[str, Any]:
+        """
+        Process everything submitted so far and stop the workers.
+
+        Returns:
+            Pipeline statistics
+        """
+        for _ in self._workers:
+            await self._documents.put(None)
+        await asyncio.gather(*self._workers)
+
+        await self._chunked.put(None)
+        await self._batcher
+        if self._batches:
+            await asyncio.gather(*self._batches)
+
+        logger.info(f"Ingestion finished: {self.stats}")
+        return dict(self.stats)
+
+    async def close(self) -> None:
+        """Stop the workers without processing queued documents."""
+        tasks = [*self._workers, *self._batches]
+        if self._batcher:
+            tasks.append(self._batcher)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> "IngestionPipeline":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            await self.finish()
+        else:
+            await self.close()
+
+    async def _chunk_worker(self) -> None:
+        while True:
+            document = await self._documents.get()
+            if document is None:
+                return
+
+            content_hash = self.vector_store._compute_content_hash(document.text)
+            known = self._known_hashes.get(document.source)
+            if known and known[1] == content_hash:
+                self.stats["unchanged"] += 1
+                continue
+            if content_hash in self._seen_hashes:
+                # Same content under another URL (e.g. with a tracking parameter)
+                self.stats["duplicate"] += 1
+                continue
+            self._seen_hashes.add(content_hash)
+
+            try:
+                chunks = []
+                if len(document.text) > self.chunk_size:
+                    chunks = await asyncio.to_thread(self.chunker, document.text)
+            except Exception as e:
+                logger.error(f"Error chunking {document.source}: {e}")
+                self.stats["failed"] += 1
+                continue
+
+            await self._chunked.put(
+                _ChunkedDocument(
+                    document=document,
+                    chunks=chunks,
+                    stale_id=known[0] if known else None,
+                )
+            )
+
+    async def _batch_worker(self) -> None:
+        batch: List[_ChunkedDocument] = []
+        texts = 0
+        done = False
+        while not done:
+            idle = False
+            try:
+                item = await asyncio.wait_for(
+                    self._chunked.get(), timeout=self.flush_interval
+                )
+                if item is None:
+                    done = True
+                else:
+                    batch.append(item)
+                    texts += len(item.chunks) or 1
+            except asyncio.TimeoutError:
+                idle = True
+
+            if batch and (done or idle or texts >= self.embed_batch_size):
+                await self._batch_slots.acquire()
+                task = asyncio.create_task(self._store_batch(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+                batch, texts = [], 0
+
+    async def _store_batch(self, batch: List[_ChunkedDocument]) -> None:
+        try:
+            texts = []
+            for item in batch:
+                texts.extend(item.chunks or [item.document.text])
+
+            result = await provider_registry.get_embeddings(texts)
+            if not result["success"]:
+                raise RuntimeError("embedding provider failed")
+
+            vectors = iter(result["embeddings"])
+            documents = []
+            for item in batch:
+                if item.chunks:
+                    chunk_embeddings = [next(vectors) for _ in item.chunks]
+                    embedding = self._mean_embedding(chunk_embeddings)
+                else:
+                    chunk_embeddings = []
+                    embedding = next(vectors)
+                documents.append(
+                    {
+                        "content": item.document.text,
+                        "embedding": embedding,
+                        "content_type": item.document.content_type,
+                        "metadata": item.document.metadata,
+                        "chunks": item.chunks,
+                        "chunk_embeddings": chunk_embeddings,
+                    }
+                )
+
+            embedding_ids = await self.vector_store.store_documents_bulk(
+                documents, provider_name=result["provider"]
+            )
+            if not embedding_ids:
+                raise RuntimeError("bulk insert failed")
+
+            # Replace changed documents only once their new version is stored
+            await self.vector_store.delete_embeddings(
+                [item.stale_id for item in batch if item.stale_id]
+            )
+
+            self.embedding_ids.extend(embedding_ids)
+            self.stats["stored"] += len(batch)
+            self.stats["chunks"] += sum(len(item.chunks) for item in batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            logger.error(f"Error storing batch of {len(batch)} documents: {e}")
+            self.stats["failed"] += len(batch)
+        finally:
+            self._batch_slots.release()
+
+    @staticmethod
+    def _mean_embedding(embeddings: List[List[float]]) -> List[float]:
+        mean = np.mean(np.array(embeddings), axis=0)
+        norm = np.linalg.norm(mean)
+        if norm > 0:
+            mean = mean / norm
+        return mean.tolist()
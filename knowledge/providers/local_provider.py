@@ -2,7 +2,10 @@
 Local embedding provider implementation using sentence-transformers.
 
 This module provides a fallback embedding provider that uses locally running
-sentence-transformers models instead of an external API.
+sentence-transformers models instead of an external API. When the host runs
+the model server sidecar (MODEL_SERVER_SOCKET), embeddings come from its warm,
+shared copy of the model; otherwise the model is loaded in this process, and
+released again once the server answers.
 """
 
 import asyncio
@@ -13,6 +16,8 @@ from typing import Any, Dict, List, Optional
 import numpy as np
 from loguru import logger
 
+from services.model_server import ModelServerError, get_model_server_client
+
 from .base_provider import BaseEmbeddingProvider
 
 
@@ -46,7 +51,13 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
         if self.model_name in self.model_dimensions:
             self._embedding_dimensions = self.model_dimensions[self.model_name]
 
-        # Load model lazily on first use
+        # Prefer the host's model server; without one, or if it does not
+        # answer and MODEL_SERVER_FALLBACK allows it, load the model lazily
+        # on first use
+        self.model_server = get_model_server_client()
+        self.model_server_fallback = (
+            os.environ.get("MODEL_SERVER_FALLBACK", "true").lower() == "true"
+        )
 
     @property
     def provider_name(self) -> str:
@@ -93,6 +104,19 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
                 logger.error(f"Error loading model: {e}")
                 raise
 
+    def _unload_model(self):
+        """Drop the in-process fallback copy once the model server answers."""
+        if self.model is None:
+            return
+
+        with self.model_lock:
+            if self.model is not None:
+                logger.info(
+                    f"Model server is serving {self.model_name}; "
+                    "releasing the in-process copy"
+                )
+                self.model = None
+
     async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
         Get embeddings for a list of texts.
@@ -106,15 +130,27 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
         if not texts:
             return []
 
+        if self.model_server is not None:
+            try:
+                embeddings = await self.model_server.embed(texts, self.model_name)
+                self._embedding_dimensions = embeddings.shape[1]
+                self._unload_model()
+                return embeddings.tolist()
+            except ModelServerError as e:
+                if not self.model_server_fallback:
+                    raise
+                logger.warning(f"{e}; loading {self.model_name} in this process")
+
         # Load model if not already loaded
         if self.model is None:
             # Run in a thread to avoid blocking the async event loop
             await asyncio.get_event_loop().run_in_executor(None, self._load_model)
+        model = self.model
 
         try:
             # Run embedding generation in a thread
             embeddings = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: self.model.encode(texts, convert_to_numpy=True)
+                None, lambda: model.encode(texts, convert_to_numpy=True)
             )
 
             # Convert numpy arrays to lists
@@ -131,14 +167,35 @@ class LocalEmbeddingProvider(BaseEmbeddingProvider):
         Returns:
             Health check results
         """
+        if self.model_server is not None:
+            if await self.model_server.serves_embedding_model(self.model_name):
+                self._unload_model()
+                return {
+                    "healthy": True,
+                    "model": self.model_name,
+                    "dimensions": self.embedding_dimensions,
+                    "provider": self.provider_name,
+                    "model_server": self.model_server.socket_path,
+                }
+            if not self.model_server_fallback:
+                return {
+                    "healthy": False,
+                    "error": (
+                        f"Model server at {self.model_server.socket_path} "
+                        f"does not serve {self.model_name}"
+                    ),
+                    "provider": self.provider_name,
+                }
+
         try:
             if self.model is None:
                 # Try to load the model
                 await asyncio.get_event_loop().run_in_executor(None, self._load_model)
+            model = self.model
 
             # Try to generate an embedding for a simple text
             embedding = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: self.model.encode("health check", convert_to_numpy=True)
+                None, lambda: model.encode("health check", convert_to_numpy=True)
             )
 
             return {
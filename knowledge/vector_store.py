@@ -261,6 +261,273 @@ class VectorStore:
             logger.error(f"Error storing chunks: {e}")
             return []
 
+    # One statement per batch, so the embeddings and their chunks are written
+    # in a single transaction. Embeddings are upserted on their unique
+    # (content_hash, embedding_provider) key and RETURNING gives the stored
+    # ID; chunks beyond a document's new chunk count are removed and the
+    # others are upserted on (embedding_id, chunk_index).
+    BULK_UPSERT_SQL = """
+        WITH docs (id, content_type, content_hash, embedding_vector, metadata,
+                   chunk_count) AS (
+            VALUES {docs}
+        ),
+        upserted AS (
+            INSERT INTO embeddings (id, content_type, content_hash,
+                                    embedding_vector, metadata, embedding_provider)
+            SELECT id, content_type, content_hash, embedding_vector, metadata, ${provider}
+            FROM docs
+            ON CONFLICT (content_hash, embedding_provider) DO UPDATE SET
+                content_type = EXCLUDED.content_type,
+                embedding_vector = EXCLUDED.embedding_vector,
+                metadata = EXCLUDED.metadata,
+                updated_at = NOW()
+            RETURNING id, content_hash
+        ),
+        stale_chunks AS (
+            DELETE FROM vector_chunks v
+            USING upserted u, docs d
+            WHERE v.embedding_id = u.id
+              AND d.content_hash = u.content_hash
+              AND v.chunk_index >= d.chunk_count
+        ){chunks}
+        SELECT id::text AS id, content_hash FROM upserted
+    """
+
+    BULK_CHUNKS_SQL = """,
+        chunks (id, content_hash, chunk_index, chunk_text, chunk_embedding,
+                metadata) AS (
+            VALUES {chunks}
+        ),
+        stored_chunks AS (
+            INSERT INTO vector_chunks (id, embedding_id, chunk_index, chunk_text,
+                                       chunk_embedding, metadata)
+            SELECT c.id, u.id, c.chunk_index, c.chunk_text, c.chunk_embedding,
+                   c.metadata
+            FROM chunks c
+            JOIN upserted u ON u.content_hash = c.content_hash
+            ON CONFLICT (embedding_id, chunk_index) DO UPDATE SET
+                chunk_text = EXCLUDED.chunk_text,
+                chunk_embedding = EXCLUDED.chunk_embedding,
+                metadata = EXCLUDED.metadata
+        )"""
+
+    DOC_CASTS = ["::uuid", "::text", "::text", "::vector", "::jsonb", "::int"]
+    CHUNK_CASTS = ["::uuid", "::text", "::int", "::text", "::vector", "::jsonb"]
+
+    async def _upsert_batch(
+        self,
+        doc_rows: List[List[Any]],
+        chunk_rows: List[List[Any]],
+        provider_name: str,
+    ) -> Dict[str, str]:
+        """
+        Upsert a batch of embeddings and their chunks in one statement.
+
+        Args:
+            doc_rows: Embedding rows (id, content_type, content_hash, embedding,
+                metadata, chunk_count)
+            chunk_rows: Chunk rows (id, content_hash, chunk_index, text,
+                embedding, metadata)
+            provider_name: Name of the provider that generated the embeddings
+
+        Returns:
+            Mapping of content hash to the stored embedding ID
+        """
+        params: List[Any] = []
+
+        def values(rows: List[List[Any]], casts: List[str]) -> str:
+            tuples = []
+            for row in rows:
+                placeholders = [
+                    f"${len(params) + i + 1}{cast}" for i, cast in enumerate(casts)
+                ]
+                tuples.append(f"({', '.join(placeholders)})")
+                params.extend(row)
+            return ", ".join(tuples)
+
+        docs = values(doc_rows, self.DOC_CASTS)
+        chunks = (
+            self.BULK_CHUNKS_SQL.format(chunks=values(chunk_rows, self.CHUNK_CASTS))
+            if chunk_rows
+            else ""
+        )
+        params.append(provider_name)
+
+        rows = await self.supabase.execute_sql(
+            self.BULK_UPSERT_SQL.format(docs=docs, chunks=chunks, provider=len(params)),
+            params,
+        )
+        return {row["content_hash"]: row["id"] for row in rows}
+
+    async def store_documents_bulk(
+        self,
+        documents: List[Dict[str, Any]],
+        provider_name: str,
+        params_per_statement: int = 30000,
+    ) -> List[UUID]:
+        """
+        Store many embedded documents and their chunks in a few statements.
+
+        Documents are upserted on (content_hash, embedding_provider), so
+        storing content that is already present updates that record instead
+        of failing. Each statement, covering a batch of documents and all of
+        their chunks, runs in its own transaction.
+
+        Args:
+            documents: Dicts with "content", "embedding", "content_type",
+                "metadata" (EmbeddingMeta) and optional "chunks" and
+                "chunk_embeddings"
+            provider_name: Name of the provider that generated the embeddings
+            params_per_statement: Parameters per statement, kept well under
+                the Postgres limit of 65535
+
+        Returns:
+            UUIDs of the stored embedding records, in document order
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        # Later documents with the same content replace earlier ones, since a
+        # single upsert cannot touch the same row twice
+        by_hash: Dict[str, Tuple[List[Any], List[List[Any]]]] = {}
+        hashes = []
+        for document in documents:
+            content_hash = self._compute_content_hash(document["content"])
+            hashes.append(content_hash)
+            metadata = document["metadata"].dict()
+
+            chunks = list(
+                zip(
+                    document.get("chunks") or [], document.get("chunk_embeddings") or []
+                )
+            )
+            chunk_rows = [
+                [
+                    str(uuid4()),
+                    content_hash,
+                    i,
+                    chunk,
+                    embedding,
+                    json.dumps(
+                        {**metadata, "chunk_index": i, "chunk_count": len(chunks)}
+                    ),
+                ]
+                for i, (chunk, embedding) in enumerate(chunks)
+            ]
+            by_hash[content_hash] = (
+                [
+                    str(uuid4()),
+                    document["content_type"],
+                    content_hash,
+                    document["embedding"],
+                    json.dumps(metadata),
+                    len(chunks),
+                ],
+                chunk_rows,
+            )
+
+        try:
+            stored: Dict[str, str] = {}
+            doc_batch: List[List[Any]] = []
+            chunk_batch: List[List[Any]] = []
+            batch_params = 0
+            for doc_row, chunk_rows in by_hash.values():
+                size = len(doc_row) + sum(len(row) for row in chunk_rows)
+                if doc_batch and batch_params + size > params_per_statement:
+                    stored.update(
+                        await self._upsert_batch(doc_batch, chunk_batch, provider_name)
+                    )
+                    doc_batch, chunk_batch, batch_params = [], [], 0
+                doc_batch.append(doc_row)
+                chunk_batch.extend(chunk_rows)
+                batch_params += size
+            if doc_batch:
+                stored.update(
+                    await self._upsert_batch(doc_batch, chunk_batch, provider_name)
+                )
+
+            missing = set(by_hash) - set(stored)
+            if missing:
+                raise RuntimeError(f"{len(missing)} embeddings were not returned")
+
+            logger.info(
+                f"Bulk stored {len(by_hash)} embeddings "
+                f"and {sum(len(rows) for _, rows in by_hash.values())} chunks"
+            )
+            return [UUID(stored[content_hash]) for content_hash in hashes]
+
+        except Exception as e:
+            logger.error(f"Error bulk storing embeddings: {e}")
+            return []
+
+    async def get_source_hashes(
+        self, source_prefix: str
+    ) -> Dict[str, Tuple[UUID, str]]:
+        """
+        Get the stored content hash of every record under a source prefix.
+
+        A record is under the prefix if its source equals the prefix or
+        continues it after a "/", so "web:https://example.com" does not match
+        "web:https://example.com.evil.org".
+
+        Args:
+            source_prefix: Prefix of metadata "source", e.g. "web:https://example.com"
+
+        Returns:
+            Mapping of source to (embedding ID, content hash)
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        try:
+            rows = await self.supabase.execute_sql(
+                """
+                SELECT id::text, metadata->>'source' AS source, content_hash
+                FROM embeddings
+                WHERE metadata->>'source' = $1 OR metadata->>'source' LIKE $2
+                """,
+                [
+                    source_prefix,
+                    source_prefix.rstrip("/").replace("%", r"\%").replace("_", r"\_")
+                    + "/%",
+                ],
+            )
+            return {
+                row["source"]: (UUID(row["id"]), row["content_hash"]) for row in rows
+            }
+        except Exception as e:
+            logger.error(f"Error getting content hashes for {source_prefix}: {e}")
+            return {}
+
+    async def delete_embeddings(self, embedding_ids: List[UUID]) -> bool:
+        """
+        Delete embeddings and their chunks in one statement.
+
+        Args:
+            embedding_ids: UUIDs of the embeddings to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not embedding_ids:
+            return True
+
+        if not self._initialized:
+            await self.initialize()
+
+        try:
+            # Delete the embeddings (cascades to chunks)
+            await self.supabase.execute_sql(
+                "DELETE FROM embeddings WHERE id = ANY($1::uuid[])",
+                [[str(embedding_id) for embedding_id in embedding_ids]],
+            )
+
+            logger.info(f"Deleted {len(embedding_ids)} embeddings")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting embeddings: {e}")
+            return False
+
     async def get_embedding(self, embedding_id: UUID) -> Optional[VectorRecord]:
         """
         Get an embedding by ID.
@@ -281,6 +281,7 @@ def main():
         log_level=settings.server.log_level.value.lower(),
         workers=settings.server.workers,
         agents=agents_dict,  # Pass agents to the API server
+        message_bus=message_bus,
     )
 
 
@@ -306,6 +307,15 @@ async def async_initialization(message_bus=None):
         logger.error(f"Failed to initialize Redis service: {e}")
         logger.warning("Continuing without Redis - some features may be unavailable")
 
+    # Create the MongoDB indexes declared by the repositories
+    try:
+        from repositories.mongodb_repository_factory import mongo_repository_factory
+
+        await mongo_repository_factory.async_ensure_indexes()
+    except Exception as e:
+        logger.error(f"Failed to ensure MongoDB indexes: {e}")
+        logger.warning("Continuing without index checks - queries may be slower")
+
     # First initialize integrations to ensure Notion connection is established
     try:
         integration_manager = await initialize_integrations()
@@ -347,6 +357,11 @@ async def async_initialization(message_bus=None):
         logger.exception(e)
         # agents will remain None if registration fails
 
+    # This event loop ends with asyncio.run, so write the messages queued
+    # during startup; the bus restarts its Notion sink on the server's loop
+    if message_bus:
+        await message_bus.close()
+
     return agents  # Return the dictionary of initialized agents
 
 
@@ -193,6 +193,103 @@ class OCRResponse(BaseModel):
     )
 
 
+class OCRDocumentRequest(BaseModel):
+    """
+    Request model for multi-page document OCR operations.
+
+    Attributes:
+        document_source: Type of document source (file, URL, base64, bytes)
+        document_data: Document data or reference (PDF, multi-frame TIFF or image)
+        provider: OCR provider to use; None selects one automatically from
+            is_important and document_type (default: None)
+        document_type: Type of document being processed (default: "general")
+        is_important: Whether this is an important document requiring high accuracy
+        languages: List of languages to use for OCR (default: ["eng"])
+        output_format: Format of the OCR output (default: "text")
+        config: Additional provider-specific configuration options
+        preprocessing: Whether to apply preprocessing to each page (default: True)
+        page_segmentation_mode: Tesseract-specific page segmentation mode (default: 3)
+        ocr_engine_mode: Tesseract-specific OCR engine mode (default: 3)
+        dpi: Resolution used when rasterizing PDF pages (default: 300)
+        max_concurrency: Maximum number of pages processed in parallel
+    """
+
+    document_source: OCRImageSource = Field(..., description="Type of document source")
+    document_data: Union[str, bytes] = Field(
+        ..., description="Document data or reference"
+    )
+    provider: Optional[OCRProvider] = Field(
+        default=None, description="OCR provider to use (None for automatic selection)"
+    )
+    document_type: OCRDocumentType = Field(
+        default=OCRDocumentType.GENERAL, description="Type of document being processed"
+    )
+    is_important: bool = Field(
+        default=False,
+        description="Whether this is an important document requiring high accuracy",
+    )
+    languages: List[OCRLanguage] = Field(
+        default_factory=lambda: [OCRLanguage.ENGLISH],
+        description="Languages to use for OCR",
+    )
+    output_format: OCROutputFormat = Field(
+        default=OCROutputFormat.TEXT, description="Format of the OCR output"
+    )
+    config: Optional[Dict[str, Any]] = Field(
+        default=None, description="Additional provider-specific configuration options"
+    )
+    preprocessing: bool = Field(
+        default=True, description="Whether to apply preprocessing to each page"
+    )
+    page_segmentation_mode: int = Field(
+        default=3, description="Tesseract-specific page segmentation mode"
+    )
+    ocr_engine_mode: int = Field(
+        default=3, description="Tesseract-specific OCR engine mode"
+    )
+    dpi: int = Field(
+        default=300, description="Resolution used when rasterizing PDF pages"
+    )
+    max_concurrency: Optional[int] = Field(
+        default=None, description="Maximum number of pages processed in parallel"
+    )
+
+    def to_page_request(self, page_bytes: bytes) -> OCRRequest:
+        """Build the single-image request used to OCR one page."""
+        return OCRRequest(
+            image_source=OCRImageSource.BYTES,
+            image_data=page_bytes,
+            provider=self.provider or OCRProvider.TESSERACT,
+            document_type=self.document_type,
+            is_important=self.is_important,
+            languages=self.languages,
+            output_format=self.output_format,
+            config=self.config,
+            preprocessing=self.preprocessing,
+            page_segmentation_mode=self.page_segmentation_mode,
+            ocr_engine_mode=self.ocr_engine_mode,
+        )
+
+
+class OCRPageResult(BaseModel):
+    """
+    Result for a single page of a multi-page OCR document.
+
+    Attributes:
+        page_number: 1-based page number within the document
+        content_hash: SHA-256 hash of the rasterized page
+        from_cache: Whether the result was served from the page cache
+        response: OCR response for the page
+    """
+
+    page_number: int = Field(..., description="1-based page number")
+    content_hash: str = Field(..., description="SHA-256 hash of the rasterized page")
+    from_cache: bool = Field(
+        default=False, description="Whether the result was served from the page cache"
+    )
+    response: OCRResponse = Field(..., description="OCR response for the page")
+
+
 # Provider-specific models
 
 
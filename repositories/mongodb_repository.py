@@ -6,9 +6,23 @@ the data access layer and providing a clean interface for CRUD operations.
 """
 
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from loguru import logger
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
 
 from models.mongodb_models import (
     AgentCommunicationDocument,
@@ -20,14 +34,25 @@ from models.mongodb_models import (
     WorkflowDocument,
     WorkflowInstanceDocument,
 )
-from services.mongodb_service import mongo_service
+from services.mongodb_service import DEFAULT_BATCH_SIZE, mongo_service
 
 # Type variable for repository generic type
 T = TypeVar("T", bound=MongoBaseModel)
 
 
 class MongoRepository(Generic[T]):
-    """Base repository class for MongoDB collections."""
+    """
+    Base repository class for MongoDB collections.
+
+    Subclasses declare the indexes their queries rely on in ``indexes``;
+    they are created by ensure_indexes() at startup. The unique index on
+    ``id`` is created separately when ``unique_id_index`` is set, so existing
+    duplicate ids only cost that index and not the query indexes.
+    """
+
+    indexes: ClassVar[List[IndexModel]] = []
+    unique_id_index: ClassVar[bool] = True
+    ID_INDEX: ClassVar[IndexModel] = IndexModel([("id", ASCENDING)], unique=True)
 
     def __init__(self, collection_name: str, model_class: Type[T]):
         """Initialize the repository with collection name and model class."""
@@ -82,6 +107,169 @@ class MongoRepository(Generic[T]):
             self.collection_name, filter_dict, self.model_class, limit, skip
         )
 
+    def _to_models(self, documents: List[Dict[str, Any]]) -> List[T]:
+        models = []
+        for document in documents:
+            model = mongo_service.dict_to_model(document, self.model_class)
+            if model:
+                models.append(model)
+        return models
+
+    def find_page(
+        self,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        after: Optional[str] = None,
+        sort_field: str = "_id",
+        descending: bool = False,
+    ) -> Tuple[List[T], Optional[str]]:
+        """
+        Find one page of models using keyset pagination.
+
+        Args:
+            filter_dict: Optional filter
+            limit: Page size
+            after: Page token returned with the previous page
+            sort_field: Indexed field to order and page by
+            descending: Whether to page from the highest value down
+
+        Returns:
+            The page of models and the token for the next page, or None when
+            this is the last page
+        """
+        documents, next_token = mongo_service.find_page(
+            self.collection_name,
+            filter_dict or {},
+            limit,
+            after,
+            sort_field,
+            descending,
+        )
+        return self._to_models(documents), next_token
+
+    async def async_find_page(
+        self,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        after: Optional[str] = None,
+        sort_field: str = "_id",
+        descending: bool = False,
+    ) -> Tuple[List[T], Optional[str]]:
+        """
+        Find one page of models asynchronously using keyset pagination.
+
+        Args:
+            filter_dict: Optional filter
+            limit: Page size
+            after: Page token returned with the previous page
+            sort_field: Indexed field to order and page by
+            descending: Whether to page from the highest value down
+
+        Returns:
+            The page of models and the token for the next page, or None when
+            this is the last page
+        """
+        documents, next_token = await mongo_service.async_find_page(
+            self.collection_name,
+            filter_dict or {},
+            limit,
+            after,
+            sort_field,
+            descending,
+        )
+        return self._to_models(documents), next_token
+
+    async def async_iter(
+        self,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> AsyncIterator[T]:
+        """Stream models matching a filter, fetching batch_size documents at a time."""
+        async for document in mongo_service.async_iter_many(
+            self.collection_name, filter_dict or {}, batch_size=batch_size
+        ):
+            model = mongo_service.dict_to_model(document, self.model_class)
+            if model:
+                yield model
+
+    async def async_find_fields(
+        self,
+        filter_dict: Dict[str, Any],
+        fields: Sequence[str],
+        limit: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find only some fields of the matching documents asynchronously.
+
+        Args:
+            filter_dict: Filter criteria
+            fields: Fields to return
+            limit: Maximum number of documents, 0 for no limit
+
+        Returns:
+            Partial documents without _id
+        """
+        projection = {field: 1 for field in fields}
+        projection["_id"] = 0
+        return await mongo_service.async_find_many(
+            self.collection_name, filter_dict, limit, projection=projection
+        )
+
+    def insert_many(self, models: Sequence[T]) -> List[str]:
+        """Insert new models in one unordered bulk insert."""
+        return mongo_service.insert_many(
+            self.collection_name,
+            [mongo_service.model_to_dict(model) for model in models],
+        )
+
+    async def async_insert_many(self, models: Sequence[T]) -> List[str]:
+        """Insert new models in one unordered bulk insert asynchronously."""
+        return await mongo_service.async_insert_many(
+            self.collection_name,
+            [mongo_service.model_to_dict(model) for model in models],
+        )
+
+    def save_many(self, models: Sequence[T]) -> Dict[str, int]:
+        """Save models, upserting by id in one unordered bulk write."""
+        return mongo_service.save_models(self.collection_name, models)
+
+    async def async_save_many(self, models: Sequence[T]) -> Dict[str, int]:
+        """Save models asynchronously, upserting by id in one unordered bulk write."""
+        return await mongo_service.async_save_models(self.collection_name, models)
+
+    def ensure_indexes(self) -> List[str]:
+        """Create the declared indexes if missing."""
+        created = mongo_service.create_indexes(self.collection_name, self.indexes)
+        if self.unique_id_index:
+            try:
+                created += mongo_service.create_indexes(
+                    self.collection_name, [self.ID_INDEX]
+                )
+            except PyMongoError as e:
+                self._log_id_index_failure(e)
+        return created
+
+    async def async_ensure_indexes(self) -> List[str]:
+        """Create the declared indexes asynchronously if missing."""
+        created = await mongo_service.async_create_indexes(
+            self.collection_name, self.indexes
+        )
+        if self.unique_id_index:
+            try:
+                created += await mongo_service.async_create_indexes(
+                    self.collection_name, [self.ID_INDEX]
+                )
+            except PyMongoError as e:
+                self._log_id_index_failure(e)
+        return created
+
+    def _log_id_index_failure(self, error: Exception) -> None:
+        """Log why the unique id index could not be created."""
+        logger.warning(
+            f"Unique id index not created on {self.collection_name}, "
+            f"likely because of duplicate ids: {error}"
+        )
+
     def delete_by_id(self, model_id: str) -> int:
         """Delete a model by ID."""
         return mongo_service.delete_one(self.collection_name, {"id": model_id})
@@ -96,6 +284,11 @@ class MongoRepository(Generic[T]):
 class AgentRepository(MongoRepository[AgentDocument]):
     """Repository for Agent documents."""
 
+    indexes = [
+        IndexModel([("name", ASCENDING)]),
+        IndexModel([("status", ASCENDING)]),
+    ]
+
     def __init__(self):
         """Initialize the repository with the agents collection."""
         super().__init__("agents", AgentDocument)
@@ -122,6 +315,11 @@ class AgentRepository(MongoRepository[AgentDocument]):
 class WorkflowRepository(MongoRepository[WorkflowDocument]):
     """Repository for Workflow documents."""
 
+    indexes = [
+        IndexModel([("name", ASCENDING)]),
+        IndexModel([("workflow_type", ASCENDING)]),
+    ]
+
     def __init__(self):
         """Initialize the repository with the workflows collection."""
         super().__init__("workflows", WorkflowDocument)
@@ -148,6 +346,11 @@ class WorkflowRepository(MongoRepository[WorkflowDocument]):
 class WorkflowInstanceRepository(MongoRepository[WorkflowInstanceDocument]):
     """Repository for WorkflowInstance documents."""
 
+    indexes = [
+        IndexModel([("workflow_id", ASCENDING)]),
+        IndexModel([("status", ASCENDING)]),
+    ]
+
     def __init__(self):
         """Initialize the repository with the workflow_instances collection."""
         super().__init__("workflow_instances", WorkflowInstanceDocument)
@@ -174,6 +377,12 @@ class WorkflowInstanceRepository(MongoRepository[WorkflowInstanceDocument]):
 class TaskRepository(MongoRepository[TaskDocument]):
     """Repository for Task documents."""
 
+    indexes = [
+        IndexModel([("status", ASCENDING)]),
+        IndexModel([("assigned_to", ASCENDING)]),
+        IndexModel([("workflow_instance_id", ASCENDING)]),
+    ]
+
     def __init__(self):
         """Initialize the repository with the tasks collection."""
         super().__init__("tasks", TaskDocument)
@@ -212,6 +421,11 @@ class TaskRepository(MongoRepository[TaskDocument]):
 class AgentCommunicationRepository(MongoRepository[AgentCommunicationDocument]):
     """Repository for AgentCommunication documents."""
 
+    indexes = [
+        IndexModel([("source_agent_id", ASCENDING)]),
+        IndexModel([("target_agent_id", ASCENDING)]),
+    ]
+
     def __init__(self):
         """Initialize the repository with the agent_communication collection."""
         super().__init__("agent_communication", AgentCommunicationDocument)
@@ -244,6 +458,11 @@ class AgentCommunicationRepository(MongoRepository[AgentCommunicationDocument]):
 class ApiIntegrationRepository(MongoRepository[ApiIntegrationDocument]):
     """Repository for ApiIntegration documents."""
 
+    indexes = [
+        IndexModel([("platform", ASCENDING)]),
+        IndexModel([("status", ASCENDING)]),
+    ]
+
     def __init__(self):
         """Initialize the repository with the api_integrations collection."""
         super().__init__("api_integrations", ApiIntegrationDocument)
@@ -270,18 +489,22 @@ class ApiIntegrationRepository(MongoRepository[ApiIntegrationDocument]):
 class SystemHealthRepository(MongoRepository[SystemHealthDocument]):
     """Repository for SystemHealth documents."""
 
+    indexes = [IndexModel([("timestamp", DESCENDING)])]
+
     def __init__(self):
         """Initialize the repository with the system_health collection."""
         super().__init__("system_health", SystemHealthDocument)
 
     def find_latest(self) -> Optional[SystemHealthDocument]:
         """Find the latest system health record."""
-        records = self.find_by_filter({}, limit=1, skip=0)
+        records, _ = self.find_page(limit=1, sort_field="timestamp", descending=True)
         return records[0] if records else None
 
     async def async_find_latest(self) -> Optional[SystemHealthDocument]:
         """Find the latest system health record asynchronously."""
-        records = await self.async_find_by_filter({}, limit=1, skip=0)
+        records, _ = await self.async_find_page(
+            limit=1, sort_field="timestamp", descending=True
+        )
         return records[0] if records else None
 
     def find_by_time_range(
@@ -5,7 +5,7 @@ This module provides a factory for creating MongoDB repositories,
 making it easy to get the appropriate repository for a given model type.
 """
 
-from typing import Any, Dict, Optional, Type, TypeVar
+from typing import Any, Dict, List, Optional, Type, TypeVar
 
 from loguru import logger
 
@@ -110,6 +110,27 @@ class MongoRepositoryFactory:
         repo_type = self._model_to_repo[model_class]
         return self._repositories[repo_type]
 
+    async def async_ensure_indexes(self) -> Dict[str, List[str]]:
+        """
+        Create the indexes declared by every repository.
+
+        A failure on one collection, e.g. duplicate values blocking a unique
+        index, is logged and does not stop the others.
+
+        Returns:
+            Index names per repository type
+        """
+        created = {}
+        for repo_type, repository in self._repositories.items():
+            try:
+                created[repo_type] = await repository.async_ensure_indexes()
+            except Exception as e:
+                logger.error(
+                    f"Failed to create indexes for {repository.collection_name}: {e}"
+                )
+        logger.info(f"MongoDB indexes ensured for {len(created)} repositories")
+        return created
+
     def get_agent_repository(self) -> AgentRepository:
         """Get the agent repository."""
         return self._repositories["agent"]
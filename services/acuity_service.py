@@ -14,6 +14,7 @@ from loguru import logger
 from pydantic import BaseModel, Field, field_validator
 
 from services.base_service import BaseService, ServiceCredentials
+from services.http_client_registry import get_http_client
 
 
 class AcuityCredentials(ServiceCredentials):
@@ -500,7 +501,9 @@ class AcuityService(BaseService):
             if cancellation_reason:
                 payload["cancelNote"] = cancellation_reason
 
-            response = requests.put(url, headers=headers, json=payload)
+            response = await get_http_client("acuity").put(
+                url, headers=headers, json=payload
+            )
             response.raise_for_status()
 
             logger.info(f"Cancelled Acuity appointment: {appointment_id}")
@@ -552,7 +555,9 @@ class AcuityService(BaseService):
                 "date": date.strftime("%Y-%m-%d"),
             }
 
-            response = requests.get(url, headers=headers, params=params)
+            response = await get_http_client("acuity").get(
+                url, headers=headers, params=params
+            )
             response.raise_for_status()
 
             availability = response.json()
@@ -0,0 +1,314 @@
+"""
+Adaptive Concurrency Limiter for The HigherSelf Network Server.
+
+Limits in-flight calls per upstream (Notion, Supabase, OpenAI, ...) and
+adjusts the limit from observed latency instead of using a fixed semaphore:
+
+- Additive increase while latency stays near the upstream's long-term average
+- Multiplicative decrease when latency climbs or calls time out
+- Excess calls wait in a bounded FIFO queue and are shed when it is full or
+  they have waited too long
+
+Usage example:
+    @adaptive_concurrency("notion")
+    async def query_database(...):
+        ...
+
+    async with get_concurrency_limiter("openai").acquire():
+        response = await client.post(...)
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Tuple, Type
+
+from loguru import logger
+from prometheus_client import Counter, Gauge, Histogram
+
+from utils.error_handling import ServiceException
+
+CONCURRENCY_LIMIT = Gauge(
+    "adaptive_concurrency_limit",
+    "Current in-flight call limit by upstream",
+    ["upstream"],
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "adaptive_concurrency_in_flight",
+    "Calls currently in flight by upstream",
+    ["upstream"],
+)
+CONCURRENCY_QUEUE_TIME = Histogram(
+    "adaptive_concurrency_queue_seconds",
+    "Time calls waited for a concurrency slot by upstream",
+    ["upstream"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+CONCURRENCY_SHED = Counter(
+    "adaptive_concurrency_shed_total",
+    "Calls rejected by the concurrency limiter by upstream and reason",
+    ["upstream", "reason"],
+)
+
+
+class ConcurrencyLimitExceeded(ServiceException):
+    """Exception raised when a call is shed by the concurrency limiter."""
+
+    def __init__(self, upstream: str, reason: str, limit: int):
+        super().__init__(
+            message=f"Concurrency limit for {upstream} exceeded ({reason})",
+            service_name=upstream,
+            details={"reason": reason, "limit": limit},
+        )
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Latency-driven concurrency limit for one upstream.
+
+    Every completed call updates a short-term and a long-term moving average
+    of its latency. While the short-term average stays within `tolerance`
+    times the long-term one, each call that found the limit in use raises
+    the limit by 1/limit, roughly one slot per round of calls. When it rises
+    above, or a call fails with one of `overload_exceptions`, the limit is
+    multiplied by `backoff`, at most once per short-term latency so a burst
+    of slow responses counts as one signal.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff: float = 0.8,
+        tolerance: float = 2.0,
+        max_queue: int = 1000,
+        queue_timeout: float = 30.0,
+        overload_exceptions: Tuple[Type[BaseException], ...] = (
+            asyncio.TimeoutError,
+            ConnectionError,
+        ),
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Upstream name, used in metrics and errors
+            initial_limit: Starting in-flight limit
+            min_limit: Lowest the limit can go
+            max_limit: Highest the limit can go
+            backoff: Factor applied to the limit on overload
+            tolerance: Short/long-term latency ratio treated as overload
+            max_queue: Maximum calls waiting for a slot before shedding
+            queue_timeout: Seconds a call may wait for a slot before shedding
+            overload_exceptions: Exceptions that signal upstream overload;
+                other exceptions leave the limit unchanged
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.overload_exceptions = overload_exceptions
+
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Waiters that are never shed; they do not count towards max_queue
+        self._patient_waiters = 0
+        self._short_rtt = 0.0
+        self._long_rtt = 0.0
+        self._decreased_at = 0.0
+        self._metrics = {"completed": 0, "overloads": 0, "shed": 0}
+
+        CONCURRENCY_LIMIT.labels(upstream=name).set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        """Current in-flight limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently holding a slot."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Calls waiting for a slot."""
+        return len(self._waiters)
+
+    async def _wait_for_slot(self, shed: bool = True) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        if shed and len(self._waiters) - self._patient_waiters >= self.max_queue:
+            self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        if not shed:
+            self._patient_waiters += 1
+        try:
+            if shed:
+                await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            else:
+                await asyncio.shield(waiter)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on
+                self._release()
+            else:
+                waiter.cancel()
+                self._remove_waiter(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self._shed("queue_timeout")
+            raise
+        finally:
+            if not shed:
+                self._patient_waiters -= 1
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _shed(self, reason: str) -> None:
+        self._metrics["shed"] += 1
+        CONCURRENCY_SHED.labels(upstream=self.name, reason=reason).inc()
+        raise ConcurrencyLimitExceeded(self.name, reason, self.limit)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        # Hand freed slots to waiters in arrival order
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _on_sample(self, rtt: float, overloaded: bool, in_flight: int) -> None:
+        """Adjust the limit from one completed call."""
+        self._metrics["completed"] += 1
+        if self._long_rtt == 0:
+            self._short_rtt = self._long_rtt = rtt
+        else:
+            self._short_rtt += 0.2 * (rtt - self._short_rtt)
+            self._long_rtt += 0.01 * (rtt - self._long_rtt)
+
+        now = time.monotonic()
+        overloaded = overloaded or self._short_rtt > self.tolerance * self._long_rtt
+        if overloaded:
+            if now - self._decreased_at >= self._short_rtt:
+                self._metrics["overloads"] += 1
+                self._decreased_at = now
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+        elif in_flight >= self.limit:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+        CONCURRENCY_LIMIT.labels(upstream=self.name).set(self.limit)
+
+    @asynccontextmanager
+    async def acquire(self, shed: bool = True) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot for the duration of the block.
+
+        Args:
+            shed: Whether the call may be shed when the queue is full or the
+                wait exceeds queue_timeout; when False it waits for its turn
+        """
+        queued_at = time.monotonic()
+        await self._wait_for_slot(shed)
+        started_at = time.monotonic()
+        CONCURRENCY_QUEUE_TIME.labels(upstream=self.name).observe(
+            started_at - queued_at
+        )
+        CONCURRENCY_IN_FLIGHT.labels(upstream=self.name).inc()
+        in_flight = self._in_flight
+        overloaded = False
+        sample = True
+        try:
+            yield
+        except self.overload_exceptions:
+            overloaded = True
+            raise
+        except BaseException:
+            # Application errors and cancellations say nothing about load
+            sample = False
+            raise
+        finally:
+            CONCURRENCY_IN_FLIGHT.labels(upstream=self.name).dec()
+            if sample:
+                self._on_sample(time.monotonic() - started_at, overloaded, in_flight)
+            self._release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "short_rtt_ms": round(self._short_rtt * 1000, 2),
+            "long_rtt_ms": round(self._long_rtt * 1000, 2),
+            **self._metrics,
+        }
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_concurrency_limiter(name: str, **kwargs) -> AdaptiveConcurrencyLimiter:
+    """
+    Get the process-wide concurrency limiter for an upstream.
+
+    Args:
+        name: Upstream name
+        **kwargs: AdaptiveConcurrencyLimiter options, used on first creation.
+            ADAPTIVE_CONCURRENCY_<NAME>_MAX overrides max_limit.
+
+    Returns:
+        The upstream's limiter
+    """
+    if name not in _limiters:
+        max_limit = os.environ.get(f"ADAPTIVE_CONCURRENCY_{name.upper()}_MAX")
+        if max_limit:
+            kwargs["max_limit"] = int(max_limit)
+        _limiters[name] = AdaptiveConcurrencyLimiter(name, **kwargs)
+        logger.debug(f"Created adaptive concurrency limiter for {name}")
+    return _limiters[name]
+
+
+def get_all_concurrency_limiters() -> Dict[str, AdaptiveConcurrencyLimiter]:
+    """Get every upstream's concurrency limiter."""
+    return dict(_limiters)
+
+
+def adaptive_concurrency(name: str, **kwargs):
+    """
+    Decorator that runs an async function under an upstream's limiter.
+
+    Args:
+        name: Upstream name
+        **kwargs: AdaptiveConcurrencyLimiter options, used on first creation
+
+    Returns:
+        Callable: Decorated function
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @wraps(func)
+        async def wrapper(*args, **kw):
+            async with get_concurrency_limiter(name, **kwargs).acquire():
+                return await func(*args, **kw)
+
+        return wrapper
+
+    return decorator
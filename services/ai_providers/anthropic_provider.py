@@ -7,9 +7,10 @@ import json
 import os
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 
+from services.http_client_registry import get_http_client
+
 from .base_provider import (
     AICompletionRequest,
     AICompletionResponse,
@@ -112,7 +113,9 @@ class AnthropicProvider(AIProvider):
                 payload["stop_sequences"] = request.stop_sequences
 
             # Make the API request
-            response = requests.post(url, headers=headers, json=payload)
+            response = await get_http_client("anthropic").post(
+                url, headers=headers, json=payload
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -169,7 +172,9 @@ class AnthropicProvider(AIProvider):
                 "temperature": 0,
             }
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = await get_http_client("anthropic").post(
+                url, headers=headers, json=payload
+            )
             response.raise_for_status()
 
             return True
@@ -6,10 +6,11 @@ This service provides methods for interacting with Airtable.
 import os
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 from pydantic import BaseModel
 
+from services.http_client_registry import get_http_client
+
 
 class AirtableConfig(BaseModel):
     """Configuration for Airtable API integration."""
@@ -82,7 +83,9 @@ class AirtableService:
         payload = {"fields": fields}
 
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = await get_http_client("airtable").post(
+                url, headers=self.headers, json=payload
+            )
             response.raise_for_status()
             record_id = response.json().get("id")
             logger.info(f"Created Airtable record in {table_name}: {record_id}")
@@ -111,7 +114,7 @@ class AirtableService:
         url = f"{self.base_url}/{table_name}/{record_id}"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = await get_http_client("airtable").get(url, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             return AirtableRecord(id=data.get("id"), fields=data.get("fields", {}))
@@ -141,7 +144,9 @@ class AirtableService:
         payload = {"fields": fields}
 
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
+            response = await get_http_client("airtable").patch(
+                url, headers=self.headers, json=payload
+            )
             response.raise_for_status()
             logger.info(f"Updated Airtable record in {table_name}: {record_id}")
             return True
@@ -167,7 +172,9 @@ class AirtableService:
         url = f"{self.base_url}/{table_name}/{record_id}"
 
         try:
-            response = requests.delete(url, headers=self.headers)
+            response = await get_http_client("airtable").delete(
+                url, headers=self.headers
+            )
             response.raise_for_status()
             logger.info(f"Deleted Airtable record in {table_name}: {record_id}")
             return True
@@ -203,7 +210,9 @@ class AirtableService:
             params["filterByFormula"] = filter_by_formula
 
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = await get_http_client("airtable").get(
+                url, headers=self.headers, params=params
+            )
             response.raise_for_status()
             records = response.json().get("records", [])
             return [
@@ -8,10 +8,11 @@ import os
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from services.http_client_registry import get_http_client
+
 
 class AmeliaConfig(BaseModel):
     """Configuration for Amelia Booking API integration."""
@@ -125,7 +126,7 @@ class AmeliaServiceClient:
             url = f"{self.api_url}/services"
             headers = self._get_headers()
 
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("amelia").get(url, headers=headers)
             response.raise_for_status()
 
             logger.info("Amelia Booking credentials validated successfully")
@@ -149,7 +150,7 @@ class AmeliaServiceClient:
             url = f"{self.api_url}/services"
             headers = self._get_headers()
 
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("amelia").get(url, headers=headers)
             response.raise_for_status()
 
             services_data = response.json()
@@ -208,7 +209,9 @@ class AmeliaServiceClient:
             if status:
                 params["status"] = status
 
-            response = requests.get(url, headers=headers, params=params)
+            response = await get_http_client("amelia").get(
+                url, headers=headers, params=params
+            )
             response.raise_for_status()
 
             appointments_data = response.json()
@@ -302,7 +305,7 @@ class AmeliaServiceClient:
             url = f"{self.api_url}/appointments/{appointment_id}"
             headers = self._get_headers()
 
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("amelia").get(url, headers=headers)
             response.raise_for_status()
 
             data = response.json()
@@ -427,7 +430,9 @@ class AmeliaServiceClient:
                     "status": appointment.payment_status,
                 }
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = await get_http_client("amelia").post(
+                url, headers=headers, json=payload
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -459,7 +464,9 @@ class AmeliaServiceClient:
             url = f"{self.api_url}/appointments/{appointment_id}"
             headers = self._get_headers()
 
-            response = requests.patch(url, headers=headers, json=update_data)
+            response = await get_http_client("amelia").patch(
+                url, headers=headers, json=update_data
+            )
             response.raise_for_status()
 
             logger.info(f"Updated Amelia appointment: {appointment_id}")
@@ -498,7 +505,7 @@ class AmeliaServiceClient:
             url = f"{self.api_url}/customers/{customer_id}"
             headers = self._get_headers()
 
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("amelia").get(url, headers=headers)
             response.raise_for_status()
 
             data = response.json()
@@ -576,7 +583,9 @@ class AmeliaServiceClient:
                     {"name": "notion_page_id", "value": customer.notion_page_id}
                 ]
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = await get_http_client("amelia").post(
+                url, headers=headers, json=payload
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -608,7 +617,9 @@ class AmeliaServiceClient:
             url = f"{self.api_url}/customers/{customer_id}"
             headers = self._get_headers()
 
-            response = requests.patch(url, headers=headers, json=update_data)
+            response = await get_http_client("amelia").patch(
+                url, headers=headers, json=update_data
+            )
             response.raise_for_status()
 
             logger.info(f"Updated Amelia customer: {customer_id}")
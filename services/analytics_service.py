@@ -12,6 +12,7 @@ from loguru import logger
 from prometheus_client import Counter, Gauge, Histogram
 from pydantic import BaseModel, Field
 
+from services.mongo_write_sink import get_mongo_write_sink
 from services.mongodb_service import mongo_service
 from services.redis_service import redis_service
 
@@ -99,10 +100,8 @@ class AgentAnalytics:
                 "metadata": metadata or {},
             }
 
-            # Record in MongoDB
-            record_id = await mongo_service.async_insert_one(
-                self.agent_collection, document
-            )
+            # Queue for a batched MongoDB write
+            record_id = get_mongo_write_sink().write(self.agent_collection, document)
 
             # Update Redis for real-time monitoring
             key = f"{self.realtime_key_prefix}:agent:{agent_id}"
@@ -160,10 +159,8 @@ class AgentAnalytics:
                 "result_summary": result_summary,
             }
 
-            # Record in MongoDB
-            record_id = await mongo_service.async_insert_one(
-                self.mcp_tool_collection, document
-            )
+            # Queue for a batched MongoDB write
+            record_id = get_mongo_write_sink().write(self.mcp_tool_collection, document)
 
             # Update Redis for real-time monitoring
             key = f"{self.realtime_key_prefix}:mcp_tool:{tool_name}"
@@ -221,10 +218,8 @@ class AgentAnalytics:
                 "duration_ms": duration_ms,
             }
 
-            # Record in MongoDB
-            record_id = await mongo_service.async_insert_one(
-                self.workflow_collection, document
-            )
+            # Queue for a batched MongoDB write
+            record_id = get_mongo_write_sink().write(self.workflow_collection, document)
 
             # Update Redis for real-time monitoring
             key = f"{self.realtime_key_prefix}:workflow:{workflow_id}"
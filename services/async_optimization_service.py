@@ -16,6 +16,12 @@ import weakref
 from loguru import logger
 from pydantic import BaseModel
 
+from services.adaptive_concurrency import (
+    AdaptiveConcurrencyLimiter,
+    adaptive_concurrency,
+    get_all_concurrency_limiters,
+    get_concurrency_limiter,
+)
 from services.performance_monitoring_service import performance_monitor
 
 T = TypeVar('T')
@@ -195,6 +201,7 @@ class AsyncOptimizationService:
     Features:
     - Connection pooling
     - Concurrent request batching
+    - Adaptive per-upstream concurrency limits
     - Async operation monitoring
     - Circuit breaker patterns
     - Rate limiting
@@ -265,17 +272,33 @@ class AsyncOptimizationService:
         """Get a semaphore by name."""
         return self.semaphores.get(name)
     
+    def get_concurrency_limiter(self, upstream: str, **kwargs) -> AdaptiveConcurrencyLimiter:
+        """Get the adaptive concurrency limiter for an upstream."""
+        return get_concurrency_limiter(upstream, **kwargs)
+    
+    def adaptive_concurrency(self, upstream: str, **kwargs):
+        """Decorator limiting calls to an upstream with an adaptive limit."""
+        return adaptive_concurrency(upstream, **kwargs)
+    
     async def batch_execute(
         self,
         operations: List[Callable[[], Awaitable[T]]],
         max_concurrent: int = 10,
-        return_exceptions: bool = True
+        return_exceptions: bool = True,
+        upstream: Optional[str] = None
     ) -> List[Union[T, Exception]]:
-        """Execute multiple async operations with concurrency control."""
+        """
+        Execute multiple async operations with concurrency control.
+        
+        With an upstream, concurrency follows that upstream's adaptive limit
+        (shared with every other caller) instead of max_concurrent. Batch
+        operations wait for a slot rather than being load-shed.
+        """
         semaphore = asyncio.Semaphore(max_concurrent)
+        limiter = get_concurrency_limiter(upstream) if upstream else None
         
         async def execute_with_semaphore(operation: Callable[[], Awaitable[T]]) -> T:
-            async with semaphore:
+            async with (limiter.acquire(shed=False) if limiter else semaphore):
                 self.concurrent_operations += 1
                 self.max_concurrent_operations = max(
                     self.max_concurrent_operations, 
@@ -471,7 +494,11 @@ class AsyncOptimizationService:
             ) * 100,
             "connection_pools": pool_stats,
             "active_semaphores": len(self.semaphores),
-            "active_rate_limiters": len(self.rate_limiters)
+            "active_rate_limiters": len(self.rate_limiters),
+            "concurrency_limiters": {
+                name: limiter.get_stats()
+                for name, limiter in get_all_concurrency_limiters().items()
+            }
         }
     
     async def _cleanup_loop(self):
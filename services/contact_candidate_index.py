@@ -0,0 +1,444 @@
+"""
+Contact Candidate Index for The HigherSelf Network Server.
+
+Finds the existing contacts worth comparing against a new one, so duplicate
+detection scores a handful of candidate pairs instead of every contact in the
+workspace.
+
+Features:
+- Exact blocking keys: normalized email, E.164 phone, sorted name tokens
+- MinHash/LSH buckets over name and message tokens for fuzzy matches
+- Precomputed contact features reused by similarity scoring
+- Incremental add/remove and sync against a fresh contact listing
+"""
+
+import hashlib
+import itertools
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from services.lead_dedup_index import normalize_email
+
+# Mersenne prime 2**31 - 1 keeps a * h + b inside uint64 for 31-bit hashes
+_MINHASH_PRIME = (1 << 31) - 1
+
+# Weights match the original pairwise DuplicateDetectionEngine scoring
+EMAIL_WEIGHT = 0.4
+NAME_WEIGHT = 0.3
+PHONE_WEIGHT = 0.2
+CONTENT_WEIGHT = 0.1
+
+
+def normalize_phone(phone: str, default_country_code: str = "1") -> Optional[str]:
+    """
+    Normalize a phone number to E.164.
+
+    Numbers without a country code are assumed to be in the default country.
+
+    Args:
+        phone: Phone number as entered
+        default_country_code: Country calling code for national numbers
+
+    Returns:
+        The E.164 number, or None if it does not look like a phone number
+    """
+    phone = phone.strip()
+    digits = re.sub(r"\D", "", phone)
+    if phone.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif len(digits) == 10:
+        digits = default_country_code + digits
+    elif len(digits) == 11 and digits.startswith(default_country_code):
+        pass
+    elif len(digits) < 8:
+        return None
+
+    if not 8 <= len(digits) <= 15:
+        return None
+    return f"+{digits}"
+
+
+@lru_cache(maxsize=200_000)
+def _token_hash(token: str) -> int:
+    digest = hashlib.blake2b(token.encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little") & _MINHASH_PRIME
+
+
+class MinHasher:
+    """MinHash signatures with banded LSH keys."""
+
+    def __init__(self, num_perm: int = 32, bands: int = 8, seed: int = 7):
+        """
+        Initialize the hasher.
+
+        Args:
+            num_perm: Number of hash permutations per signature
+            bands: Number of LSH bands; each band holds num_perm // bands rows
+            seed: Seed for the permutation and band-mixing coefficients
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a = rng.integers(1, _MINHASH_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _MINHASH_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._mix = rng.integers(1, 2**63, size=self.rows, dtype=np.uint64) | 1
+        self._salts = rng.integers(0, 2**63, size=(8, bands), dtype=np.uint64)
+
+    def band_keys(self, *token_sets: Iterable[str]) -> List[int]:
+        """
+        Compute the LSH bucket keys for one or more token sets.
+
+        Sets with Jaccard similarity s share at least one bucket with
+        probability 1 - (1 - s**rows) ** bands. Each argument position is a
+        separate field, so buckets of different fields do not collide.
+
+        Args:
+            *token_sets: Tokens of each field value
+
+        Returns:
+            One bucket key per band for every non-empty token set
+        """
+        return self.band_keys_batch([token_sets])[0]
+
+    def band_keys_batch(
+        self, items: Sequence[Sequence[Iterable[str]]]
+    ) -> List[List[int]]:
+        """
+        Compute the LSH bucket keys of many items in one vectorized pass.
+
+        Args:
+            items: Token sets of each item, one per field
+
+        Returns:
+            The band_keys() result of every item
+        """
+        hashes: List[int] = []
+        offsets: List[int] = []
+        fields: List[int] = []
+        owners: List[int] = []
+        for owner, token_sets in enumerate(items):
+            for field, tokens in enumerate(token_sets):
+                start = len(hashes)
+                hashes.extend(_token_hash(token) for token in tokens)
+                if len(hashes) > start:
+                    offsets.append(start)
+                    fields.append(field)
+                    owners.append(owner)
+
+        results: List[List[int]] = [[] for _ in items]
+        if not hashes:
+            return results
+
+        values = (
+            self._a * np.array(hashes, dtype=np.uint64) + self._b
+        ) % _MINHASH_PRIME
+        signatures = np.minimum.reduceat(values, offsets, axis=1).T
+        bands = signatures.reshape(len(fields), self.bands, self.rows)
+        keys = (bands * self._mix).sum(axis=2, dtype=np.uint64) ^ self._salts[fields]
+        for owner, row in zip(owners, keys.tolist()):
+            results[owner].extend(row)
+        return results
+
+
+def contact_fingerprint(contact: Dict[str, Any]) -> Tuple[str, ...]:
+    """Raw values of the fields that matching depends on."""
+    return tuple(
+        contact.get(field) or ""
+        for field in ("email", "phone", "first_name", "last_name", "message")
+    )
+
+
+class ContactFeatures:
+    """Normalized contact fields used for blocking and scoring."""
+
+    __slots__ = ("email", "phone", "name_tokens", "message_tokens", "fingerprint")
+
+    def __init__(self, contact: Dict[str, Any]):
+        self.fingerprint = contact_fingerprint(contact)
+        email, phone, first_name, last_name, message = self.fingerprint
+
+        self.email = normalize_email(email) or None
+        self.phone = (
+            (normalize_phone(phone) or phone.strip() or None) if phone else None
+        )
+        self.name_tokens = frozenset(f"{first_name} {last_name}".lower().split())
+        self.message_tokens = frozenset(message.lower().split())
+
+    @property
+    def name_key(self) -> Optional[str]:
+        """Name blocking key: the sorted name tokens."""
+        return " ".join(sorted(self.name_tokens)) if self.name_tokens else None
+
+
+def _jaccard(tokens1: frozenset, tokens2: frozenset) -> float:
+    if tokens1 == tokens2:
+        return 1.0
+    union = len(tokens1 | tokens2)
+    return len(tokens1 & tokens2) / union if union else 0.0
+
+
+def contact_similarity(features1: ContactFeatures, features2: ContactFeatures) -> float:
+    """
+    Score how likely two contacts are the same person.
+
+    Weighted average over the fields both contacts have: exact email (0.4),
+    name token overlap (0.3), exact phone (0.2) and message token overlap (0.1).
+
+    Args:
+        features1: Features of the first contact
+        features2: Features of the second contact
+
+    Returns:
+        Similarity between 0.0 and 1.0
+    """
+    weighted_sum = 0.0
+    total_weight = 0.0
+
+    if features1.email and features2.email:
+        weighted_sum += EMAIL_WEIGHT * (features1.email == features2.email)
+        total_weight += EMAIL_WEIGHT
+
+    if features1.name_tokens and features2.name_tokens:
+        weighted_sum += NAME_WEIGHT * _jaccard(
+            features1.name_tokens, features2.name_tokens
+        )
+        total_weight += NAME_WEIGHT
+
+    if features1.phone and features2.phone:
+        weighted_sum += PHONE_WEIGHT * (features1.phone == features2.phone)
+        total_weight += PHONE_WEIGHT
+
+    if features1.message_tokens and features2.message_tokens:
+        weighted_sum += CONTENT_WEIGHT * _jaccard(
+            features1.message_tokens, features2.message_tokens
+        )
+        total_weight += CONTENT_WEIGHT
+
+    return weighted_sum / total_weight if total_weight else 0.0
+
+
+class ContactCandidateIndex:
+    """
+    Incremental candidate-generation index over a workspace's contacts.
+
+    Exact blocking keys catch every pair sharing an email, phone or full name.
+    Pairs that only match fuzzily on name or message tokens are found through
+    MinHash/LSH buckets, with a miss probability that falls quickly as their
+    token overlap rises.
+    """
+
+    def __init__(self, num_perm: int = 32, bands: int = 8):
+        """
+        Initialize the index.
+
+        Args:
+            num_perm: Number of MinHash permutations per fuzzy field
+            bands: Number of LSH bands per fuzzy field
+        """
+        self.hasher = MinHasher(num_perm=num_perm, bands=bands)
+        self._contacts: Dict[str, Tuple[Dict[str, Any], ContactFeatures]] = {}
+        self._keys: Dict[str, List[Any]] = {}
+        # Most buckets hold a single contact, stored as a bare id so that large
+        # workspaces do not allocate millions of one-element sets
+        self._buckets: Dict[Any, Union[str, Set[str]]] = {}
+        self._anonymous_ids = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._contacts)
+
+    def __contains__(self, contact_id: str) -> bool:
+        return contact_id in self._contacts
+
+    def _contact_id(self, contact: Dict[str, Any]) -> str:
+        contact_id = contact.get("id")
+        if contact_id:
+            return str(contact_id)
+        return f"_anonymous:{next(self._anonymous_ids)}"
+
+    def _exact_keys(self, features: ContactFeatures) -> List[Any]:
+        keys: List[Any] = []
+        if features.email:
+            keys.append(("email", features.email))
+        if features.phone:
+            keys.append(("phone", features.phone))
+        if features.name_tokens:
+            keys.append(("name", features.name_key))
+        return keys
+
+    def _bucket_keys(self, features: ContactFeatures) -> List[Any]:
+        return self._exact_keys(features) + self.hasher.band_keys(
+            features.name_tokens, features.message_tokens
+        )
+
+    def _insert(
+        self, entries: List[Tuple[str, Dict[str, Any], ContactFeatures]]
+    ) -> None:
+        band_keys = self.hasher.band_keys_batch(
+            [
+                (features.name_tokens, features.message_tokens)
+                for _, _, features in entries
+            ]
+        )
+        buckets = self._buckets
+        for (contact_id, contact, features), fuzzy_keys in zip(entries, band_keys):
+            self.remove(contact_id)
+            keys = self._exact_keys(features) + fuzzy_keys
+            for key in keys:
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = contact_id
+                elif isinstance(bucket, set):
+                    bucket.add(contact_id)
+                elif bucket != contact_id:
+                    buckets[key] = {bucket, contact_id}
+            self._contacts[contact_id] = (contact, features)
+            self._keys[contact_id] = keys
+
+    def add(self, contact: Dict[str, Any]) -> str:
+        """
+        Index a contact, replacing any earlier version with the same id.
+
+        Args:
+            contact: Contact record; its "id" identifies it in the index
+
+        Returns:
+            The id the contact is indexed under
+        """
+        return self.add_many([contact])[0]
+
+    def add_many(
+        self, contacts: Iterable[Dict[str, Any]], batch_size: int = 1024
+    ) -> List[str]:
+        """
+        Index several contacts, hashing them in vectorized batches.
+
+        Contacts whose matching fields are unchanged since they were indexed
+        only have their stored record replaced.
+
+        Args:
+            contacts: Contact records
+            batch_size: Number of contacts hashed per batch
+
+        Returns:
+            The ids the contacts are indexed under
+        """
+        contact_ids: List[str] = []
+        pending: List[Tuple[str, Dict[str, Any], ContactFeatures]] = []
+
+        for contact in contacts:
+            contact_id = self._contact_id(contact)
+            contact_ids.append(contact_id)
+            previous = self._contacts.get(contact_id)
+            if previous and previous[1].fingerprint == contact_fingerprint(contact):
+                self._contacts[contact_id] = (contact, previous[1])
+                continue
+            pending.append((contact_id, contact, ContactFeatures(contact)))
+            if len(pending) >= batch_size:
+                self._insert(pending)
+                pending = []
+
+        if pending:
+            self._insert(pending)
+        return contact_ids
+
+    def remove(self, contact_id: str) -> bool:
+        """
+        Remove a contact from the index.
+
+        Args:
+            contact_id: Id the contact was indexed under
+
+        Returns:
+            True if the contact was indexed
+        """
+        if self._contacts.pop(contact_id, None) is None:
+            return False
+        buckets = self._buckets
+        for key in self._keys.pop(contact_id, ()):
+            bucket = buckets.get(key)
+            if bucket == contact_id:
+                del buckets[key]
+            elif isinstance(bucket, set):
+                bucket.discard(contact_id)
+                if len(bucket) == 1:
+                    buckets[key] = bucket.pop()
+        return True
+
+    def sync(self, contacts: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Bring the index in line with a full listing of the workspace.
+
+        Contacts whose matching fields are unchanged keep their index entries,
+        so a repeated sync only rehashes what changed. Contacts without an id
+        cannot be tracked between listings and are re-indexed each time.
+
+        Args:
+            contacts: Every contact currently in the workspace
+
+        Returns:
+            Counts of added, updated, unchanged and removed contacts
+        """
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+
+        for contact_id in [c for c in self._contacts if c.startswith("_anonymous:")]:
+            self.remove(contact_id)
+
+        for contact in contacts:
+            previous = self._contacts.get(str(contact.get("id") or ""))
+            if previous is None:
+                stats["added"] += 1
+            elif previous[1].fingerprint == contact_fingerprint(contact):
+                stats["unchanged"] += 1
+            else:
+                stats["updated"] += 1
+
+        seen = set(self.add_many(contacts))
+        for contact_id in [c for c in self._contacts if c not in seen]:
+            self.remove(contact_id)
+            stats["removed"] += 1
+
+        return stats
+
+    def features(self, contact: Dict[str, Any]) -> ContactFeatures:
+        """Compute the matching features of a contact."""
+        return ContactFeatures(contact)
+
+    def candidates(
+        self, features: ContactFeatures
+    ) -> List[Tuple[Dict[str, Any], ContactFeatures]]:
+        """
+        Find the indexed contacts that may duplicate a contact.
+
+        Args:
+            features: Features of the contact to look up
+
+        Returns:
+            (contact, features) pairs that share at least one bucket with it
+        """
+        candidate_ids: Set[str] = set()
+        for key in self._bucket_keys(features):
+            bucket = self._buckets.get(key)
+            if isinstance(bucket, set):
+                candidate_ids.update(bucket)
+            elif bucket is not None:
+                candidate_ids.add(bucket)
+        return [self._contacts[contact_id] for contact_id in candidate_ids]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get index size metrics."""
+        return {
+            "contacts": len(self._contacts),
+            "buckets": len(self._buckets),
+            "largest_bucket": max(
+                (len(b) for b in self._buckets.values() if isinstance(b, set)),
+                default=1 if self._buckets else 0,
+            ),
+        }
@@ -9,8 +9,11 @@ import asyncio
 import hashlib
 import json
 import os
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from urllib.parse import urldefrag, urljoin, urlparse
 from uuid import UUID, uuid4
 
 # Crawl4AI imports
@@ -35,6 +38,7 @@ except ImportError:
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from knowledge.ingestion_pipeline import IngestionDocument, IngestionPipeline
 from knowledge.models import EmbeddingMeta
 from knowledge.semantic_search import get_semantic_search
 
@@ -54,6 +58,51 @@ class CrawlConfig(BaseModel):
     user_query: Optional[str] = None
     tags: List[str] = []
     metadata: Dict[str, Any] = {}
+    max_concurrent_per_domain: int = 4
+    politeness_delay: float = 0.25
+    skip_unchanged: bool = True
+
+
+def _normalize_url(url: str) -> str:
+    """Drop the fragment and trailing slash so one page has one URL."""
+    url = urldefrag(url)[0]
+    return url[:-1] if url.endswith("/") and urlparse(url).path != "/" else url
+
+
+class DomainThrottle:
+    """
+    Per-domain politeness for crawlers: caps concurrent requests to a domain
+    and spaces out the start of consecutive requests.
+    """
+
+    def __init__(self, delay: float = 0.25, max_concurrent: int = 4):
+        """
+        Initialize the throttle.
+
+        Args:
+            delay: Minimum seconds between request starts to one domain
+            max_concurrent: Maximum concurrent requests to one domain
+        """
+        self.delay = delay
+        self.max_concurrent = max_concurrent
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, domain: str) -> AsyncIterator[None]:
+        """Hold one of the domain's request slots for the duration of the block."""
+        semaphore = self._semaphores.setdefault(
+            domain, asyncio.Semaphore(self.max_concurrent)
+        )
+        lock = self._locks.setdefault(domain, asyncio.Lock())
+        async with semaphore:
+            async with lock:
+                wait = self._last_start.get(domain, 0.0) + self.delay - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_start[domain] = time.monotonic()
+            yield
 
 
 class Crawl4AIService:
@@ -212,6 +261,14 @@ class Crawl4AIService:
         """
         Perform a deep crawl of a website and store all pages in the vector database.
 
+        Pages are crawled breadth-first up to config.max_depth links away from
+        config.url, staying on its domain, with at most
+        config.max_concurrent_per_domain requests in flight and
+        config.politeness_delay seconds between request starts. Each page is
+        handed to an IngestionPipeline as soon as it is crawled, so chunking,
+        embedding and storage overlap with crawling. Pages whose content has
+        not changed since the last crawl are skipped.
+
         Args:
             config: Configuration for the crawl
 
@@ -221,6 +278,14 @@ class Crawl4AIService:
         if not self._initialized:
             await self.initialize()
 
+        if not CRAWL4AI_AVAILABLE:
+            logger.warning("Crawl4AI is not available - returning error response")
+            return {
+                "success": False,
+                "error": "Crawl4AI service is not available",
+                "url": config.url,
+            }
+
         try:
             # Configure content filter
             if config.user_query:
@@ -246,13 +311,102 @@ class Crawl4AIService:
                 ),
             )
 
-            # Note: deep_crawl parameter is not supported in the current version
-            # We'll implement our own breadth-first crawling
-
-            # Execute deep crawl
-            results = await self.crawler.arun_many(urls=[config.url], config=run_config)
+            start_url = _normalize_url(config.url)
+            domain = urlparse(start_url).netloc
+            throttle = DomainThrottle(
+                delay=config.politeness_delay,
+                max_concurrent=config.max_concurrent_per_domain,
+            )
+            frontier: asyncio.Queue = asyncio.Queue()
+            frontier.put_nowait((start_url, 0))
+            queued = {start_url}
+            pages_crawled = 0
+
+            pipeline = IngestionPipeline(
+                vector_store=self.vector_store,
+                source_prefix=(
+                    f"web:{urlparse(start_url).scheme}://{domain}"
+                    if config.skip_unchanged
+                    else None
+                ),
+            )
 
-            if not results:
+            async def crawl_worker():
+                nonlocal pages_crawled
+                while True:
+                    url, depth = await frontier.get()
+                    try:
+                        async with throttle.slot(domain):
+                            result = await self.crawler.arun(url=url, config=run_config)
+                        if not result.success:
+                            logger.warning(f"Failed to crawl {url}")
+                            continue
+                        pages_crawled += 1
+
+                        if depth < config.max_depth:
+                            for link in (result.links or {}).get("internal", []):
+                                href = (
+                                    link.get("href") if isinstance(link, dict) else link
+                                )
+                                if not href:
+                                    continue
+                                link_url = _normalize_url(urljoin(url, href))
+                                if (
+                                    urlparse(link_url).netloc == domain
+                                    and link_url not in queued
+                                    and len(queued) < config.max_pages
+                                ):
+                                    queued.add(link_url)
+                                    frontier.put_nowait((link_url, depth + 1))
+
+                        content = (
+                            result.markdown.fit_markdown
+                            if hasattr(result.markdown, "fit_markdown")
+                            else result.markdown
+                        )
+                        if not content:
+                            continue
+
+                        metadata = EmbeddingMeta(
+                            content_type="web_page",
+                            source=f"web:{url}",
+                            tags=config.tags,
+                            additional_meta={
+                                "url": url,
+                                "title": getattr(result, "title", None),
+                                "crawl_time": datetime.now().isoformat(),
+                                "parent_url": config.url,
+                                "depth": depth,
+                                **config.metadata,
+                            },
+                        )
+                        await pipeline.submit(
+                            IngestionDocument(
+                                source=f"web:{url}", text=content, metadata=metadata
+                            )
+                        )
+                    except Exception as e:
+                        logger.error(f"Error crawling {url}: {e}")
+                    finally:
+                        frontier.task_done()
+
+            await pipeline.start()
+            workers = [
+                asyncio.create_task(crawl_worker())
+                for _ in range(config.max_concurrent_per_domain)
+            ]
+            try:
+                await frontier.join()
+            except BaseException:
+                await pipeline.close()
+                raise
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            stats = await pipeline.finish()
+
+            if pages_crawled == 0:
                 logger.error(f"Failed to deep crawl {config.url}")
                 return {
                     "success": False,
@@ -260,51 +414,18 @@ class Crawl4AIService:
                     "url": config.url,
                 }
 
-            # Store each page
-            embedding_ids = []
-            for result in results:
-                if not result.success:
-                    continue
-
-                # Extract content
-                content = (
-                    result.markdown.fit_markdown
-                    if hasattr(result.markdown, "fit_markdown")
-                    else result.markdown
-                )
-
-                # Create metadata
-                metadata = EmbeddingMeta(
-                    content_type="web_page",
-                    source=f"web:{result.url}",
-                    tags=config.tags,
-                    additional_meta={
-                        "url": result.url,
-                        "title": result.title,
-                        "crawl_time": datetime.now().isoformat(),
-                        "parent_url": config.url,
-                        **config.metadata,
-                    },
-                )
-
-                # Store and embed the content
-                embedding_id = await self.semantic_search.store_and_embed_text(
-                    text=content, content_type="web_page", metadata=metadata
-                )
-
-                if embedding_id:
-                    embedding_ids.append(str(embedding_id))
-
             logger.info(
-                f"Successfully deep crawled {config.url}: {len(embedding_ids)} pages stored"
+                f"Successfully deep crawled {config.url}: {pages_crawled} pages "
+                f"crawled, {stats['stored']} stored, {stats['unchanged']} unchanged"
             )
 
             return {
                 "success": True,
                 "url": config.url,
-                "pages_crawled": len(results),
-                "pages_stored": len(embedding_ids),
-                "embedding_ids": embedding_ids,
+                "pages_crawled": pages_crawled,
+                "pages_stored": stats["stored"],
+                "pages_unchanged": stats["unchanged"],
+                "embedding_ids": [str(i) for i in pipeline.embedding_ids],
             }
 
         except Exception as e:
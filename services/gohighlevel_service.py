@@ -9,7 +9,7 @@ import asyncio
 import hashlib
 import hmac
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 
 import aiohttp
@@ -23,6 +23,7 @@ from models.gohighlevel_models import (BusinessType, ContactSource,
                                        GHLSyncStatus, GHLWebhookEvent,
                                        OpportunityStage, SubAccountType)
 from services.base_service import BaseService, ServiceCredentials
+from utils.rate_limiter import get_rate_limiter
 
 
 class GoHighLevelCredentials(ServiceCredentials):
@@ -74,54 +75,6 @@ class GoHighLevelValidationError(GoHighLevelError):
     pass
 
 
-class RateLimiter:
-    """Rate limiter for GoHighLevel API compliance."""
-
-    def __init__(self, max_requests: int = 100, window_seconds: int = 10):
-        """
-        Initialize rate limiter.
-
-        Args:
-            max_requests: Maximum requests allowed in window
-            window_seconds: Time window in seconds
-        """
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self.requests: List[datetime] = []
-        self._lock = asyncio.Lock()
-
-    async def acquire(self) -> None:
-        """
-        Acquire permission to make an API request.
-
-        Blocks if rate limit would be exceeded.
-        """
-        async with self._lock:
-            now = datetime.now()
-
-            # Remove requests outside the current window
-            cutoff = now - timedelta(seconds=self.window_seconds)
-            self.requests = [
-                req_time for req_time in self.requests if req_time > cutoff
-            ]
-
-            # Check if we can make another request
-            if len(self.requests) >= self.max_requests:
-                # Calculate wait time
-                oldest_request = min(self.requests)
-                wait_time = (
-                    oldest_request + timedelta(seconds=self.window_seconds) - now
-                ).total_seconds()
-
-                if wait_time > 0:
-                    logger.info(f"Rate limit reached. Waiting {wait_time:.2f} seconds")
-                    await asyncio.sleep(wait_time)
-                    return await self.acquire()  # Recursive call after waiting
-
-            # Record this request
-            self.requests.append(now)
-
-
 class GoHighLevelService(BaseService):
     """
     Service for interacting with GoHighLevel CRM API.
@@ -177,7 +130,9 @@ class GoHighLevelService(BaseService):
         # GoHighLevel specific configuration
         self.api_base_url = "https://services.leadconnectorhq.com"
         self.api_version = "v1"
-        self.rate_limiter = RateLimiter(max_requests=100, window_seconds=10)
+        # GoHighLevel allows 100 requests per 10 seconds; a burst of 10 plus
+        # 9 per second keeps every 10 second window within that
+        self.rate_limiter = get_rate_limiter("gohighlevel", rate=9, burst=10)
 
         # Sub-account mapping
         self.sub_account_tokens = {
@@ -0,0 +1,541 @@
+"""
+HTTP Client Registry for The HigherSelf Network Server.
+
+Provides one shared httpx.AsyncClient per integration so that outbound calls
+reuse pooled keep-alive connections instead of opening a new client (or
+blocking the event loop with `requests`) on every call.
+
+Features:
+- Per-host connection pools with keep-alive
+- Cached DNS resolution for new connections
+- HTTP/2 when the optional `h2` package is installed
+- Per-integration timeouts, overridable with HTTP_TIMEOUT_<NAME>
+- Adaptive per-integration concurrency limits
+- Per-integration request rate limits, overridable with
+  RATE_LIMIT_<NAME>_PER_SECOND and RATE_LIMIT_<NAME>_BURST
+"""
+
+import asyncio
+import os
+import socket
+import time
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpcore
+import httpx
+from loguru import logger
+from prometheus_client import Counter
+
+from services.adaptive_concurrency import (
+    AdaptiveConcurrencyLimiter,
+    get_concurrency_limiter,
+)
+from utils.rate_limiter import GCRARateLimiter, get_rate_limiter
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_CLIENT_REQUESTS = Counter(
+    "http_client_requests_total",
+    "Outbound HTTP requests by integration and status class",
+    ["integration", "status"],
+)
+HTTP_CLIENT_CONNECTIONS = Counter(
+    "http_client_connections_total",
+    "New outbound TCP connections opened by host",
+    ["host"],
+)
+HTTP_CLIENT_DNS_LOOKUPS = Counter(
+    "http_client_dns_lookups_total",
+    "DNS lookups for outbound connections by cache outcome",
+    ["outcome"],
+)
+
+# Default request timeouts in seconds for integrations with slow endpoints
+DEFAULT_TIMEOUTS: Dict[str, float] = {
+    "openml": 60.0,
+    "video_generation": 60.0,
+    "anthropic": 120.0,
+    "manus_ai": 120.0,
+    "augment_code": 120.0,
+    "genspark": 180.0,
+    "devon_ai": 300.0,
+}
+
+# Default (requests per second, burst) for integrations with request quotas
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    # Amelia runs inside the WordPress site, which shares the hosting budget
+    "amelia": (5.0, 10),
+}
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that caches host name resolution.
+
+    Connections are opened to the cached addresses, trying each in turn.
+    TLS still verifies against the original host name, which httpcore passes
+    separately when starting TLS.
+    """
+
+    def __init__(
+        self,
+        backend: httpcore.AsyncNetworkBackend,
+        ttl: float = 300.0,
+        cache: Optional[Dict[Tuple[str, int], Tuple[float, List[str]]]] = None,
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            backend: Backend used to open the actual connections
+            ttl: Seconds to keep resolved addresses
+            cache: Resolution cache to share with other backends
+        """
+        self._backend = backend
+        self.ttl = ttl
+        self._cache = {} if cache is None else cache
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Resolve a host name to its addresses, using the cache when fresh."""
+        key = (host, port)
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            HTTP_CLIENT_DNS_LOOKUPS.labels(outcome="hit").inc()
+            return cached[1]
+
+        HTTP_CLIENT_DNS_LOOKUPS.labels(outcome="miss").inc()
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        HTTP_CLIENT_CONNECTIONS.labels(host=host).inc()
+        try:
+            addresses = await self.resolve(host, port)
+        except OSError:
+            addresses = [host]
+
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+
+        # Every cached address failed; resolve again on the next attempt
+        self._cache.pop((host, port), None)
+        raise last_error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# httpcore exceptions and their httpx equivalents, most specific first
+HTTPCORE_EXCEPTIONS: Tuple[Tuple[type, type], ...] = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+def _to_httpx_error(error: Exception) -> Exception:
+    """Translate an httpcore exception into the httpx exception callers expect."""
+    for httpcore_error, httpx_error in HTTPCORE_EXCEPTIONS:
+        if isinstance(error, httpcore_error):
+            return httpx_error(str(error))
+    return error
+
+
+class _PoolResponseStream(httpx.AsyncByteStream):
+    """Response body stream of an httpcore response, with httpx exceptions."""
+
+    def __init__(self, stream: Any):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except Exception as e:
+            raise _to_httpx_error(e) from e
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class ConnectionPoolTransport(httpx.AsyncBaseTransport):
+    """
+    Transport sending requests through an explicitly built httpcore pool.
+
+    httpx.AsyncHTTPTransport builds its pool internally and offers no way to
+    pass a network backend, so the registry builds the pool itself with the
+    DNS caching backend and uses this transport around it.
+    """
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool):
+        self.pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            response = await self.pool.handle_async_request(core_request)
+        except Exception as e:
+            raise _to_httpx_error(e) from e
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_PoolResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+
+class _SlotReleasingStream(httpx.AsyncByteStream):
+    """Response body stream that holds a concurrency slot until it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, slot: AsyncContextManager):
+        self._stream = stream
+        self._slot = slot
+        self._error: Optional[BaseException] = None
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except BaseException as e:
+            self._error = e
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                # An error reading the body counts towards the latency sample
+                # like an error sending the request
+                error = self._error
+                await self._slot.__aexit__(
+                    type(error) if error else None,
+                    error,
+                    error.__traceback__ if error else None,
+                )
+
+
+class AdaptiveConcurrencyTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that sends requests under an upstream's concurrency limit.
+
+    The slot is held until the response body is closed, so the latency
+    sample covers reading the body and streamed responses count as in flight.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, limiter: AdaptiveConcurrencyLimiter
+    ):
+        self._transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slot = self.limiter.acquire()
+        await slot.__aenter__()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException as e:
+            await slot.__aexit__(type(e), e, e.__traceback__)
+            raise
+
+        response.stream = _SlotReleasingStream(response.stream, slot)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport that waits for an integration's rate limit before each request."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: GCRARateLimiter):
+        self._transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire()
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientRegistry:
+    """
+    Process-wide registry of shared async HTTP clients.
+
+    Each integration gets its own client (and so its own timeout), while all
+    clients share the DNS cache. Clients are bound to the event loop that
+    created them; a client requested from a different loop is replaced.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        default_timeout: float = 30.0,
+        dns_ttl: float = 300.0,
+        http2: bool = HTTP2_AVAILABLE,
+        adaptive_concurrency: bool = True,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Maximum open connections per client
+            max_keepalive_connections: Maximum idle connections kept per client
+            keepalive_expiry: Seconds an idle connection is kept open
+            default_timeout: Timeout for integrations without their own
+            dns_ttl: Seconds to cache DNS results
+            http2: Whether to negotiate HTTP/2 (requires `h2`)
+            adaptive_concurrency: Whether to limit each integration's
+                in-flight requests with an adaptive concurrency limiter
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.default_timeout = default_timeout
+        self.dns_ttl = dns_ttl
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.adaptive_concurrency = adaptive_concurrency
+        self._dns_cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._clients: Dict[
+            str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]
+        ] = {}
+
+    @classmethod
+    def from_env(cls) -> "HTTPClientRegistry":
+        """Create a registry configured from environment variables."""
+        return cls(
+            max_connections=int(os.environ.get("HTTP_CLIENT_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(
+                os.environ.get("HTTP_CLIENT_MAX_KEEPALIVE", "20")
+            ),
+            keepalive_expiry=float(
+                os.environ.get("HTTP_CLIENT_KEEPALIVE_EXPIRY", "30")
+            ),
+            default_timeout=float(os.environ.get("HTTP_CLIENT_TIMEOUT", "30")),
+            dns_ttl=float(os.environ.get("HTTP_CLIENT_DNS_TTL", "300")),
+            adaptive_concurrency=os.environ.get(
+                "HTTP_CLIENT_ADAPTIVE_CONCURRENCY", "true"
+            ).lower()
+            == "true",
+        )
+
+    def get_timeout(self, name: str, timeout: Optional[float] = None) -> float:
+        """
+        Get the request timeout for an integration.
+
+        Args:
+            name: Integration name
+            timeout: Timeout requested by the caller
+
+        Returns:
+            HTTP_TIMEOUT_<NAME> if set, else the caller's timeout, else the
+            integration default
+        """
+        override = os.environ.get(f"HTTP_TIMEOUT_{name.upper()}")
+        if override:
+            return float(override)
+        if timeout is not None:
+            return timeout
+        return DEFAULT_TIMEOUTS.get(name, self.default_timeout)
+
+    def get_rate_limiter(self, name: str) -> Optional[GCRARateLimiter]:
+        """
+        Get the request rate limiter for an integration.
+
+        Args:
+            name: Integration name
+
+        Returns:
+            The integration's limiter, or None if it has no default rate and
+            RATE_LIMIT_<NAME>_PER_SECOND is not set
+        """
+        default = DEFAULT_RATE_LIMITS.get(name)
+        if default is None:
+            if not os.environ.get(f"RATE_LIMIT_{name.upper()}_PER_SECOND"):
+                return None
+            default = (1.0, 1)
+        rate, burst = default
+        return get_rate_limiter(name, rate=rate, burst=burst)
+
+    def _create_client(self, name: str, timeout: float) -> httpx.AsyncClient:
+        # httpx has no resolver hook, so the pool is built with the caching
+        # network backend and wrapped in a transport of our own
+        pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=self.limits.max_connections,
+            max_keepalive_connections=self.limits.max_keepalive_connections,
+            keepalive_expiry=self.limits.keepalive_expiry,
+            http1=True,
+            http2=self.http2,
+            network_backend=CachingDNSBackend(
+                httpcore.AnyIOBackend(), self.dns_ttl, self._dns_cache
+            ),
+        )
+        transport: httpx.AsyncBaseTransport = ConnectionPoolTransport(pool)
+        if self.adaptive_concurrency:
+            transport = AdaptiveConcurrencyTransport(
+                transport,
+                get_concurrency_limiter(
+                    name,
+                    initial_limit=20,
+                    max_limit=self.limits.max_connections,
+                    queue_timeout=timeout,
+                    overload_exceptions=(httpx.TimeoutException, httpx.NetworkError),
+                ),
+            )
+        rate_limiter = self.get_rate_limiter(name)
+        if rate_limiter is not None:
+            # Outermost, so requests waiting for their turn hold no
+            # concurrency slot
+            transport = RateLimitedTransport(transport, rate_limiter)
+
+        async def record_response(response: httpx.Response) -> None:
+            HTTP_CLIENT_REQUESTS.labels(
+                integration=name, status=f"{response.status_code // 100}xx"
+            ).inc()
+
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout,
+            follow_redirects=True,
+            event_hooks={"response": [record_response]},
+        )
+
+    def get_client(
+        self, name: str, timeout: Optional[float] = None
+    ) -> httpx.AsyncClient:
+        """
+        Get the shared client for an integration, creating it if needed.
+
+        Must be called from within a running event loop.
+
+        Args:
+            name: Integration name, used for timeouts and metrics
+            timeout: Default timeout in seconds when the client is created
+
+        Returns:
+            Shared httpx.AsyncClient; callers must not close it
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(name)
+        if entry and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        client = self._create_client(name, self.get_timeout(name, timeout))
+        self._clients[name] = (loop, client)
+        logger.debug(f"Created shared HTTP client for {name} (http2={self.http2})")
+        return client
+
+    async def close_all(self) -> None:
+        """Close every client created on the running event loop."""
+        loop = asyncio.get_running_loop()
+        for name, (client_loop, client) in list(self._clients.items()):
+            if client_loop is loop:
+                await client.aclose()
+            del self._clients[name]
+        logger.info("Closed shared HTTP clients")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        return {
+            "clients": sorted(self._clients),
+            "http2": self.http2,
+            "dns_cache_entries": len(self._dns_cache),
+        }
+
+
+http_client_registry = HTTPClientRegistry.from_env()
+
+
+def get_http_client(name: str, timeout: Optional[float] = None) -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client for an integration.
+
+    Args:
+        name: Integration name, used for timeouts and metrics
+        timeout: Default timeout in seconds when the client is created
+
+    Returns:
+        Shared httpx.AsyncClient; callers must not close it
+    """
+    return http_client_registry.get_client(name, timeout)
@@ -21,6 +21,7 @@ from models.huggingface_models import (
 )
 from services.ai_providers.huggingface_provider import HuggingFaceProvider
 from services.base_service import BaseService
+from services.model_server import ModelServerError, get_model_server_client
 from services.notion_service import NotionService
 
 
@@ -105,6 +106,9 @@ class HuggingFaceService(BaseService):
         """
         Query a Hugging Face model with standardized error handling.
 
+        Models served by the local model server run there; others go to the
+        Inference API.
+
         Args:
             model_config: Configuration for the model to query
             inputs: Input text to process
@@ -112,6 +116,17 @@ class HuggingFaceService(BaseService):
         Returns:
             Dictionary containing the model's response
         """
+        model_server = get_model_server_client()
+        if model_server is not None and await model_server.serves_pipeline(
+            model_config.model_id
+        ):
+            try:
+                return await model_server.run_pipeline(
+                    model_config.model_id, inputs, model_config.parameters
+                )
+            except ModelServerError as e:
+                logger.warning(f"{e}; querying the Hugging Face API instead")
+
         try:
             response = requests.post(
                 f"{self.api_url}{model_config.model_id}",
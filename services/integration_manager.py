@@ -4,9 +4,11 @@ This service coordinates all third-party integrations and ensures Notion remains
 """
 
 import asyncio
+import functools
 import os
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from loguru import logger
 from pydantic import BaseModel
@@ -17,11 +19,13 @@ from services.acuity_service import AcuityService
 from services.ai_provider_service import AIProviderService
 from services.airtable_service import AirtableService
 from services.amelia_service import AmeliaServiceClient as AmeliaService
+
 # Import base service
 from services.base_service import BaseService
 from services.bettermode_service import BetterModeService
 from services.capcut_service import CapCutService
 from services.huggingface_service import HuggingFaceService
+
 # Import service classes
 from services.notion_service import NotionService
 from services.pipit_service import PipitService
@@ -32,8 +36,9 @@ from services.tutor_lm_service import TutorLMService
 from services.tutorlm_service import TutorLMService as LegacyTutorLMService
 from services.typeform_service import TypeFormService
 from services.user_feedback_service import UserFeedbackService
-from services.userfeedback_service import \
-    UserFeedbackService as LegacyUserFeedbackService
+from services.userfeedback_service import (
+    UserFeedbackService as LegacyUserFeedbackService,
+)
 from services.woocommerce_service import WooCommerceService
 
 # Singleton instance of the IntegrationManager
@@ -57,6 +62,12 @@ async def get_integration_manager() -> "IntegrationManager":
     return _integration_manager
 
 
+async def close_integration_manager() -> None:
+    """Stop background work of the IntegrationManager, if one was created."""
+    if _integration_manager is not None:
+        await _integration_manager.stop_revalidation()
+
+
 class IntegrationManagerConfig(BaseModel):
     """Configuration for the Integration Manager."""
 
@@ -80,6 +91,12 @@ class IntegrationManagerConfig(BaseModel):
     enable_softr: bool = True
     enable_capcut: bool = True
     enable_pipit: bool = True
+    # Seconds a single connection check may take before it counts as failed
+    validation_timeout: float = 10.0
+    # Seconds a connection check result is reused before checking again
+    validation_cache_ttl: float = 300.0
+    # Seconds between background revalidations; 0 disables them
+    revalidation_interval: float = 300.0
 
     class Config:
         env_prefix = "INTEGRATION_"
@@ -128,6 +145,15 @@ class IntegrationManager:
                         "ENABLE_AI_PROVIDERS", "true"
                     ).lower()
                     == "true",
+                    validation_timeout=float(
+                        os.environ.get("INTEGRATION_VALIDATION_TIMEOUT", "10")
+                    ),
+                    validation_cache_ttl=float(
+                        os.environ.get("INTEGRATION_VALIDATION_CACHE_TTL", "300")
+                    ),
+                    revalidation_interval=float(
+                        os.environ.get("INTEGRATION_REVALIDATION_INTERVAL", "300")
+                    ),
                 )
             except ValueError as e:
                 logger.error(f"Error initializing IntegrationManager config: {e}")
@@ -150,6 +176,14 @@ class IntegrationManager:
         # Dictionary to track initialization status
         self.initialization_status = {}
 
+        # Connection check results: name -> (monotonic time checked, result)
+        self._validation_cache: Dict[str, Tuple[float, bool]] = {}
+        # Seconds the last connection check of each service took
+        self._validation_durations: Dict[str, float] = {}
+        self._revalidation_task: Optional[asyncio.Task] = None
+        # Services that failed connection validation, registered once they pass
+        self._failed_services: Dict[str, Any] = {}
+
     async def initialize(self) -> bool:
         """
         Initialize all enabled integrations.
@@ -190,100 +224,50 @@ class IntegrationManager:
                         f"Missing Notion database IDs for: {', '.join(missing_dbs)}"
                     )
 
-            # Attempt to validate the token
-            try:
-                logger.info("Validating Notion API token...")
-                notion_initialized = await self.notion_service.validate_token()
-                self.initialization_status["notion"] = notion_initialized
-
-                if notion_initialized:
-                    logger.info("✅ Notion API token validated successfully")
-                else:
-                    logger.error("❌ Notion API token validation failed")
-            except Exception as e:
-                logger.error(f"❌ Exception during Notion API token validation: {e}")
-                notion_initialized = False
-                self.initialization_status["notion"] = False
-
-            if not notion_initialized:
-                logger.error("Failed to initialize Notion service. Cannot continue.")
-                return False
-
-            logger.info("Notion service initialized successfully")
-
-            # Initialize optional services
-
-            # TypeForm
-            if self.config.enable_typeform:
-                logger.info("Initializing TypeForm service...")
-                try:
-                    typeform_service = TypeFormService()
-                    typeform_initialized = await typeform_service.validate_connection()
-                    if typeform_initialized:
-                        self.services["typeform"] = typeform_service
-                        logger.info("TypeForm service initialized successfully")
-                    else:
-                        logger.warning("TypeForm service failed connection validation")
-                except Exception as e:
-                    logger.error(f"Failed to initialize TypeForm service: {e}")
-                    typeform_initialized = False
-
-                self.initialization_status["typeform"] = typeform_initialized
-
-            # WooCommerce
-            if self.config.enable_woocommerce:
-                logger.info("Initializing WooCommerce service...")
-                try:
-                    woocommerce_service = WooCommerceService()
-                    woocommerce_initialized = (
-                        await woocommerce_service.validate_connection()
-                    )
-                    if woocommerce_initialized:
-                        self.services["woocommerce"] = woocommerce_service
-                        logger.info("WooCommerce service initialized successfully")
-                    else:
-                        logger.warning(
-                            "WooCommerce service failed connection validation"
-                        )
-                except Exception as e:
-                    logger.error(f"Failed to initialize WooCommerce service: {e}")
-                    woocommerce_initialized = False
-
-                self.initialization_status["woocommerce"] = woocommerce_initialized
-
-            # Acuity
-            if self.config.enable_acuity:
-                logger.info("Initializing Acuity service...")
+            # Construct the services first; their connection checks, including
+            # Notion's, then run concurrently so startup takes as long as the
+            # slowest integration rather than the sum of all of them
+            checks: Dict[str, Callable[[], Awaitable[bool]]] = {
+                "notion": self.notion_service.validate_token
+            }
+            validated: Dict[str, Any] = {}
+
+            for service_name, enabled, factory in (
+                ("typeform", self.config.enable_typeform, TypeFormService),
+                ("woocommerce", self.config.enable_woocommerce, WooCommerceService),
+                ("acuity", self.config.enable_acuity, AcuityService),
+                ("amelia", self.config.enable_amelia, AmeliaService),
+                ("snovio", self.config.enable_snovio, SnovIOService),
+                ("bettermode", self.config.enable_bettermode, BetterModeService),
+            ):
+                if not enabled:
+                    continue
+                logger.info(f"Initializing {service_name} service...")
                 try:
-                    acuity_service = AcuityService()
-                    acuity_initialized = await acuity_service.validate_connection()
-                    if acuity_initialized:
-                        self.services["acuity"] = acuity_service
-                        logger.info("Acuity service initialized successfully")
-                    else:
-                        logger.warning("Acuity service failed connection validation")
+                    service = factory()
                 except Exception as e:
-                    logger.error(f"Failed to initialize Acuity service: {e}")
-                    acuity_initialized = False
+                    logger.error(f"Failed to initialize {service_name} service: {e}")
+                    self.initialization_status[service_name] = False
+                    continue
+                check = self._connection_check(service)
+                if check is None:
+                    # No way to validate, so assume it's initialized
+                    self.services[service_name] = service
+                    self.initialization_status[service_name] = True
+                    continue
+                validated[service_name] = service
+                checks[service_name] = check
 
-                self.initialization_status["acuity"] = acuity_initialized
-
-            # Amelia
-            if self.config.enable_amelia:
-                logger.info("Initializing Amelia service...")
+            # AI Providers
+            if self.config.enable_ai_providers:
+                logger.info("Initializing AI Provider service...")
                 try:
-                    amelia_service = AmeliaService()
-                    amelia_initialized = await amelia_service.validate_connection()
-                    if amelia_initialized:
-                        self.services["amelia"] = amelia_service
-                        logger.info("Amelia service initialized successfully")
-                    else:
-                        logger.warning("Amelia service failed connection validation")
+                    ai_provider_service = AIProviderService()
+                    validated["ai_provider"] = ai_provider_service
+                    checks["ai_provider"] = self._connection_check(ai_provider_service)
                 except Exception as e:
-                    logger.error(f"Failed to initialize Amelia service: {e}")
-                    amelia_initialized = False
-
-                self.initialization_status["amelia"] = amelia_initialized
+                    logger.error(f"Failed to initialize AI Provider service: {e}")
+                    self.initialization_status["ai_provider"] = False
 
             # Airtable
             if self.config.enable_airtable:
@@ -292,19 +276,6 @@ class IntegrationManager:
                 # Airtable doesn't have a validate method, so assume it's initialized
                 self.initialization_status["airtable"] = True
 
-            # SnovIO
-            if self.config.enable_snovio:
-                logger.info("Initializing SnovIO service...")
-                self.services["snovio"] = SnovioService()
-                snovio_initialized = await self.services[
-                    "snovio"
-                ].validate_credentials()
-                self.initialization_status["snovio"] = snovio_initialized
-                if not snovio_initialized:
-                    logger.warning(
-                        "SnovIO service failed to initialize. Some features may be unavailable."
-                    )
-
             # UserFeedback
             if self.config.enable_user_feedback or self.config.enable_userfeedback:
                 logger.info("Initializing UserFeedback service...")
@@ -326,20 +297,24 @@ class IntegrationManager:
                 # Plaud doesn't have a specific validation method
                 self.initialization_status["plaud"] = True
 
-            # Hugging Face
-            if self.config.enable_huggingface:
-                logger.info("Initializing Hugging Face service...")
+            # Services without validation that need the Notion service
+            for service_name, enabled, factory in (
+                ("huggingface", self.config.enable_huggingface, HuggingFaceService),
+                ("capcut", self.config.enable_capcut, CapCutService),
+                ("pipit", self.config.enable_pipit, PipitService),
+            ):
+                if not enabled:
+                    continue
+                logger.info(f"Initializing {service_name} service...")
                 try:
-                    huggingface_service = HuggingFaceService(
+                    self.services[service_name] = factory(
                         notion_service=self.notion_service
                     )
-                    # Hugging Face doesn't have a specific validation method yet
-                    self.services["huggingface"] = huggingface_service
-                    self.initialization_status["huggingface"] = True
-                    logger.info("Hugging Face service initialized successfully")
+                    self.initialization_status[service_name] = True
+                    logger.info(f"{service_name} service initialized successfully")
                 except Exception as e:
-                    logger.error(f"Failed to initialize Hugging Face service: {e}")
-                    self.initialization_status["huggingface"] = False
+                    logger.error(f"Failed to initialize {service_name} service: {e}")
+                    self.initialization_status[service_name] = False
 
             # Softr
             if self.config.enable_softr:
@@ -354,86 +329,32 @@ class IntegrationManager:
                     logger.error(f"Failed to initialize Softr service: {e}")
                     self.initialization_status["softr"] = False
 
-            # BetterMode
-            if self.config.enable_bettermode:
-                logger.info("Initializing BetterMode service...")
-                try:
-                    bettermode_service = BetterModeService()
-                    bettermode_initialized = (
-                        await bettermode_service.validate_connection()
-                    )
-                    if bettermode_initialized:
-                        self.services["bettermode"] = bettermode_service
-                        logger.info("BetterMode service initialized successfully")
-                    else:
-                        logger.warning(
-                            "BetterMode service failed connection validation"
-                        )
-                except Exception as e:
-                    logger.error(f"Failed to initialize BetterMode service: {e}")
-                    bettermode_initialized = False
-
-                self.initialization_status["bettermode"] = bettermode_initialized
-
-            # CapCut
-            if self.config.enable_capcut:
-                logger.info("Initializing CapCut service...")
-                try:
-                    capcut_service = CapCutService(notion_service=self.notion_service)
-                    # CapCut doesn't have a specific validation method yet
-                    self.services["capcut"] = capcut_service
-                    self.initialization_status["capcut"] = True
-                    logger.info("CapCut service initialized successfully")
-                except Exception as e:
-                    logger.error(f"Failed to initialize CapCut service: {e}")
-                    self.initialization_status["capcut"] = False
-
-            # Pipit
-            if self.config.enable_pipit:
-                logger.info("Initializing Pipit service...")
-                try:
-                    pipit_service = PipitService(notion_service=self.notion_service)
-                    # Pipit doesn't have a specific validation method yet
-                    self.services["pipit"] = pipit_service
-                    self.initialization_status["pipit"] = True
-                    logger.info("Pipit service initialized successfully")
-                except Exception as e:
-                    logger.error(f"Failed to initialize Pipit service: {e}")
-                    self.initialization_status["pipit"] = False
+            logger.info(f"Validating connections: {', '.join(checks)}")
+            results = await self._validate_many(checks, force=True)
 
-            # AI Providers
-            if self.config.enable_ai_providers:
-                logger.info("Initializing AI Provider service...")
-                try:
-                    ai_provider_service = AIProviderService()
+            notion_initialized = results.pop("notion")
+            self.initialization_status["notion"] = notion_initialized
+            if not notion_initialized:
+                logger.error("❌ Notion API token validation failed")
+                logger.error("Failed to initialize Notion service. Cannot continue.")
+                return False
+            logger.info("✅ Notion API token validated successfully")
 
-                    # Try to validate both OpenAI and Anthropic providers
-                    openai_initialized = await ai_provider_service.validate_connection(
-                        "openai"
-                    )
-                    anthropic_initialized = (
-                        await ai_provider_service.validate_connection("anthropic")
+            for service_name, service in validated.items():
+                initialized = results[service_name]
+                if initialized:
+                    self.services[service_name] = service
+                    logger.info(f"{service_name} service initialized successfully")
+                else:
+                    # Kept so background revalidation can register it later
+                    self._failed_services[service_name] = service
+                    logger.warning(
+                        f"{service_name} service failed connection validation"
                     )
+                self.initialization_status[service_name] = initialized
 
-                    # Consider service initialized if at least one provider works
-                    ai_initialized = openai_initialized or anthropic_initialized
-
-                    if ai_initialized:
-                        self.services["ai_provider"] = ai_provider_service
-                        logger.info("AI Provider service initialized successfully")
-                        if openai_initialized:
-                            logger.info("OpenAI provider validated successfully")
-                        if anthropic_initialized:
-                            logger.info("Anthropic provider validated successfully")
-                    else:
-                        logger.warning(
-                            "AI Provider service failed - no providers validated"
-                        )
-                except Exception as e:
-                    logger.error(f"Failed to initialize AI Provider service: {e}")
-                    ai_initialized = False
-
-                self.initialization_status["ai_provider"] = ai_initialized
+            if self.config.revalidation_interval > 0:
+                self.start_revalidation()
 
             # Log initialization summary
             successful = sum(
@@ -449,6 +370,178 @@ class IntegrationManager:
             logger.error(f"Error initializing Integration Manager: {e}")
             return False
 
+    @staticmethod
+    async def _validate_ai_providers(ai_provider_service: AIProviderService) -> bool:
+        """Validate OpenAI and Anthropic concurrently; either one is enough."""
+        openai_initialized, anthropic_initialized = await asyncio.gather(
+            ai_provider_service.validate_connection("openai"),
+            ai_provider_service.validate_connection("anthropic"),
+        )
+        if openai_initialized:
+            logger.info("OpenAI provider validated successfully")
+        if anthropic_initialized:
+            logger.info("Anthropic provider validated successfully")
+        return openai_initialized or anthropic_initialized
+
+    @classmethod
+    def _connection_check(
+        cls, service: Any
+    ) -> Optional[Callable[[], Awaitable[bool]]]:
+        """Get the coroutine function that validates a service's connection."""
+        if isinstance(service, AIProviderService):
+            return functools.partial(cls._validate_ai_providers, service)
+        for method in ("validate_connection", "validate_credentials"):
+            check = getattr(service, method, None)
+            if callable(check):
+                return check
+        return None
+
+    async def _validate(
+        self,
+        service_name: str,
+        check: Callable[[], Awaitable[bool]],
+        force: bool = False,
+    ) -> bool:
+        """
+        Run one connection check, reusing a result younger than the cache TTL.
+
+        Args:
+            service_name: Name the result is cached under
+            check: Coroutine function returning whether the connection works
+            force: Ignore any cached result
+
+        Returns:
+            True if the connection is valid; a check that raises or exceeds
+            the validation timeout counts as failed
+        """
+        cached = self._validation_cache.get(service_name)
+        if (
+            not force
+            and cached is not None
+            and time.monotonic() - cached[0] < self.config.validation_cache_ttl
+        ):
+            return cached[1]
+
+        start = time.perf_counter()
+        try:
+            result = bool(
+                await asyncio.wait_for(check(), timeout=self.config.validation_timeout)
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Connection validation for {service_name} timed out after "
+                f"{self.config.validation_timeout}s"
+            )
+            result = False
+        except Exception as e:
+            logger.error(f"Error validating connection for {service_name}: {e}")
+            result = False
+
+        self._validation_durations[service_name] = time.perf_counter() - start
+        self._validation_cache[service_name] = (time.monotonic(), result)
+        return result
+
+    async def _validate_many(
+        self, checks: Dict[str, Callable[[], Awaitable[bool]]], force: bool = False
+    ) -> Dict[str, bool]:
+        """
+        Run connection checks concurrently.
+
+        Args:
+            checks: Mapping of service names to connection checks
+            force: Ignore cached results
+
+        Returns:
+            Dictionary mapping service names to validation results
+        """
+        results = await asyncio.gather(
+            *(self._validate(name, check, force) for name, check in checks.items())
+        )
+        return dict(zip(checks, results))
+
+    def _service_checks(self) -> Dict[str, Callable[[], Awaitable[bool]]]:
+        """Connection checks for the initialized services that have one."""
+        checks = {}
+        for service_name, service in self.services.items():
+            check = self._connection_check(service)
+            if check is not None:
+                checks[service_name] = check
+        return checks
+
+    def start_revalidation(self) -> None:
+        """Start revalidating connections in the background."""
+        if self._revalidation_task and not self._revalidation_task.done():
+            return
+        self._revalidation_task = asyncio.create_task(self._revalidate_loop())
+
+    async def stop_revalidation(self) -> None:
+        """Stop background revalidation."""
+        if self._revalidation_task:
+            self._revalidation_task.cancel()
+            try:
+                await self._revalidation_task
+            except asyncio.CancelledError:
+                pass
+            self._revalidation_task = None
+
+    async def _revalidate_loop(self) -> None:
+        """Refresh connection checks and initialization status on an interval."""
+        while True:
+            await asyncio.sleep(self.config.revalidation_interval)
+            try:
+                await self.revalidate()
+            except Exception as e:
+                logger.error(f"Error revalidating integration connections: {e}")
+
+    async def revalidate(self) -> Dict[str, bool]:
+        """
+        Check every validated connection again and update the initialization status.
+
+        Services that failed validation earlier are checked too, and are
+        registered once their connection works.
+
+        Returns:
+            Dictionary mapping service names to validation results
+        """
+        checks = {"notion": self.notion_service.validate_token}
+        checks.update(self._service_checks())
+        for service_name, service in self._failed_services.items():
+            checks[service_name] = self._connection_check(service)
+        results = await self._validate_many(checks, force=True)
+
+        for service_name, result in results.items():
+            if self.initialization_status.get(service_name) != result:
+                if result:
+                    logger.info(f"Connection for {service_name} is valid again")
+                else:
+                    logger.warning(f"Connection for {service_name} is failing")
+            self.initialization_status[service_name] = result
+            if result and service_name in self._failed_services:
+                self.services[service_name] = self._failed_services.pop(
+                    service_name
+                )
+        return results
+
+    def get_validation_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the cached connection check results.
+
+        Returns:
+            Dictionary mapping service names to the last result, its age and
+            how long the check took, in seconds
+        """
+        now = time.monotonic()
+        return {
+            service_name: {
+                "valid": result,
+                "age_seconds": round(now - checked_at, 1),
+                "duration_seconds": round(
+                    self._validation_durations.get(service_name, 0.0), 3
+                ),
+            }
+            for service_name, (checked_at, result) in self._validation_cache.items()
+        }
+
     def get_service(self, service_name: str) -> Any:
         """
         Get a specific service by name.
@@ -594,34 +687,33 @@ class IntegrationManager:
             logger.error(f"Error synchronizing data from Notion to {service_name}: {e}")
             return False
 
-    async def validate_all_connections(self) -> Dict[str, bool]:
+    async def validate_all_connections(self, force: bool = False) -> Dict[str, bool]:
         """
         Validate connections for all initialized services.
 
+        Checks run concurrently, and results younger than the validation
+        cache TTL are reused unless force is set.
+
+        Args:
+            force: Check every connection again even if a result is cached
+
         Returns:
             Dictionary mapping service names to validation results
         """
-        validation_results = {}
-
-        for service_name, service in self.services.items():
-            try:
-                if hasattr(service, "validate_connection"):
-                    logger.info(f"Validating connection for {service_name}...")
-                    result = await service.validate_connection()
-                    validation_results[service_name] = result
-                    if result:
-                        logger.info(f"Connection validated for {service_name}")
-                    else:
-                        logger.warning(
-                            f"Connection validation failed for {service_name}"
-                        )
-                else:
-                    logger.warning(
-                        f"Service {service_name} does not support connection validation"
-                    )
-                    validation_results[service_name] = False
-            except Exception as e:
-                logger.error(f"Error validating connection for {service_name}: {e}")
-                validation_results[service_name] = False
+        checks = self._service_checks()
+        validation_results = {
+            service_name: False
+            for service_name in self.services
+            if service_name not in checks
+        }
+        for service_name in validation_results:
+            logger.warning(
+                f"Service {service_name} does not support connection validation"
+            )
 
+        results = await self._validate_many(checks, force=force)
+        for service_name, result in results.items():
+            if not result:
+                logger.warning(f"Connection validation failed for {service_name}")
+        validation_results.update(results)
         return validation_results
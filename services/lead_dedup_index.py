@@ -0,0 +1,416 @@
+"""
+Lead Deduplication Index for The HigherSelf Network Server.
+
+Answers "have we accepted this lead recently?" without querying Notion. Each
+accepted lead is recorded under its normalized email, keyed by its
+StandardizedLead fingerprint, and expires after the deduplication window.
+
+Features:
+- In-process Bloom filter for fast negatives (most leads are new)
+- Redis sorted sets with time-window expiry, shared by all workers
+- In-memory fallback when Redis is unavailable
+- Warm-up from recent Notion workflow instances at startup
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+
+def normalize_email(email: str) -> str:
+    """Normalize an email address for deduplication."""
+    return email.strip().lower()
+
+
+def sources_match(existing: str, incoming: str) -> bool:
+    """
+    Check whether two lead sources count as the same source.
+
+    Sources match if equal or if one contains the other, so that for example
+    "ZapierEventbrite" and "Eventbrite" are treated as the same source.
+    """
+    if not existing or not incoming:
+        return False
+
+    existing = existing.lower()
+    incoming = incoming.lower()
+    return existing == incoming or incoming in existing or existing in incoming
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01):
+        """
+        Initialize the Bloom filter.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate at capacity
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class LeadDedupEntry(BaseModel):
+    """A lead recorded in the deduplication index."""
+
+    email: str
+    fingerprint: str
+    source: str
+    instance_id: Optional[str] = None
+    accepted_at: float
+
+
+class LeadDedupIndex:
+    """
+    Time-windowed index of recently accepted leads.
+
+    Lookups first consult a Bloom filter of recently seen emails; only possible
+    matches go to Redis (or the in-memory fallback). The Bloom filter has two
+    generations that rotate every window, so emails older than two windows
+    fall out of it without a rebuild. Emails accepted by other workers are
+    pulled into the local filter every sync_interval seconds.
+    """
+
+    def __init__(
+        self,
+        window_hours: float = 24,
+        prefix: str = "leads:dedup",
+        bloom_capacity: int = 100_000,
+        bloom_error_rate: float = 0.01,
+        sync_interval: float = 1.0,
+        use_redis: bool = True,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            window_hours: Deduplication window in hours
+            prefix: Redis key prefix
+            bloom_capacity: Expected leads per window
+            bloom_error_rate: Bloom filter false positive rate
+            sync_interval: Seconds between pulls of other workers' leads
+            use_redis: Whether to store entries in Redis
+        """
+        self.window = window_hours * 3600
+        self.prefix = prefix
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.sync_interval = sync_interval
+        self.use_redis = use_redis
+
+        self._bloom = self._new_bloom()
+        self._previous_bloom = self._new_bloom()
+        self._rotated_at = time.time()
+        self._synced_at = time.time()
+        self._local: Dict[str, List[LeadDedupEntry]] = {}
+        self._redis = None
+        self._warmed = False
+        self._warm_lock = asyncio.Lock()
+        self._metrics = {"checks": 0, "bloom_negatives": 0, "duplicates": 0}
+
+    @property
+    def warmed(self) -> bool:
+        """Whether the index has been loaded from Notion."""
+        return self._warmed
+
+    def _new_bloom(self) -> BloomFilter:
+        return BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+
+    def _email_key(self, email: str) -> str:
+        return f"{self.prefix}:email:{email}"
+
+    def _meta_key(self, email: str) -> str:
+        return f"{self.prefix}:meta:{email}"
+
+    @property
+    def _recent_key(self) -> str:
+        return f"{self.prefix}:recent"
+
+    async def _get_redis(self):
+        """Get the async Redis client, or None if Redis is unavailable."""
+        if not self.use_redis:
+            return None
+
+        if self._redis is None:
+            try:
+                from services.redis_service import redis_service
+
+                self._redis = await redis_service.get_async_client()
+            except Exception as e:
+                logger.warning(f"Redis unavailable, lead dedup index is local: {e}")
+                self.use_redis = False
+                return None
+
+        return self._redis
+
+    def _rotate(self, now: float) -> None:
+        """Drop the oldest Bloom generation once a window has passed."""
+        if now - self._rotated_at < self.window:
+            return
+
+        self._previous_bloom = self._bloom
+        self._bloom = self._new_bloom()
+        self._rotated_at = now
+        self._local = {
+            email: kept
+            for email, entries in self._local.items()
+            if (kept := [e for e in entries if e.accepted_at >= now - self.window])
+        }
+
+    def _maybe_seen(self, email: str) -> bool:
+        return email in self._bloom or email in self._previous_bloom
+
+    async def _sync(self, now: float, since: Optional[float] = None) -> None:
+        """Add emails accepted by other workers to the local Bloom filter."""
+        if since is None:
+            if now - self._synced_at < self.sync_interval:
+                return
+            # Overlap the previous sync to tolerate clock skew between workers
+            since = self._synced_at - self.sync_interval
+
+        redis = await self._get_redis()
+        if redis is None:
+            return
+
+        self._synced_at = now
+        try:
+            emails = await redis.zrangebyscore(self._recent_key, since, "+inf")
+        except Exception as e:
+            logger.warning(f"Failed to sync lead dedup index: {e}")
+            return
+
+        for email in emails:
+            self._bloom.add(email)
+
+    async def add(
+        self,
+        email: str,
+        source: str,
+        fingerprint: str,
+        instance_id: Optional[str] = None,
+        accepted_at: Optional[float] = None,
+    ) -> None:
+        """
+        Record an accepted lead.
+
+        Args:
+            email: Lead email address
+            source: Lead source system
+            fingerprint: StandardizedLead fingerprint
+            instance_id: Workflow instance (Notion page) created for the lead
+            accepted_at: Unix timestamp the lead was accepted (default: now)
+        """
+        now = time.time()
+        self._rotate(now)
+
+        entry = LeadDedupEntry(
+            email=normalize_email(email),
+            fingerprint=fingerprint,
+            source=source,
+            instance_id=instance_id,
+            accepted_at=accepted_at or now,
+        )
+        if entry.accepted_at < now - self.window:
+            return
+
+        self._bloom.add(entry.email)
+
+        redis = await self._get_redis()
+        if redis is None:
+            self._local.setdefault(entry.email, []).append(entry)
+            return
+
+        ttl = int(self.window) + 1
+        cutoff = now - self.window
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.zadd(
+                    self._email_key(entry.email), {fingerprint: entry.accepted_at}
+                )
+                pipe.zremrangebyscore(self._email_key(entry.email), "-inf", cutoff)
+                pipe.hset(
+                    self._meta_key(entry.email),
+                    fingerprint,
+                    json.dumps({"source": source, "instance_id": instance_id}),
+                )
+                pipe.expire(self._email_key(entry.email), ttl)
+                pipe.expire(self._meta_key(entry.email), ttl)
+                pipe.zadd(self._recent_key, {entry.email: entry.accepted_at})
+                pipe.zremrangebyscore(self._recent_key, "-inf", cutoff)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record lead in Redis, keeping it locally: {e}")
+            self._local.setdefault(entry.email, []).append(entry)
+
+    async def find_duplicate(self, email: str, source: str) -> Optional[LeadDedupEntry]:
+        """
+        Find a lead from a matching source accepted within the window.
+
+        Args:
+            email: Lead email address
+            source: Lead source system
+
+        Returns:
+            The most recent matching entry, or None
+        """
+        now = time.time()
+        email = normalize_email(email)
+        self._metrics["checks"] += 1
+        self._rotate(now)
+        await self._sync(now)
+
+        if not self._maybe_seen(email):
+            self._metrics["bloom_negatives"] += 1
+            return None
+
+        entries = list(self._local.get(email, []))
+        entries.extend(await self._load_from_redis(email, now))
+
+        cutoff = now - self.window
+        matches = [
+            e
+            for e in entries
+            if e.accepted_at >= cutoff and sources_match(e.source, source)
+        ]
+        if not matches:
+            return None
+
+        self._metrics["duplicates"] += 1
+        return max(matches, key=lambda e: e.accepted_at)
+
+    async def _load_from_redis(self, email: str, now: float) -> List[LeadDedupEntry]:
+        redis = await self._get_redis()
+        if redis is None:
+            return []
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zrangebyscore(
+                    self._email_key(email), now - self.window, "+inf", withscores=True
+                )
+                pipe.hgetall(self._meta_key(email))
+                scored, meta = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to read lead dedup index from Redis: {e}")
+            return []
+
+        entries = []
+        for fingerprint, accepted_at in scored:
+            info = json.loads(meta.get(fingerprint, "{}"))
+            entries.append(
+                LeadDedupEntry(
+                    email=email,
+                    fingerprint=fingerprint,
+                    source=info.get("source", ""),
+                    instance_id=info.get("instance_id"),
+                    accepted_at=accepted_at,
+                )
+            )
+        return entries
+
+    async def warm_from_notion(self, notion_service: Any, page_size: int = 100) -> int:
+        """
+        Load leads accepted within the window from Notion workflow instances.
+
+        Follows Notion's pagination until every instance in the window is
+        loaded, then loads every email recorded in Redis within the window
+        into the local Bloom filter. Runs once successfully; later calls
+        return immediately. If Notion fails the error is raised and the next
+        call tries again.
+
+        Args:
+            notion_service: NotionService used to query workflow instances
+            page_size: Number of instances requested per Notion query
+
+        Returns:
+            Number of leads added to the index
+        """
+        async with self._warm_lock:
+            if self._warmed:
+                return 0
+
+            from models.notion_db_models import WorkflowInstance
+
+            since = datetime.fromtimestamp(time.time() - self.window)
+            pages = notion_service.iter_database(
+                WorkflowInstance,
+                filter_conditions={
+                    "property": "start_date",
+                    "date": {"on_or_after": since.isoformat()},
+                },
+                page_size=page_size,
+            )
+
+            count = 0
+            async for instances in pages:
+                for instance in instances:
+                    if not instance.client_lead_email or not instance.start_date:
+                        continue
+
+                    fingerprint = (instance.key_data_payload or {}).get(
+                        "lead_fingerprint"
+                    ) or hashlib.md5(
+                        f"{instance.client_lead_email.lower()}:"
+                        f"{instance.source_system}:{instance.source_record_id}".encode()
+                    ).hexdigest()
+
+                    await self.add(
+                        instance.client_lead_email,
+                        instance.source_system or "",
+                        fingerprint,
+                        instance_id=instance.page_id,
+                        accepted_at=instance.start_date.timestamp(),
+                    )
+                    count += 1
+
+            # Leads accepted by other workers that are already in Redis
+            now = time.time()
+            await self._sync(now, since=now - self.window)
+
+            self._warmed = True
+            logger.info(f"Warmed lead dedup index with {count} recent leads")
+            return count
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get lookup metrics."""
+        metrics = self._metrics.copy()
+        metrics["local_emails"] = len(self._local)
+        metrics["backend"] = "redis" if self.use_redis else "memory"
+        return metrics
+
+
+_indexes: Dict[float, LeadDedupIndex] = {}
+
+
+def get_lead_dedup_index(window_hours: float = 24) -> LeadDedupIndex:
+    """Get the process-wide lead dedup index for a deduplication window."""
+    if window_hours not in _indexes:
+        _indexes[window_hours] = LeadDedupIndex(window_hours=window_hours)
+    return _indexes[window_hours]
@@ -0,0 +1,704 @@
+"""
+Local Model Server for The HigherSelf Network Server.
+
+One sidecar process per host holds the local models (sentence-transformers
+embedders and Hugging Face pipelines) and serves every API and Celery worker
+on that host over a Unix socket. The host keeps one copy of each model instead
+of one per worker, and models are loaded before the first request arrives.
+
+Features:
+- Models loaded once at startup from MODEL_SERVER_EMBEDDING_MODELS and
+  MODEL_SERVER_PIPELINES
+- Dynamic batching: concurrent embedding requests for a model are merged
+  into one encode() call, up to a batch size or a short wait
+- Length-prefixed JSON frames, with embeddings returned as raw float32 bytes
+- Thin async client with a small connection pool for the workers
+
+Run the sidecar with:
+    python -m services.model_server
+
+Workers find it through MODEL_SERVER_SOCKET; see get_model_server_client().
+"""
+
+import asyncio
+import json
+import os
+import signal
+import struct
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from utils.error_handling import ServiceException
+
+DEFAULT_SOCKET_PATH = "data/models.sock"
+
+# Frame header: length of the JSON header that follows
+_FRAME_PREFIX = struct.Struct(">I")
+MAX_HEADER_BYTES = 16 * 1024 * 1024
+
+
+class ModelServerError(ServiceException):
+    """Exception raised when the model server cannot serve a request."""
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(message=message, service_name="model_server", details=details)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy values found in pipeline outputs."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def write_frame(
+    writer: asyncio.StreamWriter, header: Dict[str, Any], payload: bytes = b""
+) -> None:
+    """
+    Write one frame: JSON header, then an optional binary payload.
+
+    Args:
+        writer: Stream to write to
+        header: JSON-serializable header; payload_bytes is set from payload
+        payload: Binary payload
+    """
+    header = {**header, "payload_bytes": len(payload)}
+    encoded = json.dumps(header, default=_json_default).encode("utf-8")
+    writer.write(_FRAME_PREFIX.pack(len(encoded)) + encoded + payload)
+    await writer.drain()
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Read one frame written by write_frame.
+
+    Returns:
+        The header and the payload
+
+    Raises:
+        asyncio.IncompleteReadError: If the peer closed the connection
+    """
+    (length,) = _FRAME_PREFIX.unpack(await reader.readexactly(_FRAME_PREFIX.size))
+    if length > MAX_HEADER_BYTES:
+        raise ValueError(f"Frame header of {length} bytes is too large")
+    header = json.loads(await reader.readexactly(length))
+    payload = b""
+    if header.get("payload_bytes"):
+        payload = await reader.readexactly(header["payload_bytes"])
+    return header, payload
+
+
+class EmbeddingBatcher:
+    """
+    Merges concurrent embedding requests for one model into batches.
+
+    A request waits at most `max_wait` seconds for others to join it. The
+    model runs in a worker thread, one batch at a time.
+    """
+
+    def __init__(self, model: Any, max_batch_size: int = 64, max_wait: float = 0.005):
+        """
+        Initialize the batcher.
+
+        Args:
+            model: Object with a sentence-transformers style encode() method
+            max_batch_size: Texts per encode() call
+            max_wait: Seconds a request waits for others to batch with
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: Deque[Tuple[List[str], asyncio.Future]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._metrics = {"requests": 0, "texts": 0, "batches": 0, "max_batch": 0}
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        """Embedding dimensions reported by the model, if it reports them."""
+        get_dimension = getattr(self.model, "get_sentence_embedding_dimension", None)
+        return get_dimension() if callable(get_dimension) else None
+
+    def start(self) -> None:
+        """Start the batching task."""
+        if self._task and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching task, failing any queued requests."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            _, future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(ModelServerError("Model server is stopping"))
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts as part of the next batch.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array with one row per text
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((texts, future))
+        self._metrics["requests"] += 1
+        self._wakeup.set()
+        return await future
+
+    def _take_batch(self) -> List[Tuple[List[str], asyncio.Future]]:
+        """Take queued requests up to the batch size; always at least one."""
+        batch = []
+        count = 0
+        while self._pending:
+            texts, future = self._pending[0]
+            if batch and count + len(texts) > self.max_batch_size:
+                break
+            self._pending.popleft()
+            if future.done():
+                continue  # Caller went away
+            batch.append((texts, future))
+            count += len(texts)
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            queued = sum(len(texts) for texts, _ in self._pending)
+            if queued < self.max_batch_size and self.max_wait > 0:
+                # Give concurrent requests a moment to join the batch
+                await asyncio.sleep(self.max_wait)
+            self._wakeup.clear()
+
+            batch = self._take_batch()
+            if self._pending:
+                self._wakeup.set()
+            if not batch:
+                continue
+
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            self._metrics["batches"] += 1
+            self._metrics["texts"] += len(texts)
+            self._metrics["max_batch"] = max(self._metrics["max_batch"], len(texts))
+            try:
+                vectors = await asyncio.to_thread(
+                    self.model.encode,
+                    texts,
+                    batch_size=self.max_batch_size,
+                    convert_to_numpy=True,
+                )
+                vectors = np.asarray(vectors, dtype=np.float32)
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(texts)} texts failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            start = 0
+            for request_texts, future in batch:
+                end = start + len(request_texts)
+                if not future.done():
+                    future.set_result(vectors[start:end])
+                start = end
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get batching counters."""
+        metrics = self._metrics.copy()
+        metrics["queued"] = len(self._pending)
+        metrics["average_batch"] = (
+            round(metrics["texts"] / metrics["batches"], 2) if metrics["batches"] else 0
+        )
+        return metrics
+
+
+class ModelServer:
+    """
+    Sidecar process serving local models over a Unix socket.
+
+    Operations:
+    - embed: {"model", "texts"} -> float32 matrix as the payload
+    - pipeline: {"model", "inputs", "parameters"} -> {"result"}
+    - health: served models and batching metrics
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        max_batch_size: int = 64,
+        max_batch_wait: float = 0.005,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            socket_path: Unix socket to listen on
+            max_batch_size: Texts per embedding batch
+            max_batch_wait: Seconds an embedding request waits for others
+        """
+        self.socket_path = socket_path
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.embedders: Dict[str, EmbeddingBatcher] = {}
+        self.pipelines: Dict[str, Tuple[str, Any]] = {}
+        self._pipeline_locks: Dict[str, asyncio.Lock] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Set[asyncio.Task] = set()
+        self._started_at = time.time()
+        self._metrics = {"connections": 0, "requests": 0, "errors": 0}
+
+    @classmethod
+    def from_env(cls) -> "ModelServer":
+        """
+        Create a ModelServer instance using environment variables.
+
+        Environment variables:
+            MODEL_SERVER_SOCKET: Unix socket path (default: data/models.sock)
+            MODEL_SERVER_MAX_BATCH_SIZE: Texts per embedding batch (default: 64)
+            MODEL_SERVER_MAX_BATCH_WAIT_MS: Batching wait in milliseconds (default: 5)
+        """
+        return cls(
+            socket_path=os.environ.get("MODEL_SERVER_SOCKET", DEFAULT_SOCKET_PATH),
+            max_batch_size=int(os.environ.get("MODEL_SERVER_MAX_BATCH_SIZE", "64")),
+            max_batch_wait=float(os.environ.get("MODEL_SERVER_MAX_BATCH_WAIT_MS", "5"))
+            / 1000,
+        )
+
+    def add_embedding_model(self, name: str, model: Any) -> None:
+        """
+        Serve an embedding model.
+
+        Args:
+            name: Name clients request the model by
+            model: Object with a sentence-transformers style encode() method
+        """
+        self.embedders[name] = EmbeddingBatcher(
+            model, self.max_batch_size, self.max_batch_wait
+        )
+
+    def add_pipeline(self, model_id: str, task: str, pipeline: Any) -> None:
+        """
+        Serve a Hugging Face pipeline.
+
+        Args:
+            model_id: Hugging Face model ID clients request it by
+            task: Pipeline task, e.g. "summarization"
+            pipeline: Callable pipeline
+        """
+        self.pipelines[model_id] = (task, pipeline)
+        self._pipeline_locks[model_id] = asyncio.Lock()
+
+    def load_models(self) -> None:
+        """
+        Load the models configured in the environment.
+
+        Environment variables:
+            MODEL_SERVER_EMBEDDING_MODELS: Comma-separated sentence-transformers
+                models (default: LOCAL_EMBEDDING_MODEL or all-MiniLM-L6-v2)
+            MODEL_SERVER_PIPELINES: Comma-separated task:model_id pairs, e.g.
+                summarization:facebook/bart-large-cnn (default: none)
+        """
+        embedding_models = os.environ.get(
+            "MODEL_SERVER_EMBEDDING_MODELS",
+            os.environ.get("LOCAL_EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+        )
+        names = [name.strip() for name in embedding_models.split(",") if name.strip()]
+        if names:
+            from sentence_transformers import SentenceTransformer
+
+            for name in names:
+                start = time.perf_counter()
+                self.add_embedding_model(name, SentenceTransformer(name))
+                logger.info(
+                    f"Loaded embedding model {name} in "
+                    f"{time.perf_counter() - start:.1f}s"
+                )
+
+        specs = [
+            spec.strip()
+            for spec in os.environ.get("MODEL_SERVER_PIPELINES", "").split(",")
+            if spec.strip()
+        ]
+        if specs:
+            from transformers import pipeline
+
+            for spec in specs:
+                task, _, model_id = spec.partition(":")
+                if not model_id:
+                    logger.warning(f"Ignoring pipeline {spec}; expected task:model_id")
+                    continue
+                start = time.perf_counter()
+                self.add_pipeline(model_id, task, pipeline(task, model=model_id))
+                logger.info(
+                    f"Loaded {task} pipeline {model_id} in "
+                    f"{time.perf_counter() - start:.1f}s"
+                )
+
+    async def start(self) -> None:
+        """Start listening on the Unix socket."""
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        if os.path.exists(self.socket_path):
+            # Left behind by a previous run
+            os.remove(self.socket_path)
+        for batcher in self.embedders.values():
+            batcher.start()
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.socket_path
+        )
+        os.chmod(self.socket_path, 0o660)
+        logger.info(
+            f"Model server listening on {self.socket_path} "
+            f"(embeddings: {list(self.embedders) or 'none'}, "
+            f"pipelines: {list(self.pipelines) or 'none'})"
+        )
+
+    async def stop(self) -> None:
+        """Stop accepting connections and remove the socket."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Idle client connections would otherwise keep their handlers waiting
+        for handler in list(self._handlers):
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        for batcher in self.embedders.values():
+            await batcher.stop()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        logger.info("Model server stopped")
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._metrics["connections"] += 1
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                try:
+                    header, payload = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    return  # Client closed the connection
+
+                self._metrics["requests"] += 1
+                try:
+                    response, response_payload = await self._dispatch(header, payload)
+                except Exception as e:
+                    self._metrics["errors"] += 1
+                    response, response_payload = {"ok": False, "error": str(e)}, b""
+                await write_frame(writer, response, response_payload)
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Dropping model server connection: {e}")
+        except asyncio.CancelledError:
+            pass  # Server stopping
+        finally:
+            self._handlers.discard(handler)
+            writer.close()
+
+    async def _dispatch(
+        self, header: Dict[str, Any], payload: bytes
+    ) -> Tuple[Dict[str, Any], bytes]:
+        op = header.get("op")
+        if op == "embed":
+            batcher = self.embedders.get(header.get("model"))
+            if batcher is None:
+                raise ValueError(f"Embedding model {header.get('model')} not served")
+            vectors = await batcher.encode(list(header.get("texts", [])))
+            return {
+                "ok": True,
+                "shape": list(vectors.shape),
+                "dtype": "float32",
+            }, vectors.tobytes()
+
+        if op == "pipeline":
+            model_id = header.get("model")
+            if model_id not in self.pipelines:
+                raise ValueError(f"Pipeline {model_id} not served")
+            _, pipeline = self.pipelines[model_id]
+            parameters = dict(header.get("parameters") or {})
+            # Accept the Inference API request shape as well
+            parameters = parameters.get("parameters", parameters)
+            parameters.pop("options", None)
+            # Pipelines are not thread-safe, so each runs one call at a time
+            async with self._pipeline_locks[model_id]:
+                result = await asyncio.to_thread(
+                    pipeline, header.get("inputs"), **parameters
+                )
+            return {"ok": True, "result": result}, b""
+
+        if op == "health":
+            return {"ok": True, **self.get_status()}, b""
+
+        raise ValueError(f"Unknown operation {op}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get served models and metrics."""
+        return {
+            "embedding_models": {
+                name: {"dimensions": batcher.dimensions, **batcher.get_metrics()}
+                for name, batcher in self.embedders.items()
+            },
+            "pipelines": {
+                model_id: task for model_id, (task, _) in self.pipelines.items()
+            },
+            "uptime_seconds": round(time.time() - self._started_at, 1),
+            **self._metrics,
+        }
+
+
+class ModelServerClient:
+    """
+    Thin async client for the model server.
+
+    Keeps a few idle connections open for reuse. Connections belong to the
+    event loop that opened them; if called from another loop, the client
+    drops them and opens new ones.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        timeout: float = 30.0,
+        max_idle_connections: int = 4,
+        health_ttl: float = 60.0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Unix socket of the model server
+            timeout: Seconds to wait for a response
+            max_idle_connections: Idle connections kept for reuse
+            health_ttl: Seconds to cache the list of served models
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.max_idle_connections = max_idle_connections
+        self.health_ttl = health_ttl
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._health: Optional[Dict[str, Any]] = None
+        self._health_at = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ModelServerClient":
+        """
+        Create a ModelServerClient instance using environment variables.
+
+        Environment variables:
+            MODEL_SERVER_SOCKET: Unix socket path (default: data/models.sock)
+            MODEL_SERVER_TIMEOUT: Seconds to wait for a response (default: 30)
+        """
+        return cls(
+            socket_path=os.environ.get("MODEL_SERVER_SOCKET", DEFAULT_SOCKET_PATH),
+            timeout=float(os.environ.get("MODEL_SERVER_TIMEOUT", "30")),
+        )
+
+    @property
+    def available(self) -> bool:
+        """Whether the server's socket exists."""
+        return os.path.exists(self.socket_path)
+
+    @asynccontextmanager
+    async def _connection(
+        self,
+    ) -> AsyncIterator[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._idle = []
+            self._loop = loop
+
+        if self._idle:
+            connection = self._idle.pop()
+        else:
+            try:
+                connection = await asyncio.open_unix_connection(self.socket_path)
+            except OSError as e:
+                raise ModelServerError(
+                    f"Model server unavailable at {self.socket_path}: {e}"
+                ) from e
+
+        try:
+            yield connection
+        except BaseException:
+            # The connection may hold half a response; never reuse it
+            connection[1].close()
+            raise
+        if len(self._idle) < self.max_idle_connections:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+
+    async def _request(self, header: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        """Send a request and wait for its response."""
+
+        async def exchange(reader, writer):
+            await write_frame(writer, header)
+            return await read_frame(reader)
+
+        # Every operation is idempotent, so a request that failed on a pooled
+        # connection (e.g. after the server restarted) is retried once
+        for attempt in range(2):
+            try:
+                async with self._connection() as (reader, writer):
+                    response, payload = await asyncio.wait_for(
+                        exchange(reader, writer), timeout=self.timeout
+                    )
+                break
+            except ModelServerError:
+                raise
+            except asyncio.TimeoutError as e:
+                raise ModelServerError(
+                    f"Model server did not answer {header['op']} "
+                    f"within {self.timeout}s"
+                ) from e
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                if attempt:
+                    raise ModelServerError(
+                        f"Model server connection failed: {e}"
+                    ) from e
+
+        if not response.get("ok"):
+            raise ModelServerError(
+                response.get("error", "Model server request failed"),
+                details={"op": header["op"]},
+            )
+        return response, payload
+
+    async def embed(self, texts: List[str], model: str) -> np.ndarray:
+        """
+        Embed texts with a served model.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model name
+
+        Returns:
+            float32 array with one row per text
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        response, payload = await self._request(
+            {"op": "embed", "model": model, "texts": texts}
+        )
+        return np.frombuffer(payload, dtype=np.float32).reshape(response["shape"])
+
+    async def run_pipeline(
+        self, model_id: str, inputs: Any, parameters: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Run a served Hugging Face pipeline.
+
+        Args:
+            model_id: Hugging Face model ID
+            inputs: Pipeline inputs
+            parameters: Pipeline keyword arguments
+
+        Returns:
+            The pipeline output, shaped like the Inference API response
+        """
+        response, _ = await self._request(
+            {
+                "op": "pipeline",
+                "model": model_id,
+                "inputs": inputs,
+                "parameters": parameters or {},
+            }
+        )
+        return response["result"]
+
+    async def health(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get served models and metrics, cached for health_ttl seconds.
+
+        Args:
+            refresh: Ask the server even if a cached answer is fresh
+
+        Returns:
+            The server's status
+        """
+        if (
+            refresh
+            or self._health is None
+            or time.monotonic() - self._health_at > self.health_ttl
+        ):
+            self._health, _ = await self._request({"op": "health"})
+            self._health_at = time.monotonic()
+        return self._health
+
+    async def serves_embedding_model(self, model: str) -> bool:
+        """Whether the server is reachable and serves an embedding model."""
+        if not self.available:
+            return False
+        try:
+            return model in (await self.health())["embedding_models"]
+        except ModelServerError:
+            return False
+
+    async def serves_pipeline(self, model_id: str) -> bool:
+        """Whether the server is reachable and serves a pipeline."""
+        if not self.available:
+            return False
+        try:
+            return model_id in (await self.health())["pipelines"]
+        except ModelServerError:
+            return False
+
+    async def close(self) -> None:
+        """Close idle connections."""
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+
+_model_server_client: Optional[ModelServerClient] = None
+
+
+def get_model_server_client() -> Optional[ModelServerClient]:
+    """
+    Get the process-wide model server client.
+
+    Returns:
+        The client, or None if MODEL_SERVER_SOCKET is not set
+    """
+    global _model_server_client
+    if _model_server_client is None and os.environ.get("MODEL_SERVER_SOCKET"):
+        _model_server_client = ModelServerClient.from_env()
+    return _model_server_client
+
+
+async def _serve() -> None:
+    server = ModelServer.from_env()
+    # Load before listening, so workers never reach a server without models
+    await asyncio.to_thread(server.load_models)
+    await server.start()
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    await stopped.wait()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(_serve())
@@ -0,0 +1,373 @@
+"""
+MongoDB Write-Behind Sink for The HigherSelf Network Server.
+
+Takes audit and analytics inserts off the request path. Callers append a
+document to an in-memory buffer and return immediately; a background task
+writes the buffers to MongoDB with insert_many.
+
+Features:
+- Bounded buffer per collection; the oldest documents are dropped when full
+- Flush on interval or as soon as a collection has a full batch
+- Documents get their _id when queued, so callers still receive a record ID
+  and replays are idempotent
+- Batches that cannot be written are spilled to a local JSON lines file and
+  replayed once MongoDB accepts writes again
+- Flush, spill and drop metrics
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from bson import ObjectId, json_util
+from loguru import logger
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo.errors import BulkWriteError
+
+# Metrics for monitoring the write-behind sink
+MONGO_SINK_DEPTH = Gauge(
+    "mongo_write_sink_depth", "Documents buffered for MongoDB", ["collection"]
+)
+MONGO_SINK_DOCUMENTS = Counter(
+    "mongo_write_sink_documents_total",
+    "Documents handled by the MongoDB write sink by outcome",
+    ["collection", "outcome"],
+)
+MONGO_SINK_FLUSH_DURATION = Histogram(
+    "mongo_write_sink_flush_duration_seconds", "Time taken by one insert_many batch"
+)
+
+# MongoDB duplicate key error; a replayed document that is already stored
+DUPLICATE_KEY_ERROR = 11000
+
+Writer = Callable[[str, List[Dict[str, Any]]], Awaitable[Any]]
+
+
+async def _insert_many(collection: str, documents: List[Dict[str, Any]]) -> None:
+    """Insert a batch, treating documents that already exist as written."""
+    from services.mongodb_service import mongo_service
+
+    try:
+        await mongo_service.async_insert_many(collection, documents, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+            raise
+
+
+class MongoWriteSink:
+    """
+    Write-behind buffer for MongoDB inserts.
+
+    write() is a synchronous append, so it costs the caller no database
+    round trip. Documents are written in batches per collection by a
+    background task started on first use.
+    """
+
+    def __init__(
+        self,
+        writer: Optional[Writer] = None,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 50000,
+        spill_path: Optional[str] = "mongo_write_spill.jsonl",
+        max_spill_bytes: int = 100 * 1024 * 1024,
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            writer: Coroutine writing a batch to a collection (default:
+                mongo_service.async_insert_many)
+            batch_size: Documents per insert_many
+            flush_interval: Seconds between background flushes
+            max_pending: Documents buffered per collection before the oldest
+                are dropped
+            spill_path: JSON lines file for batches MongoDB did not accept,
+                or None to drop them
+            max_spill_bytes: Size beyond which further batches are dropped
+                instead of spilled
+        """
+        self.writer = writer or _insert_many
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.spill_path = spill_path
+        self.max_spill_bytes = max_spill_bytes
+
+        self._buffers: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._metrics = {
+            "queued": 0,
+            "written": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "flushes": 0,
+            "failed_batches": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "MongoWriteSink":
+        """
+        Create a MongoWriteSink instance using environment variables.
+
+        Environment variables:
+            MONGO_SINK_BATCH_SIZE: Documents per insert_many (default: 500)
+            MONGO_SINK_FLUSH_INTERVAL: Seconds between flushes (default: 1.0)
+            MONGO_SINK_MAX_PENDING: Documents buffered per collection (default: 50000)
+            MONGO_SINK_SPILL_PATH: Spill file for unwritten batches
+                (default: mongo_write_spill.jsonl)
+        """
+        return cls(
+            batch_size=int(os.environ.get("MONGO_SINK_BATCH_SIZE", "500")),
+            flush_interval=float(os.environ.get("MONGO_SINK_FLUSH_INTERVAL", "1.0")),
+            max_pending=int(os.environ.get("MONGO_SINK_MAX_PENDING", "50000")),
+            spill_path=os.environ.get(
+                "MONGO_SINK_SPILL_PATH", "mongo_write_spill.jsonl"
+            ),
+        )
+
+    @property
+    def depth(self) -> int:
+        """Number of buffered documents."""
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def write(self, collection: str, document: Dict[str, Any]) -> str:
+        """
+        Queue a document for insertion.
+
+        Args:
+            collection: Collection name
+            document: Document to insert; an _id is assigned if missing
+
+        Returns:
+            The document's _id as a string
+        """
+        document.setdefault("_id", ObjectId())
+
+        buffer = self._buffers.get(collection)
+        if buffer is None:
+            buffer = self._buffers[collection] = deque(maxlen=self.max_pending)
+        if len(buffer) == buffer.maxlen:
+            self._metrics["dropped"] += 1
+            MONGO_SINK_DOCUMENTS.labels(collection=collection, outcome="dropped").inc()
+        buffer.append(document)
+
+        self._metrics["queued"] += 1
+        MONGO_SINK_DEPTH.labels(collection=collection).set(len(buffer))
+
+        self._ensure_started()
+        if len(buffer) >= self.batch_size and self._flush_event:
+            self._flush_event.set()
+        return str(document["_id"])
+
+    def _ensure_started(self) -> None:
+        """Start the background flush task if an event loop is running."""
+        if self._task and not self._task.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_event = asyncio.Event()
+        self._flush_lock = self._flush_lock or asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        self._ensure_started()
+
+    async def stop(self) -> None:
+        """Stop the background task and write or spill everything buffered."""
+        if self._task and not self._task.done():
+            # Let a flush in progress finish; cancelling it would lose the
+            # batch it has taken off the buffer
+            self._stopping = True
+            self._flush_event.set()
+            try:
+                await self._task
+            finally:
+                self._stopping = False
+        self._task = None
+
+        await self.flush()
+        logger.info("MongoDB write sink stopped")
+
+    async def flush(self) -> int:
+        """
+        Write all buffered documents, then replay any spilled batches.
+
+        Returns:
+            Number of documents written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            written = 0
+            healthy = True
+            for collection, buffer in list(self._buffers.items()):
+                while buffer:
+                    batch = [
+                        buffer.popleft()
+                        for _ in range(min(self.batch_size, len(buffer)))
+                    ]
+                    if healthy and await self._write(collection, batch):
+                        written += len(batch)
+                    else:
+                        # Skip the round trip for the rest once MongoDB failed
+                        healthy = False
+                        await self._spill(collection, batch)
+                MONGO_SINK_DEPTH.labels(collection=collection).set(0)
+
+            if healthy:
+                written += await self._replay()
+
+            self._metrics["flushes"] += 1
+            return written
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get sink metrics."""
+        metrics = self._metrics.copy()
+        metrics["depth"] = self.depth
+        metrics["spill_bytes"] = self._spill_size()
+        return metrics
+
+    async def _run(self) -> None:
+        """Flush on interval or when a collection has a full batch, until stopped."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._flush_event.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_event.clear()
+            if self._stopping:
+                return
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing MongoDB write sink: {e}")
+
+    async def _write(self, collection: str, batch: List[Dict[str, Any]]) -> bool:
+        """Write one batch, returning whether MongoDB accepted it."""
+        start = time.perf_counter()
+        try:
+            await self.writer(collection, batch)
+        except Exception as e:
+            logger.warning(
+                f"Failed to write {len(batch)} documents to {collection}: {e}"
+            )
+            self._metrics["failed_batches"] += 1
+            return False
+
+        MONGO_SINK_FLUSH_DURATION.observe(time.perf_counter() - start)
+        self._metrics["written"] += len(batch)
+        MONGO_SINK_DOCUMENTS.labels(collection=collection, outcome="written").inc(
+            len(batch)
+        )
+        return True
+
+    def _spill_size(self) -> int:
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return 0
+        return os.path.getsize(self.spill_path)
+
+    async def _spill(self, collection: str, batch: List[Dict[str, Any]]) -> None:
+        """Append an unwritten batch to the spill file, or drop it if it won't fit."""
+        data = "".join(
+            json_util.dumps(
+                {"collection": collection, "document": document},
+                json_options=json_util.CANONICAL_JSON_OPTIONS,
+            )
+            + "\n"
+            for document in batch
+        ).encode("utf-8")
+
+        # Spills run under the flush lock, so the size cannot change in between
+        if not self.spill_path or self._spill_size() + len(data) > self.max_spill_bytes:
+            self._metrics["dropped"] += len(batch)
+            MONGO_SINK_DOCUMENTS.labels(collection=collection, outcome="dropped").inc(
+                len(batch)
+            )
+            logger.error(f"Dropped {len(batch)} documents for {collection}")
+            return
+
+        def append() -> None:
+            with open(self.spill_path, "ab") as spill:
+                spill.write(data)
+
+        await asyncio.to_thread(append)
+        self._metrics["spilled"] += len(batch)
+        MONGO_SINK_DOCUMENTS.labels(collection=collection, outcome="spilled").inc(
+            len(batch)
+        )
+
+    async def _replay(self) -> int:
+        """Write spilled batches back to MongoDB, keeping any that still fail."""
+        if not self.spill_path:
+            return 0
+        replay_path = f"{self.spill_path}.replay"
+        if not self._spill_size() and not os.path.exists(replay_path):
+            return 0
+
+        def take() -> List[str]:
+            # A replay file left by an interrupted replay is retried as well;
+            # documents it already wrote are skipped as duplicates
+            lines = []
+            if os.path.exists(replay_path):
+                with open(replay_path, encoding="utf-8") as spill:
+                    lines = spill.readlines()
+            # Rename so batches spilled during the replay are kept apart
+            if os.path.exists(self.spill_path):
+                os.replace(self.spill_path, replay_path)
+                with open(replay_path, encoding="utf-8") as spill:
+                    lines.extend(spill.readlines())
+            return lines
+
+        lines = await asyncio.to_thread(take)
+        batches: Dict[str, List[Dict[str, Any]]] = {}
+        for line in lines:
+            try:
+                entry = json_util.loads(line)
+            except ValueError:
+                logger.warning("Skipping unreadable line in MongoDB spill file")
+                continue
+            batches.setdefault(entry["collection"], []).append(entry["document"])
+
+        replayed = 0
+        healthy = True
+        for collection, documents in batches.items():
+            for start in range(0, len(documents), self.batch_size):
+                batch = documents[start : start + self.batch_size]
+                if healthy and await self._write(collection, batch):
+                    replayed += len(batch)
+                else:
+                    healthy = False
+                    await self._spill(collection, batch)
+
+        await asyncio.to_thread(os.remove, replay_path)
+        if replayed:
+            self._metrics["replayed"] += replayed
+            logger.info(f"Replayed {replayed} spilled documents to MongoDB")
+        return replayed
+
+
+_mongo_write_sink: Optional[MongoWriteSink] = None
+
+
+def get_mongo_write_sink() -> MongoWriteSink:
+    """Get the process-wide MongoDB write sink, creating it from the environment."""
+    global _mongo_write_sink
+    if _mongo_write_sink is None:
+        _mongo_write_sink = MongoWriteSink.from_env()
+    return _mongo_write_sink
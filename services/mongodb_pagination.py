@@ -0,0 +1,105 @@
+"""
+Keyset pagination helpers for MongoDB queries.
+
+Pages are ordered on a sort field with _id as a tie-breaker, and an opaque
+page token records the (sort value, _id) of the last document served. Kept
+apart from the MongoDB service so they can be used without a connection.
+"""
+
+import base64
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from pymongo import ASCENDING, DESCENDING
+
+
+def _get_field(document: Dict[str, Any], field: str) -> Any:
+    """Read a possibly dotted field path from a document."""
+    value: Any = document
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def encode_page_token(document: Dict[str, Any], sort_field: str = "_id") -> str:
+    """
+    Encode the keyset position after a document as an opaque page token.
+
+    Args:
+        document: Last document of a page
+        sort_field: Field the page is sorted on
+
+    Returns:
+        URL-safe token for the next page
+    """
+    position = [_get_field(document, sort_field), document.get("_id")]
+    payload = json_util.dumps(position, json_options=json_util.CANONICAL_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_page_token(token: str) -> Tuple[Any, Any]:
+    """
+    Decode a page token from encode_page_token.
+
+    Args:
+        token: Page token
+
+    Returns:
+        (sort value, _id) of the last document of the previous page
+    """
+    try:
+        position = json_util.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {token}") from e
+    if not isinstance(position, list) or len(position) != 2:
+        raise ValueError(f"Invalid page token: {token}")
+    value, document_id = position
+    return value, document_id
+
+
+def keyset_query(
+    filter_dict: Dict[str, Any],
+    sort_field: str = "_id",
+    descending: bool = False,
+    after: Optional[str] = None,
+) -> Tuple[Dict[str, Any], List[Tuple[str, int]]]:
+    """
+    Build the filter and sort for one page of a keyset-paginated query.
+
+    Pages are sorted on sort_field with _id as a tie-breaker and continue
+    strictly after the position in the page token, so each page is an index
+    range scan instead of skipping over every earlier document.
+
+    Args:
+        filter_dict: Base filter
+        sort_field: Field to order by; should be indexed and present on
+            every document
+        descending: Whether to page from the highest value down
+        after: Page token of the previous page, if any
+
+    Returns:
+        (filter, sort) to pass to find()
+    """
+    direction = DESCENDING if descending else ASCENDING
+    sort = [(sort_field, direction)]
+    if sort_field != "_id":
+        sort.append(("_id", direction))
+
+    if after is None:
+        return filter_dict, sort
+
+    value, document_id = decode_page_token(after)
+    operator = "$lt" if descending else "$gt"
+    if sort_field == "_id":
+        position = {"_id": {operator: document_id}}
+    else:
+        position = {
+            "$or": [
+                {sort_field: {operator: value}},
+                {sort_field: value, "_id": {operator: document_id}},
+            ]
+        }
+    query = {"$and": [filter_dict, position]} if filter_dict else position
+    return query, sort
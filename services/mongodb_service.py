@@ -9,6 +9,9 @@ Features:
 - Connection pooling for better performance
 - Health check functionality
 - Metrics for monitoring
+- Keyset pagination (see services.mongodb_pagination), streaming cursors and
+  projections
+- Unordered bulk writes
 """
 
 import asyncio
@@ -17,13 +20,32 @@ import os
 import time
 from datetime import datetime
 from functools import wraps
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from dotenv import load_dotenv
 from loguru import logger
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, OperationFailure, PyMongoError
+from pymongo import IndexModel, MongoClient, UpdateOne
+from pymongo.errors import (
+    BulkWriteError,
+    ConnectionFailure,
+    OperationFailure,
+    PyMongoError,
+)
+
+from services.mongodb_pagination import encode_page_token, keyset_query
 
 # Import MongoBaseModel only if it exists
 try:
@@ -46,6 +68,9 @@ load_dotenv()
 # Type variable for Pydantic models
 T = TypeVar("T", bound=MongoBaseModel)
 
+# Documents fetched per round trip when streaming a cursor
+DEFAULT_BATCH_SIZE = 500
+
 
 # Custom JSON encoder for MongoDB
 class MongoJSONEncoder(json.JSONEncoder):
@@ -63,6 +88,59 @@ class MongoJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def _page_projection(
+    projection: Optional[Dict[str, Any]], sort_field: str
+) -> Optional[Dict[str, Any]]:
+    """Make sure an inclusion projection keeps the field the page token needs."""
+    if projection and sort_field not in projection and any(projection.values()):
+        return {**projection, sort_field: 1}
+    return projection
+
+
+def _bulk_counts(result: Any) -> Dict[str, int]:
+    """Summarize a BulkWriteResult."""
+    return {
+        "inserted": result.inserted_count,
+        "matched": result.matched_count,
+        "modified": result.modified_count,
+        "upserted": result.upserted_count,
+        "deleted": result.deleted_count,
+        "errors": 0,
+    }
+
+
+def _bulk_counts_empty() -> Dict[str, int]:
+    return dict.fromkeys(
+        ("inserted", "matched", "modified", "upserted", "deleted", "errors"), 0
+    )
+
+
+def _bulk_error_counts(error: BulkWriteError) -> Dict[str, int]:
+    """Summarize the partial result of an unordered bulk write that had errors."""
+    details = error.details
+    logger.warning(
+        f"MongoDB bulk write completed with {len(details.get('writeErrors', []))} "
+        f"errors: {details.get('writeErrors', [])[:3]}"
+    )
+    return {
+        "inserted": details.get("nInserted", 0),
+        "matched": details.get("nMatched", 0),
+        "modified": details.get("nModified", 0),
+        "upserted": details.get("nUpserted", 0),
+        "deleted": details.get("nRemoved", 0),
+        "errors": len(details.get("writeErrors", [])),
+    }
+
+
+def _upsert_operations(
+    documents: Sequence[Dict[str, Any]], key: str
+) -> List[UpdateOne]:
+    return [
+        UpdateOne({key: document[key]}, {"$set": document}, upsert=True)
+        for document in documents
+    ]
+
+
 # Decorator for retry logic
 def with_retry(max_retries: int = 3, delay: float = 0.5):
     """Decorator to add retry logic to MongoDB operations."""
@@ -203,9 +281,10 @@ class MongoDBService:
         limit: int = 0,
         skip: int = 0,
         sort_field: Optional[str] = None,
+        projection: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """Find multiple documents matching the filter criteria."""
-        cursor = self.get_collection(collection_name).find(filter_dict)
+        cursor = self.get_collection(collection_name).find(filter_dict, projection)
 
         if skip:
             cursor = cursor.skip(skip)
@@ -216,6 +295,109 @@ class MongoDBService:
 
         return list(cursor)
 
+    def find_page(
+        self,
+        collection_name: str,
+        filter_dict: Dict[str, Any],
+        limit: int = 100,
+        after: Optional[str] = None,
+        sort_field: str = "_id",
+        descending: bool = False,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Find one page of documents using keyset pagination.
+
+        Args:
+            collection_name: Collection to query
+            filter_dict: Filter criteria
+            limit: Page size
+            after: Page token returned with the previous page
+            sort_field: Field to order and page by
+            descending: Whether to page from the highest value down
+            projection: Optional field projection
+
+        Returns:
+            The page of documents and the token for the next page, or None
+            when this is the last page
+        """
+        query, sort = keyset_query(filter_dict, sort_field, descending, after)
+        cursor = (
+            self.get_collection(collection_name)
+            .find(query, _page_projection(projection, sort_field))
+            .sort(sort)
+            .limit(limit + 1)
+        )
+        documents = list(cursor)
+        if len(documents) <= limit:
+            return documents, None
+        documents = documents[:limit]
+        return documents, encode_page_token(documents[-1], sort_field)
+
+    def insert_many(
+        self,
+        collection_name: str,
+        documents: List[Dict[str, Any]],
+        ordered: bool = False,
+    ) -> List[str]:
+        """Insert documents into a collection in one round trip and return their IDs."""
+        if not documents:
+            return []
+        result = self.get_collection(collection_name).insert_many(
+            documents, ordered=ordered
+        )
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+    def bulk_write(
+        self,
+        collection_name: str,
+        operations: List[Any],
+        ordered: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Run write operations in one round trip.
+
+        With ordered=False the server applies every operation it can and the
+        failures are counted instead of aborting the batch.
+
+        Args:
+            collection_name: Collection to write to
+            operations: pymongo write operations, e.g. UpdateOne or InsertOne
+            ordered: Whether to stop at the first failing operation
+
+        Returns:
+            Counts of inserted, matched, modified, upserted, deleted and
+            failed operations
+        """
+        if not operations:
+            return _bulk_counts_empty()
+        try:
+            result = self.get_collection(collection_name).bulk_write(
+                operations, ordered=ordered
+            )
+        except BulkWriteError as e:
+            if ordered:
+                raise
+            return _bulk_error_counts(e)
+        return _bulk_counts(result)
+
+    def upsert_many(
+        self,
+        collection_name: str,
+        documents: Sequence[Dict[str, Any]],
+        key: str = "id",
+    ) -> Dict[str, int]:
+        """Insert or update documents matched on a key field in one bulk write."""
+        return self.bulk_write(collection_name, _upsert_operations(documents, key))
+
+    def create_indexes(
+        self, collection_name: str, indexes: List[IndexModel]
+    ) -> List[str]:
+        """Create indexes on a collection if missing and return their names."""
+        if not indexes:
+            return []
+        return self.get_collection(collection_name).create_indexes(indexes)
+
     def update_one(
         self,
         collection_name: str,
@@ -243,6 +425,19 @@ class MongoDBService:
         result = await collection.insert_one(document)
         return str(result.inserted_id)
 
+    async def async_insert_many(
+        self,
+        collection_name: str,
+        documents: List[Dict[str, Any]],
+        ordered: bool = False,
+    ) -> List[str]:
+        """Insert documents into a collection in one round trip and return their IDs."""
+        if not documents:
+            return []
+        collection = await self.get_async_collection(collection_name)
+        result = await collection.insert_many(documents, ordered=ordered)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+
     async def async_find_one(
         self, collection_name: str, filter_dict: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
@@ -257,10 +452,12 @@ class MongoDBService:
         limit: int = 0,
         skip: int = 0,
         sort_field: Optional[str] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ) -> List[Dict[str, Any]]:
         """Find multiple documents matching the filter criteria asynchronously."""
         collection = await self.get_async_collection(collection_name)
-        cursor = collection.find(filter_dict)
+        cursor = collection.find(filter_dict, projection).batch_size(batch_size)
 
         if skip:
             cursor = cursor.skip(skip)
@@ -269,10 +466,129 @@ class MongoDBService:
         if sort_field:
             cursor = cursor.sort([(sort_field, 1)])
 
-        result = []
+        return await cursor.to_list(length=limit or None)
+
+    async def async_iter_many(
+        self,
+        collection_name: str,
+        filter_dict: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream documents matching the filter criteria.
+
+        Documents are fetched batch_size at a time, so memory use does not
+        grow with the size of the result.
+
+        Args:
+            collection_name: Collection to query
+            filter_dict: Filter criteria
+            projection: Optional field projection
+            sort: Optional list of (field, direction) pairs
+            batch_size: Documents fetched per round trip
+
+        Yields:
+            Matching documents
+        """
+        collection = await self.get_async_collection(collection_name)
+        cursor = collection.find(filter_dict, projection).batch_size(batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
         async for document in cursor:
-            result.append(document)
-        return result
+            yield document
+
+    async def async_find_page(
+        self,
+        collection_name: str,
+        filter_dict: Dict[str, Any],
+        limit: int = 100,
+        after: Optional[str] = None,
+        sort_field: str = "_id",
+        descending: bool = False,
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Find one page of documents asynchronously using keyset pagination.
+
+        Args:
+            collection_name: Collection to query
+            filter_dict: Filter criteria
+            limit: Page size
+            after: Page token returned with the previous page
+            sort_field: Field to order and page by
+            descending: Whether to page from the highest value down
+            projection: Optional field projection
+
+        Returns:
+            The page of documents and the token for the next page, or None
+            when this is the last page
+        """
+        collection = await self.get_async_collection(collection_name)
+        query, sort = keyset_query(filter_dict, sort_field, descending, after)
+        cursor = (
+            collection.find(query, _page_projection(projection, sort_field))
+            .sort(sort)
+            .limit(limit + 1)
+        )
+        documents = await cursor.to_list(length=limit + 1)
+        if len(documents) <= limit:
+            return documents, None
+        documents = documents[:limit]
+        return documents, encode_page_token(documents[-1], sort_field)
+
+    async def async_bulk_write(
+        self,
+        collection_name: str,
+        operations: List[Any],
+        ordered: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Run write operations asynchronously in one round trip.
+
+        With ordered=False the server applies every operation it can and the
+        failures are counted instead of aborting the batch.
+
+        Args:
+            collection_name: Collection to write to
+            operations: pymongo write operations, e.g. UpdateOne or InsertOne
+            ordered: Whether to stop at the first failing operation
+
+        Returns:
+            Counts of inserted, matched, modified, upserted, deleted and
+            failed operations
+        """
+        if not operations:
+            return _bulk_counts_empty()
+        collection = await self.get_async_collection(collection_name)
+        try:
+            result = await collection.bulk_write(operations, ordered=ordered)
+        except BulkWriteError as e:
+            if ordered:
+                raise
+            return _bulk_error_counts(e)
+        return _bulk_counts(result)
+
+    async def async_upsert_many(
+        self,
+        collection_name: str,
+        documents: Sequence[Dict[str, Any]],
+        key: str = "id",
+    ) -> Dict[str, int]:
+        """Insert or update documents matched on a key field in one bulk write asynchronously."""
+        return await self.async_bulk_write(
+            collection_name, _upsert_operations(documents, key)
+        )
+
+    async def async_create_indexes(
+        self, collection_name: str, indexes: List[IndexModel]
+    ) -> List[str]:
+        """Create indexes on a collection asynchronously if missing and return their names."""
+        if not indexes:
+            return []
+        collection = await self.get_async_collection(collection_name)
+        return await collection.create_indexes(indexes)
 
     async def async_update_one(
         self,
@@ -395,6 +711,24 @@ class MongoDBService:
             # Insert new document
             return await self.async_insert_one(collection_name, model_dict)
 
+    def save_models(
+        self, collection_name: str, models: Sequence[MongoBaseModel]
+    ) -> Dict[str, int]:
+        """Save Pydantic models to MongoDB, upserting by id in one bulk write."""
+        documents = [self.model_to_dict(model) for model in models]
+        if any(not document.get("id") for document in documents):
+            raise ValueError("Model must have an 'id' field")
+        return self.upsert_many(collection_name, documents)
+
+    async def async_save_models(
+        self, collection_name: str, models: Sequence[MongoBaseModel]
+    ) -> Dict[str, int]:
+        """Save Pydantic models to MongoDB asynchronously, upserting by id in one bulk write."""
+        documents = [self.model_to_dict(model) for model in models]
+        if any(not document.get("id") for document in documents):
+            raise ValueError("Model must have an 'id' field")
+        return await self.async_upsert_many(collection_name, documents)
+
     def find_model_by_id(
         self, collection_name: str, model_id: str, model_class: Type[MongoBaseModel]
     ) -> Optional[MongoBaseModel]:
@@ -436,15 +770,17 @@ class MongoDBService:
         skip: int = 0,
     ) -> List[MongoBaseModel]:
         """Find models matching criteria asynchronously and return as Pydantic models."""
-        data_list = await self.async_find_many(
-            collection_name, filter_dict, limit, skip
-        )
         result = []
-        for data in data_list:
-            if data:
-                model = self.dict_to_model(data, model_class)
-                if model:
-                    result.append(model)
+        collection = await self.get_async_collection(collection_name)
+        cursor = collection.find(filter_dict).batch_size(DEFAULT_BATCH_SIZE)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        async for data in cursor:
+            model = self.dict_to_model(data, model_class)
+            if model:
+                result.append(model)
         return result
 
 
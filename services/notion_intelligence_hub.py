@@ -24,6 +24,11 @@ from loguru import logger
 
 from agents.multi_entity_agent_orchestrator import MultiEntityAgentOrchestrator
 from config.business_entity_workflows import BusinessEntityWorkflows
+from services.contact_candidate_index import (
+    ContactCandidateIndex,
+    ContactFeatures,
+    contact_similarity,
+)
 from services.notion_service import NotionService
 
 
@@ -140,14 +145,34 @@ class DuplicateDetectionEngine:
         self.matching_algorithms = ["email_exact", "name_fuzzy", "phone_exact", "content_similarity"]
     
     async def detect_duplicates(
-        self, new_contact: Dict[str, Any], existing_contacts: List[Dict[str, Any]]
+        self,
+        new_contact: Dict[str, Any],
+        existing_contacts: Optional[List[Dict[str, Any]]] = None,
+        index: Optional[ContactCandidateIndex] = None,
     ) -> List[Dict[str, Any]]:
-        """Detect potential duplicate contacts."""
-        
+        """
+        Detect potential duplicate contacts.
+
+        Only the candidates returned by the blocking index are scored, instead
+        of every existing contact.
+
+        Args:
+            new_contact: Contact to check
+            existing_contacts: Contacts to compare against when no index is given
+            index: Candidate index over the existing contacts
+
+        Returns:
+            Potential duplicates, best match first
+        """
+        if index is None:
+            index = ContactCandidateIndex()
+            index.add_many(existing_contacts or [])
+
+        features = index.features(new_contact)
         potential_duplicates = []
         
-        for existing_contact in existing_contacts:
-            similarity_score = await self._calculate_similarity(new_contact, existing_contact)
+        for existing_contact, existing_features in index.candidates(features):
+            similarity_score = contact_similarity(features, existing_features)
             
             if similarity_score >= self.similarity_threshold:
                 potential_duplicates.append({
@@ -165,61 +190,7 @@ class DuplicateDetectionEngine:
         self, contact1: Dict[str, Any], contact2: Dict[str, Any]
     ) -> float:
         """Calculate similarity score between two contacts."""
-        
-        scores = []
-        
-        # Email exact match
-        if contact1.get("email") and contact2.get("email"):
-            email_score = 1.0 if contact1["email"].lower() == contact2["email"].lower() else 0.0
-            scores.append(("email", email_score, 0.4))  # High weight for email
-        
-        # Name similarity
-        name1 = f"{contact1.get('first_name', '')} {contact1.get('last_name', '')}".strip()
-        name2 = f"{contact2.get('first_name', '')} {contact2.get('last_name', '')}".strip()
-        if name1 and name2:
-            name_score = self._fuzzy_string_match(name1, name2)
-            scores.append(("name", name_score, 0.3))
-        
-        # Phone exact match
-        if contact1.get("phone") and contact2.get("phone"):
-            phone_score = 1.0 if contact1["phone"] == contact2["phone"] else 0.0
-            scores.append(("phone", phone_score, 0.2))
-        
-        # Content similarity
-        message1 = contact1.get("message", "")
-        message2 = contact2.get("message", "")
-        if message1 and message2:
-            content_score = self._fuzzy_string_match(message1, message2)
-            scores.append(("content", content_score, 0.1))
-        
-        # Calculate weighted average
-        if scores:
-            weighted_sum = sum(score * weight for _, score, weight in scores)
-            total_weight = sum(weight for _, _, weight in scores)
-            return weighted_sum / total_weight
-        
-        return 0.0
-    
-    def _fuzzy_string_match(self, str1: str, str2: str) -> float:
-        """Calculate fuzzy string similarity."""
-        # Simple implementation - in production, use libraries like fuzzywuzzy
-        str1_lower = str1.lower()
-        str2_lower = str2.lower()
-        
-        if str1_lower == str2_lower:
-            return 1.0
-        
-        # Simple character overlap calculation
-        set1 = set(str1_lower.split())
-        set2 = set(str2_lower.split())
-        
-        if not set1 or not set2:
-            return 0.0
-        
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
-        
-        return intersection / union if union > 0 else 0.0
+        return contact_similarity(ContactFeatures(contact1), ContactFeatures(contact2))
     
     def _identify_matching_fields(
         self, contact1: Dict[str, Any], contact2: Dict[str, Any]
@@ -272,6 +243,9 @@ class NotionIntelligenceHub:
         self.enrichment_engine = ContactEnrichmentEngine(agent_orchestrator)
         self.duplicate_engine = DuplicateDetectionEngine()
         
+        # Per-entity duplicate candidate indexes, refreshed incrementally on sync
+        self.contact_indexes: Dict[str, ContactCandidateIndex] = {}
+        
         # Synchronization tracking
         self.sync_metrics = {
             "contacts_synchronized": 0,
@@ -336,6 +310,8 @@ class NotionIntelligenceHub:
         try:
             # Step 1: Fetch existing contacts from Notion
             existing_contacts = await self._fetch_entity_contacts(entity_name)
+            contact_index = self.contact_indexes.setdefault(entity_name, ContactCandidateIndex())
+            index_changes = contact_index.sync(existing_contacts)
             
             # Step 2: Fetch new contacts from capture system
             new_contacts = await self._fetch_new_contacts(entity_name)
@@ -344,7 +320,7 @@ class NotionIntelligenceHub:
             processing_results = []
             for new_contact in new_contacts:
                 contact_result = await self._process_contact_intelligently(
-                    new_contact, existing_contacts, entity_name
+                    new_contact, existing_contacts, entity_name, contact_index
                 )
                 processing_results.append(contact_result)
             
@@ -354,6 +330,7 @@ class NotionIntelligenceHub:
             return {
                 "entity": entity_name,
                 "existing_contacts_count": len(existing_contacts),
+                "index_changes": index_changes,
                 "new_contacts_processed": len(processing_results),
                 "contacts_enriched": len(enrichment_results),
                 "processing_results": processing_results,
@@ -454,13 +431,19 @@ class NotionIntelligenceHub:
         return sample_new_contacts.get(entity_name, [])
     
     async def _process_contact_intelligently(
-        self, new_contact: Dict[str, Any], existing_contacts: List[Dict[str, Any]], entity_name: str
+        self,
+        new_contact: Dict[str, Any],
+        existing_contacts: List[Dict[str, Any]],
+        entity_name: str,
+        contact_index: Optional[ContactCandidateIndex] = None,
     ) -> Dict[str, Any]:
         """Process a new contact with intelligent analysis."""
         
         try:
             # Step 1: Detect duplicates
-            duplicates = await self.duplicate_engine.detect_duplicates(new_contact, existing_contacts)
+            duplicates = await self.duplicate_engine.detect_duplicates(
+                new_contact, existing_contacts, index=contact_index
+            )
             
             # Step 2: Enrich contact data
             enriched_contact = await self.enrichment_engine.enrich_contact(new_contact, entity_name)
@@ -638,6 +621,9 @@ class NotionIntelligenceHub:
                 "enrichment_engine": "active",
                 "duplicate_engine": "active"
             },
+            "contact_indexes": {
+                entity: index.get_metrics() for entity, index in self.contact_indexes.items()
+            },
             "last_status_check": datetime.now().isoformat()
         }
     
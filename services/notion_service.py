@@ -4,10 +4,11 @@ Handles all interactions with the Notion API, following the standardized
 data structures and patterns defined in the Pydantic models.
 """
 
+import asyncio
 import json
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Type, TypeVar, Union
 
 from loguru import logger
 from notion_client import Client
@@ -23,6 +24,7 @@ from models.notion_db_models import (Agent, AgentCommunication,
 from models.video_models import VideoContent
 from models.video_transaction_models import (VideoTransaction,
                                              VideoTransactionStatus)
+from services.notion_write_queue import NotionWriteQueue
 
 # Add AgentBestPractices, WorkflowPatterns, and AgentTrainingResults to database mappings
 # These will be used by the Grace Fields training system
@@ -34,16 +36,20 @@ T = TypeVar("T", bound=BaseModel)
 class NotionService:
     """Service for interacting with Notion databases via the Notion API."""
 
-    def __init__(self, config: NotionIntegrationConfig):
+    def __init__(self, config: NotionIntegrationConfig, write_behind: bool = False):
         """
         Initialize the Notion service with the provided configuration.
 
         Args:
             config: NotionIntegrationConfig containing API token and database mappings
+            write_behind: Whether page property updates go through the write-behind queue
         """
         self.config = config
         self.client = Client(auth=config.token)
         self.db_mappings = config.database_mappings
+        self.write_queue = (
+            NotionWriteQueue.from_env(self.client) if write_behind else None
+        )
         # self.logger removed, use global loguru logger
         logger.info(
             f"Notion service initialized with {len(self.db_mappings)} database mappings for {self.__class__.__name__}"
@@ -125,7 +131,11 @@ class NotionService:
             token=token, database_mappings=db_mappings, last_sync=datetime.now()
         )
 
-        return cls(config)
+        write_behind = (
+            os.environ.get("NOTION_WRITE_BEHIND_ENABLED", "false").lower() == "true"
+        )
+
+        return cls(config, write_behind=write_behind)
 
     def _model_to_notion_properties(self, model: BaseModel) -> Dict[str, Any]:
         """
@@ -319,25 +329,62 @@ class NotionService:
 
             properties = self._model_to_notion_properties(model)
 
+            return await self.queue_page_update(model.page_id, properties)
+
+        except Exception as e:
+            logger.error(f"Error updating Notion page: {e}")
+            return False
+
+    async def queue_page_update(self, page_id: str, properties: Dict[str, Any]) -> bool:
+        """
+        Update properties of a page, through the write-behind queue if enabled.
+
+        With write-behind enabled, updates to the same page are coalesced and
+        written in the background, so True means the update was accepted.
+
+        Args:
+            page_id: Notion page ID
+            properties: Notion properties to set on the page
+
+        Returns:
+            True if the update was written or queued
+        """
+        try:
+            if self.write_queue:
+                await self.write_queue.enqueue(page_id, properties)
+                return True
+
             # Check if Notion API is disabled in testing mode
             if is_api_disabled("notion"):
                 TestingMode.log_attempted_api_call(
                     api_name="notion",
                     endpoint="pages.update",
                     method="PATCH",
-                    params={"page_id": model.page_id, "properties": properties},
+                    params={"page_id": page_id, "properties": properties},
                 )
-                logger.info(f"[TESTING MODE] Simulated updating page {model.page_id}")
+                logger.info(f"[TESTING MODE] Simulated updating page {page_id}")
                 return True
 
-            self.client.pages.update(page_id=model.page_id, properties=properties)
+            self.client.pages.update(page_id=page_id, properties=properties)
 
             return True
 
         except Exception as e:
-            logger.error(f"Error updating Notion page: {e}")
+            logger.error(f"Error updating Notion page {page_id}: {e}")
             return False
 
+    async def flush_pending_writes(self) -> int:
+        """
+        Flush queued page updates to Notion immediately.
+
+        Returns:
+            Number of pages written
+        """
+        if not self.write_queue:
+            return 0
+
+        return await self.write_queue.flush()
+
     async def get_page(
         self, page_id: str, model_class: Type[T] = None
     ) -> Union[T, Dict[str, Any]]:
@@ -448,6 +495,68 @@ class NotionService:
             logger.error(f"Error querying Notion database: {e}")
             return []
 
+    async def iter_database(
+        self,
+        model_class: Type[T],
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[List[T]]:
+        """
+        Query a Notion database and yield every page of results.
+
+        Unlike query_database, this follows next_cursor until the query is
+        exhausted, and errors are raised instead of returning no results.
+
+        Args:
+            model_class: Pydantic model class to convert results to
+            filter_conditions: Optional Notion filter conditions
+            sorts: Optional sort specifications
+            page_size: Results per request (at most 100)
+
+        Yields:
+            Lists of model instances, one per Notion response
+        """
+        db_type = model_class.__name__
+        if db_type not in self.db_mappings:
+            raise ValueError(f"No database mapping found for model type: {db_type}")
+
+        query_params = {
+            "database_id": self.db_mappings[db_type],
+            "page_size": min(page_size, 100),
+        }
+        if filter_conditions:
+            query_params["filter"] = filter_conditions
+        if sorts:
+            query_params["sorts"] = sorts
+
+        if is_api_disabled("notion"):
+            TestingMode.log_attempted_api_call(
+                api_name="notion",
+                endpoint="databases.query",
+                method="POST",
+                params=query_params,
+            )
+            logger.info(f"[TESTING MODE] Simulated querying {db_type} database")
+            return
+
+        while True:
+            response = await asyncio.to_thread(
+                self.client.databases.query, **query_params
+            )
+
+            results = []
+            for page in response.get("results", []):
+                try:
+                    results.append(self._notion_to_model(page, model_class))
+                except ValidationError as e:
+                    logger.warning(f"Error converting Notion page to model: {e}")
+            yield results
+
+            if not response.get("has_more") or not response.get("next_cursor"):
+                return
+            query_params["start_cursor"] = response["next_cursor"]
+
     async def append_to_history_log(
         self,
         workflow_instance: WorkflowInstance,
@@ -468,12 +577,7 @@ class NotionService:
         if not workflow_instance.page_id:
             raise ValueError("WorkflowInstance does not have a page_id set")
 
-        # Get the current history log
         try:
-            current_instance = await self.get_page(
-                workflow_instance.page_id, WorkflowInstance
-            )
-
             # Add the new entry to the history log
             workflow_instance.add_history_entry(action, details)
 
@@ -481,9 +585,9 @@ class NotionService:
             history_log_json = json.dumps(workflow_instance.history_log)
 
             # Update just the history_log property
-            self.client.pages.update(
-                page_id=workflow_instance.page_id,
-                properties={
+            updated = await self.queue_page_update(
+                workflow_instance.page_id,
+                {
                     "history_log": {
                         "rich_text": [{"text": {"content": history_log_json}}]
                     },
@@ -494,6 +598,8 @@ class NotionService:
                     },
                 },
             )
+            if not updated:
+                return False
 
             # logger.info already here, no change needed for this specific block's logger call
             logger.info(
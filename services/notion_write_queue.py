@@ -0,0 +1,534 @@
+"""
+Notion Write-Behind Queue for The HigherSelf Network Server.
+
+Coalesces pending property updates per Notion page and flushes them in the
+background, so bursts of state changes on one page become a single API call.
+
+Features:
+- Per-page coalescing of property updates (last write wins per property)
+- Flush on interval or when the number of pending pages reaches a threshold
+- GCRA pacing to respect Notion's ~3 requests/second limit
+- Retries with exponential backoff, then a Redis dead-letter list
+- Redis persistence of pending updates so nothing is lost on restart; each
+  worker keeps its own hash and only claims those of workers that are gone
+- Flush latency and queue depth metrics
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from prometheus_client import Counter, Gauge, Histogram
+
+from config.testing_mode import TestingMode, is_api_disabled
+from utils.rate_limiter import get_rate_limiter
+
+# Metrics for monitoring the write-behind queue
+NOTION_QUEUE_DEPTH = Gauge(
+    "notion_write_queue_depth", "Number of Notion pages with pending updates"
+)
+NOTION_QUEUE_COALESCED = Counter(
+    "notion_write_queue_coalesced_total",
+    "Property updates merged into an already pending page update",
+)
+NOTION_QUEUE_WRITES = Counter(
+    "notion_write_queue_writes_total", "Notion page writes by outcome", ["outcome"]
+)
+NOTION_QUEUE_FLUSH_LATENCY = Histogram(
+    "notion_write_queue_flush_latency_seconds",
+    "Time between the first enqueued update for a page and its write to Notion",
+)
+
+
+class NotionWriteQueue:
+    """
+    Write-behind queue for Notion page property updates.
+
+    Updates are merged per page in memory and mirrored to a Redis hash owned
+    by this worker. A background task flushes them to Notion, paced by the
+    Notion rate limiter. While the queue runs it keeps a heartbeat key alive;
+    on start it claims the hashes of workers whose heartbeat has expired.
+    """
+
+    REDIS_KEY = "notion:write_queue:pending"
+    OWNER_KEY = "notion:write_queue:owner"
+    DEAD_LETTER_KEY = "notion:write_queue:dead_letter"
+    DEAD_LETTER_LIMIT = 1000
+
+    def __init__(
+        self,
+        client: Any,
+        flush_interval: float = 2.0,
+        max_pending: int = 50,
+        requests_per_second: float = 3.0,
+        persist: bool = True,
+        max_attempts: int = 5,
+        retry_backoff: float = 2.0,
+        max_retry_delay: float = 300.0,
+        lease_ttl: float = 60.0,
+        worker_id: Optional[str] = None,
+    ):
+        """
+        Initialize the write-behind queue.
+
+        Args:
+            client: notion_client.Client used to write pages
+            flush_interval: Seconds between background flushes
+            max_pending: Number of pending pages that triggers an early flush
+            requests_per_second: Sustained Notion request rate
+            persist: Whether to mirror pending updates to Redis
+            max_attempts: Failed writes before a page update is dead-lettered
+            retry_backoff: Base delay in seconds between attempts (doubled each time)
+            max_retry_delay: Upper bound in seconds for the retry delay
+            lease_ttl: Seconds the worker heartbeat outlives a stalled worker
+            worker_id: Identifier of this worker (default: hostname:pid)
+        """
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.persist = persist
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self.lease_ttl = lease_ttl
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.redis_key = f"{self.REDIS_KEY}:{self.worker_id}"
+        self.rate_limiter = get_rate_limiter(
+            "notion",
+            rate=requests_per_second,
+            burst=max(1, int(requests_per_second)),
+        )
+
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._enqueued_at: Dict[str, float] = {}
+        self._attempts: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        self._heartbeat_at = 0.0
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._redis = None
+        self._restored = False
+        self._metrics = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "written": 0,
+            "failed": 0,
+            "dead_lettered": 0,
+            "flushes": 0,
+            "flush_latency_sum": 0.0,
+            "flush_latency_max": 0.0,
+        }
+
+    @classmethod
+    def from_env(cls, client: Any) -> "NotionWriteQueue":
+        """
+        Create a NotionWriteQueue instance using environment variables.
+
+        Environment variables:
+            NOTION_WRITE_FLUSH_INTERVAL: Seconds between flushes (default: 2.0)
+            NOTION_WRITE_MAX_PENDING: Pending pages that trigger a flush (default: 50)
+            NOTION_REQUESTS_PER_SECOND: Sustained request rate (default: 3.0)
+            NOTION_WRITE_PERSIST: Whether to persist the queue in Redis (default: True)
+            NOTION_WRITE_MAX_ATTEMPTS: Attempts before dead-lettering (default: 5)
+            NOTION_WRITE_RETRY_BACKOFF: Base retry delay in seconds (default: 2.0)
+        """
+        return cls(
+            client=client,
+            flush_interval=float(os.environ.get("NOTION_WRITE_FLUSH_INTERVAL", "2.0")),
+            max_pending=int(os.environ.get("NOTION_WRITE_MAX_PENDING", "50")),
+            requests_per_second=float(
+                os.environ.get("NOTION_REQUESTS_PER_SECOND", "3.0")
+            ),
+            persist=os.environ.get("NOTION_WRITE_PERSIST", "true").lower() == "true",
+            max_attempts=int(os.environ.get("NOTION_WRITE_MAX_ATTEMPTS", "5")),
+            retry_backoff=float(os.environ.get("NOTION_WRITE_RETRY_BACKOFF", "2.0")),
+        )
+
+    @property
+    def depth(self) -> int:
+        """Number of pages with pending updates."""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Restore persisted updates and start the background flush task."""
+        if self._task and not self._task.done():
+            return
+
+        self._flush_event = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        await self._heartbeat()
+        await self._restore()
+        self._task = asyncio.create_task(self._run())
+        _running_queues.add(self)
+        logger.info(f"Notion write-behind queue started (worker {self.worker_id})")
+
+    async def stop(self) -> None:
+        """
+        Stop the background task and flush everything still pending.
+
+        Updates that still fail stay persisted, and the heartbeat is released
+        so another worker can claim them.
+        """
+        _running_queues.discard(self)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush(force=True)
+        await self._release()
+        logger.info("Notion write-behind queue stopped")
+
+    async def enqueue(self, page_id: str, properties: Dict[str, Any]) -> None:
+        """
+        Queue a property update for a page.
+
+        Args:
+            page_id: Notion page ID
+            properties: Notion properties to set on the page
+        """
+        if not self._task:
+            await self.start()
+
+        pending = self._pending.get(page_id)
+        if pending is None:
+            self._pending[page_id] = dict(properties)
+            self._enqueued_at[page_id] = time.time()
+        else:
+            pending.update(properties)
+            self._metrics["coalesced"] += 1
+            NOTION_QUEUE_COALESCED.inc()
+
+        self._metrics["enqueued"] += 1
+        NOTION_QUEUE_DEPTH.set(self.depth)
+
+        await self._persist(page_id)
+
+        if self.depth >= self.max_pending:
+            self._flush_event.set()
+
+    async def flush(self, force: bool = False) -> int:
+        """
+        Write pending updates to Notion.
+
+        Args:
+            force: Also write pages that are waiting out a retry delay
+
+        Returns:
+            Number of pages written successfully
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            now = time.time()
+            due = [
+                page_id
+                for page_id in self._pending
+                if force or self._retry_at.get(page_id, 0.0) <= now
+            ]
+            batch = {page_id: self._pending.pop(page_id) for page_id in due}
+            enqueued_at = {page_id: self._enqueued_at.pop(page_id) for page_id in due}
+
+            written = 0
+            for page_id, properties in batch.items():
+                error = await self._write(page_id, properties)
+                if error is None:
+                    written += 1
+                    self._attempts.pop(page_id, None)
+                    self._retry_at.pop(page_id, None)
+                    self._record_latency(time.time() - enqueued_at[page_id])
+
+                    # Newer updates for the page were persisted by enqueue
+                    if page_id not in self._pending:
+                        await self._unpersist(page_id)
+                    continue
+
+                # Merge without overriding updates that arrived meanwhile
+                properties.update(self._pending.get(page_id, {}))
+                attempts = self._attempts.get(page_id, 0) + 1
+
+                if attempts >= self.max_attempts:
+                    self._pending.pop(page_id, None)
+                    self._enqueued_at.pop(page_id, None)
+                    self._attempts.pop(page_id, None)
+                    self._retry_at.pop(page_id, None)
+                    await self._dead_letter(page_id, properties, attempts, error)
+                    await self._unpersist(page_id)
+                    continue
+
+                delay = min(
+                    self.retry_backoff * (2 ** (attempts - 1)), self.max_retry_delay
+                )
+                self._pending[page_id] = properties
+                self._enqueued_at[page_id] = enqueued_at[page_id]
+                self._attempts[page_id] = attempts
+                self._retry_at[page_id] = time.time() + delay
+                await self._persist(page_id)
+
+            self._metrics["flushes"] += 1
+            NOTION_QUEUE_DEPTH.set(self.depth)
+            return written
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue metrics."""
+        metrics = self._metrics.copy()
+        metrics["depth"] = self.depth
+        metrics["avg_flush_latency"] = (
+            metrics["flush_latency_sum"] / metrics["written"]
+            if metrics["written"]
+            else 0.0
+        )
+        metrics["oldest_pending_age"] = (
+            time.time() - min(self._enqueued_at.values()) if self._enqueued_at else 0.0
+        )
+        return metrics
+
+    async def _run(self) -> None:
+        """Flush on interval or when the size threshold is reached."""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_event.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_event.clear()
+
+            try:
+                await self.flush()
+                if time.time() - self._heartbeat_at >= self.lease_ttl / 3:
+                    await self._heartbeat()
+            except Exception as e:
+                logger.error(f"Error flushing Notion write queue: {e}")
+
+    async def _write(self, page_id: str, properties: Dict[str, Any]) -> Optional[str]:
+        """
+        Write a single page update, paced by the Notion rate limiter.
+
+        Returns:
+            None on success, otherwise the error message
+        """
+        if is_api_disabled("notion"):
+            TestingMode.log_attempted_api_call(
+                api_name="notion",
+                endpoint="pages.update",
+                method="PATCH",
+                params={"page_id": page_id, "properties": properties},
+            )
+            logger.info(f"[TESTING MODE] Simulated updating page {page_id}")
+            return None
+
+        await self.rate_limiter.acquire()
+
+        try:
+            await asyncio.to_thread(
+                self.client.pages.update, page_id=page_id, properties=properties
+            )
+            self._metrics["written"] += 1
+            NOTION_QUEUE_WRITES.labels(outcome="success").inc()
+            return None
+        except Exception as e:
+            logger.error(f"Error writing queued update for Notion page {page_id}: {e}")
+            self._metrics["failed"] += 1
+            NOTION_QUEUE_WRITES.labels(outcome="failure").inc()
+            return str(e)
+
+    async def _dead_letter(
+        self, page_id: str, properties: Dict[str, Any], attempts: int, error: str
+    ) -> None:
+        """Give up on a page update and keep it in the dead-letter list."""
+        logger.error(
+            f"Dropping update for Notion page {page_id} after {attempts} attempts: "
+            f"{error}"
+        )
+        self._metrics["dead_lettered"] += 1
+        NOTION_QUEUE_WRITES.labels(outcome="dead_letter").inc()
+
+        redis = await self._get_redis()
+        if redis is None:
+            return
+
+        entry = {
+            "page_id": page_id,
+            "properties": properties,
+            "attempts": attempts,
+            "error": error,
+            "failed_at": time.time(),
+        }
+        try:
+            await redis.lpush(self.DEAD_LETTER_KEY, json.dumps(entry))
+            await redis.ltrim(self.DEAD_LETTER_KEY, 0, self.DEAD_LETTER_LIMIT - 1)
+        except Exception as e:
+            logger.warning(f"Failed to dead-letter update for {page_id}: {e}")
+
+    def _record_latency(self, latency: float) -> None:
+        """Record the enqueue-to-write latency for a page."""
+        self._metrics["flush_latency_sum"] += latency
+        self._metrics["flush_latency_max"] = max(
+            self._metrics["flush_latency_max"], latency
+        )
+        NOTION_QUEUE_FLUSH_LATENCY.observe(latency)
+
+    async def _get_redis(self):
+        """Get the async Redis client, or None if persistence is unavailable."""
+        if not self.persist:
+            return None
+
+        if self._redis is None:
+            try:
+                from services.redis_service import redis_service
+
+                self._redis = await redis_service.get_async_client()
+            except Exception as e:
+                logger.warning(
+                    f"Redis unavailable, Notion write queue will not be persisted: {e}"
+                )
+                self.persist = False
+                return None
+
+        return self._redis
+
+    async def _persist(self, page_id: str) -> None:
+        """Mirror the pending update for a page to Redis."""
+        redis = await self._get_redis()
+        if redis is None:
+            return
+
+        entry = {
+            "properties": self._pending[page_id],
+            "enqueued_at": self._enqueued_at[page_id],
+            "attempts": self._attempts.get(page_id, 0),
+        }
+        try:
+            await redis.hset(self.redis_key, page_id, json.dumps(entry))
+        except Exception as e:
+            logger.warning(f"Failed to persist queued update for {page_id}: {e}")
+
+    async def _unpersist(self, page_id: str) -> None:
+        """Remove a written page update from Redis."""
+        redis = await self._get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.hdel(self.redis_key, page_id)
+        except Exception as e:
+            logger.warning(f"Failed to remove queued update for {page_id}: {e}")
+
+    async def _heartbeat(self) -> None:
+        """Mark this worker as alive so other workers leave its hash alone."""
+        redis = await self._get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.set(
+                f"{self.OWNER_KEY}:{self.worker_id}", "1", ex=int(self.lease_ttl)
+            )
+            self._heartbeat_at = time.time()
+        except Exception as e:
+            logger.warning(f"Failed to refresh Notion write queue heartbeat: {e}")
+
+    async def _release(self) -> None:
+        """Drop the heartbeat so leftover updates can be claimed right away."""
+        redis = await self._get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.delete(f"{self.OWNER_KEY}:{self.worker_id}")
+        except Exception as e:
+            logger.warning(f"Failed to release Notion write queue heartbeat: {e}")
+
+    async def _claim_orphans(self, redis) -> int:
+        """
+        Move the hashes of workers without a heartbeat into this worker's hash.
+
+        RENAME makes the claim atomic: when two workers race for the same
+        hash, only one of them gets it.
+
+        Returns:
+            Number of hashes claimed
+        """
+        claimed = 0
+        async for key in redis.scan_iter(match=f"{self.REDIS_KEY}*"):
+            key = key.decode() if isinstance(key, bytes) else key
+            if key == self.redis_key:
+                continue
+
+            owner = key[len(self.REDIS_KEY) + 1 :]
+            if owner and await redis.exists(f"{self.OWNER_KEY}:{owner}"):
+                continue
+
+            claim_key = f"{self.redis_key}:claim:{owner or 'legacy'}"
+            try:
+                await redis.rename(key, claim_key)
+            except Exception:
+                # Claimed by another worker first
+                continue
+
+            entries = await redis.hgetall(claim_key)
+            for page_id, raw in entries.items():
+                # Updates already held by this worker take precedence
+                await redis.hsetnx(self.redis_key, page_id, raw)
+            await redis.delete(claim_key)
+            claimed += 1
+
+        return claimed
+
+    async def _restore(self) -> None:
+        """Load this worker's persisted updates and those of departed workers."""
+        if self._restored:
+            return
+        self._restored = True
+
+        redis = await self._get_redis()
+        if redis is None:
+            return
+
+        try:
+            claimed = await self._claim_orphans(redis)
+            if claimed:
+                logger.info(f"Claimed {claimed} Notion write queues of stopped workers")
+            entries = await redis.hgetall(self.redis_key)
+        except Exception as e:
+            logger.warning(f"Failed to restore Notion write queue: {e}")
+            return
+
+        for page_id, raw in entries.items():
+            page_id = page_id.decode() if isinstance(page_id, bytes) else page_id
+            entry = json.loads(raw)
+            properties = entry["properties"]
+            properties.update(self._pending.get(page_id, {}))
+            self._pending[page_id] = properties
+            self._enqueued_at.setdefault(page_id, entry["enqueued_at"])
+            if entry.get("attempts"):
+                self._attempts[page_id] = entry["attempts"]
+
+        if entries:
+            logger.info(f"Restored {len(entries)} pending Notion page updates")
+        NOTION_QUEUE_DEPTH.set(self.depth)
+
+
+# Queues with a running flush task, so shutdown can flush all of them
+_running_queues: "weakref.WeakSet[NotionWriteQueue]" = weakref.WeakSet()
+
+
+async def stop_notion_write_queues() -> None:
+    """Stop every running write-behind queue, flushing pending updates."""
+    for queue in list(_running_queues):
+        try:
+            await queue.stop()
+        except Exception as e:
+            logger.error(f"Error stopping Notion write queue: {e}")
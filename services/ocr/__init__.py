@@ -5,6 +5,9 @@ This package provides OCR capabilities using various providers:
 - Tesseract: Open-source OCR engine
 - Google Cloud Vision: Google's OCR service with high accuracy
 - ABBYY: Commercial OCR service with high accuracy for structured documents
+
+Multi-page documents (PDF, TIFF) are handled by DocumentOCRService, which
+splits pages and processes them in parallel with the providers above.
 """
 
 import asyncio
@@ -14,6 +17,7 @@ from loguru import logger
 from models.tesseract_models import OCRProvider
 from services.ocr.abbyy_ocr_service import ABBYY_AVAILABLE, ABBYYOCRService
 from services.ocr.base_ocr_service import BaseOCRService
+from services.ocr.document_ocr_service import DocumentOCRService
 from services.ocr.google_vision_ocr_service import (
     GOOGLE_VISION_AVAILABLE,
     GoogleVisionOCRService,
@@ -58,6 +62,9 @@ if ABBYY_AVAILABLE:
     except Exception as e:
         logger.error(f"Failed to initialize ABBYY OCR service: {e}")
 
+# Multi-page document OCR built on top of the provider services
+document_ocr_service = DocumentOCRService.from_env()
+
 
 __all__ = [
     "BaseOCRService",
@@ -65,7 +72,9 @@ __all__ = [
     "GoogleVisionOCRService",
     "ABBYYOCRService",
     "OCRServiceFactory",
+    "DocumentOCRService",
     "tesseract_service",
     "google_vision_service",
     "abbyy_service",
+    "document_ocr_service",
 ]
@@ -14,7 +14,6 @@ import time
 from io import BytesIO
 from typing import Any, Dict, List, Optional, Union
 
-import httpx
 from loguru import logger
 
 # Note: This is a placeholder for the actual ABBYY SDK import
@@ -32,6 +31,7 @@ from models.tesseract_models import (ABBYYOCRConfig, OCRBoundingBox,
                                      OCRImageSource, OCRLanguage,
                                      OCROutputFormat, OCRProvider, OCRRequest,
                                      OCRResponse, OCRTextElement)
+from services.http_client_registry import get_http_client
 from services.ocr.base_ocr_service import BaseOCRService
 
 
@@ -213,10 +213,10 @@ class ABBYYOCRService(BaseOCRService):
 
         elif source_type == OCRImageSource.URL:
             # Load from URL
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_data)
-                response.raise_for_status()
-                return response.content
+            client = get_http_client("abbyy_ocr")
+            response = await client.get(image_data)
+            response.raise_for_status()
+            return response.content
 
         elif source_type == OCRImageSource.BASE64:
             # Load from base64
@@ -0,0 +1,320 @@
+"""
+Document OCR Service for The HigherSelf Network Server.
+
+This module provides OCR for multi-page documents (PDFs, multi-frame TIFFs).
+Pages are split lazily, processed in parallel by the provider selected through
+OCRServiceFactory, and streamed back as they finish. Page results are cached by
+the content hash of the rasterized page, so re-submitting a document with one
+changed page only OCRs that page.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import time
+from io import BytesIO
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+from PIL import Image, ImageSequence
+
+try:
+    import fitz  # PyMuPDF
+
+    PDF_AVAILABLE = True
+except ImportError:
+    logger.warning("PyMuPDF not installed. PDF documents cannot be split for OCR.")
+    PDF_AVAILABLE = False
+
+from models.tesseract_models import (
+    OCRDocumentRequest,
+    OCRImageSource,
+    OCRPageResult,
+    OCRProvider,
+    OCRResponse,
+)
+from services.cache_service import CacheType, multi_level_cache
+from services.http_client_registry import get_http_client
+from services.ocr.base_ocr_service import BaseOCRService
+from services.ocr.ocr_service_factory import OCRServiceFactory
+
+
+class DocumentOCRService:
+    """
+    Service for performing OCR on multi-page documents.
+
+    Pages are rasterized one at a time, so at most max_concurrency pages are held
+    in memory regardless of document size.
+    """
+
+    def __init__(
+        self, max_concurrency: Optional[int] = None, cache_results: bool = True
+    ):
+        """
+        Initialize the document OCR service.
+
+        Args:
+            max_concurrency: Default number of pages processed in parallel
+            cache_results: Whether to cache page results by content hash
+        """
+        self.max_concurrency = max_concurrency or os.cpu_count() or 4
+        self.cache_results = cache_results
+        logger.info(
+            f"Initialized DocumentOCRService (max_concurrency={self.max_concurrency})"
+        )
+
+    @classmethod
+    def from_env(cls) -> "DocumentOCRService":
+        """
+        Create a DocumentOCRService instance from environment variables.
+
+        Environment variables:
+            OCR_DOCUMENT_CONCURRENCY: Number of pages processed in parallel
+            OCR_CACHE_RESULTS: Whether to cache OCR results (default: True)
+
+        Returns:
+            DocumentOCRService instance
+        """
+        concurrency = os.getenv("OCR_DOCUMENT_CONCURRENCY")
+        cache_results = os.getenv("OCR_CACHE_RESULTS", "True").lower() == "true"
+
+        return cls(
+            max_concurrency=int(concurrency) if concurrency else None,
+            cache_results=cache_results,
+        )
+
+    async def process_document(
+        self, request: OCRDocumentRequest
+    ) -> AsyncIterator[OCRPageResult]:
+        """
+        Process a document and stream page results as they finish.
+
+        Results are yielded in completion order, not page order.
+
+        Args:
+            request: Document OCR request
+
+        Yields:
+            OCR result for each page
+        """
+        service = self._select_service(request)
+        document = await self._load_document(
+            request.document_source, request.document_data
+        )
+        pages = self._iter_pages(document, request.dpi)
+        concurrency = request.max_concurrency or self.max_concurrency
+
+        pending = set()
+        exhausted = False
+
+        try:
+            while pending or not exhausted:
+                # Rasterize the next page only when a processing slot is free
+                while not exhausted and len(pending) < concurrency:
+                    page = await asyncio.to_thread(next, pages, None)
+                    if page is None:
+                        exhausted = True
+                        break
+
+                    page_number, page_bytes = page
+                    pending.add(
+                        asyncio.create_task(
+                            self._process_page(
+                                service, request, page_number, page_bytes
+                            )
+                        )
+                    )
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            pages.close()
+
+    async def process_document_pages(
+        self, request: OCRDocumentRequest
+    ) -> List[OCRPageResult]:
+        """
+        Process a document and return all page results in page order.
+
+        Args:
+            request: Document OCR request
+
+        Returns:
+            OCR results for every page, sorted by page number
+        """
+        results = [result async for result in self.process_document(request)]
+        return sorted(results, key=lambda result: result.page_number)
+
+    def _select_service(self, request: OCRDocumentRequest) -> BaseOCRService:
+        """
+        Select the OCR service for a document.
+
+        An explicitly requested provider always wins; otherwise the factory
+        selects one from the document importance and type.
+
+        Args:
+            request: Document OCR request
+
+        Returns:
+            OCR service for the selected provider, or Tesseract if unavailable
+        """
+        provider = request.provider or OCRServiceFactory.select_provider(
+            request.to_page_request(b"")
+        )
+
+        try:
+            return OCRServiceFactory.get_service(provider)
+        except ValueError:
+            logger.warning(f"Provider {provider} not available, using Tesseract")
+            return OCRServiceFactory.get_service(OCRProvider.TESSERACT)
+
+    async def _process_page(
+        self,
+        service: BaseOCRService,
+        request: OCRDocumentRequest,
+        page_number: int,
+        page_bytes: bytes,
+    ) -> OCRPageResult:
+        """
+        OCR a single page, using the page cache when possible.
+
+        Args:
+            service: OCR service to use
+            request: Document OCR request
+            page_number: 1-based page number
+            page_bytes: Rasterized page as PNG bytes
+
+        Returns:
+            OCR result for the page
+        """
+        content_hash = hashlib.sha256(page_bytes).hexdigest()
+        cache_key = self._generate_page_cache_key(service, request, content_hash)
+
+        if self.cache_results:
+            cached_result = await multi_level_cache.get(cache_key, CacheType.API)
+            if cached_result:
+                return OCRPageResult(
+                    page_number=page_number,
+                    content_hash=content_hash,
+                    from_cache=True,
+                    response=OCRResponse(**cached_result),
+                )
+
+        start_time = time.time()
+        try:
+            response = await service.process_image(request.to_page_request(page_bytes))
+        except Exception as e:
+            logger.error(f"Error processing page {page_number}: {e}")
+            response = OCRResponse(
+                success=False,
+                provider=service.provider,
+                output_format=request.output_format,
+                processing_time=time.time() - start_time,
+                error=str(e),
+            )
+
+        if self.cache_results and response.success:
+            await multi_level_cache.set(cache_key, response.dict(), CacheType.API)
+
+        return OCRPageResult(
+            page_number=page_number, content_hash=content_hash, response=response
+        )
+
+    async def _load_document(
+        self, source_type: OCRImageSource, document_data: Union[str, bytes]
+    ) -> bytes:
+        """
+        Load raw document bytes from various sources.
+
+        Args:
+            source_type: Type of document source
+            document_data: Document data or reference
+
+        Returns:
+            Document bytes
+        """
+        if source_type == OCRImageSource.FILE:
+            return await asyncio.to_thread(self._read_file, document_data)
+
+        elif source_type == OCRImageSource.URL:
+            client = get_http_client("document_ocr")
+            response = await client.get(document_data)
+            response.raise_for_status()
+            return response.content
+
+        elif source_type == OCRImageSource.BASE64:
+            return base64.b64decode(document_data)
+
+        elif source_type == OCRImageSource.BYTES:
+            return document_data
+
+        else:
+            raise ValueError(f"Unsupported document source: {source_type}")
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        """Read a document from disk."""
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _iter_pages(self, document: bytes, dpi: int) -> Iterator[Tuple[int, bytes]]:
+        """
+        Lazily split a document into rasterized pages.
+
+        Args:
+            document: Document bytes
+            dpi: Resolution used when rasterizing PDF pages
+
+        Yields:
+            Tuples of (1-based page number, PNG bytes)
+        """
+        if document[:5] == b"%PDF-":
+            if not PDF_AVAILABLE:
+                raise RuntimeError("PyMuPDF is required to OCR PDF documents")
+
+            with fitz.open(stream=document, filetype="pdf") as pdf:
+                for index, page in enumerate(pdf):
+                    pixmap = page.get_pixmap(dpi=dpi)
+                    yield index + 1, pixmap.tobytes("png")
+            return
+
+        # TIFFs (and any other multi-frame image) are split frame by frame
+        with Image.open(BytesIO(document)) as image:
+            for index, frame in enumerate(ImageSequence.Iterator(image)):
+                buffer = BytesIO()
+                frame.convert("RGB").save(buffer, format="PNG")
+                yield index + 1, buffer.getvalue()
+
+    def _generate_page_cache_key(
+        self,
+        service: BaseOCRService,
+        request: OCRDocumentRequest,
+        content_hash: str,
+    ) -> str:
+        """
+        Generate a cache key for a single page.
+
+        Args:
+            service: OCR service processing the page
+            request: Document OCR request
+            content_hash: SHA-256 hash of the rasterized page
+
+        Returns:
+            Cache key
+        """
+        languages = "+".join([lang.value for lang in request.languages])
+        config_key = f"{request.page_segmentation_mode}_{request.ocr_engine_mode}"
+
+        return (
+            f"ocr:page:{service.provider.value}:{content_hash}:{languages}:"
+            f"{request.output_format}:{config_key}:{request.preprocessing}"
+        )
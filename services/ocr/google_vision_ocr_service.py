@@ -12,7 +12,6 @@ import time
 from io import BytesIO
 from typing import Any, Dict, List, Optional, Union
 
-import httpx
 from loguru import logger
 
 try:
@@ -38,6 +37,7 @@ from models.tesseract_models import (
     OCRResponse,
     OCRTextElement,
 )
+from services.http_client_registry import get_http_client
 from services.ocr.base_ocr_service import BaseOCRService
 
 
@@ -269,10 +269,10 @@ class GoogleVisionOCRService(BaseOCRService):
 
         elif source_type == OCRImageSource.URL:
             # Load from URL
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_data)
-                response.raise_for_status()
-                return vision.Image(content=response.content)
+            client = get_http_client("google_vision_ocr")
+            response = await client.get(image_data)
+            response.raise_for_status()
+            return vision.Image(content=response.content)
 
         elif source_type == OCRImageSource.BASE64:
             # Load from base64
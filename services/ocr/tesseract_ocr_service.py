@@ -5,6 +5,7 @@ This service provides OCR capabilities using Tesseract, allowing agents to extra
 text from images. It supports various image sources, languages, and output formats.
 """
 
+import asyncio
 import base64
 import hashlib
 import os
@@ -14,7 +15,6 @@ from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import httpx
 from loguru import logger
 from PIL import Image, ImageEnhance, ImageFilter
 
@@ -36,6 +36,7 @@ from models.tesseract_models import (
     OCRResponse,
     OCRTextElement,
 )
+from services.http_client_registry import get_http_client
 from services.ocr.base_ocr_service import BaseOCRService
 
 
@@ -146,86 +147,10 @@ class TesseractOCRService(BaseOCRService):
             # Load the image
             image = await self._load_image(request.image_source, request.image_data)
 
-            # Preprocess the image if requested
-            if request.preprocessing:
-                image = self._preprocess_image(image)
-
-            # Prepare Tesseract configuration
-            config = self._prepare_config(request)
-
-            # Perform OCR
-            languages = "+".join([lang.value for lang in request.languages])
-
-            if request.output_format == OCROutputFormat.TEXT:
-                # Extract text
-                text = pytesseract.image_to_string(image, lang=languages, config=config)
-
-                # Get text elements with confidence if available
-                elements = None
-                try:
-                    data = pytesseract.image_to_data(
-                        image,
-                        lang=languages,
-                        config=config,
-                        output_type=pytesseract.Output.DICT,
-                    )
-                    elements = self._parse_text_elements(data)
-                except Exception as e:
-                    logger.warning(f"Error getting text elements: {e}")
-
-                result = OCRResponse(
-                    success=True,
-                    provider=self.provider,
-                    text=text,
-                    elements=elements,
-                    output_format=request.output_format,
-                    processing_time=time.time() - start_time,
-                )
-
-            elif request.output_format == OCROutputFormat.HOCR:
-                # Extract HOCR
-                hocr = pytesseract.image_to_pdf_or_hocr(
-                    image, lang=languages, config=config, extension="hocr"
-                )
-                result = OCRResponse(
-                    success=True,
-                    provider=self.provider,
-                    raw_output=hocr.decode("utf-8"),
-                    output_format=request.output_format,
-                    processing_time=time.time() - start_time,
-                )
-
-            elif request.output_format == OCROutputFormat.TSV:
-                # Extract TSV
-                tsv = pytesseract.image_to_data(image, lang=languages, config=config)
-                result = OCRResponse(
-                    success=True,
-                    provider=self.provider,
-                    raw_output=tsv,
-                    output_format=request.output_format,
-                    processing_time=time.time() - start_time,
-                )
-
-            elif request.output_format == OCROutputFormat.BOX:
-                # Extract bounding boxes
-                boxes = pytesseract.image_to_boxes(image, lang=languages, config=config)
-                result = OCRResponse(
-                    success=True,
-                    provider=self.provider,
-                    raw_output=boxes,
-                    output_format=request.output_format,
-                    processing_time=time.time() - start_time,
-                )
-
-            else:
-                # Unsupported output format
-                result = OCRResponse(
-                    success=False,
-                    provider=self.provider,
-                    output_format=request.output_format,
-                    processing_time=time.time() - start_time,
-                    error=f"Unsupported output format: {request.output_format}",
-                )
+            # Run Tesseract off the event loop so pages can be processed in parallel
+            result = await asyncio.to_thread(
+                self._run_tesseract, image, request, start_time
+            )
 
             # Cache the result if enabled
             await self.cache_result(request, result)
@@ -242,6 +167,105 @@ class TesseractOCRService(BaseOCRService):
                 error=str(e),
             )
 
+    def _run_tesseract(
+        self, image: Image.Image, request: OCRRequest, start_time: float
+    ) -> OCRResponse:
+        """
+        Run Tesseract on a loaded image.
+
+        This is blocking and is executed in a worker thread by process_image.
+
+        Args:
+            image: PIL Image
+            request: OCR request
+            start_time: Time at which processing of the request started
+
+        Returns:
+            OCR response
+        """
+        # Preprocess the image if requested
+        if request.preprocessing:
+            image = self._preprocess_image(image)
+
+        # Prepare Tesseract configuration
+        config = self._prepare_config(request)
+
+        # Perform OCR
+        languages = "+".join([lang.value for lang in request.languages])
+
+        if request.output_format == OCROutputFormat.TEXT:
+            # Extract text
+            text = pytesseract.image_to_string(image, lang=languages, config=config)
+
+            # Get text elements with confidence if available
+            elements = None
+            try:
+                data = pytesseract.image_to_data(
+                    image,
+                    lang=languages,
+                    config=config,
+                    output_type=pytesseract.Output.DICT,
+                )
+                elements = self._parse_text_elements(data)
+            except Exception as e:
+                logger.warning(f"Error getting text elements: {e}")
+
+            result = OCRResponse(
+                success=True,
+                provider=self.provider,
+                text=text,
+                elements=elements,
+                output_format=request.output_format,
+                processing_time=time.time() - start_time,
+            )
+
+        elif request.output_format == OCROutputFormat.HOCR:
+            # Extract HOCR
+            hocr = pytesseract.image_to_pdf_or_hocr(
+                image, lang=languages, config=config, extension="hocr"
+            )
+            result = OCRResponse(
+                success=True,
+                provider=self.provider,
+                raw_output=hocr.decode("utf-8"),
+                output_format=request.output_format,
+                processing_time=time.time() - start_time,
+            )
+
+        elif request.output_format == OCROutputFormat.TSV:
+            # Extract TSV
+            tsv = pytesseract.image_to_data(image, lang=languages, config=config)
+            result = OCRResponse(
+                success=True,
+                provider=self.provider,
+                raw_output=tsv,
+                output_format=request.output_format,
+                processing_time=time.time() - start_time,
+            )
+
+        elif request.output_format == OCROutputFormat.BOX:
+            # Extract bounding boxes
+            boxes = pytesseract.image_to_boxes(image, lang=languages, config=config)
+            result = OCRResponse(
+                success=True,
+                provider=self.provider,
+                raw_output=boxes,
+                output_format=request.output_format,
+                processing_time=time.time() - start_time,
+            )
+
+        else:
+            # Unsupported output format
+            result = OCRResponse(
+                success=False,
+                provider=self.provider,
+                output_format=request.output_format,
+                processing_time=time.time() - start_time,
+                error=f"Unsupported output format: {request.output_format}",
+            )
+
+        return result
+
     async def _load_image(
         self, source_type: OCRImageSource, image_data: Union[str, bytes]
     ) -> Image.Image:
@@ -261,10 +285,10 @@ class TesseractOCRService(BaseOCRService):
 
         elif source_type == OCRImageSource.URL:
             # Load from URL
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_data)
-                response.raise_for_status()
-                return Image.open(BytesIO(response.content))
+            client = get_http_client("tesseract_ocr")
+            response = await client.get(image_data)
+            response.raise_for_status()
+            return Image.open(BytesIO(response.content))
 
         elif source_type == OCRImageSource.BASE64:
             # Load from base64
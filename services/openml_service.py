@@ -23,11 +23,11 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-import requests
 from loguru import logger
 from pydantic import BaseModel
 
 from models.dataset_models import DatasetMetadata, DatasetVersion, ProcessedDataset
+from services.http_client_registry import get_http_client
 from services.redis_service import redis_service
 
 
@@ -99,7 +99,9 @@ class OpenMLService:
             start_time = time.time()
             self._metrics["api_calls"] += 1
 
-            response = requests.get(f"{self.base_url}/data/list", params=params)
+            response = await get_http_client("openml").get(
+                f"{self.base_url}/data/list", params=params
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -176,7 +178,9 @@ class OpenMLService:
             start_time = time.time()
             self._metrics["api_calls"] += 1
 
-            response = requests.get(f"{self.base_url}/data/{dataset_id}")
+            response = await get_http_client("openml").get(
+                f"{self.base_url}/data/{dataset_id}"
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -259,7 +263,9 @@ class OpenMLService:
             # Get the dataset download URL
             data_url = dataset_meta.url
             if not data_url:
-                response = requests.get(f"{self.base_url}/data/features/{dataset_id}")
+                response = await get_http_client("openml").get(
+                    f"{self.base_url}/data/features/{dataset_id}"
+                )
                 response.raise_for_status()
                 data = response.json()
                 data_url = data.get("data_features", {}).get("url", "")
@@ -269,7 +275,7 @@ class OpenMLService:
                 return None
 
             # Download the data file
-            response = requests.get(data_url)
+            response = await get_http_client("openml").get(data_url)
             response.raise_for_status()
 
             # Save to a temporary file
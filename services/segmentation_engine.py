@@ -0,0 +1,825 @@
+"""
+Segmentation Engine for The HigherSelf Network Server.
+
+Keeps customer attributes from contacts, WooCommerce orders and Amelia/Acuity
+bookings in a columnar in-memory store and evaluates audience segment
+criteria as vectorized boolean masks over it.
+
+Features:
+- NumPy columns per attribute: numeric, datetime, categorical and multi-valued
+- Segment criteria compiled once into vectorized predicates
+- Incremental refresh that re-evaluates only contacts changed since the last run
+- Per-customer order and booking aggregates that stay correct on re-delivery
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel
+
+from models.audience_models import SegmentCriteria
+from services.lead_dedup_index import normalize_email
+
+# Booking statuses that do not count towards booking aggregates
+INACTIVE_BOOKING_STATUSES = {"canceled", "cancelled", "rejected", "no-show"}
+
+# Order statuses that do not count towards order aggregates
+INACTIVE_ORDER_STATUSES = {"cancelled", "refunded", "failed", "trash"}
+
+
+class ColumnType(str, Enum):
+    """Storage type of an attribute column."""
+
+    NUMERIC = "numeric"
+    DATETIME = "datetime"
+    CATEGORICAL = "categorical"
+    MULTI = "multi"
+
+
+def _column_type_for(value: Any) -> ColumnType:
+    if isinstance(value, (datetime, date)):
+        return ColumnType.DATETIME
+    if isinstance(value, (bool, int, float)):
+        return ColumnType.NUMERIC
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return ColumnType.MULTI
+    return ColumnType.CATEGORICAL
+
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def _as_dict(record: Any) -> Dict[str, Any]:
+    return record.model_dump() if isinstance(record, BaseModel) else dict(record)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _Column:
+    kind: ColumnType
+    values: Optional[np.ndarray] = None
+    vocabulary: Dict[str, int] = field(default_factory=dict)
+    labels: List[str] = field(default_factory=list)
+    postings: Dict[str, Set[int]] = field(default_factory=dict)
+    row_values: Dict[int, frozenset] = field(default_factory=dict)
+
+
+@dataclass
+class _CompiledSegment:
+    criteria: List[SegmentCriteria]
+    predicates: List[Callable[[Optional[np.ndarray], float], np.ndarray]]
+    time_relative: bool
+    mask: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+    evaluated_seq: int = -1
+
+
+class SegmentationEngine:
+    """
+    Columnar customer attribute store with vectorized segment evaluation.
+
+    Each customer is a row keyed by normalized email. Every attribute is a
+    column: numeric and datetime values in float64 arrays (NaN when missing),
+    strings as int32 category codes, and lists as per-value row postings.
+    """
+
+    # Operators accepted in SegmentCriteria.operator
+    OPERATORS = {
+        "equals",
+        "not_equals",
+        "contains",
+        "not_contains",
+        "in",
+        "not_in",
+        "greater_than",
+        "greater_than_or_equal",
+        "less_than",
+        "less_than_or_equal",
+        "between",
+        "exists",
+        "not_exists",
+        "within_last_days",
+        "older_than_days",
+    }
+
+    def __init__(self, initial_capacity: int = 1024):
+        """
+        Initialize the engine.
+
+        Args:
+            initial_capacity: Number of rows to allocate up front
+        """
+        self._capacity = max(1, initial_capacity)
+        self._size = 0
+        self._rows: Dict[str, int] = {}
+        self._emails: List[str] = []
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._changed_seq = np.zeros(self._capacity, dtype=np.int64)
+        self._seq = 0
+        self._columns: Dict[str, _Column] = {}
+        self._segments: Dict[str, _CompiledSegment] = {}
+
+        # Per-customer source records, so re-delivered orders and bookings
+        # replace their earlier version instead of being counted twice
+        self._orders: Dict[str, Dict[str, Tuple[float, Optional[float], frozenset]]]
+        self._bookings: Dict[str, Dict[str, Tuple[float, Optional[float], str]]]
+        self._orders = {}
+        self._bookings = {}
+
+    def __len__(self) -> int:
+        return int(self._alive[: self._size].sum())
+
+    def __contains__(self, email: str) -> bool:
+        row = self._rows.get(normalize_email(email))
+        return row is not None and bool(self._alive[row])
+
+    # Storage
+
+    def _grow(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+
+        def resized(array: np.ndarray, fill: Any) -> np.ndarray:
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[: self._capacity] = array
+            return grown
+
+        self._alive = resized(self._alive, False)
+        self._changed_seq = resized(self._changed_seq, 0)
+        for column in self._columns.values():
+            if column.kind == ColumnType.CATEGORICAL:
+                column.values = resized(column.values, -1)
+            elif column.kind != ColumnType.MULTI:
+                column.values = resized(column.values, np.nan)
+        self._capacity = capacity
+
+    def _row_for(self, email: str) -> int:
+        row = self._rows.get(email)
+        if row is None:
+            row = self._size
+            self._grow(row + 1)
+            self._rows[email] = row
+            self._emails.append(email)
+            self._size += 1
+        self._alive[row] = True
+        return row
+
+    def _column(self, name: str, value: Any) -> _Column:
+        column = self._columns.get(name)
+        if column is None:
+            kind = _column_type_for(value)
+            column = _Column(kind=kind)
+            if kind == ColumnType.CATEGORICAL:
+                column.values = np.full(self._capacity, -1, dtype=np.int32)
+            elif kind != ColumnType.MULTI:
+                column.values = np.full(self._capacity, np.nan)
+            self._columns[name] = column
+        return column
+
+    def _set_value(self, row: int, name: str, value: Any) -> None:
+        column = self._columns.get(name)
+        if column is None:
+            if value is None:
+                return
+            column = self._column(name, value)
+
+        if column.kind == ColumnType.MULTI:
+            old = column.row_values.pop(row, frozenset())
+            if value is None:
+                new = frozenset()
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                new = frozenset(str(item) for item in value if item is not None)
+            else:
+                new = frozenset([str(value)])
+            for item in old - new:
+                postings = column.postings.get(item)
+                if postings is not None:
+                    postings.discard(row)
+            for item in new - old:
+                column.postings.setdefault(item, set()).add(row)
+            if new:
+                column.row_values[row] = new
+        elif column.kind == ColumnType.CATEGORICAL:
+            if value is None:
+                column.values[row] = -1
+                return
+            label = str(value)
+            code = column.vocabulary.get(label)
+            if code is None:
+                code = len(column.labels)
+                column.vocabulary[label] = code
+                column.labels.append(label)
+            column.values[row] = code
+        else:
+            if column.kind == ColumnType.DATETIME:
+                number = _to_timestamp(value) if value is not None else None
+            else:
+                number = _to_float(value) if value is not None else None
+            column.values[row] = np.nan if number is None else number
+
+    def _touch(self, row: int) -> None:
+        self._seq += 1
+        self._changed_seq[row] = self._seq
+
+    def upsert_contacts(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or update customer attributes.
+
+        Attributes not present in a record keep their current value; a value
+        of None clears the attribute.
+
+        Args:
+            records: Attribute dicts, each with an "email"
+
+        Returns:
+            Number of records applied
+        """
+        applied = 0
+        for record in records:
+            email = normalize_email(record.get("email") or "")
+            if not email:
+                continue
+            row = self._row_for(email)
+            for name, value in record.items():
+                if name != "email":
+                    self._set_value(row, name, value)
+            self._touch(row)
+            applied += 1
+        return applied
+
+    def remove_contacts(self, emails: Iterable[str]) -> int:
+        """
+        Remove customers from the store.
+
+        Args:
+            emails: Emails of the customers to remove
+
+        Returns:
+            Number of customers removed
+        """
+        removed = 0
+        for email in emails:
+            row = self._rows.get(normalize_email(email))
+            if row is None or not self._alive[row]:
+                continue
+            for name in list(self._columns):
+                self._set_value(row, name, None)
+            self._alive[row] = False
+            self._touch(row)
+            removed += 1
+        return removed
+
+    # Source loaders
+
+    def load_profiles(self, profiles: Iterable[Any]) -> int:
+        """
+        Load customer profiles (CustomerProfile models or dicts).
+
+        Args:
+            profiles: Customer profiles
+
+        Returns:
+            Number of profiles applied
+        """
+        records = []
+        for profile in profiles:
+            data = _as_dict(profile)
+            record = {
+                "email": data.get("email"),
+                "first_name": data.get("first_name"),
+                "last_name": data.get("last_name"),
+                "interests": data.get("interests") or [],
+                "sources": data.get("sources") or [],
+                "first_seen": data.get("first_seen"),
+                "last_interaction": data.get("last_interaction"),
+                "form_submission_count": len(data.get("form_submissions") or []),
+                "course_enrollment_count": len(data.get("course_enrollments") or []),
+            }
+            for name, value in (data.get("custom_fields") or {}).items():
+                record.setdefault(name, value)
+            records.append(record)
+        return self._upsert_typed(
+            records, datetime_fields=("first_seen", "last_interaction")
+        )
+
+    def load_orders(self, orders: Iterable[Any]) -> int:
+        """
+        Load WooCommerce orders (WooOrder models or order dicts).
+
+        Adds order_count, total_spent, first_order_date, last_order_date and
+        purchased_products to each ordering customer.
+
+        Args:
+            orders: Orders; the customer is matched by billing email
+
+        Returns:
+            Number of orders applied
+        """
+        touched: Set[str] = set()
+        for order in orders:
+            data = _as_dict(order)
+            email = normalize_email((data.get("billing") or {}).get("email") or "")
+            if not email:
+                continue
+            order_id = str(data.get("id") or data.get("number") or id(order))
+            customer_orders = self._orders.setdefault(email, {})
+            if str(data.get("status", "")).lower() in INACTIVE_ORDER_STATUSES:
+                customer_orders.pop(order_id, None)
+            else:
+                products = frozenset(
+                    str(item.get("name"))
+                    for item in data.get("line_items") or []
+                    if item.get("name")
+                )
+                customer_orders[order_id] = (
+                    _to_float(data.get("total")) or 0.0,
+                    _to_timestamp(data.get("date_created")),
+                    products,
+                )
+            touched.add(email)
+
+        records = []
+        for email in touched:
+            customer_orders = self._orders.get(email, {}).values()
+            dates = [
+                created for _, created, _ in customer_orders if created is not None
+            ]
+            records.append(
+                {
+                    "email": email,
+                    "order_count": len(customer_orders),
+                    "total_spent": sum(total for total, _, _ in customer_orders),
+                    "first_order_date": min(dates) if dates else None,
+                    "last_order_date": max(dates) if dates else None,
+                    "purchased_products": set().union(
+                        *(products for _, _, products in customer_orders)
+                    ),
+                }
+            )
+        self._upsert_typed(
+            records, datetime_fields=("first_order_date", "last_order_date")
+        )
+        return len(touched)
+
+    def load_bookings(self, bookings: Iterable[Any], source: str = "amelia") -> int:
+        """
+        Load Amelia or Acuity appointments (models or dicts).
+
+        Adds booking_count, booking_spent, last_booking_date,
+        next_booking_date and booked_services to each booking customer.
+
+        Args:
+            bookings: Appointments
+            source: "amelia" or "acuity", selecting the field layout
+
+        Returns:
+            Number of bookings applied
+        """
+        touched: Set[str] = set()
+        for booking in bookings:
+            data = _as_dict(booking)
+            if source == "acuity":
+                email = data.get("email")
+                start = data.get("datetime")
+                amount = data.get("amount_paid") or data.get("price")
+                service = data.get("type") or data.get("appointment_type_id")
+                status = "canceled" if data.get("canceled") else "approved"
+            else:
+                email = data.get("customer_email")
+                start = data.get("booking_start")
+                amount = data.get("payment_amount")
+                service = data.get("service_id")
+                status = str(data.get("status") or "")
+            email = normalize_email(email or "")
+            if not email:
+                continue
+
+            booking_id = f"{source}:{data.get('id') or id(booking)}"
+            customer_bookings = self._bookings.setdefault(email, {})
+            if status.lower() in INACTIVE_BOOKING_STATUSES:
+                customer_bookings.pop(booking_id, None)
+            else:
+                customer_bookings[booking_id] = (
+                    _to_float(amount) or 0.0,
+                    _to_timestamp(start),
+                    str(service) if service is not None else "",
+                )
+            touched.add(email)
+
+        now = datetime.now().timestamp()
+        records = []
+        for email in touched:
+            customer_bookings = self._bookings.get(email, {}).values()
+            starts = [start for _, start, _ in customer_bookings if start is not None]
+            past = [start for start in starts if start <= now]
+            upcoming = [start for start in starts if start > now]
+            records.append(
+                {
+                    "email": email,
+                    "booking_count": len(customer_bookings),
+                    "booking_spent": sum(amount for amount, _, _ in customer_bookings),
+                    "last_booking_date": max(past) if past else None,
+                    "next_booking_date": min(upcoming) if upcoming else None,
+                    "booked_services": {
+                        service for _, _, service in customer_bookings if service
+                    },
+                }
+            )
+        self._upsert_typed(
+            records, datetime_fields=("last_booking_date", "next_booking_date")
+        )
+        return len(touched)
+
+    def _upsert_typed(
+        self, records: List[Dict[str, Any]], datetime_fields: Tuple[str, ...]
+    ) -> int:
+        for name in datetime_fields:
+            if name not in self._columns:
+                self._columns[name] = _Column(
+                    kind=ColumnType.DATETIME,
+                    values=np.full(self._capacity, np.nan),
+                )
+        return self.upsert_contacts(records)
+
+    # Segment evaluation
+
+    def _compile(
+        self, criterion: SegmentCriteria
+    ) -> Tuple[Callable[[Optional[np.ndarray], float], np.ndarray], bool]:
+        operator = criterion.operator.lower()
+        if operator not in self.OPERATORS:
+            raise ValueError(f"Unsupported segment operator: {criterion.operator}")
+        name = criterion.field
+        value = criterion.value
+
+        def predicate(rows: Optional[np.ndarray], now: float) -> np.ndarray:
+            return self._apply(name, operator, value, rows, now)
+
+        return predicate, operator in ("within_last_days", "older_than_days")
+
+    def _apply(
+        self,
+        name: str,
+        operator: str,
+        value: Any,
+        rows: Optional[np.ndarray],
+        now: float,
+    ) -> np.ndarray:
+        length = self._size if rows is None else len(rows)
+        column = self._columns.get(name)
+        if column is None:
+            fill = operator in ("not_exists", "not_equals", "not_contains", "not_in")
+            return np.full(length, fill, dtype=bool)
+
+        if column.kind == ColumnType.MULTI:
+            return self._apply_multi(column, operator, value, rows, length)
+
+        values = column.values[: self._size] if rows is None else column.values[rows]
+
+        if column.kind == ColumnType.CATEGORICAL:
+            present = values >= 0
+            if operator == "exists":
+                return present
+            if operator == "not_exists":
+                return ~present
+            if operator in ("equals", "not_equals", "in", "not_in"):
+                wanted = value if operator in ("in", "not_in") else [value]
+                codes = [
+                    column.vocabulary[str(item)]
+                    for item in wanted
+                    if str(item) in column.vocabulary
+                ]
+            elif operator in ("contains", "not_contains"):
+                needle = str(value).lower()
+                codes = [
+                    code
+                    for code, label in enumerate(column.labels)
+                    if needle in label.lower()
+                ]
+            else:
+                raise ValueError(
+                    f"Operator {operator} does not apply to text field {name}"
+                )
+            matched = np.isin(values, codes)
+            return ~matched if operator.startswith("not_") else matched
+
+        present = ~np.isnan(values)
+        if operator == "exists":
+            return present
+        if operator == "not_exists":
+            return ~present
+        if operator in ("within_last_days", "older_than_days"):
+            cutoff = now - float(value) * 86400
+            with np.errstate(invalid="ignore"):
+                if operator == "within_last_days":
+                    return present & (values >= cutoff)
+                return present & (values < cutoff)
+
+        convert = _to_timestamp if column.kind == ColumnType.DATETIME else _to_float
+        if operator == "between":
+            low, high = (convert(bound) for bound in value)
+            with np.errstate(invalid="ignore"):
+                return (values >= low) & (values <= high)
+        if operator in ("in", "not_in"):
+            matched = np.isin(values, [convert(item) for item in value])
+            return ~matched if operator == "not_in" else matched
+
+        number = convert(value)
+        if number is None:
+            raise ValueError(f"Invalid value {value!r} for field {name}")
+        with np.errstate(invalid="ignore"):
+            if operator == "equals":
+                return values == number
+            if operator == "not_equals":
+                return values != number
+            if operator == "greater_than":
+                return values > number
+            if operator == "greater_than_or_equal":
+                return values >= number
+            if operator == "less_than":
+                return values < number
+            if operator == "less_than_or_equal":
+                return values <= number
+        raise ValueError(f"Operator {operator} does not apply to numeric field {name}")
+
+    def _apply_multi(
+        self,
+        column: _Column,
+        operator: str,
+        value: Any,
+        rows: Optional[np.ndarray],
+        length: int,
+    ) -> np.ndarray:
+        if operator in ("exists", "not_exists"):
+            wanted_rows: Iterable[int] = column.row_values.keys()
+        elif operator in (
+            "equals",
+            "not_equals",
+            "contains",
+            "not_contains",
+            "in",
+            "not_in",
+        ):
+            wanted = value if isinstance(value, (list, tuple, set)) else [value]
+            wanted_rows = set().union(
+                *(column.postings.get(str(item), ()) for item in wanted)
+            )
+        else:
+            raise ValueError(f"Operator {operator} does not apply to list fields")
+
+        mask = np.zeros(self._size, dtype=bool)
+        indices = np.fromiter(wanted_rows, dtype=np.int64)
+        mask[indices] = True
+        if rows is not None:
+            mask = mask[rows]
+        return ~mask if operator.startswith("not_") else mask
+
+    def evaluate(
+        self, criteria: List[SegmentCriteria], now: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Evaluate criteria against every customer.
+
+        Args:
+            criteria: Criteria that must all hold
+            now: Reference time for day-relative operators
+
+        Returns:
+            Boolean membership mask indexed by row
+        """
+        timestamp = (now or datetime.now()).timestamp()
+        mask = self._alive[: self._size].copy()
+        for criterion in criteria:
+            predicate, _ = self._compile(criterion)
+            mask &= predicate(None, timestamp)
+        return mask
+
+    def define_segment(self, segment_id: str, criteria: List[SegmentCriteria]) -> None:
+        """
+        Register or replace a segment; its members are computed on refresh.
+
+        Args:
+            segment_id: Segment identifier
+            criteria: Criteria that must all hold
+
+        Raises:
+            ValueError: If a criterion uses an unsupported operator
+        """
+        compiled = [self._compile(criterion) for criterion in criteria]
+        self._segments[segment_id] = _CompiledSegment(
+            criteria=list(criteria),
+            predicates=[predicate for predicate, _ in compiled],
+            time_relative=any(relative for _, relative in compiled),
+        )
+
+    def has_segment(
+        self, segment_id: str, criteria: Optional[List[SegmentCriteria]] = None
+    ) -> bool:
+        """Check whether a segment is registered, optionally with these criteria."""
+        segment = self._segments.get(segment_id)
+        return segment is not None and (
+            criteria is None or segment.criteria == list(criteria)
+        )
+
+    def remove_segment(self, segment_id: str) -> bool:
+        """Unregister a segment."""
+        return self._segments.pop(segment_id, None) is not None
+
+    def refresh_segments(
+        self,
+        segment_ids: Optional[Iterable[str]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring segment memberships up to date.
+
+        Segments are re-evaluated only for customers changed since their last
+        refresh, unless they use day-relative operators, whose result moves
+        with time and is recomputed in full.
+
+        Args:
+            segment_ids: Segments to refresh; all segments if omitted
+            now: Reference time for day-relative operators
+
+        Returns:
+            Per segment id: member_count, added, removed and whether the
+            segment was evaluated in full
+        """
+        timestamp = (now or datetime.now()).timestamp()
+        size = self._size
+        alive = self._alive[:size]
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for segment_id in (
+            segment_ids if segment_ids is not None else list(self._segments)
+        ):
+            segment = self._segments[segment_id]
+            previous = np.zeros(size, dtype=bool)
+            previous[: len(segment.mask)] = segment.mask
+
+            full = segment.time_relative or segment.evaluated_seq < 0
+            if full:
+                mask = alive.copy()
+                for predicate in segment.predicates:
+                    mask &= predicate(None, timestamp)
+            else:
+                rows = np.flatnonzero(self._changed_seq[:size] > segment.evaluated_seq)
+                mask = previous.copy()
+                if len(rows):
+                    changed = alive[rows].copy()
+                    for predicate in segment.predicates:
+                        changed &= predicate(rows, timestamp)
+                    mask[rows] = changed
+
+            segment.mask = mask
+            segment.evaluated_seq = self._seq
+            results[segment_id] = {
+                "member_count": int(mask.sum()),
+                "added": int((mask & ~previous).sum()),
+                "removed": int((previous & ~mask).sum()),
+                "full": full,
+            }
+
+        logger.debug(f"Refreshed {len(results)} segments over {size} customers")
+        return results
+
+    def member_count(self, segment_id: str) -> int:
+        """Get the member count as of the segment's last refresh."""
+        return int(self._segments[segment_id].mask.sum())
+
+    def members(self, segment_id: str) -> List[str]:
+        """Get member emails as of the segment's last refresh."""
+        return [
+            self._emails[row] for row in np.flatnonzero(self._segments[segment_id].mask)
+        ]
+
+    def segments_for(self, email: str) -> List[str]:
+        """Get the segments a customer belonged to at their last refresh."""
+        row = self._rows.get(normalize_email(email))
+        if row is None:
+            return []
+        return [
+            segment_id
+            for segment_id, segment in self._segments.items()
+            if row < len(segment.mask) and segment.mask[row]
+        ]
+
+    # Analysis
+
+    def _value_counts(self, name: str, top: int = 10) -> Dict[str, int]:
+        column = self._columns.get(name)
+        if column is None:
+            return {}
+        if column.kind == ColumnType.MULTI:
+            counts = {
+                value: int(self._alive[list(rows)].sum())
+                for value, rows in column.postings.items()
+                if rows
+            }
+        elif column.kind == ColumnType.CATEGORICAL:
+            values = column.values[: self._size][self._alive[: self._size]]
+            codes = np.bincount(values[values >= 0], minlength=len(column.labels))
+            counts = {label: int(count) for label, count in zip(column.labels, codes)}
+        else:
+            return {}
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        return {value: count for value, count in ranked[:top] if count}
+
+    def _column_sum(self, name: str) -> float:
+        column = self._columns.get(name)
+        if column is None or column.kind in (ColumnType.MULTI, ColumnType.CATEGORICAL):
+            return 0.0
+        return float(np.nansum(column.values[: self._size][self._alive[: self._size]]))
+
+    def summary(self, days: int = 30, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Summarize the customer base for an analysis window.
+
+        Args:
+            days: Length of the analysis window
+            now: End of the analysis window
+
+        Returns:
+            Customer, engagement, order, booking and source breakdowns
+        """
+        now = now or datetime.now()
+
+        def within(name: str) -> np.ndarray:
+            criterion = SegmentCriteria(
+                field=name, operator="within_last_days", value=days
+            )
+            return self.evaluate([criterion], now=now)
+
+        active = np.zeros(self._size, dtype=bool)
+        for name in ("last_interaction", "last_order_date", "last_booking_date"):
+            active |= within(name)
+
+        return {
+            "total_customers": len(self),
+            "new_customers": int(within("first_seen").sum()),
+            "active_customers": int(active.sum()),
+            "customers_with_orders": int(
+                self.evaluate(
+                    [
+                        SegmentCriteria(
+                            field="order_count", operator="greater_than", value=0
+                        )
+                    ]
+                ).sum()
+            ),
+            "customers_with_bookings": int(
+                self.evaluate(
+                    [
+                        SegmentCriteria(
+                            field="booking_count", operator="greater_than", value=0
+                        )
+                    ]
+                ).sum()
+            ),
+            "engagement_metrics": {
+                "form_submissions": int(self._column_sum("form_submission_count")),
+                "course_enrollments": int(self._column_sum("course_enrollment_count")),
+            },
+            "order_revenue": round(self._column_sum("total_spent"), 2),
+            "booking_revenue": round(self._column_sum("booking_spent"), 2),
+            "product_categories": self._value_counts("purchased_products"),
+            "booked_services": self._value_counts("booked_services"),
+            "sources": self._value_counts("sources"),
+            "interests": self._value_counts("interests"),
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get store size metrics."""
+        return {
+            "customers": len(self),
+            "rows": self._size,
+            "capacity": self._capacity,
+            "columns": {
+                name: column.kind.value for name, column in self._columns.items()
+            },
+            "segments": len(self._segments),
+        }
@@ -6,10 +6,11 @@ This service handles lead data enrichment through the SnovIO API.
 import os
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 from pydantic import BaseModel
 
+from services.http_client_registry import get_http_client
+
 
 class SnovIOConfig(BaseModel):
     """Configuration for SnovIO API integration."""
@@ -61,7 +62,7 @@ class SnovIOService:
         }
 
         try:
-            response = requests.post(url, json=payload)
+            response = await get_http_client("snovio").post(url, json=payload)
             response.raise_for_status()
             data = response.json()
             self.access_token = data.get("access_token")
@@ -70,6 +71,17 @@ class SnovIOService:
             logger.error(f"Error getting SnovIO access token: {e}")
             return None
 
+    async def validate_credentials(self) -> bool:
+        """
+        Validate the SnovIO credentials by requesting an access token.
+
+        Returns:
+            True if credentials are valid, False otherwise
+        """
+        if not self.client_id or not self.client_secret:
+            return False
+        return await self._get_access_token() is not None
+
     async def enrich_email(self, email: str) -> Optional[Dict[str, Any]]:
         """
         Enrich a lead by email address.
@@ -89,7 +101,7 @@ class SnovIOService:
         params = {"access_token": token, "email": email}
 
         try:
-            response = requests.get(url, params=params)
+            response = await get_http_client("snovio").get(url, params=params)
             response.raise_for_status()
             data = response.json()
             if data.get("success"):
@@ -124,7 +136,7 @@ class SnovIOService:
         params = {"access_token": token, "domain": domain, "limit": limit}
 
         try:
-            response = requests.get(url, params=params)
+            response = await get_http_client("snovio").get(url, params=params)
             response.raise_for_status()
             data = response.json()
             if data.get("success"):
@@ -159,7 +171,7 @@ class SnovIOService:
         payload = {"access_token": token, "listId": list_id, "emails": emails}
 
         try:
-            response = requests.post(url, json=payload)
+            response = await get_http_client("snovio").post(url, json=payload)
             response.raise_for_status()
             data = response.json()
             if data.get("success"):
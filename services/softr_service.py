@@ -10,13 +10,13 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 from pydantic import BaseModel
 
 from models.base import ApiPlatform
 from models.softr_models import AgentInteraction, AgentRequest, AgentResponse, StaffUser
 from services.base_service import BaseService
+from services.http_client_registry import get_http_client
 
 
 class SoftrServiceConfig(BaseModel):
@@ -96,7 +96,7 @@ class SoftrService(BaseService):
         try:
             # In a real implementation, this would check against Softr's user database
             # For now, we'll use a simplified approach
-            response = requests.get(
+            response = await get_http_client("softr").get(
                 f"{self.api_url}/users/{user_id}", headers=self._get_headers()
             )
 
@@ -142,7 +142,7 @@ class SoftrService(BaseService):
         """
         try:
             # In a real implementation, this would create a record in Softr's database
-            response = requests.post(
+            response = await get_http_client("softr").post(
                 f"{self.api_url}/records/agent_interactions",
                 headers=self._get_headers(),
                 json=interaction.model_dump(),
@@ -180,7 +180,7 @@ class SoftrService(BaseService):
                 params["agent_id"] = agent_id
 
             # In a real implementation, this would query Softr's database
-            response = requests.get(
+            response = await get_http_client("softr").get(
                 f"{self.api_url}/records/agent_interactions",
                 headers=self._get_headers(),
                 params=params,
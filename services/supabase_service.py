@@ -9,14 +9,13 @@ import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Type, TypeVar, Union
 
-import httpx
-
 # import logging # Replaced by loguru
 from loguru import logger  # Added for direct loguru usage
 from pydantic import BaseModel, ValidationError
 
 from config.testing_mode import TestingMode, is_api_disabled
 from models.base import NotionIntegrationConfig
+from services.http_client_registry import get_http_client
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -98,20 +97,20 @@ class SupabaseService:
             return {"data": [], "status": 200, "statusText": "OK"}
 
         try:
-            async with httpx.AsyncClient() as client:
-                if method == "GET":
-                    response = await client.get(url, headers=headers, params=params)
-                elif method == "POST":
-                    response = await client.post(url, headers=headers, json=data)
-                elif method == "PUT":
-                    response = await client.put(url, headers=headers, json=data)
-                elif method == "DELETE":
-                    response = await client.delete(url, headers=headers, params=params)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-
-                response.raise_for_status()
-                return response.json()
+            client = get_http_client("supabase")
+            if method == "GET":
+                response = await client.get(url, headers=headers, params=params)
+            elif method == "POST":
+                response = await client.post(url, headers=headers, json=data)
+            elif method == "PUT":
+                response = await client.put(url, headers=headers, json=data)
+            elif method == "DELETE":
+                response = await client.delete(url, headers=headers, params=params)
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error making request to Supabase: {e}")
             raise
@@ -13,7 +13,6 @@ from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import httpx
 from loguru import logger
 from PIL import Image, ImageEnhance, ImageFilter
 
@@ -35,6 +34,7 @@ from models.tesseract_models import (
     OCRTextElement,
 )
 from services.cache_service import CacheType, multi_level_cache
+from services.http_client_registry import get_http_client
 
 
 class TesseractService:
@@ -254,10 +254,10 @@ class TesseractService:
 
         elif source_type == OCRImageSource.URL:
             # Load from URL
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image_data)
-                response.raise_for_status()
-                return Image.open(BytesIO(response.content))
+            client = get_http_client("tesseract")
+            response = await client.get(image_data)
+            response.raise_for_status()
+            return Image.open(BytesIO(response.content))
 
         elif source_type == OCRImageSource.BASE64:
             # Load from base64
@@ -8,10 +8,11 @@ import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from services.http_client_registry import get_http_client
+
 
 class TutorSession(BaseModel):
     """Model representing a TutorLM tutoring session."""
@@ -101,7 +102,9 @@ class TutorLMService:
             payload["end_time"] = session.end_time.isoformat()
 
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = await get_http_client("tutorlm").post(
+                url, headers=headers, json=payload
+            )
             response.raise_for_status()
             data = response.json()
             session_id = data.get("id")
@@ -129,7 +132,7 @@ class TutorLMService:
         headers = {"Authorization": f"Bearer {self.api_key}"}
 
         try:
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("tutorlm").get(url, headers=headers)
             response.raise_for_status()
             data = response.json()
 
@@ -205,7 +208,9 @@ class TutorLMService:
             update_data["end_time"] = update_data["end_time"].isoformat()
 
         try:
-            response = requests.patch(url, headers=headers, json=update_data)
+            response = await get_http_client("tutorlm").patch(
+                url, headers=headers, json=update_data
+            )
             response.raise_for_status()
             logger.info(f"Updated TutorLM session: {session_id}")
             return True
@@ -249,7 +254,7 @@ class TutorLMService:
         headers = {"Authorization": f"Bearer {self.api_key}"}
 
         try:
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("tutorlm").get(url, headers=headers)
             response.raise_for_status()
             data = response.json()
             return data.get("transcript")
@@ -279,7 +284,9 @@ class TutorLMService:
         params = {"limit": limit}
 
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = await get_http_client("tutorlm").get(
+                url, headers=headers, params=params
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -387,7 +394,9 @@ class TutorLMService:
             params["subject"] = subject
 
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = await get_http_client("tutorlm").get(
+                url, headers=headers, params=params
+            )
             response.raise_for_status()
             data = response.json()
             return data.get("tutors", [])
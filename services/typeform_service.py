@@ -10,10 +10,11 @@ import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import requests
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from services.http_client_registry import get_http_client
+
 
 class TypeFormConfig(BaseModel):
     """Configuration for TypeForm API integration."""
@@ -80,7 +81,7 @@ class TypeFormService:
             url = f"{self.base_url}/me"
             headers = {"Authorization": f"Bearer {self.personal_token}"}
 
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("typeform").get(url, headers=headers)
             response.raise_for_status()
 
             logger.info("TypeForm credentials validated successfully")
@@ -104,7 +105,7 @@ class TypeFormService:
             url = f"{self.base_url}/forms"
             headers = {"Authorization": f"Bearer {self.personal_token}"}
 
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("typeform").get(url, headers=headers)
             response.raise_for_status()
 
             data = response.json()
@@ -134,7 +135,7 @@ class TypeFormService:
             url = f"{self.base_url}/forms/{form_id}"
             headers = {"Authorization": f"Bearer {self.personal_token}"}
 
-            response = requests.get(url, headers=headers)
+            response = await get_http_client("typeform").get(url, headers=headers)
             response.raise_for_status()
 
             form_details = response.json()
@@ -173,7 +174,9 @@ class TypeFormService:
             if since:
                 params["since"] = since
 
-            response = requests.get(url, headers=headers, params=params)
+            response = await get_http_client("typeform").get(
+                url, headers=headers, params=params
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -421,7 +424,9 @@ class TypeFormService:
             if self.webhook_secret:
                 payload["secret"] = self.webhook_secret
 
-            response = requests.put(url, headers=headers, json=payload)
+            response = await get_http_client("typeform").put(
+                url, headers=headers, json=payload
+            )
             response.raise_for_status()
 
             logger.info(f"Created TypeForm webhook for form {form_id}")
@@ -8,11 +8,11 @@ import json
 import os
 from typing import Any, Dict, List, Optional, Union
 
-import httpx
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from models.base import ApiPlatform
+from services.http_client_registry import get_http_client
 
 
 class VideoGenerationRequest(BaseModel):
@@ -114,29 +114,27 @@ class VideoGenerationService:
         self.logger.info(f"Generating video for topic: {request.topic}")
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.api_url}/generate", json=request.dict(exclude_none=True)
-                )
-
-                if response.status_code != 200:
-                    self.logger.error(f"Error generating video: {response.text}")
-                    return VideoGenerationResponse(
-                        task_id="error",
-                        status="failed",
-                        message=f"API error: {response.text}",
-                    )
-
-                result = response.json()
-                self.logger.info(
-                    f"Video generation task created: {result.get('task_id')}"
-                )
+            client = get_http_client("video_generation")
+            response = await client.post(
+                f"{self.api_url}/generate", json=request.dict(exclude_none=True)
+            )
 
+            if response.status_code != 200:
+                self.logger.error(f"Error generating video: {response.text}")
                 return VideoGenerationResponse(
-                    task_id=result.get("task_id"),
-                    status="pending",
-                    message="Video generation task created successfully",
+                    task_id="error",
+                    status="failed",
+                    message=f"API error: {response.text}",
                 )
+
+            result = response.json()
+            self.logger.info(f"Video generation task created: {result.get('task_id')}")
+
+            return VideoGenerationResponse(
+                task_id=result.get("task_id"),
+                status="pending",
+                message="Video generation task created successfully",
+            )
         except Exception as e:
             self.logger.error(f"Error generating video: {e}")
             return VideoGenerationResponse(
@@ -156,28 +154,28 @@ class VideoGenerationService:
         self.logger.info(f"Checking status of video task: {task_id}")
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{self.api_url}/tasks/{task_id}/status")
-
-                if response.status_code != 200:
-                    self.logger.error(f"Error checking task status: {response.text}")
-                    return VideoTaskStatus(
-                        task_id=task_id,
-                        status="error",
-                        error=f"API error: {response.text}",
-                    )
-
-                result = response.json()
+            client = get_http_client("video_generation")
+            response = await client.get(f"{self.api_url}/tasks/{task_id}/status")
 
+            if response.status_code != 200:
+                self.logger.error(f"Error checking task status: {response.text}")
                 return VideoTaskStatus(
                     task_id=task_id,
-                    status=result.get("status", "unknown"),
-                    progress=result.get("progress"),
-                    video_url=result.get("video_url"),
-                    error=result.get("error"),
-                    created_at=result.get("created_at"),
-                    completed_at=result.get("completed_at"),
+                    status="error",
+                    error=f"API error: {response.text}",
                 )
+
+            result = response.json()
+
+            return VideoTaskStatus(
+                task_id=task_id,
+                status=result.get("status", "unknown"),
+                progress=result.get("progress"),
+                video_url=result.get("video_url"),
+                error=result.get("error"),
+                created_at=result.get("created_at"),
+                completed_at=result.get("completed_at"),
+            )
         except Exception as e:
             self.logger.error(f"Error checking task status: {e}")
             return VideoTaskStatus(
@@ -192,16 +190,14 @@ class VideoGenerationService:
             List of voice objects with name, language, and gender
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{self.api_url}/voices")
+            client = get_http_client("video_generation")
+            response = await client.get(f"{self.api_url}/voices")
 
-                if response.status_code != 200:
-                    self.logger.error(
-                        f"Error getting available voices: {response.text}"
-                    )
-                    return []
+            if response.status_code != 200:
+                self.logger.error(f"Error getting available voices: {response.text}")
+                return []
 
-                return response.json()
+            return response.json()
         except Exception as e:
             self.logger.error(f"Error getting available voices: {e}")
             return []
@@ -0,0 +1,629 @@
+"""
+Durable Webhook Intake Queue for The HigherSelf Network Server.
+
+Webhook endpoints verify the request, append the raw payload to this queue and
+return 202 immediately. A pool of async workers drains the queue and runs the
+handler registered for each source, so slow downstream calls (Notion, agents,
+provider APIs) never hold a provider's webhook request open.
+
+Features:
+- SQLite (WAL mode) storage, so accepted deliveries survive restarts
+- Idempotency keys, so provider retries of the same event are stored once;
+  without a provider event ID, identical bodies are only deduplicated for a
+  short window
+- Retries with exponential backoff, then a failed state that can be replayed
+- Leases on claimed deliveries, so only deliveries abandoned by a stopped
+  worker are requeued, never ones another worker is still processing
+- Backlog, lag and delivery outcome metrics
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from prometheus_client import Counter, Gauge, Histogram
+from pydantic import BaseModel, Field
+
+# Metrics for monitoring webhook intake
+WEBHOOK_QUEUE_BACKLOG = Gauge(
+    "webhook_queue_backlog", "Webhook deliveries waiting to be processed"
+)
+WEBHOOK_QUEUE_LAG = Gauge(
+    "webhook_queue_lag_seconds", "Age of the oldest webhook delivery still waiting"
+)
+WEBHOOK_DELIVERIES = Counter(
+    "webhook_deliveries_total",
+    "Webhook deliveries by source and outcome",
+    ["source", "outcome"],
+)
+WEBHOOK_PROCESSING_LATENCY = Histogram(
+    "webhook_processing_latency_seconds",
+    "Time between receiving a webhook and finishing its processing",
+    ["source"],
+)
+
+WebhookHandler = Callable[["WebhookDelivery"], Awaitable[Any]]
+
+
+class WebhookDelivery(BaseModel):
+    """A webhook payload accepted by the intake queue."""
+
+    id: int
+    source: str
+    idempotency_key: str
+    payload: bytes
+    headers: Dict[str, str] = Field(default_factory=dict)
+    query_params: Dict[str, str] = Field(default_factory=dict)
+    status: str = "pending"
+    attempts: int = 0
+    received_at: float
+    last_error: Optional[str] = None
+
+    def json_payload(self) -> Any:
+        """Decode the payload as JSON."""
+        return json.loads(self.payload)
+
+
+class WebhookQueue:
+    """
+    Durable queue of received webhooks, drained by a pool of async workers.
+
+    Deliveries move from pending to processing to done. A delivery whose
+    handler keeps failing ends up failed after max_attempts and stays there
+    until it is replayed.
+
+    Claiming a delivery records this worker as its lease owner until
+    lease_expires_at, and the lease is renewed while the handler runs. A
+    processing delivery whose lease expired is claimable again.
+    """
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        path: str = "webhook_queue.db",
+        workers: int = 4,
+        max_attempts: int = 5,
+        retry_backoff: float = 2.0,
+        poll_interval: float = 1.0,
+        retention: float = 7 * 24 * 3600,
+        lease_ttl: float = 60.0,
+        worker_id: Optional[str] = None,
+        body_dedupe_window: float = 300.0,
+    ):
+        """
+        Initialize the webhook queue.
+
+        Args:
+            path: Path of the SQLite database file
+            workers: Number of concurrent worker tasks
+            max_attempts: Attempts before a delivery is marked failed
+            retry_backoff: Base delay in seconds between attempts (doubled each time)
+            poll_interval: Seconds between checks for deliveries due for retry
+            retention: Seconds to keep completed deliveries for deduplication
+            lease_ttl: Seconds a claimed delivery stays leased without renewal
+            worker_id: Lease owner name of this process (default: hostname:pid)
+            body_dedupe_window: Seconds within which a delivery without a
+                provider event ID is a duplicate of an identical body
+        """
+        self.path = path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.lease_ttl = lease_ttl
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.body_dedupe_window = body_dedupe_window
+
+        self.handlers: Dict[str, WebhookHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS webhook_deliveries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                payload BLOB NOT NULL,
+                headers TEXT NOT NULL,
+                query_params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                received_at REAL NOT NULL,
+                available_at REAL NOT NULL,
+                completed_at REAL,
+                last_error TEXT,
+                lease_owner TEXT,
+                lease_expires_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_webhook_deliveries_status
+                ON webhook_deliveries (status, available_at);
+            """
+        )
+
+        # Databases created before leases were added lack the lease columns
+        columns = {
+            row[1]
+            for row in self._conn.execute("PRAGMA table_info(webhook_deliveries)")
+        }
+        for column, definition in (
+            ("lease_owner", "TEXT"),
+            ("lease_expires_at", "REAL"),
+        ):
+            if column not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE webhook_deliveries ADD COLUMN {column} {definition}"
+                )
+
+    @classmethod
+    def from_env(cls) -> "WebhookQueue":
+        """
+        Create a WebhookQueue instance using environment variables.
+
+        Environment variables:
+            WEBHOOK_QUEUE_DB_PATH: SQLite database path (default: webhook_queue.db)
+            WEBHOOK_QUEUE_WORKERS: Number of worker tasks (default: 4)
+            WEBHOOK_QUEUE_MAX_ATTEMPTS: Attempts before failing a delivery (default: 5)
+            WEBHOOK_QUEUE_LEASE_TTL: Seconds a claimed delivery stays leased (default: 60)
+            WEBHOOK_QUEUE_BODY_DEDUPE_WINDOW: Seconds identical bodies without an
+                event ID count as duplicates (default: 300)
+        """
+        return cls(
+            path=os.environ.get("WEBHOOK_QUEUE_DB_PATH", "webhook_queue.db"),
+            workers=int(os.environ.get("WEBHOOK_QUEUE_WORKERS", "4")),
+            max_attempts=int(os.environ.get("WEBHOOK_QUEUE_MAX_ATTEMPTS", "5")),
+            lease_ttl=float(os.environ.get("WEBHOOK_QUEUE_LEASE_TTL", "60")),
+            body_dedupe_window=float(
+                os.environ.get("WEBHOOK_QUEUE_BODY_DEDUPE_WINDOW", "300")
+            ),
+        )
+
+    def register_handler(self, source: str, handler: WebhookHandler) -> None:
+        """
+        Register the coroutine that processes deliveries from a source.
+
+        Args:
+            source: Webhook source name, e.g. "typeform"
+            handler: Coroutine function taking a WebhookDelivery
+        """
+        self.handlers[source] = handler
+
+    async def start(self) -> None:
+        """Requeue deliveries abandoned by stopped workers and start the pool."""
+        if self._tasks:
+            return
+
+        self._wakeup = asyncio.Event()
+        recovered = await asyncio.to_thread(self._recover)
+        if recovered:
+            logger.info(f"Requeued {recovered} interrupted webhook deliveries")
+
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info(f"Webhook queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the worker pool. Unfinished deliveries are retried on restart."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Webhook queue stopped")
+
+    async def enqueue(
+        self,
+        source: str,
+        payload: bytes,
+        idempotency_key: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        query_params: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, bool]:
+        """
+        Durably store a webhook payload for processing.
+
+        Args:
+            source: Webhook source name
+            payload: Raw request body
+            idempotency_key: Provider event ID. Without one, an identical body
+                is only a duplicate within body_dedupe_window, so a repeated
+                event is processed again later
+            headers: Request headers worth keeping for the handler
+            query_params: Request query parameters
+
+        Returns:
+            Tuple of (delivery ID, whether it was a duplicate)
+        """
+        if not self._tasks:
+            await self.start()
+
+        if idempotency_key:
+            key, dedupe_window = f"{source}:{idempotency_key}", None
+        else:
+            key = f"{source}:body:{hashlib.sha256(payload).hexdigest()}"
+            dedupe_window = self.body_dedupe_window
+        delivery_id, duplicate = await asyncio.to_thread(
+            self._insert,
+            source,
+            key,
+            payload,
+            headers or {},
+            query_params or {},
+            dedupe_window,
+        )
+
+        if duplicate:
+            WEBHOOK_DELIVERIES.labels(source=source, outcome="duplicate").inc()
+            logger.info(f"Duplicate {source} webhook ignored ({key})")
+        else:
+            WEBHOOK_QUEUE_BACKLOG.inc()
+            self._wakeup.set()
+
+        return delivery_id, duplicate
+
+    async def replay(
+        self, delivery_id: Optional[int] = None, source: Optional[str] = None
+    ) -> int:
+        """
+        Move failed deliveries back to pending.
+
+        Args:
+            delivery_id: Replay a single delivery
+            source: Replay all failed deliveries from a source
+
+        Returns:
+            Number of deliveries requeued
+        """
+        count = await asyncio.to_thread(self._replay, delivery_id, source)
+        if count and self._wakeup:
+            self._wakeup.set()
+        logger.info(f"Replaying {count} failed webhook deliveries")
+        return count
+
+    async def get_delivery(self, delivery_id: int) -> Optional[WebhookDelivery]:
+        """Get a delivery by ID."""
+        rows = await asyncio.to_thread(self._select, "WHERE id = ?", (delivery_id,), 1)
+        return rows[0] if rows else None
+
+    async def list_failed(self, limit: int = 100) -> List[WebhookDelivery]:
+        """List failed deliveries, most recent first."""
+        return await asyncio.to_thread(
+            self._select, "WHERE status = ? ORDER BY id DESC", (self.FAILED,), limit
+        )
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+
+        Returns:
+            Counts by status, backlog and lag of the oldest pending delivery
+        """
+        stats = await asyncio.to_thread(self._stats)
+        WEBHOOK_QUEUE_BACKLOG.set(stats["backlog"])
+        WEBHOOK_QUEUE_LAG.set(stats["lag_seconds"])
+        stats["workers"] = len(self._tasks)
+        return stats
+
+    async def _worker(self, index: int) -> None:
+        """Claim and process deliveries until cancelled."""
+        while True:
+            try:
+                delivery = await asyncio.to_thread(self._claim)
+            except Exception as e:
+                logger.error(f"Webhook worker {index} failed to claim a delivery: {e}")
+                delivery = None
+
+            if delivery is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(delivery)
+
+    async def _process(self, delivery: WebhookDelivery) -> None:
+        """Run the handler for a claimed delivery and record the outcome."""
+        handler = self.handlers.get(delivery.source)
+        WEBHOOK_QUEUE_BACKLOG.dec()
+        renewal = asyncio.create_task(self._renew_lease(delivery.id))
+
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler registered for '{delivery.source}'")
+            await handler(delivery)
+        except Exception as e:
+            failed = await asyncio.to_thread(self._fail, delivery, str(e))
+            outcome = "failed" if failed else "retry"
+            if not failed:
+                WEBHOOK_QUEUE_BACKLOG.inc()
+            WEBHOOK_DELIVERIES.labels(source=delivery.source, outcome=outcome).inc()
+            logger.error(
+                f"Error processing {delivery.source} webhook {delivery.id} "
+                f"(attempt {delivery.attempts}): {e}"
+            )
+            return
+        finally:
+            renewal.cancel()
+
+        await asyncio.to_thread(self._complete, delivery.id)
+        WEBHOOK_DELIVERIES.labels(source=delivery.source, outcome="success").inc()
+        WEBHOOK_PROCESSING_LATENCY.labels(source=delivery.source).observe(
+            time.time() - delivery.received_at
+        )
+
+    async def _renew_lease(self, delivery_id: int) -> None:
+        """Extend the lease of a delivery for as long as its handler runs."""
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            try:
+                await asyncio.to_thread(self._extend_lease, delivery_id)
+            except Exception as e:
+                logger.warning(f"Failed to renew lease of webhook {delivery_id}: {e}")
+
+    def _insert(
+        self,
+        source: str,
+        key: str,
+        payload: bytes,
+        headers: Dict[str, str],
+        query_params: Dict[str, str],
+        dedupe_window: Optional[float] = None,
+    ) -> Tuple[int, bool]:
+        now = time.time()
+        with self._lock:
+            if dedupe_window is not None:
+                # Retire the key of an older identical body so this delivery
+                # is stored as a new event
+                self._conn.execute(
+                    "UPDATE webhook_deliveries "
+                    "SET idempotency_key = idempotency_key || ':' || id "
+                    "WHERE idempotency_key = ? AND received_at < ?",
+                    (key, now - dedupe_window),
+                )
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO webhook_deliveries "
+                "(source, idempotency_key, payload, headers, query_params, status, "
+                "received_at, available_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    source,
+                    key,
+                    payload,
+                    json.dumps(headers),
+                    json.dumps(query_params),
+                    self.PENDING,
+                    now,
+                    now,
+                ),
+            )
+            if cursor.rowcount == 1:
+                return cursor.lastrowid, False
+
+            row = self._conn.execute(
+                "SELECT id FROM webhook_deliveries WHERE idempotency_key = ?", (key,)
+            ).fetchone()
+            return row[0], True
+
+    def _claim(self) -> Optional[WebhookDelivery]:
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute(
+                    "SELECT id, status FROM webhook_deliveries "
+                    "WHERE (status = ? AND available_at <= ?) "
+                    "OR (status = ? AND lease_expires_at < ?) "
+                    "ORDER BY available_at, id LIMIT 1",
+                    (self.PENDING, now, self.PROCESSING, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.commit()
+                    return None
+
+                self._conn.execute(
+                    "UPDATE webhook_deliveries "
+                    "SET status = ?, attempts = attempts + 1, "
+                    "lease_owner = ?, lease_expires_at = ? WHERE id = ?",
+                    (self.PROCESSING, self.worker_id, now + self.lease_ttl, row[0]),
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+        if row[1] == self.PROCESSING:
+            # Abandoned by a worker that stopped without releasing it
+            logger.info(f"Reclaimed webhook delivery {row[0]} with an expired lease")
+            WEBHOOK_QUEUE_BACKLOG.inc()
+
+        return self._select("WHERE id = ?", (row[0],), 1)[0]
+
+    def _extend_lease(self, delivery_id: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE webhook_deliveries SET lease_expires_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (
+                    time.time() + self.lease_ttl,
+                    delivery_id,
+                    self.PROCESSING,
+                    self.worker_id,
+                ),
+            )
+
+    def _complete(self, delivery_id: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE webhook_deliveries "
+                "SET status = ?, completed_at = ?, payload = ?, last_error = NULL, "
+                "lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND lease_owner = ?",
+                (self.DONE, now, b"", delivery_id, self.worker_id),
+            )
+            # Completed rows only serve deduplication; drop them once expired
+            self._conn.execute(
+                "DELETE FROM webhook_deliveries WHERE status = ? AND completed_at < ?",
+                (self.DONE, now - self.retention),
+            )
+
+    def _fail(self, delivery: WebhookDelivery, error: str) -> bool:
+        """Schedule a retry, or mark failed. Returns True if marked failed."""
+        failed = delivery.attempts >= self.max_attempts
+        delay = self.retry_backoff * (2 ** (delivery.attempts - 1))
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE webhook_deliveries "
+                "SET status = ?, available_at = ?, last_error = ?, "
+                "lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND lease_owner = ?",
+                (
+                    self.FAILED if failed else self.PENDING,
+                    time.time() + delay,
+                    error,
+                    delivery.id,
+                    self.worker_id,
+                ),
+            )
+        return failed
+
+    def _replay(self, delivery_id: Optional[int], source: Optional[str]) -> int:
+        query = (
+            "UPDATE webhook_deliveries SET status = ?, attempts = 0, available_at = ? "
+            "WHERE status = ?"
+        )
+        params: List[Any] = [self.PENDING, time.time(), self.FAILED]
+        if delivery_id is not None:
+            query += " AND id = ?"
+            params.append(delivery_id)
+        if source is not None:
+            query += " AND source = ?"
+            params.append(source)
+
+        with self._lock:
+            count = self._conn.execute(query, params).rowcount
+
+        WEBHOOK_QUEUE_BACKLOG.inc(count)
+        return count
+
+    def _recover(self) -> int:
+        """
+        Requeue processing deliveries whose worker is gone.
+
+        That is deliveries whose lease expired, deliveries leased by an earlier
+        process with this worker ID, and deliveries claimed before leases
+        existed. Deliveries leased by other running workers are left alone.
+        """
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE webhook_deliveries "
+                "SET status = ?, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE status = ? AND (lease_expires_at IS NULL "
+                "OR lease_expires_at < ? OR lease_owner = ?)",
+                (self.PENDING, self.PROCESSING, time.time(), self.worker_id),
+            ).rowcount
+            backlog = self._conn.execute(
+                "SELECT COUNT(*) FROM webhook_deliveries WHERE status = ?",
+                (self.PENDING,),
+            ).fetchone()[0]
+
+        WEBHOOK_QUEUE_BACKLOG.set(backlog)
+        return count
+
+    def _select(
+        self, where: str, params: Tuple[Any, ...], limit: int
+    ) -> List[WebhookDelivery]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, source, idempotency_key, payload, headers, query_params, "
+                f"status, attempts, received_at, last_error FROM webhook_deliveries "
+                f"{where} LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+
+        return [
+            WebhookDelivery(
+                id=row[0],
+                source=row[1],
+                idempotency_key=row[2],
+                payload=row[3],
+                headers=json.loads(row[4]),
+                query_params=json.loads(row[5]),
+                status=row[6],
+                attempts=row[7],
+                received_at=row[8],
+                last_error=row[9],
+            )
+            for row in rows
+        ]
+
+    def _stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM webhook_deliveries GROUP BY status"
+                ).fetchall()
+            )
+            oldest = self._conn.execute(
+                "SELECT MIN(received_at) FROM webhook_deliveries WHERE status IN (?, ?)",
+                (self.PENDING, self.PROCESSING),
+            ).fetchone()[0]
+
+        backlog = counts.get(self.PENDING, 0) + counts.get(self.PROCESSING, 0)
+        return {
+            "backlog": backlog,
+            "lag_seconds": time.time() - oldest if oldest else 0.0,
+            "pending": counts.get(self.PENDING, 0),
+            "processing": counts.get(self.PROCESSING, 0),
+            "done": counts.get(self.DONE, 0),
+            "failed": counts.get(self.FAILED, 0),
+        }
+
+
+_webhook_queue: Optional[WebhookQueue] = None
+_webhook_handlers: Dict[str, WebhookHandler] = {}
+
+
+def register_webhook_handler(source: str, handler: WebhookHandler) -> None:
+    """
+    Register a handler with the process-wide webhook queue.
+
+    Modules register their handlers at import, before the queue exists; the
+    handlers are attached when get_webhook_queue first creates it.
+
+    Args:
+        source: Webhook source name, e.g. "typeform"
+        handler: Coroutine function taking a WebhookDelivery
+    """
+    _webhook_handlers[source] = handler
+    if _webhook_queue is not None:
+        _webhook_queue.register_handler(source, handler)
+
+
+def get_webhook_queue() -> WebhookQueue:
+    """Get the process-wide webhook queue, creating it from the environment."""
+    global _webhook_queue
+    if _webhook_queue is None:
+        _webhook_queue = WebhookQueue.from_env()
+        for source, handler in _webhook_handlers.items():
+            _webhook_queue.register_handler(source, handler)
+    return _webhook_queue
@@ -0,0 +1,721 @@
+"""
+WebSocket Broadcast Engine for The HigherSelf Network Server.
+
+Fans messages out to many WebSocket clients without letting one slow client
+hold up the rest:
+
+- Each message is serialized once per broadcast, not once per client
+- Every connection has its own bounded send queue drained by its own sender
+  task, so a broadcast is a loop of non-blocking queue appends
+- When a client's queue is full, the connection's SlowConsumerPolicy decides
+  whether to drop its oldest message, drop the new one, or disconnect it
+- Connect/disconnect audit records go through the MongoDB write-behind
+  sink instead of being inserted inline
+- Shared topics (agent, workflow and system channels) are relayed between
+  workers through Redis pubsub. Each worker holds one pubsub connection and
+  subscribes only to the topics its own clients follow, then fans each
+  message out locally, so any worker can serve any client
+
+Usage example:
+    await connection_manager.connect(websocket, client_id, agent_id="grace")
+    await connection_manager.subscribe(client_id, "agent_channel:grace")
+    await connection_manager.publish("agent_channel:grace", message)  # every worker
+    await connection_manager.broadcast_to_topic("dashboard", metrics)  # this worker
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Set
+
+from fastapi import WebSocket
+from loguru import logger
+from prometheus_client import Counter, Gauge
+from starlette.websockets import WebSocketState
+
+from services.mongo_write_sink import MongoWriteSink, get_mongo_write_sink
+
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections", "WebSocket connections currently open"
+)
+WEBSOCKET_MESSAGES_SENT = Counter(
+    "websocket_messages_sent_total", "Messages delivered to WebSocket clients"
+)
+WEBSOCKET_MESSAGES_DROPPED = Counter(
+    "websocket_messages_dropped_total",
+    "Messages not delivered to WebSocket clients by reason",
+    ["reason"],
+)
+WEBSOCKET_SLOW_DISCONNECTS = Counter(
+    "websocket_slow_consumer_disconnects_total",
+    "WebSocket clients disconnected for not keeping up",
+)
+WEBSOCKET_PUBSUB_TOPICS = Gauge(
+    "websocket_pubsub_topics", "Redis pubsub channels this worker is subscribed to"
+)
+WEBSOCKET_PUBSUB_MESSAGES = Counter(
+    "websocket_pubsub_messages_total", "Messages received from Redis pubsub"
+)
+
+# Channel every worker follows while it has clients, for broadcasts to all
+BROADCAST_CHANNEL = "ws_broadcast"
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a client's send queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
+def serialize_message(message: Dict[str, Any]) -> str:
+    """Serialize a message the way WebSocket.send_json does."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ClientConnection:
+    """A WebSocket client with its own bounded send queue and sender task."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        client_id: str,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+        send_timeout: float = 10.0,
+    ):
+        """
+        Initialize the connection.
+
+        Args:
+            websocket: The accepted WebSocket
+            client_id: Unique identifier for the client
+            max_queue: Maximum messages waiting to be sent to this client
+            policy: What to do when the queue is full
+            send_timeout: Seconds a single send may take before the client
+                is treated as stalled and disconnected
+        """
+        self.websocket = websocket
+        self.client_id = client_id
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.last_activity = time.time()
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+
+        self._queue: Deque[str] = deque()
+        self._ready = asyncio.Event()
+        self._sender: Optional[asyncio.Task] = None
+
+    @property
+    def queued(self) -> int:
+        """Messages waiting to be sent."""
+        return len(self._queue)
+
+    def start(self) -> None:
+        """Start the sender task."""
+        if self._sender is None:
+            self._sender = asyncio.create_task(self._send_loop())
+
+    def enqueue(self, payload: str) -> bool:
+        """
+        Queue a serialized message without waiting.
+
+        Args:
+            payload: Serialized message
+
+        Returns:
+            True if the message was queued
+        """
+        if self.closed:
+            return False
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy == SlowConsumerPolicy.DROP_NEWEST:
+                self._drop("queue_full")
+                return False
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                WEBSOCKET_SLOW_DISCONNECTS.inc()
+                logger.warning(
+                    f"Disconnecting slow WebSocket client {self.client_id} "
+                    f"({len(self._queue)} messages queued)"
+                )
+                asyncio.create_task(self.close(code=1013, reason="Too slow"))
+                return False
+            self._queue.popleft()
+            self._drop("queue_full")
+
+        self._queue.append(payload)
+        self._ready.set()
+        return True
+
+    def _drop(self, reason: str) -> None:
+        self.dropped += 1
+        WEBSOCKET_MESSAGES_DROPPED.labels(reason=reason).inc()
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                if not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+
+                payload = self._queue.popleft()
+                if self.websocket.client_state != WebSocketState.CONNECTED:
+                    break
+                await asyncio.wait_for(
+                    self.websocket.send_text(payload), self.send_timeout
+                )
+                self.sent += 1
+                self.last_activity = time.time()
+                WEBSOCKET_MESSAGES_SENT.inc()
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            WEBSOCKET_SLOW_DISCONNECTS.inc()
+            logger.warning(f"WebSocket send to {self.client_id} timed out")
+            await self.close(code=1013, reason="Too slow")
+        except Exception as e:
+            logger.error(f"Error sending WebSocket message to {self.client_id}: {e}")
+        finally:
+            self.closed = True
+            if self._queue:
+                WEBSOCKET_MESSAGES_DROPPED.labels(reason="closed").inc(len(self._queue))
+                self._queue.clear()
+
+    async def close(self, code: int = 1000, reason: Optional[str] = None) -> None:
+        """Stop sending and close the WebSocket if it is still open."""
+        self.closed = True
+        if self._sender and self._sender is not asyncio.current_task():
+            self._sender.cancel()
+        if self.websocket.client_state == WebSocketState.CONNECTED:
+            try:
+                await self.websocket.close(code=code, reason=reason)
+            except Exception as e:
+                logger.debug(f"Error closing WebSocket {self.client_id}: {e}")
+
+
+class RedisPubSubFanout:
+    """
+    Relays topic messages between workers through Redis pubsub.
+
+    Holds a single pubsub connection per worker, subscribed to exactly the
+    topics passed to subscribe(), and hands every message received to
+    `deliver(topic, payload)` for local fan-out. If the connection drops it
+    is re-established and all topics are subscribed again.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[str, str], None],
+        redis_client: Any = None,
+        reconnect_delay: float = 1.0,
+    ):
+        """
+        Initialize the fan-out.
+
+        Args:
+            deliver: Called with (topic, payload) for each message received
+            redis_client: Async Redis client with decode_responses=True
+                (default: the shared redis_service client)
+            reconnect_delay: Seconds to wait before reconnecting after an error
+        """
+        self._deliver = deliver
+        self._redis = redis_client
+        self.reconnect_delay = reconnect_delay
+        self._pubsub = None
+        self._topics: Set[str] = set()
+        self._reader: Optional[asyncio.Task] = None
+
+    @property
+    def topics(self) -> Set[str]:
+        """Topics this worker is subscribed to."""
+        return set(self._topics)
+
+    async def _get_redis(self):
+        if self._redis is None:
+            from services.redis_service import redis_service
+
+            self._redis = await redis_service.get_async_client()
+        return self._redis
+
+    async def _get_pubsub(self):
+        if self._pubsub is None:
+            redis = await self._get_redis()
+            self._pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        return self._pubsub
+
+    async def subscribe(self, topic: str) -> None:
+        """
+        Start receiving a topic.
+
+        Args:
+            topic: Topic (Redis channel) name
+        """
+        if topic in self._topics:
+            return
+
+        self._topics.add(topic)
+        WEBSOCKET_PUBSUB_TOPICS.set(len(self._topics))
+        try:
+            pubsub = await self._get_pubsub()
+            await pubsub.subscribe(topic)
+        except Exception as e:
+            # The reader subscribes again once Redis is reachable
+            logger.warning(f"Could not subscribe to {topic}: {e}")
+
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_loop())
+
+    async def unsubscribe(self, topic: str) -> None:
+        """
+        Stop receiving a topic.
+
+        Args:
+            topic: Topic (Redis channel) name
+        """
+        if topic not in self._topics:
+            return
+
+        self._topics.discard(topic)
+        WEBSOCKET_PUBSUB_TOPICS.set(len(self._topics))
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(topic)
+            except Exception as e:
+                logger.debug(f"Could not unsubscribe from {topic}: {e}")
+
+    async def publish(self, topic: str, payload: str) -> int:
+        """
+        Publish a serialized message to every worker following a topic.
+
+        Args:
+            topic: Topic (Redis channel) name
+            payload: Serialized message
+
+        Returns:
+            Number of workers that received the message
+        """
+        redis = await self._get_redis()
+        return await redis.publish(topic, payload)
+
+    async def _read_loop(self) -> None:
+        delay = self.reconnect_delay
+        while self._topics:
+            try:
+                pubsub = await self._get_pubsub()
+                if not pubsub.subscribed:
+                    await pubsub.subscribe(*self._topics)
+                message = await pubsub.get_message(timeout=1.0)
+                delay = self.reconnect_delay
+                if message and message["type"] == "message":
+                    WEBSOCKET_PUBSUB_MESSAGES.inc()
+                    self._deliver(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Redis pubsub fan-out error, reconnecting in {delay:.0f}s: {e}"
+                )
+                await self._reset()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+            if not self._topics:
+                # Close the idle connection; a later subscribe() opens a new
+                # one and restarts this loop
+                await self._reset()
+
+    async def _reset(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.close()
+            except Exception as e:
+                logger.debug(f"Error closing Redis pubsub: {e}")
+
+    async def close(self) -> None:
+        """Unsubscribe from everything and close the pubsub connection."""
+        self._topics.clear()
+        WEBSOCKET_PUBSUB_TOPICS.set(0)
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self._reset()
+
+
+class ConnectionManager:
+    """
+    WebSocket connection manager for agent communications.
+    Follows the Agent Communication Security rules by enforcing
+    authorized communication patterns.
+
+    Clients can also subscribe to topics. Shared topics are followed
+    through Redis pubsub while this worker has a subscriber, so publish()
+    reaches subscribers on every worker; broadcast_to_* reach only this
+    worker's clients.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+        send_timeout: float = 10.0,
+        audit_sink: Optional[MongoWriteSink] = None,
+        redis_fanout: bool = True,
+        redis_client: Any = None,
+    ):
+        """
+        Initialize the connection manager.
+
+        Args:
+            max_queue: Maximum messages queued per client
+            policy: What to do when a client's queue is full
+            send_timeout: Seconds a single send may take
+            audit_sink: Sink for audit records (default: the shared
+                MongoDB write sink)
+            redis_fanout: Whether to relay shared topics between workers
+                through Redis pubsub
+            redis_client: Async Redis client for the fan-out (default: the
+                shared redis_service client)
+        """
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.audit_sink = audit_sink or get_mongo_write_sink()
+
+        self.connections: Dict[str, ClientConnection] = {}
+        self.agent_connections: Dict[str, Set[str]] = {}
+        self.topic_connections: Dict[str, Set[str]] = {}
+        self.connection_info: Dict[str, Dict[str, Any]] = {}
+
+        self.fanout = (
+            RedisPubSubFanout(self._deliver, redis_client) if redis_fanout else None
+        )
+
+    @classmethod
+    def from_env(cls) -> "ConnectionManager":
+        """Create a manager configured from WEBSOCKET_* environment variables."""
+        return cls(
+            max_queue=int(os.environ.get("WEBSOCKET_SEND_QUEUE_SIZE", "256")),
+            policy=SlowConsumerPolicy(
+                os.environ.get("WEBSOCKET_SLOW_CONSUMER_POLICY", "drop_oldest")
+            ),
+            send_timeout=float(os.environ.get("WEBSOCKET_SEND_TIMEOUT", "10")),
+            redis_fanout=os.environ.get("WEBSOCKET_REDIS_FANOUT", "true").lower()
+            == "true",
+        )
+
+    @property
+    def active_connections(self) -> Dict[str, WebSocket]:
+        """WebSockets by client ID."""
+        return {
+            client_id: connection.websocket
+            for client_id, connection in self.connections.items()
+        }
+
+    async def connect(
+        self, websocket: WebSocket, client_id: str, agent_id: Optional[str] = None
+    ):
+        """
+        Connect a client websocket.
+
+        Args:
+            websocket: The WebSocket connection
+            client_id: Unique identifier for the client
+            agent_id: Optional agent ID if this connection is associated with an agent
+        """
+        await websocket.accept()
+        connection = ClientConnection(
+            websocket,
+            client_id,
+            max_queue=self.max_queue,
+            policy=self.policy,
+            send_timeout=self.send_timeout,
+        )
+        connection.start()
+        self.connections[client_id] = connection
+        WEBSOCKET_CONNECTIONS.set(len(self.connections))
+        if self.fanout and len(self.connections) == 1:
+            await self.fanout.subscribe(BROADCAST_CHANNEL)
+
+        # Record connection info for monitoring
+        connected_at = datetime.utcnow().isoformat()
+        self.connection_info[client_id] = {
+            "connected_at": connected_at,
+            "client_ip": websocket.client.host,
+            "agent_id": agent_id,
+        }
+
+        # Add to agent connections if associated with an agent
+        if agent_id:
+            self.agent_connections.setdefault(agent_id, set()).add(client_id)
+
+            # Log for audit trail
+            self._audit(
+                "agent_websocket_connections",
+                {
+                    "agent_id": agent_id,
+                    "client_id": client_id,
+                    "client_ip": websocket.client.host,
+                    "connected_at": connected_at,
+                },
+            )
+
+        logger.info(f"WebSocket connected: {client_id} (Agent: {agent_id})")
+
+    async def disconnect(self, client_id: str):
+        """
+        Disconnect a client websocket.
+
+        Args:
+            client_id: The client ID to disconnect
+        """
+        connection = self.connections.pop(client_id, None)
+        if connection is None:
+            return
+
+        await connection.close()
+        WEBSOCKET_CONNECTIONS.set(len(self.connections))
+        info = self.connection_info.pop(client_id, {})
+
+        for topic in list(self.topic_connections):
+            await self.unsubscribe(client_id, topic)
+        if self.fanout and not self.connections:
+            await self.fanout.unsubscribe(BROADCAST_CHANNEL)
+
+        agent_id = info.get("agent_id")
+        if agent_id:
+            self._discard(self.agent_connections, agent_id, client_id)
+
+            # Log disconnection for audit trail
+            connected_at = info.get("connected_at")
+            self._audit(
+                "agent_websocket_disconnections",
+                {
+                    "agent_id": agent_id,
+                    "client_id": client_id,
+                    "connected_at": connected_at,
+                    "disconnected_at": datetime.utcnow().isoformat(),
+                    "duration_seconds": (
+                        (
+                            datetime.utcnow() - datetime.fromisoformat(connected_at)
+                        ).total_seconds()
+                        if connected_at
+                        else 0
+                    ),
+                },
+            )
+
+        logger.info(f"WebSocket disconnected: {client_id}")
+
+    @staticmethod
+    def _discard(groups: Dict[str, Set[str]], key: str, client_id: str) -> None:
+        members = groups.get(key)
+        if members is not None:
+            members.discard(client_id)
+            if not members:
+                del groups[key]
+
+    async def subscribe(self, client_id: str, topic: str, shared: bool = True):
+        """
+        Subscribe a connected client to a topic.
+
+        Args:
+            client_id: The client ID
+            topic: Topic name (the Redis channel for shared topics)
+            shared: Whether the topic receives messages published by other
+                workers; local topics are only fed by broadcast_to_topic
+        """
+        if client_id not in self.connections:
+            return
+
+        subscribers = self.topic_connections.setdefault(topic, set())
+        first = not subscribers
+        subscribers.add(client_id)
+        if first and shared and self.fanout:
+            await self.fanout.subscribe(topic)
+
+    async def unsubscribe(self, client_id: str, topic: str):
+        """
+        Unsubscribe a client from a topic.
+
+        Args:
+            client_id: The client ID
+            topic: Topic name
+        """
+        self._discard(self.topic_connections, topic, client_id)
+        if topic not in self.topic_connections and self.fanout:
+            await self.fanout.unsubscribe(topic)
+
+    async def send_json(self, client_id: str, message: Dict[str, Any]):
+        """
+        Send a JSON message to a specific client.
+
+        Args:
+            client_id: The client ID to send to
+            message: The message to send (will be serialized to JSON)
+
+        Returns:
+            True if queued for sending, False otherwise
+        """
+        connection = self.connections.get(client_id)
+        if connection is None:
+            return False
+        return connection.enqueue(serialize_message(message))
+
+    def _fan_out(self, client_ids: Iterable[str], message: Dict[str, Any]) -> int:
+        return self._fan_out_payload(client_ids, serialize_message(message))
+
+    def _fan_out_payload(self, client_ids: Iterable[str], payload: str) -> int:
+        sent_count = 0
+        for client_id in list(client_ids):
+            connection = self.connections.get(client_id)
+            if connection is not None and connection.enqueue(payload):
+                sent_count += 1
+        return sent_count
+
+    async def broadcast_to_agent(self, agent_id: str, message: Dict[str, Any]):
+        """
+        Broadcast a message to all clients connected to an agent.
+
+        Args:
+            agent_id: The agent to broadcast to
+            message: The message to broadcast (will be serialized to JSON)
+
+        Returns:
+            Number of clients the message was queued for
+        """
+        return self._fan_out(self.agent_connections.get(agent_id, ()), message)
+
+    async def broadcast_to_topic(self, topic: str, message: Dict[str, Any]):
+        """
+        Broadcast a message to all clients subscribed to a topic.
+
+        Args:
+            topic: The topic to broadcast to
+            message: The message to broadcast (will be serialized to JSON)
+
+        Returns:
+            Number of clients the message was queued for
+        """
+        return self._fan_out(self.topic_connections.get(topic, ()), message)
+
+    async def broadcast_to_all(self, message: Dict[str, Any]):
+        """
+        Broadcast a message to all connected clients.
+
+        Args:
+            message: The message to broadcast (will be serialized to JSON)
+
+        Returns:
+            Number of clients the message was queued for
+        """
+        return self._fan_out(self.connections, message)
+
+    async def publish(self, topic: str, message: Dict[str, Any]) -> int:
+        """
+        Publish a message to a topic's subscribers on every worker.
+
+        Falls back to this worker's subscribers if Redis is unavailable.
+
+        Args:
+            topic: The topic to publish to
+            message: The message to publish (will be serialized to JSON)
+
+        Returns:
+            Number of workers the message reached, or of local clients it
+            was queued for when published without Redis
+        """
+        payload = serialize_message(message)
+        if self.fanout:
+            try:
+                return await self.fanout.publish(topic, payload)
+            except Exception as e:
+                logger.warning(f"Redis publish to {topic} failed, sending locally: {e}")
+        self._deliver(topic, payload)
+        return 1
+
+    async def publish_to_all(self, message: Dict[str, Any]) -> int:
+        """
+        Publish a message to every client on every worker.
+
+        Args:
+            message: The message to publish (will be serialized to JSON)
+
+        Returns:
+            Number of workers the message reached
+        """
+        return await self.publish(BROADCAST_CHANNEL, message)
+
+    def _deliver(self, topic: str, payload: str) -> None:
+        """Fan a message received for a topic out to local subscribers."""
+        try:
+            json.loads(payload)
+        except (ValueError, TypeError):
+            # Not JSON; wrap it so clients can always parse what they receive
+            payload = serialize_message(
+                {
+                    "type": "message",
+                    "data": payload,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+            )
+
+        if topic == BROADCAST_CHANNEL:
+            self._fan_out_payload(self.connections, payload)
+        else:
+            self._fan_out_payload(self.topic_connections.get(topic, ()), payload)
+
+    def get_connection_count(self) -> int:
+        """Get the number of active connections."""
+        return len(self.connections)
+
+    def get_agent_connection_count(self, agent_id: str) -> int:
+        """Get the number of connections for a specific agent."""
+        return len(self.agent_connections.get(agent_id, ()))
+
+    def get_topic_connection_count(self, topic: str) -> int:
+        """Get the number of connections subscribed to a topic."""
+        return len(self.topic_connections.get(topic, ()))
+
+    def get_all_connection_info(self) -> Dict[str, Dict[str, Any]]:
+        """Get information about all active connections."""
+        return {
+            client_id: {
+                **self.connection_info.get(client_id, {}),
+                "last_activity": datetime.utcfromtimestamp(
+                    connection.last_activity
+                ).isoformat(),
+                "messages_sent": connection.sent,
+                "messages_queued": connection.queued,
+                "messages_dropped": connection.dropped,
+            }
+            for client_id, connection in self.connections.items()
+        }
+
+    def _audit(self, collection: str, document: Dict[str, Any]) -> None:
+        """Queue an audit record for the next batched write."""
+        self.audit_sink.write(collection, document)
+
+    async def close(self) -> None:
+        """Disconnect every client and stop the Redis fan-out."""
+        for client_id in list(self.connections):
+            await self.disconnect(client_id)
+        if self.fanout:
+            await self.fanout.close()
+
+
+# Shared connection manager for this worker
+connection_manager = ConnectionManager.from_env()
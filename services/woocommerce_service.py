@@ -16,6 +16,7 @@ from woocommerce import API as SyncAPI
 
 # Import base service class
 from services.base_service import BaseService, ServiceCredentials
+from utils.rate_limiter import get_rate_limiter
 
 
 class WooCommerceCredentials(ServiceCredentials):
@@ -102,7 +103,7 @@ class WooCustomer(BaseModel):
 
 
 class AsyncWooCommerceAPI:
-    """Async wrapper around the WooCommerce API."""
+    """Async wrapper around the WooCommerce API, paced by a rate limiter."""
 
     def __init__(
         self,
@@ -129,21 +130,27 @@ class AsyncWooCommerceAPI:
             version=version,
             timeout=timeout,
         )
+        # Shared hosting behind most stores throttles bursts of API calls
+        self.rate_limiter = get_rate_limiter("woocommerce", rate=5, burst=10)
 
     async def get(self, endpoint: str, **kwargs) -> Any:
         """Perform an async GET request."""
+        await self.rate_limiter.acquire()
         return await asyncio.to_thread(self.sync_client.get, endpoint, **kwargs)
 
     async def post(self, endpoint: str, data: Dict[str, Any], **kwargs) -> Any:
         """Perform an async POST request."""
+        await self.rate_limiter.acquire()
         return await asyncio.to_thread(self.sync_client.post, endpoint, data, **kwargs)
 
     async def put(self, endpoint: str, data: Dict[str, Any], **kwargs) -> Any:
         """Perform an async PUT request."""
+        await self.rate_limiter.acquire()
         return await asyncio.to_thread(self.sync_client.put, endpoint, data, **kwargs)
 
     async def delete(self, endpoint: str, **kwargs) -> Any:
         """Perform an async DELETE request."""
+        await self.rate_limiter.acquire()
         return await asyncio.to_thread(self.sync_client.delete, endpoint, **kwargs)
 
 
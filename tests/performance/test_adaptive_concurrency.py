@@ -0,0 +1,120 @@
+"""
+Tests for the adaptive concurrency limiter.
+"""
+
+import asyncio
+
+import pytest
+
+from services.adaptive_concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimitExceeded,
+)
+
+
+async def call(limiter, delay=0.01, error=None):
+    async with limiter.acquire():
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_saturated_and_latency_is_steady():
+    limiter = AdaptiveConcurrencyLimiter("fast", initial_limit=2, max_limit=20)
+
+    for _ in range(20):
+        await asyncio.gather(*(call(limiter) for _ in range(20)))
+
+    assert limiter.limit > 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_backs_off_on_overload():
+    limiter = AdaptiveConcurrencyLimiter("slow", initial_limit=10)
+
+    for _ in range(3):
+        with pytest.raises(asyncio.TimeoutError):
+            await call(limiter, delay=0, error=asyncio.TimeoutError())
+        await asyncio.sleep(0.001)
+
+    assert limiter.limit < 10
+    # Application errors do not count as overload
+    limit = limiter.limit
+    with pytest.raises(ValueError):
+        await call(limiter, delay=0, error=ValueError())
+    assert limiter.limit == limit
+
+
+@pytest.mark.asyncio
+async def test_excess_calls_queue_in_order_and_are_shed():
+    limiter = AdaptiveConcurrencyLimiter("queued", initial_limit=1, max_queue=2)
+    order = []
+
+    async def tracked(i):
+        async with limiter.acquire():
+            order.append(i)
+            await asyncio.sleep(0.01)
+
+    tasks = [asyncio.create_task(tracked(i)) for i in range(3)]
+    await asyncio.sleep(0)
+    assert limiter.queued == 2
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await call(limiter)
+
+    await asyncio.gather(*tasks)
+    assert order == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_do_not_leak_slots():
+    limiter = AdaptiveConcurrencyLimiter(
+        "cancel", initial_limit=1, max_limit=1, queue_timeout=0.05
+    )
+
+    holder = asyncio.create_task(call(limiter, delay=0.02))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(call(limiter))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    await holder
+    assert limiter.in_flight == 0
+    assert limiter.queued == 0
+
+    holder = asyncio.create_task(call(limiter, delay=0.2))
+    await asyncio.sleep(0)
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await call(limiter)
+    await holder
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_patient_calls_wait_instead_of_being_shed():
+    limiter = AdaptiveConcurrencyLimiter(
+        "batch", initial_limit=2, max_limit=2, max_queue=1, queue_timeout=0.3
+    )
+
+    async def patient():
+        async with limiter.acquire(shed=False):
+            await asyncio.sleep(0.2)
+
+    batch = [asyncio.create_task(patient()) for _ in range(10)]
+    await asyncio.sleep(0)
+    assert limiter.queued == 8
+
+    # Patient waiters leave room in the queue for other callers
+    other = asyncio.create_task(call(limiter))
+    await asyncio.sleep(0)
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await call(limiter)
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await other
+
+    await asyncio.gather(*batch)
+    assert limiter.in_flight == 0 and limiter.queued == 0
@@ -0,0 +1,70 @@
+"""
+Benchmark for duplicate detection against a 100k-contact workspace.
+"""
+
+import random
+import time
+
+import pytest
+
+from services.contact_candidate_index import (
+    ContactCandidateIndex,
+    ContactFeatures,
+    contact_similarity,
+)
+
+WORKSPACE_SIZE = 100_000
+WORDS = [f"word{i}" for i in range(2_000)]
+
+
+def make_workspace(size, rng):
+    return [
+        {
+            "id": f"contact-{i}",
+            "email": f"person{i}@example.com",
+            "first_name": rng.choice(WORDS),
+            "last_name": rng.choice(WORDS),
+            "phone": f"+1555{i:07d}",
+            "message": " ".join(rng.sample(WORDS, 8)),
+        }
+        for i in range(size)
+    ]
+
+
+@pytest.mark.slow
+def test_duplicate_lookup_in_100k_workspace():
+    rng = random.Random(11)
+    contacts = make_workspace(WORKSPACE_SIZE, rng)
+    index = ContactCandidateIndex()
+
+    start = time.perf_counter()
+    index.sync(contacts)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resync = index.sync(contacts)
+    resync_time = time.perf_counter() - start
+    assert resync["unchanged"] == WORKSPACE_SIZE
+
+    new_contacts = [
+        {**contact, "id": None, "phone": contact["phone"].replace("+1", "")}
+        for contact in rng.sample(contacts, 500)
+    ]
+    start = time.perf_counter()
+    scored = 0
+    for contact in new_contacts:
+        features = ContactFeatures(contact)
+        candidates = index.candidates(features)
+        scored += len(candidates)
+        best = max(contact_similarity(features, f) for _, f in candidates)
+        assert best == 1.0
+    lookup_time = time.perf_counter() - start
+
+    print(
+        f"\nbuild {build_time:.2f}s, resync {resync_time:.2f}s, "
+        f"{len(new_contacts)} lookups {lookup_time:.2f}s, "
+        f"{scored / len(new_contacts):.1f} candidates per lookup, {index.get_metrics()}"
+    )
+    # Pairwise scoring would have compared every new contact with all 100k
+    assert scored < len(new_contacts) * WORKSPACE_SIZE / 1000
+    assert lookup_time < 5
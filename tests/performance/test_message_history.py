@@ -0,0 +1,88 @@
+"""
+Tests for the bounded, indexed MessageBus history and background Notion sink.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from utils.message_bus import AgentMessage, MessageBus, MessageHistory
+
+
+def make_message(i: int) -> AgentMessage:
+    return AgentMessage(
+        sender=f"agent{i % 5}",
+        recipient=f"agent{(i + 1) % 7}",
+        message_type=["task", "query", "notification"][i % 3],
+        payload={"i": i},
+    )
+
+
+def linear_scan(messages, limit, agent_id=None, message_type=None):
+    matches = [
+        m
+        for m in reversed(messages)
+        if (not agent_id or agent_id in (m.sender, m.recipient))
+        and (not message_type or m.message_type == message_type)
+    ]
+    return matches[:limit]
+
+
+class TestMessageHistory:
+    def test_bounded_size(self):
+        history = MessageHistory(max_size=100)
+        for i in range(1000):
+            history.append(make_message(i))
+
+        assert len(history) == 100
+        assert [m.payload["i"] for m in history] == list(range(900, 1000))
+        assert sum(len(b) for b in history._by_type.values()) == 100
+
+    def test_query_matches_linear_scan(self):
+        history = MessageHistory(max_size=500)
+        messages = [make_message(i) for i in range(2000)]
+        for message in messages:
+            history.append(message)
+        retained = messages[-500:]
+
+        for agent_id in [None, "agent0", "agent1", "agent6", "nobody"]:
+            for message_type in [None, "task", "query"]:
+                for limit in [1, 10, 1000]:
+                    assert history.query(limit, agent_id, message_type) == (
+                        linear_scan(retained, limit, agent_id, message_type)
+                    )
+
+    def test_self_addressed_message_returned_once(self):
+        history = MessageHistory()
+        history.append(
+            AgentMessage(sender="a", recipient="a", message_type="t", payload={})
+        )
+        assert len(history.query(agent_id="a")) == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_does_not_wait_for_notion():
+    stored = []
+
+    async def slow_store(message):
+        await asyncio.sleep(0.2)
+        stored.append(message.message_id)
+
+    bus = MessageBus(notion_service=object())
+    bus.notion_sink.write = slow_store
+    received = []
+
+    async def on_message(message):
+        received.append(message.message_id)
+
+    bus.subscribe("agent1", on_message)
+
+    start = time.perf_counter()
+    ids = [await bus.publish(make_message(0)) for _ in range(10)]
+    assert time.perf_counter() - start < 0.2
+    assert received == ids
+
+    await bus.close()
+    assert sorted(stored) == sorted(ids)
+    assert bus.get_message_history(limit=3) == list(bus.message_history)[::-1][:3]
@@ -0,0 +1,98 @@
+"""
+Benchmark for refreshing audience segments over 100k customers.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.audience_models import SegmentCriteria
+from services.segmentation_engine import SegmentationEngine
+
+CUSTOMERS = 100_000
+NOW = datetime(2025, 6, 1)
+INTERESTS = ["art", "yoga", "retreats", "coaching", "wellness", "gallery"]
+SEGMENTS = {
+    "art_lovers": [("interests", "contains", "art")],
+    "big_spenders": [("total_spent", "greater_than", 500)],
+    "recent_buyers": [("last_order_date", "within_last_days", 30)],
+    "lapsed": [("last_order_date", "older_than_days", 180)],
+    "bookers": [("booking_count", "greater_than_or_equal", 2)],
+    "austin_yoga": [("city", "equals", "Austin"), ("interests", "contains", "yoga")],
+    "no_orders": [("order_count", "not_exists", None)],
+    "mid_tier": [("total_spent", "between", [100, 500])],
+}
+
+
+def load(engine, rng):
+    engine.load_profiles(
+        {
+            "email": f"customer{i}@example.com",
+            "interests": rng.sample(INTERESTS, 2),
+            "custom_fields": {"city": rng.choice(["Austin", "Boston", "Denver"])},
+        }
+        for i in range(CUSTOMERS)
+    )
+    engine.load_orders(
+        {
+            "id": i,
+            "status": "completed",
+            "total": rng.uniform(10, 900),
+            "date_created": NOW - timedelta(days=rng.randrange(365)),
+            "billing": {"email": f"customer{rng.randrange(CUSTOMERS)}@example.com"},
+            "line_items": [{"name": rng.choice(INTERESTS)}],
+        }
+        for i in range(CUSTOMERS)
+    )
+    engine.load_bookings(
+        {
+            "id": i,
+            "status": "approved",
+            "customer_email": f"customer{rng.randrange(CUSTOMERS)}@example.com",
+            "booking_start": NOW - timedelta(days=rng.randrange(90)),
+            "service_id": rng.randrange(10),
+        }
+        for i in range(CUSTOMERS // 2)
+    )
+
+
+@pytest.mark.slow
+def test_refresh_all_segments_for_100k_customers():
+    rng = random.Random(5)
+    engine = SegmentationEngine()
+    start = time.perf_counter()
+    load(engine, rng)
+    load_time = time.perf_counter() - start
+
+    for segment_id, specs in SEGMENTS.items():
+        engine.define_segment(
+            segment_id,
+            [SegmentCriteria(field=f, operator=op, value=v) for f, op, v in specs],
+        )
+
+    start = time.perf_counter()
+    full = engine.refresh_segments(now=NOW)
+    full_time = time.perf_counter() - start
+
+    engine.upsert_contacts(
+        {"email": f"customer{i}@example.com", "interests": ["art"]}
+        for i in rng.sample(range(CUSTOMERS), 100)
+    )
+    start = time.perf_counter()
+    incremental = engine.refresh_segments(now=NOW)
+    incremental_time = time.perf_counter() - start
+
+    print(
+        f"\nload {load_time:.2f}s, full refresh {full_time * 1000:.1f}ms, "
+        f"incremental refresh {incremental_time * 1000:.1f}ms, "
+        f"{ {k: v['member_count'] for k, v in full.items()} }"
+    )
+    assert len(engine) == CUSTOMERS
+    assert full_time < 0.5
+    assert incremental_time < full_time
+    assert not incremental["art_lovers"]["full"]
+    assert (
+        incremental["art_lovers"]["member_count"] >= full["art_lovers"]["member_count"]
+    )
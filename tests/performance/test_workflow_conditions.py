@@ -0,0 +1,211 @@
+"""
+Tests and micro-benchmark for compiled workflow transition conditions.
+
+Checks that compiled conditions agree with the interpreted TransitionCondition /
+ConditionGroup evaluation, and measures condition evaluations per second over a
+large population of workflow instances.
+"""
+
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from workflow.compiled_conditions import (
+    compile_condition,
+    compile_condition_group,
+    compile_engine_condition,
+)
+from workflow.state_machine import StateTransition
+from workflow.transitions import ConditionGroup, TransitionCondition
+from workflow.workflow_engine import ConditionEvaluator
+
+CONDITIONS = [
+    {
+        "name": "qualified",
+        "description": "Lead is qualified",
+        "field_path": "lead.status",
+        "operator": "equals",
+        "expected_value": "Qualified",
+    },
+    {
+        "name": "high_score",
+        "description": "Lead score is high",
+        "field_path": "lead.score",
+        "operator": "greater_than",
+        "expected_value": "70",
+    },
+    {
+        "name": "has_email",
+        "description": "Email present",
+        "field_path": "email",
+        "operator": "exists",
+    },
+    {
+        "name": "vip_tag",
+        "description": "Tagged VIP",
+        "field_path": "tags",
+        "operator": "contains",
+        "expected_value": '"vip"',
+    },
+    {
+        "name": "gmail",
+        "description": "Gmail address",
+        "field_path": "email",
+        "operator": "regex_match",
+        "expected_value": '".*@GMAIL\\\\.com$"',
+    },
+]
+
+GROUP = {"operator": "OR", "conditions": CONDITIONS[3:]}
+
+ROUTING = {
+    "lead.score >= 90": "fast_track",
+    "lead.status == Nurture": "nurture",
+}
+
+
+def make_context(i: int) -> dict:
+    """Build varied context data for instance i."""
+    rng = random.Random(i)
+    context = {
+        "lead": {
+            "status": rng.choice(["qualified", "Qualified", "Nurture", "new"]),
+            "score": rng.randint(0, 100),
+        },
+        "tags": rng.sample(["vip", "newsletter", "event", "partner"], k=2),
+    }
+    if rng.random() > 0.2:
+        context["email"] = f"user{i}@" + rng.choice(["gmail.com", "example.org"])
+    return context
+
+
+def make_instance(context: dict) -> SimpleNamespace:
+    """Build a stand-in workflow instance; conditions only read context_data."""
+    return SimpleNamespace(current_state="new", context_data=context)
+
+
+def make_transition() -> StateTransition:
+    return StateTransition(
+        from_state="new",
+        to_state="qualified",
+        name="qualify",
+        description="Qualify the lead",
+        conditions=CONDITIONS[:3],
+        condition_groups=[GROUP],
+        conditional_routing=ROUTING,
+    )
+
+
+class TestCompiledConditionParity:
+    """Compiled conditions must agree with the interpreted evaluation."""
+
+    def test_conditions_match_interpreted(self):
+        contexts = [make_context(i) for i in range(500)]
+
+        for data in CONDITIONS:
+            interpreted = TransitionCondition.from_dict(data)
+            compiled = compile_condition(data)
+            for context in contexts:
+                assert compiled(context) == interpreted.is_satisfied(context)
+
+    def test_group_matches_interpreted(self):
+        interpreted = ConditionGroup.from_dict(GROUP)
+        compiled = compile_condition_group(GROUP)
+
+        for i in range(500):
+            context = make_context(i)
+            assert compiled(context) == interpreted.is_satisfied(context)
+
+    def test_engine_conditions_match_evaluator(self):
+        conditions = [
+            {"field": "lead.score", "operator": "gte", "value": 50},
+            {"field": "lead.status", "operator": "starts_with", "value": "Q"},
+            {"field": "missing.field", "operator": "not_exists"},
+            {"field": "lead.score", "operator": "unknown", "value": 1},
+        ]
+
+        for condition in conditions:
+            compiled = compile_engine_condition(condition)
+            for i in range(200):
+                context = make_context(i)
+                actual = ConditionEvaluator.get_field_value(context, condition["field"])
+                expected = ConditionEvaluator.compare_values(
+                    actual, condition["operator"], condition.get("value")
+                )
+                assert compiled(context) == expected
+
+    def test_engine_conditions_are_compiled_once(self):
+        condition = {"field": "lead.score", "operator": "gte", "value": 50}
+
+        first = compile_engine_condition(condition)
+        assert compile_engine_condition(dict(reversed(condition.items()))) is first
+        assert ConditionEvaluator.evaluate_condition(condition, make_context(1)) == (
+            first(make_context(1))
+        )
+
+    @pytest.mark.asyncio
+    async def test_transition_evaluation_and_routing(self):
+        transition = make_transition()
+
+        for i in range(200):
+            context = make_context(i)
+            instance = make_instance(context)
+
+            expected = all(
+                TransitionCondition.from_dict(c).is_satisfied(context)
+                for c in CONDITIONS[:3]
+            ) and ConditionGroup.from_dict(GROUP).is_satisfied(context)
+            assert await transition.evaluate_conditions(instance) == expected
+
+            if context["lead"]["score"] >= 90:
+                expected_route = "fast_track"
+            elif context["lead"]["status"] == "Nurture":
+                expected_route = "nurture"
+            else:
+                expected_route = None
+            assert transition.get_dynamic_target_state(instance) == expected_route
+
+    def test_string_condition_is_unsatisfied(self):
+        transition = StateTransition(
+            from_state="a",
+            to_state="b",
+            name="ref",
+            description="Condition by reference",
+            conditions=["some_named_condition"],
+        )
+        assert transition.compile().conditions({}) is False
+
+
+@pytest.mark.slow
+class TestCompiledConditionBenchmark:
+    """Micro-benchmark of condition evaluations per second."""
+
+    POPULATION = 100_000
+
+    def test_transitions_per_second(self):
+        contexts = [make_context(i) for i in range(self.POPULATION)]
+        compiled = make_transition().compile()
+
+        start = time.perf_counter()
+        for context in contexts:
+            if compiled.conditions(context):
+                compiled.route(context)
+        compiled_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for context in contexts:
+            all(
+                TransitionCondition.from_dict(c).is_satisfied(context)
+                for c in CONDITIONS[:3]
+            ) and ConditionGroup.from_dict(GROUP).is_satisfied(context)
+        interpreted_elapsed = time.perf_counter() - start
+
+        rate = self.POPULATION / compiled_elapsed
+        print(
+            f"\ncompiled: {rate:,.0f} transitions/s, "
+            f"interpreted: {self.POPULATION / interpreted_elapsed:,.0f} transitions/s"
+        )
+
+        assert compiled_elapsed < interpreted_elapsed
@@ -0,0 +1,85 @@
+"""
+Tests for The 7 Space artwork store.
+
+The module is loaded from its file, since importing the gallery package
+imports the Notion-backed inventory manager.
+"""
+
+import importlib.util
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+STORE_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "integrations/the7space/automation/gallery/artwork_store.py"
+)
+spec = importlib.util.spec_from_file_location("the7space_artwork_store", STORE_PATH)
+artwork_store = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = artwork_store
+spec.loader.exec_module(artwork_store)
+
+
+class Status(Enum):
+    AVAILABLE = "available"
+    SOLD = "sold"
+
+
+@dataclass
+class Artwork:
+    id: str
+    artist_name: str
+    price: float
+    status: Status = Status.AVAILABLE
+    medium: str = "Oil"
+    notion_page_id: Optional[str] = None
+
+
+def make_store(*artworks):
+    store = artwork_store.ArtworkStore()
+    store.apply(
+        [(artwork, f"2026-10-0{i + 1}") for i, artwork in enumerate(artworks)],
+        full=True,
+    )
+    return store
+
+
+def test_price_range_queries_are_inclusive_and_ordered():
+    store = make_store(
+        Artwork("a", "Ana", 300, notion_page_id="p1"),
+        Artwork("b", "Ben", 100, notion_page_id="p2"),
+        Artwork("c", "ana", 200, medium="Ink", notion_page_id="p3"),
+        Artwork("d", "Ana", 200, notion_page_id="p4"),
+    )
+
+    assert [a.id for a in store.query(min_price=200)] == ["c", "d", "a"]
+    assert [a.id for a in store.query(max_price=200)] == ["b", "c", "d"]
+    assert [a.id for a in store.query(artist="ANA", min_price=150, max_price=250)] == [
+        "c",
+        "d",
+    ]
+    assert [a.id for a in store.query(medium="Ink")] == ["c"]
+    assert store.query(min_price=301) == []
+
+
+def test_upsert_reindexes_and_full_refresh_drops_missing_pages():
+    first = Artwork("a", "Ana", 300, notion_page_id="p1")
+    second = Artwork("b", "Ben", 100, notion_page_id="p2")
+    store = make_store(first, second)
+
+    sold = store.get("a")
+    sold.status, sold.price = Status.SOLD, 50
+    store.upsert(sold)
+
+    assert store.count_by_status() == {"sold": 1, "available": 1}
+    assert [a.id for a in store.query(max_price=60)] == ["a"]
+    assert store._prices == [price for price, _ in store._by_price] == [50, 100]
+
+    counts = store.apply([(second, "2026-10-02")], full=True)
+
+    assert counts == {"upserted": 0, "removed": 1}
+    assert store.get("a") is None
+    assert store._prices == [100]
+    assert store.cursor == "2026-10-02"
@@ -0,0 +1,95 @@
+"""
+Tests for loading the segmentation engine behind the Audience Segmentation Agent.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from agents.audience_segmentation_agent import AudienceSegmentationAgent
+from models.audience_models import AudienceSegment, SegmentCriteria
+
+
+class FakeNotionService:
+    def __init__(self, segment):
+        self.segment = segment
+        self.updates = []
+
+    async def get_audience_segment(self, segment_id):
+        return self.segment
+
+    async def update_audience_segment(self, segment):
+        self.updates.append(segment.member_count)
+
+
+class FakeWooCommerceService:
+    def __init__(self, orders):
+        self.orders = orders
+        self.calls = 0
+
+    async def get_recent_orders(self, limit=10):
+        self.calls += 1
+        return self.orders
+
+
+class FakeBookingService:
+    async def get_appointments(self, **kwargs):
+        return []
+
+
+def make_agent(orders):
+    segment = AudienceSegment(
+        name="Buyers",
+        description="Customers with an order",
+        criteria=[
+            SegmentCriteria(field="order_count", operator="greater_than", value=0)
+        ],
+        business_entity_id="the7space",
+        member_count=42,
+    )
+    woocommerce = FakeWooCommerceService(orders)
+    agent = AudienceSegmentationAgent(
+        notion_service=FakeNotionService(segment),
+        woocommerce_service=woocommerce,
+        amelia_service=FakeBookingService(),
+        acuity_service=FakeBookingService(),
+    )
+    return agent, woocommerce
+
+
+@pytest.mark.asyncio
+async def test_empty_engine_does_not_overwrite_segment_counts():
+    agent, woocommerce = make_agent(orders=[])
+
+    result = await agent.refresh_segment("segment-1")
+
+    assert result["status"] == "error"
+    assert agent._notion_service.updates == []
+    assert agent._notion_service.segment.member_count == 42
+
+    # Loading is tried again on the next call
+    await agent.refresh_segment("segment-1")
+    assert woocommerce.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_loads_from_order_sources_on_first_use():
+    agent, woocommerce = make_agent(
+        orders=[
+            {
+                "id": 1,
+                "status": "completed",
+                "total": "25.00",
+                "date_created": datetime.now() - timedelta(days=1),
+                "billing": {"email": "ana@example.com"},
+            }
+        ]
+    )
+
+    result = await agent.refresh_segment("segment-1")
+    await agent.refresh_segment("segment-1")
+
+    assert result["status"] == "success"
+    assert result["previous_count"] == 42 and result["new_count"] == 1
+    assert agent._notion_service.updates == [1, 1]
+    assert woocommerce.calls == 1
@@ -0,0 +1,85 @@
+"""
+Tests for the duplicate-contact candidate index.
+"""
+
+import random
+
+from services.contact_candidate_index import (
+    ContactCandidateIndex,
+    ContactFeatures,
+    contact_similarity,
+    normalize_phone,
+)
+
+FIRST_NAMES = ["jane", "john", "maya", "omar", "lena", "ravi", "sofia", "tom"]
+LAST_NAMES = ["smith", "garcia", "chen", "okafor", "novak", "patel", "silva"]
+
+
+def make_contacts(count, seed=3):
+    rng = random.Random(seed)
+    contacts = []
+    for i in range(count):
+        contact = {
+            "id": f"c{i}",
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "message": " ".join(
+                rng.choices(["art", "yoga", "retreat", "gallery"], k=3)
+            ),
+        }
+        if rng.random() < 0.7:
+            contact["email"] = f"user{rng.randrange(count)}@example.com"
+        if rng.random() < 0.5:
+            contact["phone"] = f"555{rng.randrange(10_000_000):07d}"
+        contacts.append(contact)
+    return contacts
+
+
+def test_normalize_phone_to_e164():
+    assert normalize_phone("(555) 123-4567") == "+15551234567"
+    assert normalize_phone("1 555 123 4567") == "+15551234567"
+    assert normalize_phone("+44 20 7946 0958") == "+442079460958"
+    assert normalize_phone("0044 20 7946 0958") == "+442079460958"
+    assert normalize_phone("123") is None
+
+
+def test_candidates_cover_every_pairwise_duplicate():
+    existing = make_contacts(400)
+    new = make_contacts(100, seed=4)
+    index = ContactCandidateIndex()
+    index.add_many(existing)
+
+    for contact in new:
+        features = ContactFeatures(contact)
+        expected = {
+            other["id"]
+            for other in existing
+            if contact_similarity(features, ContactFeatures(other)) >= 0.8
+        }
+        found = {other["id"] for other, _ in index.candidates(features)}
+        assert expected <= found
+        assert len(found) < len(existing)
+
+
+def test_fuzzy_names_share_lsh_buckets():
+    index = ContactCandidateIndex()
+    index.add({"id": "a", "first_name": "Mary Ann", "last_name": "Lee Jones"})
+    index.add({"id": "b", "first_name": "Peter", "last_name": "Novak"})
+
+    features = ContactFeatures({"first_name": "Mary Ann", "last_name": "Jones"})
+    assert [c["id"] for c, _ in index.candidates(features)] == ["a"]
+
+
+def test_sync_only_reindexes_changed_contacts():
+    index = ContactCandidateIndex()
+    contacts = make_contacts(50)
+    assert index.sync(contacts)["added"] == 50
+
+    contacts[0] = {**contacts[0], "email": "moved@example.com"}
+    removed = contacts.pop()
+    stats = index.sync(contacts)
+
+    assert stats == {"added": 0, "updated": 1, "unchanged": 48, "removed": 1}
+    assert removed["id"] not in index
+    features = ContactFeatures({"email": "Moved@Example.com "})
+    assert [c["id"] for c, _ in index.candidates(features)] == [contacts[0]["id"]]
@@ -0,0 +1,197 @@
+"""
+Tests for the Redis-backed circuit breaker, using an in-memory stand-in for
+the handful of Redis commands it issues.
+"""
+
+import asyncio
+
+import pytest
+
+from utils.circuit_breaker import (
+    CircuitOpenException,
+    CircuitState,
+    DistributedCircuitBreaker,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.strings = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        entry = self.hashes.setdefault(key, {})
+        if field is not None:
+            entry[field] = str(value)
+        for k, v in (mapping or {}).items():
+            entry[k] = str(v)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.strings.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def hset(self, *args, **kwargs):
+                self.calls.append(redis.hset(*args, **kwargs))
+
+            def delete(self, *args):
+                self.calls.append(redis.delete(*args))
+
+            async def execute(self):
+                return [await call for call in self.calls]
+
+        return Pipeline()
+
+    def register_script(self, script):
+        async def failure_script(keys, args):
+            state_key, probe_key = keys
+            threshold, now, probe, _ = args
+            entry = self.hashes.setdefault(state_key, {})
+            failures = int(entry.get("failures", 0)) + 1
+            entry["failures"] = str(failures)
+            state = entry.get("state", "closed")
+            if probe or (state != "open" and failures >= threshold):
+                entry.update(state="open", opened_at=str(now))
+                self.strings.pop(probe_key, None)
+                state = "open"
+            return [state, failures, entry.get("opened_at", "0")]
+
+        return failure_script
+
+
+def make_breaker(redis, **kwargs):
+    breaker = DistributedCircuitBreaker(
+        "notion", failure_threshold=2, recovery_timeout=0.05, sync_interval=0, **kwargs
+    )
+    breaker._redis = redis
+    breaker._failure_script = redis.register_script(breaker.FAILURE_SCRIPT)
+    return breaker
+
+
+async def fail():
+    raise RuntimeError("service down")
+
+
+async def succeed():
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_failures_open_the_circuit_for_every_worker():
+    redis = FakeRedis()
+    first, second = make_breaker(redis), make_breaker(redis)
+
+    with pytest.raises(RuntimeError):
+        await first.execute(fail)
+    with pytest.raises(RuntimeError):
+        await second.execute(fail)
+
+    for breaker in (first, second):
+        with pytest.raises(CircuitOpenException):
+            await breaker.execute(succeed)
+
+
+@pytest.mark.asyncio
+async def test_single_probe_closes_the_circuit_everywhere():
+    redis = FakeRedis()
+    first, second = make_breaker(redis), make_breaker(redis)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await first.execute(fail)
+
+    await asyncio.sleep(0.06)
+    probe_started = asyncio.Event()
+
+    async def slow_probe():
+        probe_started.set()
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    probe = asyncio.create_task(first.execute(slow_probe))
+    await probe_started.wait()
+    with pytest.raises(CircuitOpenException):
+        await second.execute(succeed)
+
+    assert await probe == "ok"
+    assert first.state == CircuitState.CLOSED
+    assert await second.execute(succeed) == "ok"
+    assert second.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_the_circuit():
+    redis = FakeRedis()
+    breaker = make_breaker(redis)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await breaker.execute(fail)
+
+    await asyncio.sleep(0.06)
+    with pytest.raises(RuntimeError):
+        await breaker.execute(fail)
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenException):
+        await breaker.execute(succeed)
+
+
+@pytest.mark.asyncio
+async def test_excluded_probe_error_survives_a_redis_failure():
+    redis = FakeRedis()
+    breaker = make_breaker(redis, exclude_exceptions=[ValueError])
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await breaker.execute(fail)
+
+    async def broken_delete(*keys):
+        raise ConnectionError("redis down")
+
+    redis.delete = broken_delete
+    await asyncio.sleep(0.06)
+
+    async def bad_request():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await breaker.execute(bad_request)
+
+
+@pytest.mark.asyncio
+async def test_probe_lease_failure_falls_back_to_the_local_circuit():
+    redis = FakeRedis()
+    breaker = make_breaker(redis)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await breaker.execute(fail)
+
+    async def broken_set(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    redis.set = broken_set
+    await asyncio.sleep(0.06)
+
+    # The local circuit lets the call through as its half-open test call
+    assert await breaker.execute(succeed) == "ok"
+    assert breaker.state == CircuitState.HALF_OPEN
@@ -0,0 +1,226 @@
+"""
+Tests for provider selection, parallel processing and page caching in
+multi-page document OCR.
+"""
+
+import asyncio
+import importlib
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+pytest.importorskip("google.cloud.vision")
+
+from agents.mixins import ocr_mixin
+from models.tesseract_models import (
+    OCRDocumentRequest,
+    OCRDocumentType,
+    OCRImageSource,
+    OCRProvider,
+    OCRResponse,
+)
+from services.ocr.document_ocr_service import DocumentOCRService
+from services.ocr.ocr_service_factory import OCRServiceFactory
+
+
+@pytest.fixture
+def selected(monkeypatch):
+    monkeypatch.setattr(
+        OCRServiceFactory,
+        "get_service",
+        classmethod(lambda cls, provider: SimpleNamespace(provider=provider)),
+    )
+
+
+class FakeCache:
+    def __init__(self):
+        self.entries = {}
+
+    async def get(self, key, cache_type):
+        return self.entries.get(key)
+
+    async def set(self, key, value, cache_type):
+        self.entries[key] = value
+
+
+class FakeOCRService:
+    """Reads each page's marker from the red channel of its first pixel."""
+
+    provider = OCRProvider.TESSERACT
+
+    def __init__(self, delays=None, wait_for=0):
+        self.delays = delays or {}
+        self.wait_for = wait_for
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.processed = []
+        self._started = asyncio.Event()
+
+    async def process_image(self, request):
+        marker = Image.open(BytesIO(request.image_data)).getpixel((0, 0))[0]
+        self.processed.append(marker)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if self.in_flight >= self.wait_for:
+            self._started.set()
+
+        try:
+            await asyncio.wait_for(self._started.wait(), timeout=1)
+            await asyncio.sleep(self.delays.get(marker, 0))
+        finally:
+            self.in_flight -= 1
+
+        return OCRResponse(
+            success=True,
+            provider=self.provider,
+            text=f"page {marker}",
+            output_format=request.output_format,
+            processing_time=0,
+        )
+
+
+def make_request(document_data: bytes = b"", **kwargs) -> OCRDocumentRequest:
+    return OCRDocumentRequest(
+        document_source=OCRImageSource.BYTES, document_data=document_data, **kwargs
+    )
+
+
+def make_tiff(markers) -> bytes:
+    frames = [Image.new("RGB", (8, 8), (marker, 0, 0)) for marker in markers]
+    buffer = BytesIO()
+    frames[0].save(buffer, format="TIFF", save_all=True, append_images=frames[1:])
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeCache()
+    # services.ocr re-exports a service instance under the module's name
+    module = importlib.import_module("services.ocr.document_ocr_service")
+    monkeypatch.setattr(module, "multi_level_cache", cache)
+    return cache
+
+
+def use_service(monkeypatch, ocr_service):
+    monkeypatch.setattr(
+        OCRServiceFactory,
+        "get_service",
+        classmethod(lambda cls, provider: ocr_service),
+    )
+
+
+def test_explicit_provider_wins_for_important_documents(selected):
+    service = DocumentOCRService(cache_results=False)
+    request = make_request(
+        provider=OCRProvider.TESSERACT,
+        is_important=True,
+        document_type=OCRDocumentType.INVOICE,
+    )
+
+    assert service._select_service(request).provider == OCRProvider.TESSERACT
+
+
+def test_important_documents_are_routed_without_explicit_provider(selected):
+    service = DocumentOCRService(cache_results=False)
+
+    invoice = make_request(is_important=True, document_type=OCRDocumentType.INVOICE)
+    general = make_request(is_important=True)
+
+    assert service._select_service(invoice).provider == OCRProvider.ABBYY
+    assert service._select_service(general).provider == OCRProvider.GOOGLE_VISION
+    assert service._select_service(make_request()).provider == OCRProvider.TESSERACT
+
+
+@pytest.mark.asyncio
+async def test_stream_text_from_document_passes_explicit_provider(monkeypatch):
+    requests = []
+
+    async def process_document(request):
+        requests.append(request)
+        return
+        yield
+
+    monkeypatch.setattr(
+        ocr_mixin.document_ocr_service, "process_document", process_document
+    )
+    mixin = ocr_mixin.OCRMixin()
+
+    async for _ in mixin.stream_text_from_document(
+        "doc.pdf", is_important=True, provider="tesseract"
+    ):
+        pass
+    async for _ in mixin.stream_text_from_document("doc.pdf", is_important=True):
+        pass
+
+    assert requests[0].provider == OCRProvider.TESSERACT
+    assert requests[1].provider is None
+
+
+@pytest.mark.asyncio
+async def test_pages_are_processed_in_parallel_and_streamed_as_they_finish(
+    monkeypatch,
+):
+    ocr_service = FakeOCRService(delays={10: 0.2, 20: 0.1, 30: 0}, wait_for=3)
+    use_service(monkeypatch, ocr_service)
+    service = DocumentOCRService(cache_results=False)
+    request = make_request(
+        make_tiff([10, 20, 30]), provider=OCRProvider.TESSERACT, max_concurrency=3
+    )
+
+    streamed = [result async for result in service.process_document(request)]
+
+    assert ocr_service.max_in_flight == 3
+    assert [result.page_number for result in streamed] == [3, 2, 1]
+    assert [result.response.text for result in streamed] == [
+        "page 30",
+        "page 20",
+        "page 10",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_bounds_pages_in_flight(monkeypatch):
+    markers = [10, 20, 30, 40, 50]
+    ocr_service = FakeOCRService(
+        delays={marker: 0.02 for marker in markers}, wait_for=2
+    )
+    use_service(monkeypatch, ocr_service)
+    service = DocumentOCRService(cache_results=False)
+    request = make_request(
+        make_tiff(markers),
+        provider=OCRProvider.TESSERACT,
+        max_concurrency=2,
+    )
+
+    results = await service.process_document_pages(request)
+
+    assert ocr_service.max_in_flight == 2
+    assert [result.page_number for result in results] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_resubmitted_document_only_ocrs_changed_pages(monkeypatch, fake_cache):
+    ocr_service = FakeOCRService()
+    use_service(monkeypatch, ocr_service)
+    service = DocumentOCRService()
+
+    first = await service.process_document_pages(
+        make_request(make_tiff([10, 20, 30]), provider=OCRProvider.TESSERACT)
+    )
+    second = await service.process_document_pages(
+        make_request(make_tiff([10, 25, 30]), provider=OCRProvider.TESSERACT)
+    )
+
+    assert sorted(ocr_service.processed[:3]) == [10, 20, 30]
+    assert ocr_service.processed[3:] == [25]
+    assert not any(result.from_cache for result in first)
+    assert [result.from_cache for result in second] == [True, False, True]
+    assert [result.response.text for result in second] == [
+        "page 10",
+        "page 25",
+        "page 30",
+    ]
+    assert second[0].content_hash == first[0].content_hash
+    assert second[1].content_hash != first[1].content_hash
@@ -0,0 +1,131 @@
+"""
+Tests for the shared async HTTP client registry.
+"""
+
+import asyncio
+
+import httpcore
+import httpx
+import pytest
+
+from services.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from services.http_client_registry import (
+    AdaptiveConcurrencyTransport,
+    CachingDNSBackend,
+    HTTPClientRegistry,
+)
+
+# conftest patches httpx.AsyncClient for every test
+RealAsyncClient = httpx.AsyncClient
+
+
+class FakeBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.connected = []
+
+    async def connect_tcp(self, host, port, timeout=None, **kwargs):
+        if host in self.failing:
+            raise httpcore.ConnectError(f"cannot reach {host}")
+        self.connected.append(host)
+        return object()
+
+    async def sleep(self, seconds):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_integration(monkeypatch):
+    monkeypatch.setattr(httpx, "AsyncClient", RealAsyncClient)
+    monkeypatch.setenv("HTTP_TIMEOUT_AMELIA", "7")
+    registry = HTTPClientRegistry()
+
+    amelia = registry.get_client("amelia")
+    assert registry.get_client("amelia") is amelia
+    assert registry.get_client("typeform") is not amelia
+    assert amelia.timeout.read == 7
+    assert registry.get_client("devon_ai").timeout.read == 300
+
+    await registry.close_all()
+    assert amelia.is_closed
+    assert registry.get_client("amelia") is not amelia
+    await registry.close_all()
+
+
+@pytest.mark.asyncio
+async def test_dns_results_are_cached():
+    inner = FakeBackend()
+    backend = CachingDNSBackend(inner, ttl=60)
+
+    await backend.connect_tcp("localhost", 80)
+    await backend.connect_tcp("localhost", 80)
+
+    assert len(backend._cache) == 1
+    assert inner.connected[0] == inner.connected[1]
+    assert inner.connected[0] != "localhost"
+
+
+@pytest.mark.asyncio
+async def test_failed_addresses_are_skipped_and_evicted():
+    inner = FakeBackend(failing={"10.0.0.1"})
+    cache = {("api.example.com", 443): (float("inf"), ["10.0.0.1", "10.0.0.2"])}
+    backend = CachingDNSBackend(inner, cache=cache)
+
+    await backend.connect_tcp("api.example.com", 443)
+    assert inner.connected == ["10.0.0.2"]
+
+    inner.failing.add("10.0.0.2")
+    with pytest.raises(httpcore.ConnectError):
+        await backend.connect_tcp("api.example.com", 443)
+    assert cache == {}
+
+
+@pytest.mark.asyncio
+async def test_client_connections_go_through_the_dns_cache(monkeypatch):
+    monkeypatch.setattr(httpx, "AsyncClient", RealAsyncClient)
+
+    async def respond(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(respond, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    registry = HTTPClientRegistry(adaptive_concurrency=False)
+
+    try:
+        response = await registry.get_client("test").get(f"http://localhost:{port}/")
+        assert response.text == "ok"
+        assert ("localhost", port) in registry._dns_cache
+
+        with pytest.raises(httpx.ConnectError):
+            await registry.get_client("test").get("http://127.0.0.1:1/")
+    finally:
+        await registry.close_all()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_slot_is_held_until_the_body_is_closed(monkeypatch):
+    monkeypatch.setattr(httpx, "AsyncClient", RealAsyncClient)
+    limiter = AdaptiveConcurrencyLimiter("test")
+
+    async def body():
+        yield b"chunk"
+
+    transport = AdaptiveConcurrencyTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200, content=body())),
+        limiter,
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with client.stream("GET", "https://example.com") as response:
+            assert limiter.in_flight == 1
+            assert [chunk async for chunk in response.aiter_bytes()] == [b"chunk"]
+        assert limiter.in_flight == 0
+
+        await client.get("https://example.com")
+        assert limiter.in_flight == 0
+
+    assert limiter.get_stats()["completed"] == 2
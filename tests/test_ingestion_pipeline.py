@@ -0,0 +1,105 @@
+"""
+Tests for the streaming ingestion pipeline.
+"""
+
+import hashlib
+from uuid import uuid4
+
+import pytest
+
+from knowledge import ingestion_pipeline
+from knowledge.ingestion_pipeline import IngestionDocument, IngestionPipeline
+from knowledge.models import EmbeddingMeta
+
+
+class FakeVectorStore:
+    def __init__(self, known=None):
+        self.known = known or {}
+        self.inserts = []
+        self.deleted = []
+
+    def _compute_content_hash(self, content):
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    async def get_source_hashes(self, source_prefix):
+        return self.known
+
+    async def store_documents_bulk(self, documents, provider_name):
+        self.inserts.append(documents)
+        return [uuid4() for _ in documents]
+
+    async def delete_embeddings(self, embedding_ids):
+        self.deleted.extend(embedding_ids)
+        return True
+
+
+@pytest.fixture
+def embedding_calls(monkeypatch):
+    calls = []
+
+    async def get_embeddings(texts):
+        calls.append(list(texts))
+        return {
+            "success": True,
+            "provider": "mock",
+            "embeddings": [[1.0, 0.0]] * len(texts),
+        }
+
+    monkeypatch.setattr(
+        ingestion_pipeline.provider_registry, "get_embeddings", get_embeddings
+    )
+    return calls
+
+
+def page(url, text):
+    return IngestionDocument(
+        source=f"web:{url}",
+        text=text,
+        metadata=EmbeddingMeta(content_type="web_page", source=f"web:{url}"),
+    )
+
+
+def chunk_words(text):
+    return text.split()
+
+
+@pytest.mark.asyncio
+async def test_chunks_from_many_pages_share_embedding_batches(embedding_calls):
+    store = FakeVectorStore()
+    pipeline = IngestionPipeline(
+        vector_store=store, chunk_size=5, embed_batch_size=6, chunker=chunk_words
+    )
+
+    async with pipeline:
+        for i in range(6):
+            await pipeline.submit(page(f"https://example.com/{i}", f"page {i} words"))
+
+    assert pipeline.stats["stored"] == 6
+    assert pipeline.stats["chunks"] == 18
+    # 18 chunks across 6 pages in batches of 6, each written with one bulk insert
+    assert [len(call) for call in embedding_calls] == [6, 6, 6]
+    assert len(store.inserts) == 3
+
+
+@pytest.mark.asyncio
+async def test_unchanged_pages_are_skipped_and_changed_pages_replaced(
+    embedding_calls,
+):
+    old_id = uuid4()
+    store = FakeVectorStore()
+    store.known = {
+        "web:https://example.com/same": (uuid4(), store._compute_content_hash("same")),
+        "web:https://example.com/edited": (old_id, store._compute_content_hash("old")),
+    }
+    pipeline = IngestionPipeline(vector_store=store, source_prefix="web:https://")
+
+    async with pipeline:
+        await pipeline.submit(page("https://example.com/same", "same"))
+        await pipeline.submit(page("https://example.com/edited", "new"))
+        await pipeline.submit(page("https://example.com/edited?ref=x", "new"))
+
+    assert pipeline.stats["unchanged"] == 1
+    assert pipeline.stats["duplicate"] == 1
+    assert pipeline.stats["stored"] == 1
+    assert embedding_calls == [["new"]]
+    assert store.deleted == [old_id]
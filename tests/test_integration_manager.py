@@ -0,0 +1,119 @@
+"""
+Tests for integration connection validation.
+"""
+
+import asyncio
+
+import pytest
+
+# The manager imports every integration service
+pytest.importorskip("openai")
+pytest.importorskip("woocommerce")
+
+from services import integration_manager
+from services.integration_manager import IntegrationManager, IntegrationManagerConfig
+
+
+class StubService:
+    def __init__(self, result=True, delay=0.0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    async def validate_connection(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.result
+
+    # NotionService names its check differently
+    validate_token = validate_connection
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    notion = StubService()
+    monkeypatch.setattr(
+        integration_manager, "NotionIntegrationConfig", lambda **kwargs: None
+    )
+    monkeypatch.setattr(integration_manager, "NotionService", lambda config: notion)
+    return IntegrationManager(
+        IntegrationManagerConfig(
+            notion_api_token="token",
+            validation_timeout=0.2,
+            validation_cache_ttl=60,
+            revalidation_interval=0,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_checks_run_concurrently_with_per_check_timeouts(manager):
+    manager.services = {
+        "a": StubService(delay=0.1),
+        "b": StubService(delay=0.1),
+        "slow": StubService(delay=5),
+        "broken": StubService(result=False),
+    }
+
+    started = asyncio.get_running_loop().time()
+    results = await manager.validate_all_connections()
+    elapsed = asyncio.get_running_loop().time() - started
+
+    assert results == {"a": True, "b": True, "slow": False, "broken": False}
+    # Bounded by the timeout, not the sum of the checks
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_until_ttl_or_force(manager):
+    service = StubService()
+    manager.services = {"a": service}
+
+    await manager.validate_all_connections()
+    await manager.validate_all_connections()
+    assert service.calls == 1
+
+    await manager.validate_all_connections(force=True)
+    assert service.calls == 2
+
+    # Age the cached result past the TTL
+    checked_at, result = manager._validation_cache["a"]
+    manager._validation_cache["a"] = (checked_at - 61, result)
+    await manager.validate_all_connections()
+    assert service.calls == 3
+    assert manager.get_validation_status()["a"]["valid"] is True
+
+
+@pytest.mark.asyncio
+async def test_revalidate_registers_services_that_failed_at_startup(manager):
+    recovering = StubService(result=False)
+    manager._failed_services = {"typeform": recovering}
+    manager.initialization_status = {"typeform": False}
+
+    assert (await manager.revalidate())["typeform"] is False
+    assert manager.get_service("typeform") is None
+
+    recovering.result = True
+    results = await manager.revalidate()
+
+    assert results == {"notion": True, "typeform": True}
+    assert manager.get_service("typeform") is recovering
+    assert manager.get_initialization_status()["typeform"] is True
+    assert manager._failed_services == {}
+
+
+def test_revalidation_restarts_on_a_new_event_loop(manager):
+    async def start():
+        manager.start_revalidation()
+        return manager._revalidation_task
+
+    # As main.py does: startup and the server run on different loops
+    first = asyncio.run(start())
+    assert first.cancelled()
+
+    async def restart():
+        task = await start()
+        assert task is not first and not task.done()
+        await manager.stop_revalidation()
+
+    asyncio.run(restart())
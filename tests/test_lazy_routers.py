@@ -0,0 +1,111 @@
+"""
+Tests for lazy router mounting.
+"""
+
+import importlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Importing the api package imports the server
+pytest.importorskip("uvicorn")
+
+from api.lazy_routers import (
+    LazyRouterMiddleware,
+    LazyRouterRegistry,
+    RouterMode,
+    RouterSpec,
+)
+
+ROUTER_SOURCE = """
+from fastapi import APIRouter
+{imports}
+router = APIRouter(prefix="{prefix}")
+
+
+@router.get("/ping")
+async def ping():
+    return {{"router": "{prefix}"}}
+"""
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def write(name, prefix="", imports=""):
+        source = ROUTER_SOURCE.format(prefix=prefix, imports=imports)
+        (tmp_path / f"{name}.py").write_text(source)
+        importlib.invalidate_caches()
+
+    return write
+
+
+def make_client(specs, **kwargs):
+    app = FastAPI()
+    registry = LazyRouterRegistry(app, specs, **kwargs)
+    registry.mount_all()
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    return registry, TestClient(app)
+
+
+def test_mode_resolution(monkeypatch):
+    heavy = RouterSpec("crawl", "api.crawl_router", "/crawl", heavy=True)
+    light = RouterSpec("todoist", "api.todoist_router", "/todoist")
+    monkeypatch.delenv("API_ROUTER_CRAWL", raising=False)
+    monkeypatch.delenv("API_LAZY_ROUTERS", raising=False)
+
+    assert heavy.mode() == RouterMode.LAZY
+    assert light.mode() == RouterMode.EAGER
+
+    monkeypatch.setenv("API_LAZY_ROUTERS", "false")
+    assert heavy.mode() == RouterMode.EAGER
+
+    monkeypatch.setenv("API_ROUTER_CRAWL", "disabled")
+    assert heavy.mode() == RouterMode.DISABLED
+
+    monkeypatch.setenv("API_ROUTER_CRAWL", "sometimes")
+    assert heavy.mode() == RouterMode.EAGER
+
+
+def test_lazy_routers_mount_on_first_request_by_longest_prefix(modules):
+    modules("lazy_outer_router", "/hooks")
+    modules("lazy_inner_router", "/hooks/inner")
+    registry, client = make_client(
+        [
+            RouterSpec("outer", "lazy_outer_router", "/hooks", heavy=True),
+            RouterSpec("inner", "lazy_inner_router", "/hooks/inner", heavy=True),
+        ]
+    )
+
+    assert registry.mounted == {}
+    # A shared string prefix is not a path prefix
+    assert client.get("/hooksx/ping").status_code == 404
+    assert registry.mounted == {}
+
+    assert client.get("/hooks/inner/ping").json() == {"router": "/hooks/inner"}
+    assert set(registry.mounted) == {"inner"}
+
+    assert client.get("/hooks/ping").json() == {"router": "/hooks"}
+    assert not registry.has_pending
+
+
+def test_failed_lazy_router_returns_503_and_is_retried(modules):
+    modules("lazy_broken_router", "/broken", imports="import lazy_router_dependency")
+    registry, client = make_client(
+        [RouterSpec("broken", "lazy_broken_router", "/broken", heavy=True)],
+        retry_interval=0,
+    )
+
+    response = client.get("/broken/ping")
+
+    assert response.status_code == 503
+    assert "lazy_router_dependency" in registry.get_status()["broken"]["error"]
+    assert registry.has_pending
+
+    modules("lazy_router_dependency")
+
+    assert client.get("/broken/ping").status_code == 200
+    assert registry.get_status()["broken"]["error"] is None
+    assert not registry.has_pending
@@ -0,0 +1,114 @@
+"""
+Tests for the local lead deduplication index.
+"""
+
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from services.lead_dedup_index import BloomFilter, LeadDedupIndex
+
+
+def make_index(**kwargs) -> LeadDedupIndex:
+    return LeadDedupIndex(use_redis=False, **kwargs)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    items = [f"user{i}@example.com" for i in range(10_000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+
+    false_positives = sum(f"other{i}@example.com" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_duplicate_within_window():
+    index = make_index()
+    await index.add("Jane@Example.com ", "ZapierEventbrite", "fp1", instance_id="p1")
+
+    match = await index.find_duplicate("jane@example.com", "Eventbrite")
+    assert match.instance_id == "p1"
+    assert match.fingerprint == "fp1"
+
+    assert await index.find_duplicate("jane@example.com", "Typeform") is None
+    assert await index.find_duplicate("john@example.com", "Eventbrite") is None
+    assert index.get_metrics()["bloom_negatives"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_window():
+    index = make_index(window_hours=1)
+    await index.add("a@example.com", "typeform", "fp1", accepted_at=time.time() - 7200)
+    await index.add("b@example.com", "typeform", "fp2", accepted_at=time.time() - 1800)
+
+    assert await index.find_duplicate("a@example.com", "typeform") is None
+    assert await index.find_duplicate("b@example.com", "typeform") is not None
+
+
+@pytest.mark.asyncio
+async def test_warm_from_notion_runs_once():
+    now = datetime.now()
+    instances = [
+        SimpleNamespace(
+            client_lead_email="lead@example.com",
+            start_date=now - timedelta(hours=1),
+            source_system="Typeform",
+            source_record_id="r1",
+            key_data_payload={"lead_fingerprint": "fp1"},
+            page_id="page-1",
+        ),
+        SimpleNamespace(
+            client_lead_email=None,
+            start_date=now,
+            source_system="Typeform",
+            source_record_id="r2",
+            key_data_payload=None,
+            page_id="page-2",
+        ),
+    ]
+    queries = []
+
+    class FakeNotion:
+        async def iter_database(self, model_class, filter_conditions=None, **kwargs):
+            # One page per instance, as if Notion returned a next_cursor
+            for instance in instances:
+                queries.append(filter_conditions)
+                yield [instance]
+
+    index = make_index()
+    assert await index.warm_from_notion(FakeNotion()) == 1
+    assert await index.warm_from_notion(FakeNotion()) == 0
+    assert len(queries) == 2
+
+    match = await index.find_duplicate("LEAD@example.com", "typeform")
+    assert match.instance_id == "page-1"
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_falls_back_to_notion_query():
+    pytest.importorskip("openai")
+    from agents.lead_capture_agent import LeadCaptureAgent
+
+    fallback = object()
+
+    async def failing_warm_up():
+        raise RuntimeError("notion unavailable")
+
+    async def query_notion(lead):
+        return fallback
+
+    agent = SimpleNamespace(
+        dedup_index=make_index(),
+        warm_dedup_index=failing_warm_up,
+        _query_notion_for_duplicates=query_notion,
+        logger=SimpleNamespace(warning=lambda message: None),
+    )
+    lead = SimpleNamespace(email="lead@example.com", source="Typeform")
+
+    assert await LeadCaptureAgent._check_for_duplicates(agent, lead) is fallback
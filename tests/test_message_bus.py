@@ -0,0 +1,63 @@
+"""
+Tests for the message bus's background Notion sink.
+"""
+
+import asyncio
+
+import pytest
+
+from utils.message_bus import AgentMessage, NotionMessageSink
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    async def acquire(self, cost=1):
+        self.acquired += cost
+        return 0.0
+
+
+def make_message(n: int) -> AgentMessage:
+    return AgentMessage(
+        sender="a", recipient="b", message_type="note", payload={"n": n}
+    )
+
+
+@pytest.mark.asyncio
+async def test_every_write_waits_on_the_rate_limiter():
+    written = []
+
+    async def write(message):
+        written.append(message.payload["n"])
+
+    limiter = RecordingLimiter()
+    sink = NotionMessageSink(write, flush_interval=0.01, rate_limiter=limiter)
+
+    for n in range(5):
+        sink.submit(make_message(n))
+    await sink.close()
+
+    assert sorted(written) == list(range(5))
+    assert limiter.acquired == 5
+
+
+def test_closed_sink_restarts_on_a_new_event_loop():
+    written = []
+
+    async def write(message):
+        written.append(message.payload["n"])
+
+    sink = NotionMessageSink(
+        write, flush_interval=0.01, rate_limiter=RecordingLimiter()
+    )
+
+    async def publish(n):
+        sink.submit(make_message(n))
+        await sink.close()
+
+    # As main.py does: startup and the server run on different loops
+    asyncio.run(publish(1))
+    asyncio.run(publish(2))
+
+    assert written == [1, 2]
@@ -0,0 +1,146 @@
+"""
+Tests for the local model server and its client.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from knowledge.providers.local_provider import LocalEmbeddingProvider
+from models.huggingface_models import HuggingFaceModelConfig
+from services import huggingface_service
+from services.huggingface_service import HuggingFaceService
+from services.model_server import ModelServer, ModelServerClient, ModelServerError
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.batches = []
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.batches.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch(tmp_path):
+    embedder = FakeEmbedder()
+    server = ModelServer(socket_path=str(tmp_path / "models.sock"), max_batch_wait=0.02)
+    server.add_embedding_model("mini", embedder)
+    server.add_pipeline("echo", "text-generation", lambda inputs, **kw: [inputs, kw])
+    await server.start()
+    client = ModelServerClient(socket_path=server.socket_path)
+
+    try:
+        results = await asyncio.gather(
+            client.embed(["a"], "mini"),
+            client.embed(["bb", "ccc"], "mini"),
+            client.embed(["dddd"], "mini"),
+        )
+
+        assert [r[:, 0].tolist() for r in results] == [[1], [2, 3], [4]]
+        assert len(embedder.batches) == 1
+        assert await client.serves_embedding_model("mini")
+        assert await client.run_pipeline("echo", "hi", {"max_length": 5}) == [
+            "hi",
+            {"max_length": 5},
+        ]
+        with pytest.raises(ModelServerError):
+            await client.embed(["a"], "missing")
+    finally:
+        await client.close()
+        await server.stop()
+
+    with pytest.raises(ModelServerError):
+        await client.embed(["a"], "mini")
+
+
+@pytest.fixture
+def model_server(tmp_path):
+    server = ModelServer(socket_path=str(tmp_path / "models.sock"))
+    server.add_embedding_model("mini", FakeEmbedder())
+    server.add_pipeline("echo", "text-generation", lambda inputs, **kw: [inputs])
+    return server
+
+
+def local_provider(socket_path, fallback, monkeypatch):
+    monkeypatch.setenv("MODEL_SERVER_FALLBACK", "true" if fallback else "false")
+    provider = LocalEmbeddingProvider("mini")
+    provider.model_server = ModelServerClient(socket_path=socket_path)
+    loads = []
+
+    def load_model():
+        loads.append(provider.model_name)
+        provider.model = FakeEmbedder()
+
+    provider._load_model = load_model
+    return provider, loads
+
+
+@pytest.mark.asyncio
+async def test_provider_without_fallback_never_loads_the_model(
+    model_server, monkeypatch
+):
+    provider, loads = local_provider(model_server.socket_path, False, monkeypatch)
+
+    assert (await provider.health_check())["healthy"] is False
+    with pytest.raises(ModelServerError):
+        await provider.get_embeddings(["a"])
+    assert loads == []
+
+    await model_server.start()
+    assert (await provider.health_check())["healthy"] is True
+    assert await provider.get_embeddings(["abc"]) == [[3.0, 1.0]]
+    assert loads == []
+    await provider.model_server.close()
+    await model_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_provider_releases_its_fallback_copy_once_the_server_answers(
+    model_server, monkeypatch
+):
+    provider, loads = local_provider(model_server.socket_path, True, monkeypatch)
+
+    assert await provider.get_embeddings(["ab"]) == [[2.0, 1.0]]
+    assert loads == ["mini"] and provider.model is not None
+
+    await model_server.start()
+    assert await provider.get_embeddings(["ab"]) == [[2.0, 1.0]]
+    assert provider.model is None
+    await provider.model_server.close()
+    await model_server.stop()
+
+
+@pytest.mark.asyncio
+async def test_query_model_runs_served_pipelines_locally(model_server, monkeypatch):
+    await model_server.start()
+    client = ModelServerClient(socket_path=model_server.socket_path)
+    monkeypatch.setattr(huggingface_service, "get_model_server_client", lambda: client)
+    api_calls = []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"source": "api"}
+
+    def post(url, **kwargs):
+        api_calls.append(url)
+        return Response()
+
+    monkeypatch.setattr(huggingface_service.requests, "post", post)
+    service = HuggingFaceService(api_key="key")
+
+    served = HuggingFaceModelConfig(model_id="echo", task="text-generation")
+    remote = HuggingFaceModelConfig(model_id="other", task="text-generation")
+    assert await service.query_model(served, "hi") == ["hi"]
+    assert await service.query_model(remote, "hi") == {"source": "api"}
+    assert api_calls == [f"{service.api_url}other"]
+    await client.close()
+    await model_server.stop()
@@ -0,0 +1,137 @@
+"""
+Tests for the MongoDB write-behind sink.
+"""
+
+import asyncio
+
+import pytest
+
+from services.mongo_write_sink import MongoWriteSink
+
+
+class FakeMongo:
+    def __init__(self):
+        self.available = True
+        self.batches = []
+        self.stored = {}
+
+    async def insert_many(self, collection, documents):
+        if not self.available:
+            raise ConnectionError("MongoDB unreachable")
+        self.batches.append((collection, len(documents)))
+        for document in documents:
+            self.stored[(collection, str(document["_id"]))] = document
+
+
+@pytest.mark.asyncio
+async def test_writes_are_batched_per_collection(tmp_path):
+    mongo = FakeMongo()
+    sink = MongoWriteSink(
+        writer=mongo.insert_many,
+        batch_size=10,
+        flush_interval=60,
+        spill_path=str(tmp_path / "spill.jsonl"),
+    )
+
+    ids = [sink.write("agent_analytics", {"n": n}) for n in range(25)]
+    sink.write("workflow_analytics", {"n": 0})
+
+    # A full batch wakes the flusher without waiting for the interval
+    for _ in range(100):
+        if mongo.batches:
+            break
+        await asyncio.sleep(0.01)
+    await sink.stop()
+
+    assert len(set(ids)) == 25
+    assert ("agent_analytics", 10) in mongo.batches
+    assert (
+        sum(n for collection, n in mongo.batches if collection == "agent_analytics")
+        == 25
+    )
+    assert ("workflow_analytics", 1) in mongo.batches
+    assert sink.get_metrics()["written"] == 26
+
+
+@pytest.mark.asyncio
+async def test_unwritten_batches_are_spilled_and_replayed(tmp_path):
+    mongo = FakeMongo()
+    spill_path = tmp_path / "spill.jsonl"
+    sink = MongoWriteSink(
+        writer=mongo.insert_many,
+        batch_size=4,
+        flush_interval=60,
+        max_pending=5,
+        spill_path=str(spill_path),
+    )
+
+    mongo.available = False
+    for n in range(7):
+        sink.write("agent_websocket_connections", {"n": n})
+    await sink.flush()
+
+    metrics = sink.get_metrics()
+    assert metrics["dropped"] == 2
+    assert metrics["spilled"] == 5
+    assert spill_path.exists()
+
+    mongo.available = True
+    await sink.stop()
+
+    stored = sorted(document["n"] for document in mongo.stored.values())
+    assert stored == [2, 3, 4, 5, 6]
+    assert sink.get_metrics()["replayed"] == 5
+    assert not spill_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_spill_file_never_exceeds_its_limit(tmp_path):
+    mongo = FakeMongo()
+    mongo.available = False
+    spill_path = tmp_path / "spill.jsonl"
+    sink = MongoWriteSink(
+        writer=mongo.insert_many,
+        batch_size=1,
+        flush_interval=60,
+        max_spill_bytes=250,
+        spill_path=str(spill_path),
+    )
+
+    for n in range(10):
+        sink.write("agent_analytics", {"n": n})
+    await sink.flush()
+
+    metrics = sink.get_metrics()
+    assert 0 < metrics["spilled"] < 10
+    assert metrics["spilled"] + metrics["dropped"] == 10
+    assert spill_path.stat().st_size <= 250
+
+    await sink.stop()
+    assert spill_path.stat().st_size <= 250
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_the_flush_in_progress(tmp_path):
+    mongo = FakeMongo()
+    writing = asyncio.Event()
+
+    async def slow_writer(collection, documents):
+        writing.set()
+        await asyncio.sleep(0.1)
+        await mongo.insert_many(collection, documents)
+
+    sink = MongoWriteSink(
+        writer=slow_writer,
+        batch_size=5,
+        flush_interval=60,
+        spill_path=str(tmp_path / "spill.jsonl"),
+    )
+    for n in range(7):
+        sink.write("agent_analytics", {"n": n})
+
+    # Stop while the background flush is writing its first batch
+    await asyncio.wait_for(writing.wait(), 5)
+    await sink.stop()
+
+    assert len(mongo.stored) == 7
+    assert sink.get_metrics()["spilled"] == 0
@@ -0,0 +1,69 @@
+"""
+Tests for MongoDB keyset pagination helpers.
+"""
+
+import base64
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from services.mongodb_pagination import (
+    decode_page_token,
+    encode_page_token,
+    keyset_query,
+)
+
+
+def test_page_tokens_round_trip_bson_values():
+    document_id = ObjectId()
+    created = datetime(2026, 10, 18, 12, 30)
+    document = {"_id": document_id, "meta": {"created": created}}
+
+    token = encode_page_token(document, "meta.created")
+
+    assert decode_page_token(token) == (created, document_id)
+    assert decode_page_token(encode_page_token({"_id": 7})) == (7, 7)
+    assert decode_page_token(encode_page_token({"_id": 7}, "missing")) == (None, 7)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not base64!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(b'{"a": 1, "b": 2}').decode(),
+        base64.urlsafe_b64encode(b"[1, 2, 3]").decode(),
+    ],
+)
+def test_bad_page_tokens_raise_value_error(token):
+    with pytest.raises(ValueError):
+        decode_page_token(token)
+
+
+def test_keyset_query_breaks_ties_on_id():
+    token = encode_page_token({"_id": 5, "score": 10}, "score")
+
+    query, sort = keyset_query({"status": "active"}, "score", after=token)
+
+    assert sort == [("score", ASCENDING), ("_id", ASCENDING)]
+    assert query == {
+        "$and": [
+            {"status": "active"},
+            {"$or": [{"score": {"$gt": 10}}, {"score": 10, "_id": {"$gt": 5}}]},
+        ]
+    }
+
+    query, sort = keyset_query({}, "score", descending=True, after=token)
+
+    assert sort == [("score", DESCENDING), ("_id", DESCENDING)]
+    assert query == {"$or": [{"score": {"$lt": 10}}, {"score": 10, "_id": {"$lt": 5}}]}
+
+
+def test_keyset_query_on_id_and_first_page():
+    assert keyset_query({"a": 1}) == ({"a": 1}, [("_id", ASCENDING)])
+
+    query, _ = keyset_query({}, after=encode_page_token({"_id": 5}))
+
+    assert query == {"_id": {"$gt": 5}}
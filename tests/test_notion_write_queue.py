@@ -0,0 +1,150 @@
+"""
+Tests for the Notion write-behind queue.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from services import notion_write_queue
+from services.notion_write_queue import NotionWriteQueue
+
+
+class FlakyPages:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.updates = []
+
+    def update(self, page_id, properties):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("notion unavailable")
+        self.updates.append((page_id, properties))
+
+
+@pytest.fixture(autouse=True)
+def live_notion(monkeypatch):
+    monkeypatch.setattr(notion_write_queue, "is_api_disabled", lambda api: False)
+
+
+def make_queue(pages, redis=None, **kwargs) -> NotionWriteQueue:
+    queue = NotionWriteQueue(
+        SimpleNamespace(pages=pages),
+        requests_per_second=1000,
+        persist=redis is not None,
+        **kwargs,
+    )
+    queue._redis = redis
+    return queue
+
+
+async def wait_for_writes(pages, count, timeout=1.0):
+    async def written():
+        while len(pages.updates) < count:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(written(), timeout=timeout)
+
+
+@pytest.mark.asyncio
+async def test_updates_to_a_page_are_coalesced_last_write_wins():
+    pages = FlakyPages()
+    queue = make_queue(pages, flush_interval=60)
+
+    await queue.enqueue("p1", {"Status": "a", "Title": "first"})
+    await queue.enqueue("p2", {"Status": "x"})
+    await queue.enqueue("p1", {"Status": "b"})
+    await queue.enqueue("p1", {"Status": "c", "Owner": "ana"})
+
+    assert queue.depth == 2
+    assert await queue.flush() == 2
+    await queue.stop()
+
+    assert dict(pages.updates) == {
+        "p1": {"Status": "c", "Title": "first", "Owner": "ana"},
+        "p2": {"Status": "x"},
+    }
+    assert len(pages.updates) == 2
+    metrics = queue.get_metrics()
+    assert metrics["enqueued"] == 4 and metrics["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reaching_max_pending_flushes_before_the_interval():
+    pages = FlakyPages()
+    queue = make_queue(pages, flush_interval=60, max_pending=2)
+
+    await queue.enqueue("p1", {"Status": "a"})
+    await queue.enqueue("p1", {"Status": "b"})
+    await asyncio.sleep(0.05)
+    assert pages.updates == []
+
+    await queue.enqueue("p2", {"Status": "x"})
+    await wait_for_writes(pages, 2)
+    await queue.stop()
+
+    assert sorted(pages.updates) == [("p1", {"Status": "b"}), ("p2", {"Status": "x"})]
+
+
+@pytest.mark.asyncio
+async def test_pending_updates_are_flushed_on_the_interval():
+    pages = FlakyPages()
+    queue = make_queue(pages, flush_interval=0.05, max_pending=100)
+
+    await queue.enqueue("p1", {"Status": "a"})
+    assert pages.updates == []
+
+    await wait_for_writes(pages, 1)
+    assert queue.depth == 0
+    await queue.stop()
+
+    assert pages.updates == [("p1", {"Status": "a"})]
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_back_off_then_dead_letter():
+    pages = FlakyPages(failures=10)
+    queue = make_queue(pages, max_attempts=3, retry_backoff=60)
+    queue._pending["p1"] = {"Status": "a"}
+    queue._enqueued_at["p1"] = 0.0
+
+    assert await queue.flush() == 0
+    assert queue.depth == 1
+
+    # Still waiting out the retry delay
+    await queue.flush()
+    assert pages.failures == 9
+
+    await queue.flush(force=True)
+    assert queue.depth == 1
+    await queue.flush(force=True)
+
+    assert queue.depth == 0
+    assert queue.get_metrics()["dead_lettered"] == 1
+    assert pages.updates == []
+
+
+@pytest.mark.asyncio
+async def test_claims_only_hashes_of_departed_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis()
+    entry = json.dumps({"properties": {"Status": "x"}, "enqueued_at": 1.0})
+    await redis.hset(f"{NotionWriteQueue.REDIS_KEY}:alive:1", "p1", entry)
+    await redis.set(f"{NotionWriteQueue.OWNER_KEY}:alive:1", "1")
+    await redis.hset(f"{NotionWriteQueue.REDIS_KEY}:gone:2", "p2", entry)
+
+    pages = FlakyPages()
+    queue = make_queue(pages, redis=redis, worker_id="me:3")
+    await queue.start()
+
+    assert set(queue._pending) == {"p2"}
+    assert await redis.exists(f"{NotionWriteQueue.REDIS_KEY}:gone:2") == 0
+
+    await notion_write_queue.stop_notion_write_queues()
+
+    assert pages.updates == [("p2", {"Status": "x"})]
+    assert await redis.hlen(queue.redis_key) == 0
+    assert await redis.hlen(f"{NotionWriteQueue.REDIS_KEY}:alive:1") == 1
+    assert await redis.exists(f"{NotionWriteQueue.OWNER_KEY}:me:3") == 0
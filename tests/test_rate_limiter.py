@@ -0,0 +1,121 @@
+"""
+Tests for the sliding window and GCRA rate limiters.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from utils.rate_limiter import GCRARateLimiter, RateQuota, SlidingWindowRateLimiter
+
+
+def make_limiter() -> SlidingWindowRateLimiter:
+    return SlidingWindowRateLimiter(use_redis=False)
+
+
+@pytest.mark.asyncio
+async def test_denied_calls_report_retry_after():
+    limiter = make_limiter()
+    quota = RateQuota(key="agent", limit=3, window=10)
+
+    results = [await limiter.hit(quota) for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+    assert 9 < results[-1].retry_after <= 10
+
+
+@pytest.mark.asyncio
+async def test_call_must_fit_every_quota():
+    limiter = make_limiter()
+    tool = RateQuota(key="tool", limit=3)
+
+    assert (await limiter.hit(RateQuota(key="a", limit=2), tool)).allowed
+    assert (await limiter.hit(RateQuota(key="a", limit=2), tool)).allowed
+    # Agent "a" is out of calls, so the tool quota is not charged
+    assert not (await limiter.hit(RateQuota(key="a", limit=2), tool)).allowed
+
+    result = await limiter.hit(RateQuota(key="b", limit=2), tool)
+    assert result.allowed
+    assert result.remaining == 0
+    assert not (await limiter.hit(RateQuota(key="b", limit=2), tool)).allowed
+
+
+class FlakyRedis:
+    """Redis client whose hit script fails until `healthy` is set."""
+
+    def __init__(self):
+        self.healthy = False
+        self.calls = 0
+
+    def register_script(self, script):
+        async def run(keys, args):
+            self.calls += 1
+            if not self.healthy:
+                raise ConnectionError("redis down")
+            return [1, 10, 9, 0]
+
+        return run
+
+
+@pytest.mark.asyncio
+async def test_redis_is_retried_after_a_failed_check():
+    redis = FlakyRedis()
+    limiter = SlidingWindowRateLimiter(redis_client=redis, redis_retry_interval=0.05)
+    quota = RateQuota(key="agent", limit=10)
+
+    assert (await limiter.hit(quota)).allowed
+    redis.healthy = True
+    # Within the retry interval the local window is used without calling Redis
+    assert (await limiter.hit(quota)).remaining == 8
+    assert redis.calls == 1
+
+    await asyncio.sleep(0.06)
+    assert (await limiter.hit(quota)).remaining == 9
+    assert redis.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_gcra_allows_burst_then_paces_waiters_in_order():
+    limiter = GCRARateLimiter("test", rate=50, burst=3)
+    order = []
+
+    async def call(n):
+        await limiter.acquire()
+        order.append((n, time.monotonic()))
+
+    start = time.monotonic()
+    await asyncio.gather(*(call(n) for n in range(6)))
+
+    assert [n for n, _ in order] == list(range(6))
+    # Three calls go straight through, the rest are spaced 20ms apart
+    assert order[2][1] - start < 0.015
+    assert 0.05 <= order[-1][1] - start < 0.1
+
+
+@pytest.mark.asyncio
+async def test_gcra_cancelled_waiter_returns_its_slot():
+    limiter = GCRARateLimiter("test", rate=10, burst=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    # The next call gets the cancelled waiter's slot, not the one after it
+    assert 0.05 < await limiter.acquire() <= 0.1
+
+
+@pytest.mark.asyncio
+async def test_gcra_try_acquire_does_not_wait():
+    limiter = GCRARateLimiter("test", rate=1, burst=2)
+
+    assert (await limiter.try_acquire()).remaining == 1
+    assert (await limiter.try_acquire()).allowed
+    result = await limiter.try_acquire()
+
+    assert not result.allowed
+    assert 0.9 < result.retry_after <= 1.0
@@ -0,0 +1,115 @@
+"""
+Tests for the response optimization middleware.
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+# Importing the api package imports the server; the monitor needs psutil
+pytest.importorskip("uvicorn")
+pytest.importorskip("psutil")
+
+from api.middleware.response_optimization import ResponseOptimizationMiddleware
+
+
+def make_client(**options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/text/{size}")
+    async def text(size: int):
+        return PlainTextResponse("x" * size)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"line {i}\n" * 200
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/events")
+    async def events():
+        async def chunks():
+            yield "data: " + "x" * 2000 + "\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/json")
+    async def payload():
+        return JSONResponse({"value": 1}, status_code=201)
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    app.add_middleware(ResponseOptimizationMiddleware, **options)
+    return TestClient(app)
+
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def test_gzip_applies_only_above_threshold():
+    client = make_client(min_compression_size=100)
+
+    small = client.get("/text/99", headers=GZIP)
+    large = client.get("/text/5000", headers=GZIP)
+
+    assert "content-encoding" not in small.headers
+    assert small.text == "x" * 99
+    assert large.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in large.headers["vary"]
+    assert large.text == "x" * 5000
+    assert "x-request-id" in large.headers
+
+
+def test_streaming_responses_are_compressed_chunk_by_chunk():
+    client = make_client()
+
+    with client.stream("GET", "/stream", headers=GZIP) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode() == "".join(
+        f"line {i}\n" * 200 for i in range(3)
+    )
+
+
+def test_server_sent_events_pass_through_uncompressed():
+    client = make_client()
+
+    response = client.get("/events", headers=GZIP)
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "data: " + "x" * 2000 + "\n\n"
+
+
+def test_unhandled_errors_return_the_500_envelope():
+    response = make_client().get("/fail")
+
+    assert response.status_code == 500
+    body = response.json()
+    assert body["success"] is False
+    assert body["errors"] == ["boom"]
+    assert body["request_id"] == response.headers["x-request-id"]
+
+
+@pytest.mark.parametrize("wrap", [False, True])
+def test_json_bodies_are_wrapped_only_when_enabled(wrap):
+    response = make_client(wrap_responses=wrap).get("/json")
+
+    assert response.status_code == 201
+    body = response.json()
+    if wrap:
+        assert body["success"] is True
+        assert body["data"] == {"value": 1}
+        assert int(response.headers["content-length"]) == len(response.content)
+    else:
+        assert body == {"value": 1}
+        assert json.loads(response.content) == {"value": 1}
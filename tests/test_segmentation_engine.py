@@ -0,0 +1,151 @@
+"""
+Tests for the columnar segmentation engine.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.audience_models import SegmentCriteria
+from services.segmentation_engine import SegmentationEngine
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+def criteria(*specs):
+    return [SegmentCriteria(field=f, operator=op, value=v) for f, op, v in specs]
+
+
+@pytest.fixture
+def engine():
+    engine = SegmentationEngine(initial_capacity=2)
+    engine.load_profiles(
+        [
+            {
+                "email": "ana@example.com",
+                "interests": ["art", "yoga"],
+                "sources": ["web"],
+            },
+            {
+                "email": "ben@example.com",
+                "interests": ["retreats"],
+                "custom_fields": {"city": "Austin"},
+            },
+            {
+                "email": "cy@example.com",
+                "interests": ["art"],
+                "custom_fields": {"city": "Boston"},
+            },
+        ]
+    )
+    engine.load_orders(
+        [
+            {
+                "id": 1,
+                "status": "completed",
+                "total": "120.00",
+                "date_created": NOW - timedelta(days=3),
+                "billing": {"email": "Ana@Example.com"},
+                "line_items": [{"name": "Watercolor Course"}],
+            },
+            {
+                "id": 2,
+                "status": "completed",
+                "total": "40.00",
+                "date_created": NOW - timedelta(days=90),
+                "billing": {"email": "ben@example.com"},
+                "line_items": [{"name": "Gallery Pass"}],
+            },
+        ]
+    )
+    engine.load_bookings(
+        [
+            {
+                "id": 7,
+                "status": "approved",
+                "customer_email": "cy@example.com",
+                "booking_start": NOW - timedelta(days=1),
+                "payment_amount": 80.0,
+                "service_id": 3,
+            }
+        ]
+    )
+    return engine
+
+
+def test_criteria_evaluate_across_sources(engine):
+    def members(*specs):
+        mask = engine.evaluate(criteria(*specs), now=NOW)
+        return sorted(engine._emails[row] for row in mask.nonzero()[0])
+
+    assert members(("interests", "contains", "art")) == [
+        "ana@example.com",
+        "cy@example.com",
+    ]
+    assert members(
+        ("total_spent", "greater_than", 100),
+        ("last_order_date", "within_last_days", 30),
+    ) == ["ana@example.com"]
+    assert members(("booking_count", "greater_than_or_equal", 1)) == ["cy@example.com"]
+    assert members(("city", "in", ["Austin", "Denver"])) == ["ben@example.com"]
+    assert members(("order_count", "not_exists", None)) == ["cy@example.com"]
+
+    with pytest.raises(ValueError):
+        engine.define_segment("bad", criteria(("city", "resembles", "x")))
+
+
+def test_incremental_refresh_only_reevaluates_changed_contacts(engine):
+    engine.define_segment("art", criteria(("interests", "contains", "art")))
+    engine.define_segment("buyers", criteria(("order_count", "greater_than", 0)))
+    first = engine.refresh_segments(now=NOW)
+    assert first["art"]["member_count"] == 2 and first["art"]["full"]
+
+    # Re-delivering an order replaces it instead of counting it twice
+    engine.load_orders(
+        [
+            {
+                "id": 2,
+                "status": "refunded",
+                "total": "40.00",
+                "billing": {"email": "ben@example.com"},
+            },
+            {
+                "id": 3,
+                "status": "processing",
+                "total": "15.00",
+                "date_created": NOW,
+                "billing": {"email": "dee@example.com"},
+            },
+        ]
+    )
+    engine.upsert_contacts([{"email": "ben@example.com", "interests": ["art"]}])
+    engine.remove_contacts(["cy@example.com"])
+
+    second = engine.refresh_segments(now=NOW)
+    assert not second["art"]["full"]
+    assert second["art"] == {"member_count": 2, "added": 1, "removed": 1, "full": False}
+    assert sorted(engine.members("buyers")) == ["ana@example.com", "dee@example.com"]
+    assert engine.segments_for("ben@example.com") == ["art"]
+    assert engine.summary(days=30, now=NOW)["total_customers"] == 3
+
+
+def test_profile_timestamps_load_from_iso_strings():
+    engine = SegmentationEngine()
+    engine.load_profiles(
+        [
+            {
+                "email": "ana@example.com",
+                "first_seen": (NOW - timedelta(days=5)).isoformat(),
+                "last_interaction": (NOW - timedelta(days=2)).isoformat(),
+            },
+            {
+                "email": "ben@example.com",
+                "first_seen": (NOW - timedelta(days=400)).isoformat(),
+                "last_interaction": (NOW - timedelta(days=60)).isoformat(),
+            },
+        ]
+    )
+
+    summary = engine.summary(days=30, now=NOW)
+    assert summary["new_customers"] == 1
+    assert summary["active_customers"] == 1
@@ -0,0 +1,72 @@
+"""
+Tests for The 7 Space appointment slot index.
+
+The module is loaded from its file, since importing the wellness package
+imports the Notion-backed scheduler.
+"""
+
+import importlib.util
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+SLOT_INDEX_PATH = (
+    Path(__file__).resolve().parents[1]
+    / "integrations/the7space/automation/wellness/slot_index.py"
+)
+spec = importlib.util.spec_from_file_location("the7space_slot_index", SLOT_INDEX_PATH)
+slot_index = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = slot_index
+spec.loader.exec_module(slot_index)
+
+HOURS = {day: {"open": "10:00", "close": "18:00"} for day in slot_index.WEEKDAYS}
+MONDAY = date(2026, 10, 19)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 10, 19, hour, minute)
+
+
+def test_reserve_marks_quanta_and_release_frees_them():
+    index = slot_index.SlotIndex(HOURS)
+
+    reservation = index.reserve("massage", at(10), at(11, 15))
+
+    assert reservation.resource == slot_index.DEFAULT_RESOURCE
+    busy = index._busy[(slot_index.DEFAULT_RESOURCE, MONDAY)]
+    assert busy == slot_index._bits(120, 135)
+    assert index.reserve("massage", at(11), at(12)) is None
+
+    index.release(reservation)
+
+    assert index._busy == {}
+    assert index.reserve("massage", at(11), at(12)) is not None
+
+
+def test_overlaps_and_business_hours():
+    index = slot_index.SlotIndex(HOURS)
+    index.add("a1", None, at(12), at(13))
+
+    assert index.free_resource("massage", at(11), at(12)) is not None
+    assert index.free_resource("massage", at(12, 55), at(13, 30)) is None
+    assert index.free_resource("massage", at(12), at(13), exclude="a1") is not None
+    assert index.reserve("massage", at(17, 30), at(18, 30)) is None
+
+    slots = index.free_slots("massage", MONDAY, 60, step_minutes=60)
+    assert [start.hour for start, _ in slots] == [10, 11, 13, 14, 15, 16, 17]
+
+
+def test_unconfigured_practitioners_share_the_studio():
+    index = slot_index.SlotIndex(HOURS)
+    index.add("a1", "jane", at(10), at(11))
+
+    # A booking without a practitioner must see Jane's appointment
+    assert index.reserve("massage", at(10, 30), at(11)) is None
+    assert index.reserve("massage", at(10, 30), at(11), "sam") is None
+
+    index = slot_index.SlotIndex(HOURS, practitioners={"jane": set(), "sam": set()})
+    index.add("a1", "jane", at(10), at(11))
+
+    reservation = index.reserve("massage", at(10, 30), at(11))
+    assert reservation.resource == "sam"
+    assert index.reserve("massage", at(10, 30), at(11), "jane") is None
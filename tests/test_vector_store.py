@@ -0,0 +1,89 @@
+"""
+Tests for bulk writes and source lookups in the vector store.
+"""
+
+import pytest
+
+from knowledge.models import EmbeddingMeta
+from knowledge.vector_store import VectorStore
+
+
+class RecordingSupabase:
+    def __init__(self):
+        self.calls = []
+
+    async def execute_sql(self, sql, params=None):
+        self.calls.append((sql, params))
+        if "RETURNING" in sql:
+            # Params are 6 per document row, then 6 per chunk row, then the
+            # provider; document rows are the ones ending in the chunk count
+            docs = [params[i : i + 6] for i in range(0, len(params), 6)]
+            return [
+                {"id": doc[0], "content_hash": doc[2]}
+                for doc in docs
+                if len(doc) == 6 and isinstance(doc[5], int)
+            ]
+        return []
+
+
+def make_store() -> VectorStore:
+    store = VectorStore(RecordingSupabase())
+    store._initialized = True
+    return store
+
+
+def make_document(content, chunks=()):
+    return {
+        "content": content,
+        "embedding": [1.0, 0.0],
+        "content_type": "text",
+        "metadata": EmbeddingMeta(
+            content_type="text", source="web:https://example.com/a"
+        ),
+        "chunks": list(chunks),
+        "chunk_embeddings": [[0.0, 1.0]] * len(chunks),
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_store_upserts_embeddings_and_chunks_in_one_statement():
+    store = make_store()
+
+    ids = await store.store_documents_bulk(
+        [make_document("a", ["a1"]), make_document("b", ["b1"]), make_document("a")],
+        "mock",
+    )
+
+    ((sql, params),) = store.supabase.calls
+    assert "ON CONFLICT (content_hash, embedding_provider) DO UPDATE" in sql
+    assert "ON CONFLICT (embedding_id, chunk_index) DO UPDATE" in sql
+    assert params[-1] == "mock"
+    # The repeated "a" replaces the first, so only "b" still has a chunk
+    assert params.count("a1") == 0 and params.count("b1") == 1
+    assert len(ids) == 3 and ids[0] == ids[2] != ids[1]
+
+
+@pytest.mark.asyncio
+async def test_bulk_store_splits_batches_by_parameter_count():
+    store = make_store()
+
+    ids = await store.store_documents_bulk(
+        [make_document(str(i), ["x"]) for i in range(4)],
+        "mock",
+        params_per_statement=24,
+    )
+
+    assert len(store.supabase.calls) == 2
+    assert all("stored_chunks" in sql for sql, _ in store.supabase.calls)
+    assert len(set(ids)) == 4
+
+
+@pytest.mark.asyncio
+async def test_source_prefix_match_is_anchored():
+    store = make_store()
+
+    await store.get_source_hashes("web:https://example.com/")
+
+    sql, params = store.supabase.calls[0]
+    assert "= $1 OR" in sql
+    assert params == ["web:https://example.com/", "web:https://example.com/%"]
@@ -0,0 +1,196 @@
+"""
+Tests for the durable webhook intake queue.
+"""
+
+import asyncio
+
+import pytest
+
+from services.webhook_queue import WebhookQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return WebhookQueue(
+        path=str(tmp_path / "webhooks.db"),
+        workers=2,
+        max_attempts=2,
+        retry_backoff=0.01,
+        poll_interval=0.01,
+    )
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_deliveries_are_processed_once(queue):
+    processed = []
+
+    async def handler(delivery):
+        processed.append(delivery.json_payload()["n"])
+
+    queue.register_handler("test", handler)
+
+    for n in range(5):
+        _, duplicate = await queue.enqueue("test", f'{{"n": {n}}}'.encode())
+        assert not duplicate
+    _, duplicate = await queue.enqueue("test", b'{"n": 0}')
+    assert duplicate
+
+    await wait_for(lambda: _stat(queue, "done", 5))
+    await queue.stop()
+
+    assert sorted(processed) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_failed_delivery_can_be_replayed(queue):
+    calls = []
+
+    async def handler(delivery):
+        calls.append(delivery.attempts)
+        if len(calls) <= 2:
+            raise RuntimeError("downstream unavailable")
+
+    queue.register_handler("test", handler)
+    delivery_id, _ = await queue.enqueue("test", b"{}", idempotency_key="evt-1")
+
+    await wait_for(lambda: _stat(queue, "failed", 1))
+    failed = await queue.list_failed()
+    assert [d.id for d in failed] == [delivery_id]
+    assert failed[0].last_error == "downstream unavailable"
+
+    assert await queue.replay(delivery_id=delivery_id) == 1
+    await wait_for(lambda: _stat(queue, "done", 1))
+    await queue.stop()
+
+    assert calls == [1, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_interrupted_deliveries_survive_restart(tmp_path):
+    path = str(tmp_path / "webhooks.db")
+    first = WebhookQueue(path=path, workers=1, poll_interval=0.01)
+    started = asyncio.Event()
+
+    async def hang(delivery):
+        started.set()
+        await asyncio.sleep(60)
+
+    first.register_handler("test", hang)
+    await first.enqueue("test", b'{"n": 1}')
+    await asyncio.wait_for(started.wait(), 5)
+    await first.stop()
+
+    second = WebhookQueue(path=path, workers=1, poll_interval=0.01)
+    processed = []
+
+    async def handler(delivery):
+        processed.append(delivery.id)
+
+    second.register_handler("test", handler)
+    await second.start()
+    await wait_for(lambda: _stat(second, "done", 1))
+    await second.stop()
+
+    assert len(processed) == 1
+
+
+@pytest.mark.asyncio
+async def test_only_expired_leases_are_reclaimed(tmp_path):
+    path = str(tmp_path / "webhooks.db")
+    first = WebhookQueue(
+        path=path, workers=1, poll_interval=0.01, lease_ttl=0.3, worker_id="a"
+    )
+    started = asyncio.Event()
+
+    async def hang(delivery):
+        started.set()
+        await asyncio.sleep(60)
+
+    first.register_handler("test", hang)
+    await first.enqueue("test", b'{"n": 1}')
+    await asyncio.wait_for(started.wait(), 5)
+
+    second = WebhookQueue(path=path, workers=1, poll_interval=0.01, worker_id="b")
+    processed = []
+
+    async def handler(delivery):
+        processed.append(delivery.attempts)
+
+    second.register_handler("test", handler)
+    await second.start()
+
+    # The first worker keeps renewing its lease while the handler runs
+    await asyncio.sleep(0.6)
+    assert processed == []
+
+    await first.stop()
+    await wait_for(lambda: _stat(second, "done", 1))
+    await second.stop()
+
+    assert processed == [2]
+
+
+async def _stat(queue, name, expected):
+    return (await queue.get_stats())[name] == expected
+
+
+@pytest.mark.asyncio
+async def test_stale_worker_cannot_finish_a_reclaimed_delivery(tmp_path):
+    path = str(tmp_path / "webhooks.db")
+    first = WebhookQueue(path=path, lease_ttl=0, worker_id="a")
+    second = WebhookQueue(path=path, lease_ttl=60, worker_id="b")
+    first._insert("test", "test:1", b"{}", {}, {})
+
+    stale = first._claim()
+    reclaimed = second._claim()
+    assert reclaimed.id == stale.id
+
+    # Neither outcome of the expired lease may override the new owner's
+    first._complete(stale.id)
+    first._fail(stale, "late failure")
+    assert await _stat(second, "processing", 1)
+
+    second._complete(reclaimed.id)
+    assert await _stat(second, "done", 1)
+
+
+@pytest.mark.asyncio
+async def test_identical_bodies_without_event_id_dedupe_only_within_window(
+    tmp_path,
+):
+    queue = WebhookQueue(
+        path=str(tmp_path / "webhooks.db"), poll_interval=0.01, body_dedupe_window=0.05
+    )
+    processed = []
+
+    async def handler(delivery):
+        processed.append(delivery.id)
+
+    queue.register_handler("amelia", handler)
+    body = b'{"booking_id": 7, "status": "approved"}'
+
+    first, _ = await queue.enqueue("amelia", body)
+    _, duplicate = await queue.enqueue("amelia", body)
+    assert duplicate
+
+    # The same status sent again later is a new event
+    await asyncio.sleep(0.06)
+    second, duplicate = await queue.enqueue("amelia", body)
+    assert not duplicate and second != first
+
+    # Provider event IDs still dedupe for the whole retention period
+    await queue.enqueue("amelia", body, idempotency_key="evt-1")
+    await asyncio.sleep(0.06)
+    _, duplicate = await queue.enqueue("amelia", body, idempotency_key="evt-1")
+    assert duplicate
+
+    await wait_for(lambda: _stat(queue, "done", 3))
+    await queue.stop()
+    assert sorted(processed)[:2] == [first, second]
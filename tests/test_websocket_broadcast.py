@@ -0,0 +1,149 @@
+"""
+Tests for the WebSocket broadcast engine.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from starlette.websockets import WebSocketState
+
+from services.websocket_broadcast import ConnectionManager, SlowConsumerPolicy
+
+
+class FakeRedis:
+    """Just enough async Redis pubsub to connect several workers."""
+
+    def __init__(self):
+        self.subscribers = {}
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+    async def publish(self, channel, data):
+        receivers = [p for p in self.subscribers.get(channel, ()) if not p.closed]
+        for pubsub in receivers:
+            pubsub.messages.put_nowait(
+                {"type": "message", "channel": channel, "data": data}
+            )
+        return len(receivers)
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.channels = set()
+        self.messages = asyncio.Queue()
+        self.closed = False
+
+    @property
+    def subscribed(self):
+        return bool(self.channels)
+
+    async def subscribe(self, *channels):
+        for channel in channels:
+            self.channels.add(channel)
+            self.redis.subscribers.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, *channels):
+        for channel in channels:
+            self.channels.discard(channel)
+            self.redis.subscribers.get(channel, set()).discard(self)
+
+    async def get_message(self, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        await self.unsubscribe(*list(self.channels))
+        self.closed = True
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+        self.client = SimpleNamespace(host="127.0.0.1")
+        self.client_state = WebSocketState.CONNECTING
+        self.close_code = None
+
+    async def accept(self):
+        self.client_state = WebSocketState.CONNECTED
+
+    async def send_text(self, data):
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(data))
+
+    async def close(self, code=1000, reason=None):
+        self.close_code = code
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_hold_up_broadcast():
+    manager = ConnectionManager(max_queue=2, redis_fanout=False)
+    fast, slow = FakeWebSocket(), FakeWebSocket(delay=10)
+    await manager.connect(fast, "fast")
+    await manager.connect(slow, "slow")
+
+    for i in range(5):
+        assert await manager.broadcast_to_all({"n": i}) == 2
+        await asyncio.sleep(0.001)
+
+    assert [m["n"] for m in fast.sent] == [0, 1, 2, 3, 4]
+    # The slow client is stuck on message 0 and kept only the newest two
+    info = manager.get_all_connection_info()["slow"]
+    assert info["messages_queued"] == 2
+    assert info["messages_dropped"] == 2
+
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_closes_slow_client():
+    manager = ConnectionManager(
+        max_queue=1, policy=SlowConsumerPolicy.DISCONNECT, redis_fanout=False
+    )
+    slow = FakeWebSocket(delay=10)
+    await manager.connect(slow, "slow")
+    await manager.subscribe("slow", "dashboard")
+
+    for i in range(3):
+        await manager.broadcast_to_topic("dashboard", {"n": i})
+    await asyncio.sleep(0.01)
+
+    assert slow.close_code == 1013
+    assert not await manager.send_json("slow", {"n": 4})
+
+    await manager.disconnect("slow")
+    assert manager.get_topic_connection_count("dashboard") == 0
+
+
+@pytest.mark.asyncio
+async def test_published_messages_reach_subscribers_on_every_worker():
+    redis = FakeRedis()
+    workers = [ConnectionManager(redis_client=redis) for _ in range(3)]
+    sockets = [FakeWebSocket() for _ in workers]
+    for i, (manager, websocket) in enumerate(zip(workers, sockets)):
+        await manager.connect(websocket, f"client-{i}")
+    # Only the first two workers have a client following the agent
+    await workers[0].subscribe("client-0", "agent_channel:grace")
+    await workers[1].subscribe("client-1", "agent_channel:grace")
+
+    assert await workers[2].publish("agent_channel:grace", {"n": 1}) == 2
+    assert await workers[2].publish_to_all({"n": 2}) == 3
+    await asyncio.sleep(0.05)
+
+    assert [m["n"] for m in sockets[0].sent] == [1, 2]
+    assert [m["n"] for m in sockets[1].sent] == [1, 2]
+    assert [m["n"] for m in sockets[2].sent] == [2]
+
+    await workers[0].disconnect("client-0")
+    assert "agent_channel:grace" not in workers[0].fanout.topics
+    assert await workers[2].publish("agent_channel:grace", {"n": 3}) == 1
+
+    for manager in workers:
+        await manager.close()
@@ -0,0 +1,298 @@
+"""
+Tests for the durable workflow state store.
+
+Covers the optimistic concurrency contract shared by the in-memory, SQLite and
+Redis backends, the WorkflowEngine's and WorkflowStateMachine's use of it for
+transitions, and the ordering of Notion mirror writes.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from utils.error_handling import WorkflowException
+from workflow.state_store import (
+    InMemoryWorkflowStateStore,
+    NotionMirror,
+    RedisWorkflowStateStore,
+    SQLiteWorkflowStateStore,
+    WorkflowVersionConflict,
+    create_state_store_from_env,
+)
+from workflow.workflow_engine import WorkflowDefinition, WorkflowEngine
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteWorkflowStateStore(path=str(tmp_path / "state.db"))
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")  # fakeredis needs it to run Lua scripts
+
+        store = RedisWorkflowStateStore(prefix="test")
+        store._redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        store._save_script = store._redis.register_script(store.SAVE_SCRIPT)
+        return store
+    return InMemoryWorkflowStateStore()
+
+
+@pytest.mark.asyncio
+async def test_save_and_load(store):
+    version = await store.save("i1", "wf", {"state": "new"}, expected_version=0)
+    assert version == 1
+
+    record = await store.load("i1")
+    assert record.version == 1
+    assert record.workflow_id == "wf"
+    assert record.data == {"state": "new"}
+    assert await store.load("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_stale_version_is_rejected(store):
+    await store.save("i1", "wf", {"state": "new"}, expected_version=0)
+    await store.save(
+        "i1", "wf", {"state": "open"}, expected_version=1, transition={"to": "open"}
+    )
+
+    with pytest.raises(WorkflowVersionConflict):
+        await store.save(
+            "i1", "wf", {"state": "closed"}, expected_version=1, transition={"to": "x"}
+        )
+    with pytest.raises(WorkflowVersionConflict):
+        await store.save("i1", "wf", {"state": "new"}, expected_version=0)
+
+    record = await store.load("i1")
+    assert record.version == 2
+    assert record.data == {"state": "open"}
+    assert await store.get_transition_log("i1") == [{"to": "open"}]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_only_one_wins(store):
+    await store.save("i1", "wf", {"n": 0}, expected_version=0)
+
+    async def write(n):
+        try:
+            await store.save("i1", "wf", {"n": n}, expected_version=1)
+            return True
+        except WorkflowVersionConflict:
+            return False
+
+    results = await asyncio.gather(*(write(n) for n in range(10)))
+    assert results.count(True) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_and_delete(store):
+    await store.save("a", "wf1", {}, expected_version=0)
+    await store.save("b", "wf2", {}, expected_version=0)
+
+    assert sorted(await store.list_instance_ids()) == ["a", "b"]
+    assert await store.list_instance_ids("wf1") == ["a"]
+
+    await store.delete("a")
+    assert await store.load("a") is None
+    assert await store.list_instance_ids() == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_engine_rejects_stale_transition():
+    store = InMemoryWorkflowStateStore()
+    engine = WorkflowEngine(state_store=store)
+    engine.register_workflow(
+        WorkflowDefinition(
+            name="lead",
+            description="Lead workflow",
+            states=["new", "contacted", "closed"],
+            initial_state="new",
+            transitions={"new": ["contacted", "closed"], "contacted": ["closed"]},
+        )
+    )
+
+    instance = await engine.create_workflow("lead", {"source": "web"})
+    stale = instance.model_copy(deep=True)
+
+    result = await engine.transition_workflow(instance, "contacted", "called", "a1")
+    assert result.success
+    assert instance.version == 2
+
+    result = await engine.transition_workflow(stale, "closed", "lost", "a2")
+    assert not result.success
+    assert stale.current_state == "new"
+
+    fresh = await engine.get_workflow(instance.id)
+    assert fresh.current_state == "contacted"
+    assert len(await store.get_transition_log(instance.id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_checks_compiled_transition_conditions():
+    engine = WorkflowEngine(state_store=InMemoryWorkflowStateStore())
+    engine.register_workflow(
+        WorkflowDefinition(
+            name="lead",
+            states=["new", "qualified"],
+            initial_state="new",
+            transitions={"new": ["qualified"]},
+            conditions={
+                "new:qualified": [{"field": "score", "operator": "gte", "value": 50}]
+            },
+        )
+    )
+    assert "new:qualified" in engine.transition_conditions["lead"]
+
+    instance = await engine.create_workflow("lead", {"score": 10})
+    result = await engine.transition_workflow(instance, "qualified", "auto", "a1")
+    assert not result.success
+    assert instance.current_state == "new"
+
+    # A value of the wrong type fails the condition instead of raising
+    result = await engine.transition_workflow(
+        instance, "qualified", "auto", "a1", {"score": "high"}
+    )
+    assert not result.success
+    assert "Conditions not met" in result.error
+
+    result = await engine.transition_workflow(
+        instance, "qualified", "auto", "a1", {"score": 80}
+    )
+    assert result.success
+
+
+def test_memory_store_is_refused_with_several_workers(monkeypatch):
+    monkeypatch.setenv("WORKFLOW_STATE_STORE", "memory")
+    monkeypatch.setenv("SERVER_WORKERS", "4")
+    with pytest.raises(WorkflowException):
+        create_state_store_from_env()
+
+    monkeypatch.delenv("WORKFLOW_STATE_STORE")
+    assert isinstance(create_state_store_from_env(), RedisWorkflowStateStore)
+
+
+@pytest.mark.asyncio
+async def test_state_machine_retries_after_concurrent_update():
+    from models.notion_db_models import WorkflowInstance
+    from workflow.state_machine import (
+        StateTransition,
+        WorkflowState,
+        WorkflowStateMachine,
+    )
+
+    class RacingStore(InMemoryWorkflowStateStore):
+        """Lets another worker bump the instance before the first save."""
+
+        raced = False
+
+        async def save(self, instance_id, workflow_id, data, expected_version, **kw):
+            if expected_version and not self.raced:
+                self.raced = True
+                concurrent = {**data, "current_state": "new", "priority": "High"}
+                await super().save(
+                    instance_id, workflow_id, concurrent, expected_version
+                )
+            return await super().save(
+                instance_id, workflow_id, data, expected_version, **kw
+            )
+
+    class Notion:
+        async def update_page(self, instance):
+            return True
+
+    store = RacingStore()
+    machine = WorkflowStateMachine(
+        workflow_id="wf",
+        name="Lead",
+        description="Lead workflow",
+        states={
+            "new": WorkflowState(
+                name="new", description="New", available_transitions=["finish"]
+            ),
+            "done": WorkflowState(name="done", description="Done", is_terminal=True),
+        },
+        transitions=[
+            StateTransition(
+                from_state="new", to_state="done", name="finish", description="Finish"
+            )
+        ],
+        initial_state="new",
+        notion_service=Notion(),
+        state_store=store,
+    )
+    instance = WorkflowInstance(
+        instance_id="i1",
+        workflow_id="wf",
+        business_entity="b1",
+        current_state="new",
+        last_transition_date=datetime.now(),
+    )
+    await store.save("i1", "wf", instance.model_dump(mode="json"), expected_version=0)
+
+    success, updated = await machine.transition("i1", "finish", "agent")
+
+    assert success
+    assert updated.current_state == "done"
+    assert updated.priority == "High"
+    assert (await store.load("i1")).version == 3
+    await machine.mirror.drain()
+
+
+@pytest.mark.asyncio
+async def test_mirror_writes_are_ordered_and_coalesced_per_key():
+    mirror = NotionMirror()
+    written = []
+    release = asyncio.Event()
+
+    def write(state):
+        async def run():
+            if state == 1:
+                await release.wait()
+            written.append(state)
+
+        return run
+
+    for state in (1, 2, 3):
+        mirror.submit(write(state), "instance i1", key="i1")
+        await asyncio.sleep(0)
+    release.set()
+    await mirror.drain()
+
+    assert written == [1, 3]
+    assert mirror.coalesced == 1
+    assert mirror.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_mirror_writes_are_retried_unless_superseded():
+    mirror = NotionMirror(max_attempts=3, retry_backoff=0.01)
+    attempts = []
+
+    async def flaky():
+        attempts.append("flaky")
+        return len(attempts) > 1
+
+    mirror.submit(flaky, "instance i1", key="i1")
+    await mirror.drain()
+    assert attempts == ["flaky", "flaky"]
+    assert mirror.retries == 1 and mirror.failures == 0
+
+    written = []
+
+    async def failing():
+        written.append("old")
+        return False
+
+    async def newer():
+        written.append("new")
+
+    mirror.submit(failing, "instance i2", key="i2")
+    await asyncio.sleep(0)
+    mirror.submit(newer, "instance i2", key="i2")
+    await mirror.drain()
+    assert written == ["old", "new"]
+
+    mirror.submit(failing, "instance i3")
+    await mirror.drain()
+    assert mirror.failures == 1
@@ -7,6 +7,8 @@ external service calls, featuring:
 2. Automatic recovery mechanism
 3. Configurable thresholds and timeouts
 4. Detailed logging of circuit state changes
+5. Optional state shared across processes through Redis
+   (CIRCUIT_BREAKER_DISTRIBUTED=true)
 
 Usage example:
     # Create a circuit breaker
@@ -28,6 +30,7 @@ Usage example:
 
 import asyncio
 import logging
+import os
 import time
 from enum import Enum
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
@@ -361,6 +364,299 @@ class CircuitBreaker:
         }
 
 
+class DistributedCircuitBreaker(CircuitBreaker):
+    """
+    Circuit breaker whose state is shared across processes through Redis.
+
+    The failure count, state and open time live in a Redis hash, so once the
+    threshold is reached in any worker every worker fails fast. Shared state
+    is cached locally and re-read at most every sync_interval seconds, so
+    calls on a healthy circuit do not add a Redis round trip. After the
+    recovery timeout a single probe call is allowed fleet-wide, guarded by
+    a Redis lease; its success closes the circuit everywhere.
+
+    Falls back to per-process behaviour if Redis is unavailable.
+    """
+
+    # KEYS: state hash, probe lease
+    # ARGV: failure threshold, now, probe (0/1), state TTL
+    FAILURE_SCRIPT = """
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if ARGV[3] == '1' or (state ~= 'open' and failures >= tonumber(ARGV[1])) then
+    redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', ARGV[2])
+    redis.call('DEL', KEYS[2])
+    state = 'open'
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+local opened_at = redis.call('HGET', KEYS[1], 'opened_at') or '0'
+return {state, failures, opened_at}
+"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: int = 30,
+        timeout: float = 10.0,
+        exclude_exceptions: Optional[List[Type[Exception]]] = None,
+        half_open_max_calls: int = 1,
+        logger: Optional[logging.Logger] = None,
+        sync_interval: float = 1.0,
+        prefix: str = "circuit_breaker",
+        state_ttl: int = 86400,
+    ):
+        """
+        Initialize a distributed circuit breaker.
+
+        Args:
+            name: Name of the service protected by this circuit breaker
+            failure_threshold: Number of failures before opening the circuit
+            recovery_timeout: Seconds to wait before allowing a probe call
+            timeout: Request timeout in seconds
+            exclude_exceptions: List of exception types to not count as
+                failures
+            half_open_max_calls: Unused; one probe is allowed fleet-wide
+            logger: Optional logger instance
+            sync_interval: Seconds between reads of the shared state
+            prefix: Prefix for Redis keys
+            state_ttl: Seconds to keep the shared state after the last failure
+        """
+        super().__init__(
+            name,
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            timeout=timeout,
+            exclude_exceptions=exclude_exceptions,
+            half_open_max_calls=half_open_max_calls,
+            logger=logger,
+        )
+        self.sync_interval = sync_interval
+        self.state_key = f"{prefix}:{name}"
+        self.probe_key = f"{prefix}:{name}:probe"
+        self.state_ttl = state_ttl
+        self.use_redis = True
+        self._redis = None
+        self._failure_script = None
+        self._synced_at = 0.0
+
+    async def _get_redis(self):
+        """Get the async Redis client, or None if Redis is unavailable."""
+        if not self.use_redis:
+            return None
+
+        if self._redis is None:
+            try:
+                from services.redis_service import redis_service
+
+                self._redis = await redis_service.get_async_client()
+                self._failure_script = self._redis.register_script(self.FAILURE_SCRIPT)
+            except Exception as e:
+                self.logger.warning(
+                    f"Redis unavailable, circuit {self.name} is per process: {e}"
+                )
+                self.use_redis = False
+                return None
+
+        return self._redis
+
+    def _apply_shared_state(
+        self, state: str, failures: int, opened_at: float, reason: str
+    ) -> None:
+        """Update the local cache from the shared state."""
+        self.failure_count = failures
+        new_state = CircuitState.OPEN if state == "open" else CircuitState.CLOSED
+
+        if new_state == CircuitState.OPEN:
+            self.last_failure_time = opened_at
+        if new_state == self.state or (
+            new_state == CircuitState.OPEN and self.state == CircuitState.HALF_OPEN
+        ):
+            self.state = new_state
+            return
+
+        old_state = self.state
+        self.state = new_state
+        self.half_open_calls = 0
+        self.consecutive_successes = 0
+        self.state_changes.append(
+            {
+                "timestamp": time.time(),
+                "from_state": old_state,
+                "to_state": new_state,
+                "reason": reason,
+            }
+        )
+        self.logger.info(f"Circuit {self.name} {new_state.value.upper()}: {reason}")
+
+    async def _sync(self, redis) -> None:
+        """Refresh the local state from Redis if the cache is stale."""
+        now = time.time()
+        if now - self._synced_at < self.sync_interval:
+            return
+
+        self._synced_at = now
+        shared = await redis.hgetall(self.state_key)
+        self._apply_shared_state(
+            shared.get("state", "closed"),
+            int(shared.get("failures", 0)),
+            float(shared.get("opened_at", 0)),
+            "Shared state changed",
+        )
+
+    async def _record_failure(self, probe: bool) -> None:
+        """Count a failure in the shared state, opening the circuit if needed."""
+        self.last_failure_time = time.time()
+        try:
+            state, failures, opened_at = await self._failure_script(
+                keys=[self.state_key, self.probe_key],
+                args=[
+                    self.failure_threshold,
+                    self.last_failure_time,
+                    int(probe),
+                    self.state_ttl,
+                ],
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to record failure for {self.name}: {e}")
+            self._handle_failure()
+            return
+
+        self._synced_at = time.time()
+        self._apply_shared_state(
+            state,
+            int(failures),
+            float(opened_at),
+            (
+                "Failed during HALF_OPEN test"
+                if probe
+                else f"Reached failure threshold ({failures}/{self.failure_threshold})"
+            ),
+        )
+
+    async def _record_success(self, redis, probe: bool) -> None:
+        """Close the circuit after a probe, or clear the shared failure count."""
+        try:
+            if probe:
+                async with redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(
+                        self.state_key, mapping={"state": "closed", "failures": 0}
+                    )
+                    pipe.delete(self.probe_key)
+                    await pipe.execute()
+            elif self.failure_count > 0:
+                await redis.hset(self.state_key, "failures", 0)
+        except Exception as e:
+            self.logger.warning(f"Failed to record success for {self.name}: {e}")
+
+        if probe:
+            self._synced_at = time.time()
+            self._apply_shared_state("closed", 0, 0, "Probe call succeeded")
+        self.failure_count = 0
+
+    async def execute(
+        self, func: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        """
+        Execute a function with fleet-wide circuit breaker protection.
+
+        Args:
+            func: Async function to execute
+            *args: Arguments to pass to the function
+            **kwargs: Keyword arguments to pass to the function
+
+        Returns:
+            Any: The result of the function call
+
+        Raises:
+            CircuitOpenException: If the circuit is open
+            Exception: Any exception raised by the function
+        """
+        try:
+            redis = await self._get_redis()
+            if redis is not None:
+                await self._sync(redis)
+        except Exception as e:
+            self.logger.warning(f"Failed to sync circuit {self.name}: {e}")
+            redis = None
+
+        if redis is None:
+            return await super().execute(func, *args, **kwargs)
+
+        probe = False
+        if self.state != CircuitState.CLOSED:
+            elapsed = time.time() - self.last_failure_time
+            leased = False
+            if elapsed > self.recovery_timeout:
+                # The lease outlives the probe call, so a probe that is
+                # cancelled or crashes only delays recovery until it expires
+                try:
+                    leased = await redis.set(
+                        self.probe_key,
+                        self.name,
+                        nx=True,
+                        px=int((self.timeout + 1) * 1000),
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        f"Failed to lease probe for circuit {self.name}: {e}"
+                    )
+                    return await super().execute(func, *args, **kwargs)
+            if not leased:
+                self.total_calls += 1
+                self.rejected_calls += 1
+                raise CircuitOpenException(
+                    service_name=self.name,
+                    remaining_seconds=max(0, self.recovery_timeout - elapsed),
+                )
+            probe = True
+            self._transition_to_half_open()
+
+        self.total_calls += 1
+
+        try:
+            result = await asyncio.wait_for(func(*args, **kwargs), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.logger.warning(f"Timeout calling {self.name} after {self.timeout}s")
+            await self._record_failure(probe)
+            raise ServiceException(
+                message=f"Request to {self.name} timed out after {self.timeout}s",
+                service_name=self.name,
+                details={"timeout": self.timeout},
+            )
+        except Exception as e:
+            self.failed_calls += 1
+            if any(isinstance(e, exc_type) for exc_type in self.exclude_exceptions):
+                if probe:
+                    # Inconclusive probe; let the next call try again
+                    try:
+                        await redis.delete(self.probe_key)
+                    except Exception as redis_error:
+                        self.logger.warning(
+                            f"Failed to release probe for {self.name}: {redis_error}"
+                        )
+            else:
+                await self._record_failure(probe)
+            raise
+
+        self.successful_calls += 1
+        await self._record_success(redis, probe)
+        return result
+
+    async def reset_shared(self) -> None:
+        """Reset the circuit to closed in every process."""
+        self.reset()
+        redis = await self._get_redis()
+        if redis is not None:
+            await redis.delete(self.state_key, self.probe_key)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        metrics["backend"] = "redis" if self.use_redis else "local"
+        return metrics
+
+
 class CircuitBreakerRegistry:
     """
     Registry for circuit breakers to provide a central point of access.
@@ -379,6 +675,12 @@ class CircuitBreakerRegistry:
         # Only initialize once
         if not hasattr(self, "initialized"):
             self.circuit_breakers = {}
+            self.distributed = (
+                os.environ.get("CIRCUIT_BREAKER_DISTRIBUTED", "false").lower() == "true"
+            )
+            self.sync_interval = float(
+                os.environ.get("CIRCUIT_BREAKER_SYNC_INTERVAL", "1.0")
+            )
             self.logger = logging.getLogger("circuit_breaker.registry")
             self.initialized = True
 
@@ -389,6 +691,7 @@ class CircuitBreakerRegistry:
         recovery_timeout: int = 30,
         timeout: float = 10.0,
         exclude_exceptions: Optional[List[Type[Exception]]] = None,
+        distributed: Optional[bool] = None,
     ) -> CircuitBreaker:
         """
         Get an existing circuit breaker or create a new one.
@@ -401,18 +704,33 @@ class CircuitBreakerRegistry:
             timeout: Request timeout in seconds
             exclude_exceptions: List of exception types to not count as
                 failures
+            distributed: Share state across processes through Redis
+                (default: CIRCUIT_BREAKER_DISTRIBUTED)
 
         Returns:
             CircuitBreaker: The circuit breaker instance
         """
         if name not in self.circuit_breakers:
-            self.circuit_breakers[name] = CircuitBreaker(
-                name=name,
-                failure_threshold=failure_threshold,
-                recovery_timeout=recovery_timeout,
-                timeout=timeout,
-                exclude_exceptions=exclude_exceptions,
-            )
+            if distributed is None:
+                distributed = self.distributed
+
+            if distributed:
+                self.circuit_breakers[name] = DistributedCircuitBreaker(
+                    name=name,
+                    failure_threshold=failure_threshold,
+                    recovery_timeout=recovery_timeout,
+                    timeout=timeout,
+                    exclude_exceptions=exclude_exceptions,
+                    sync_interval=self.sync_interval,
+                )
+            else:
+                self.circuit_breakers[name] = CircuitBreaker(
+                    name=name,
+                    failure_threshold=failure_threshold,
+                    recovery_timeout=recovery_timeout,
+                    timeout=timeout,
+                    exclude_exceptions=exclude_exceptions,
+                )
             self.logger.info(f"Created new circuit breaker: {name}")
 
         return self.circuit_breakers[name]
@@ -2,13 +2,18 @@
 
 This module provides a simple message bus for inter-agent communication,
 with support for Notion as the central hub for message storage and tracing.
-Features include pub/sub messaging, request-response patterns, message
-history tracking, and asynchronous delivery with error handling.
+Features include pub/sub messaging, request-response patterns, bounded and
+indexed message history, and asynchronous delivery with error handling.
+Messages are persisted to Notion by a background batched sink, so publishing
+never waits on the Notion API.
 """
 
 import asyncio
+import heapq
+import itertools
+import os
 import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime
 from typing import (Any, Awaitable, Callable, Coroutine, Dict, Generic, List,
                     Optional, Set, TypeVar, Union)
@@ -45,6 +50,7 @@ except ImportError:
     logger = CompatLogger(__name__)
 
 from models.notion_db_models import AgentCommunication
+from utils.rate_limiter import GCRARateLimiter, get_rate_limiter
 
 # Type definition for message callback functions
 MessageCallback = Callable[[Any], Awaitable[None]]
@@ -86,6 +92,236 @@ class AgentMessage(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat()}
 
 
+class MessageHistory:
+    """Bounded ring buffer of messages with secondary indexes.
+
+    Keeps the most recent max_size messages. Each message is also indexed by
+    sender, recipient and message type, so filtered lookups only touch the
+    matching messages instead of scanning the whole history. Evicting the
+    oldest message is O(1) because every index is kept in insertion order.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """Initialize the history.
+
+        Args:
+            max_size: Maximum number of messages retained
+        """
+        self.max_size = max_size
+        self._messages: deque = deque()
+        self._by_sender: Dict[str, deque] = {}
+        self._by_recipient: Dict[str, deque] = {}
+        self._by_type: Dict[str, deque] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def append(self, message: AgentMessage) -> None:
+        """Add a message, evicting the oldest one if the buffer is full.
+
+        Args:
+            message: The message to record
+        """
+        entry = (next(self._sequence), message)
+        self._messages.append(entry)
+        self._index(self._by_sender, message.sender, entry)
+        self._index(self._by_recipient, message.recipient, entry)
+        self._index(self._by_type, message.message_type, entry)
+
+        while len(self._messages) > self.max_size:
+            oldest = self._messages.popleft()
+            _, evicted = oldest
+            self._unindex(self._by_sender, evicted.sender, oldest)
+            self._unindex(self._by_recipient, evicted.recipient, oldest)
+            self._unindex(self._by_type, evicted.message_type, oldest)
+
+    def query(
+        self,
+        limit: int = 100,
+        agent_id: Optional[str] = None,
+        message_type: Optional[str] = None,
+    ) -> List[AgentMessage]:
+        """Get the most recent messages matching the filters, newest first.
+
+        Args:
+            limit: Maximum number of messages to return
+            agent_id: Optional agent ID to match as sender or recipient
+            message_type: Optional message type to match
+
+        Returns:
+            List[AgentMessage]: Matching messages, newest first
+        """
+        if agent_id:
+            sent = reversed(self._by_sender.get(agent_id, ()))
+            received = reversed(self._by_recipient.get(agent_id, ()))
+            candidates = self._unique(
+                heapq.merge(sent, received, key=lambda e: e[0], reverse=True)
+            )
+            if message_type:
+                candidates = (
+                    e for e in candidates if e[1].message_type == message_type
+                )
+        elif message_type:
+            candidates = reversed(self._by_type.get(message_type, ()))
+        else:
+            candidates = reversed(self._messages)
+
+        return [message for _, message in itertools.islice(candidates, limit)]
+
+    def clear(self) -> None:
+        """Remove all messages."""
+        self._messages.clear()
+        self._by_sender.clear()
+        self._by_recipient.clear()
+        self._by_type.clear()
+
+    def __iter__(self):
+        """Iterate over retained messages, oldest first."""
+        return (message for _, message in self._messages)
+
+    @staticmethod
+    def _index(index: Dict[str, deque], key: str, entry: tuple) -> None:
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = deque()
+        bucket.append(entry)
+
+    @staticmethod
+    def _unindex(index: Dict[str, deque], key: str, entry: tuple) -> None:
+        bucket = index[key]
+        bucket.popleft()
+        if not bucket:
+            del index[key]
+
+    @staticmethod
+    def _unique(entries):
+        """Drop repeated entries (messages an agent sent to itself)."""
+        last = None
+        for entry in entries:
+            if entry[0] != last:
+                last = entry[0]
+                yield entry
+
+
+class NotionMessageSink:
+    """Background sink that persists messages to Notion in batches.
+
+    Messages are put on a bounded queue and written by a worker task, up to
+    batch_size at a time, each write waiting on the process-wide Notion rate
+    limiter it shares with the Notion write queue. When the queue is full the
+    message is dropped and counted rather than slowing down publishers.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[AgentMessage], Awaitable[None]],
+        batch_size: int = 20,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        rate_limiter: Optional[GCRARateLimiter] = None,
+    ):
+        """Initialize the sink.
+
+        Args:
+            write: Coroutine function that stores a single message
+            batch_size: Maximum number of messages written concurrently
+            flush_interval: Seconds to wait for a batch to fill up
+            max_queue_size: Maximum number of messages waiting to be written
+            rate_limiter: Limiter awaited before each write (default: the
+                shared "notion" limiter at NOTION_REQUESTS_PER_SECOND)
+        """
+        if rate_limiter is None:
+            requests_per_second = float(
+                os.environ.get("NOTION_REQUESTS_PER_SECOND", "3.0")
+            )
+            rate_limiter = get_rate_limiter(
+                "notion",
+                rate=requests_per_second,
+                burst=max(1, int(requests_per_second)),
+            )
+        self.write = write
+        self.rate_limiter = rate_limiter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.dropped = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be written."""
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(self, message: AgentMessage) -> None:
+        """Queue a message for persistence without waiting.
+
+        Args:
+            message: The message to persist
+        """
+        if self._task is None or self._task.done():
+            self._queue = self._queue or asyncio.Queue(maxsize=self.max_queue_size)
+            self._task = asyncio.create_task(self._run())
+
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(
+                f"Notion message sink full, dropped message {message.message_id}"
+            )
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been written."""
+        if self._queue is not None and self._task and not self._task.done():
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Write remaining messages and stop the worker task.
+
+        The sink can be used again afterwards, also from another event loop.
+        """
+        await self.flush()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._queue = None
+
+    async def _run(self) -> None:
+        """Collect messages into batches and write them."""
+        while True:
+            batch = [await self._queue.get()]
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            results = await asyncio.gather(
+                *(self._write_limited(message) for message in batch),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to store message in Notion: {result}")
+                self._queue.task_done()
+
+    async def _write_limited(self, message: AgentMessage) -> None:
+        await self.rate_limiter.acquire()
+        await self.write(message)
+
+
 class MessageBus:
     """Simple message bus for agent communication.
 
@@ -96,21 +332,31 @@ class MessageBus:
     Features:
     - Asynchronous publish-subscribe messaging
     - Request-response pattern with timeout
-    - Message history tracking
-    - Notion integration for persistent message storage
+    - Bounded, indexed message history
+    - Background Notion persistence that never delays delivery
     - Error handling for delivery failures
     """
 
-    def __init__(self, notion_service=None):
+    def __init__(
+        self,
+        notion_service=None,
+        history_size: int = 10000,
+        notion_batch_size: int = 20,
+    ):
         """Initialize the message bus.
 
         Args:
             notion_service: Optional NotionService instance for message persistence.
                 If provided, all messages will be stored in Notion.
+            history_size: Maximum number of messages kept in memory
+            notion_batch_size: Maximum number of messages written to Notion at once
         """
         self.subscribers: Dict[str, List[MessageCallback]] = defaultdict(list)
-        self.message_history: List[AgentMessage] = []
+        self.message_history = MessageHistory(max_size=history_size)
         self.notion_service = notion_service
+        self.notion_sink = NotionMessageSink(
+            self.store_in_notion, batch_size=notion_batch_size
+        )
         self.active_topics: Set[str] = set()
 
         # Initialize logger
@@ -122,8 +368,8 @@ class MessageBus:
 
         Sends a message to the appropriate subscribers based on the recipient.
         If the message is addressed to "broadcast", it will be sent to all
-        subscribers. The message is also stored in the message history and
-        optionally in Notion for traceability.
+        subscribers. The message is also stored in the message history and,
+        if Notion is configured, queued for background storage in Notion.
 
         Args:
             message: The message to publish containing sender, recipient,
@@ -140,13 +386,9 @@ class MessageBus:
             f"Message published: {message.message_type} from {message.sender} to {message.recipient}"
         )
 
-        # Store in Notion for traceability if notion_service is available
+        # Queue for Notion storage; delivery does not wait for it
         if self.notion_service:
-            try:
-                await self.store_in_notion(message)
-            except Exception as e:
-                self.logger.error(f"Failed to store message in Notion: {e}")
-                # Continue with delivery even if Notion storage fails
+            self.notion_sink.submit(message)
 
         # Deliver to specific recipient
         if message.recipient in self.subscribers:
@@ -273,9 +515,9 @@ class MessageBus:
     ) -> List[AgentMessage]:
         """Get recent message history with optional filtering.
 
-        Retrieves recent messages from the in-memory history, with options
-        to filter by agent ID and/or message type. Returns the most recent
-        messages first, up to the specified limit.
+        Retrieves recent messages from the bounded in-memory history, with
+        options to filter by agent ID and/or message type. Returns the most
+        recent messages first, up to the specified limit.
 
         Args:
             limit: Maximum number of messages to return
@@ -285,20 +527,13 @@ class MessageBus:
         Returns:
             List[AgentMessage]: List of matching messages, newest first
         """
-        # Start with complete message history
-        messages = self.message_history
-
-        # Apply filters if provided
-        if agent_id:
-            messages = [
-                m for m in messages if m.sender == agent_id or m.recipient == agent_id
-            ]
-
-        if message_type:
-            messages = [m for m in messages if m.message_type == message_type]
+        return self.message_history.query(
+            limit=limit, agent_id=agent_id, message_type=message_type
+        )
 
-        # Return the most recent messages up to the limit
-        return self.message_history[-limit:]
+    async def close(self) -> None:
+        """Write messages still queued for Notion and stop the sink."""
+        await self.notion_sink.close()
 
     async def request_response(
         self,
@@ -0,0 +1,508 @@
+"""
+Rate Limiters for The HigherSelf Network Server.
+
+SlidingWindowRateLimiter checks and records a call against one or more quotas
+(for example per-agent and per-tool) in a single atomic step. With Redis, each
+check is one EVALSHA round trip over sorted sets, so limits hold across
+workers; without Redis the same windows are kept in process memory.
+
+Usage example:
+    limiter = SlidingWindowRateLimiter(prefix="mcp_ratelimit")
+
+    result = await limiter.hit(
+        RateQuota(key="perplexity:agent:grace", limit=10),
+        RateQuota(key="perplexity:tool", limit=100),
+    )
+    if not result.allowed:
+        return {"error": "Rate limit exceeded", "retry_after": result.retry_after}
+
+GCRARateLimiter paces outbound calls to an integration instead: acquire()
+waits for the caller's turn rather than rejecting it.
+
+    limiter = get_rate_limiter("woocommerce", rate=5, burst=10)
+    await limiter.acquire()
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+
+
+class RateQuota(BaseModel):
+    """A limit of `limit` calls per `window` seconds for one key."""
+
+    key: str
+    limit: int
+    window: float = 60.0
+
+
+class RateLimitResult(BaseModel):
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+
+class SlidingWindowRateLimiter:
+    """
+    Sliding window rate limiter over one or more quotas.
+
+    A call is allowed only if every quota has room for it, in which case it is
+    recorded against all of them. Denied calls are not recorded. The result
+    reports the tightest quota's limit and remaining calls, and how long to wait
+    before the call would be allowed.
+
+    If Redis is unreachable or a check fails, calls are checked against the
+    local windows and Redis is tried again after redis_retry_interval seconds.
+    """
+
+    # KEYS: one sorted set per quota
+    # ARGV: cost, member, then limit and window (ms) for each quota
+    HIT_SCRIPT = """
+redis.replicate_commands()
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local cost = tonumber(ARGV[1])
+local member = ARGV[2]
+local retry_after = 0
+local limit = -1
+local remaining = -1
+
+for i, key in ipairs(KEYS) do
+    local quota_limit = tonumber(ARGV[1 + i * 2])
+    local window = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    if count + cost > quota_limit then
+        local wait = window
+        local index = count + cost - quota_limit - 1
+        if index < count then
+            local oldest = redis.call('ZRANGE', key, index, index, 'WITHSCORES')
+            wait = tonumber(oldest[2]) + window - now
+        end
+        retry_after = math.max(retry_after, wait)
+    end
+    if remaining < 0 or quota_limit - count < remaining then
+        remaining = quota_limit - count
+        limit = quota_limit
+    end
+end
+
+if retry_after > 0 then
+    return {0, limit, remaining, retry_after}
+end
+
+for i, key in ipairs(KEYS) do
+    for n = 1, cost do
+        redis.call('ZADD', key, now, member .. ':' .. n)
+    end
+    redis.call('PEXPIRE', key, ARGV[2 + i * 2])
+end
+return {1, limit, remaining - cost, 0}
+"""
+
+    def __init__(
+        self,
+        prefix: str = "ratelimit",
+        redis_client: Any = None,
+        use_redis: bool = True,
+        redis_retry_interval: float = 30.0,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            prefix: Prefix for all Redis keys
+            redis_client: Async Redis client (default: the shared redis_service client)
+            use_redis: Whether to share windows through Redis
+            redis_retry_interval: Seconds to use local windows after a Redis failure
+        """
+        self.prefix = prefix
+        self.use_redis = use_redis
+        self.redis_retry_interval = redis_retry_interval
+        self._redis = redis_client
+        self._hit_script = None
+        self._redis_retry_at = 0.0
+        self._windows: Dict[str, Tuple[float, Deque[float]]] = {}
+        self._swept_at = time.monotonic()
+
+    async def _get_script(self):
+        """Get the registered hit script, or None if Redis is unavailable."""
+        if not self.use_redis or time.monotonic() < self._redis_retry_at:
+            return None
+
+        if self._hit_script is None:
+            try:
+                if self._redis is None:
+                    from services.redis_service import redis_service
+
+                    self._redis = await redis_service.get_async_client()
+                self._hit_script = self._redis.register_script(self.HIT_SCRIPT)
+            except Exception as e:
+                logger.warning(f"Redis unavailable, rate limits are per process: {e}")
+                self._redis_unavailable()
+                return None
+
+        return self._hit_script
+
+    async def hit(self, *quotas: RateQuota, cost: int = 1) -> RateLimitResult:
+        """
+        Check quotas and record the call if all of them allow it.
+
+        Args:
+            *quotas: Quotas the call counts against
+            cost: Number of calls to record
+
+        Returns:
+            RateLimitResult for the tightest quota
+        """
+        script = await self._get_script()
+        if script is not None:
+            args: List[Any] = [cost, uuid.uuid4().hex]
+            for quota in quotas:
+                args.extend([quota.limit, int(quota.window * 1000)])
+
+            try:
+                allowed, limit, remaining, retry_after = await script(
+                    keys=[f"{self.prefix}:{quota.key}" for quota in quotas], args=args
+                )
+                return RateLimitResult(
+                    allowed=bool(allowed),
+                    limit=int(limit),
+                    remaining=max(0, int(remaining)),
+                    retry_after=int(retry_after) / 1000,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Redis rate limit check failed, using local window: {e}"
+                )
+                self._redis_unavailable()
+
+        return self._hit_local(quotas, cost)
+
+    def _redis_unavailable(self) -> None:
+        """Use local windows until the retry interval has passed."""
+        self._hit_script = None
+        self._redis_retry_at = time.monotonic() + self.redis_retry_interval
+
+    def _hit_local(self, quotas: Tuple[RateQuota, ...], cost: int) -> RateLimitResult:
+        now = time.monotonic()
+        self._sweep(now)
+        retry_after = 0.0
+        tightest: Optional[Tuple[int, int]] = None
+
+        for quota in quotas:
+            _, window = self._windows.setdefault(quota.key, (quota.window, deque()))
+            while window and window[0] <= now - quota.window:
+                window.popleft()
+
+            count = len(window)
+            if count + cost > quota.limit:
+                index = count + cost - quota.limit - 1
+                wait = (
+                    window[index] + quota.window - now
+                    if index < count
+                    else quota.window
+                )
+                retry_after = max(retry_after, wait)
+            if tightest is None or quota.limit - count < tightest[1]:
+                tightest = (quota.limit, quota.limit - count)
+
+        limit, remaining = tightest
+        if retry_after > 0:
+            return RateLimitResult(
+                allowed=False,
+                limit=limit,
+                remaining=max(0, remaining),
+                retry_after=retry_after,
+            )
+
+        for quota in quotas:
+            self._windows[quota.key][1].extend([now] * cost)
+        return RateLimitResult(
+            allowed=True, limit=limit, remaining=max(0, remaining - cost)
+        )
+
+    def _sweep(self, now: float, interval: float = 60.0) -> None:
+        """Drop local windows with no calls left in them."""
+        if now - self._swept_at < interval:
+            return
+
+        self._swept_at = now
+        self._windows = {
+            key: (length, window)
+            for key, (length, window) in self._windows.items()
+            if window and window[-1] > now - length
+        }
+
+
+class GCRARateLimiter:
+    """
+    Rate limiter that paces callers with the generic cell rate algorithm.
+
+    The only state is the theoretical arrival time (TAT) of the next call, so
+    acquire() is O(1). Each call reserves its slot before sleeping, which
+    makes waiters run in arrival order without holding a lock while they
+    wait. A waiter that is cancelled gives its slot back if no later call has
+    reserved after it.
+
+    Allows `rate` calls per second on average, with bursts of up to `burst`
+    calls. With shared=True the TAT is kept in Redis, so every worker draws
+    from the same budget.
+    """
+
+    # KEYS: TAT key
+    # ARGV: interval (us), tolerance (us), cost, reserve (1 = take a slot even
+    # if the caller has to wait for it)
+    # Returns: allowed, wait (us), new TAT (us, as a string)
+    RESERVE_SCRIPT = """
+redis.replicate_commands()
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local wait = tat + (cost - 1) * interval - tolerance - now
+if wait > 0 and ARGV[4] ~= '1' then
+    return {0, wait, ''}
+end
+
+local new_tat = string.format('%.0f', tat + cost * interval)
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil((tat + cost * interval - now) / 1000) + 1)
+return {1, math.max(wait, 0), new_tat}
+"""
+
+    # KEYS: TAT key; ARGV: TAT set by the reservation (us), its length (us)
+    REFUND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    local tat = string.format('%.0f', tonumber(ARGV[1]) - tonumber(ARGV[2]))
+    redis.call('SET', KEYS[1], tat, 'KEEPTTL')
+    return 1
+end
+return 0
+"""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int = 1,
+        shared: bool = False,
+        prefix: str = "ratelimit:gcra",
+        redis_client: Any = None,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            name: Limiter name, used as the Redis key and in logs
+            rate: Average calls allowed per second
+            burst: Calls allowed back to back before pacing starts
+            shared: Whether to share the budget across workers through Redis
+            prefix: Prefix for the Redis key
+            redis_client: Async Redis client (default: the shared redis_service client)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.shared = shared
+        self.key = f"{prefix}:{name}"
+        self.interval = 1.0 / rate
+        self.tolerance = (self.burst - 1) * self.interval
+        self._redis = redis_client
+        self._scripts = None
+        self._tat = 0.0
+        self._metrics = {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "denied": 0}
+
+    async def _get_scripts(self):
+        """Get the registered scripts, or None if not shared or Redis is unavailable."""
+        if not self.shared:
+            return None
+
+        if self._scripts is None:
+            try:
+                if self._redis is None:
+                    from services.redis_service import redis_service
+
+                    self._redis = await redis_service.get_async_client()
+                self._scripts = (
+                    self._redis.register_script(self.RESERVE_SCRIPT),
+                    self._redis.register_script(self.REFUND_SCRIPT),
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Redis unavailable, {self.name} rate limit is per process: {e}"
+                )
+                self.shared = False
+                return None
+
+        return self._scripts
+
+    def _reserve_local(self, cost: int, reserve: bool) -> Tuple[bool, float, Any]:
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        wait = tat + (cost - 1) * self.interval - self.tolerance - now
+        if wait > 0 and not reserve:
+            return False, wait, None
+        self._tat = tat + cost * self.interval
+        return True, max(0.0, wait), self._tat
+
+    async def _reserve(self, cost: int, reserve: bool) -> Tuple[bool, float, Any]:
+        """
+        Take a slot for `cost` calls.
+
+        Returns:
+            Whether the slot was taken, seconds until it starts, and the TAT
+            the reservation set (needed to refund it)
+        """
+        scripts = await self._get_scripts()
+        if scripts is not None:
+            interval = int(self.interval * 1_000_000)
+            try:
+                allowed, wait, tat = await scripts[0](
+                    keys=[self.key],
+                    args=[
+                        interval,
+                        int(self.tolerance * 1_000_000),
+                        cost,
+                        int(reserve),
+                    ],
+                )
+                return bool(allowed), int(wait) / 1_000_000, tat
+            except Exception as e:
+                logger.warning(
+                    f"Redis rate limit for {self.name} failed, using local pacing: {e}"
+                )
+
+        return self._reserve_local(cost, reserve)
+
+    async def _refund(self, cost: int, tat: Any) -> None:
+        """Give back a reservation if no later one was made after it."""
+        if isinstance(tat, float):
+            # Reserved locally
+            if self._tat == tat:
+                self._tat -= cost * self.interval
+            return
+        try:
+            await self._scripts[1](
+                keys=[self.key], args=[tat, int(self.interval * 1_000_000) * cost]
+            )
+        except Exception as e:
+            logger.debug(f"Could not refund {self.name} rate limit slot: {e}")
+
+    async def acquire(self, cost: int = 1) -> float:
+        """
+        Wait until `cost` calls are allowed and record them.
+
+        Args:
+            cost: Number of calls to record
+
+        Returns:
+            Seconds spent waiting
+        """
+        _, wait, tat = await self._reserve(cost, reserve=True)
+        self._metrics["acquired"] += cost
+        if wait <= 0:
+            return 0.0
+
+        self._metrics["waited"] += 1
+        self._metrics["wait_seconds"] += wait
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._metrics["acquired"] -= cost
+            await asyncio.shield(self._refund(cost, tat))
+            raise
+        return wait
+
+    async def try_acquire(self, cost: int = 1) -> RateLimitResult:
+        """
+        Record `cost` calls if they are allowed now, without waiting.
+
+        Args:
+            cost: Number of calls to record
+
+        Returns:
+            RateLimitResult; retry_after is how long until the calls would be
+            allowed
+        """
+        allowed, wait, _ = await self._reserve(cost, reserve=False)
+        if not allowed:
+            self._metrics["denied"] += 1
+            return RateLimitResult(
+                allowed=False, limit=self.burst, remaining=0, retry_after=wait
+            )
+
+        self._metrics["acquired"] += cost
+        remaining = 0
+        if not self.shared:
+            # Calls that would still fit in the current burst
+            backlog = self._tat - time.monotonic()
+            remaining = int((self.tolerance - backlog) / self.interval) + 1
+        return RateLimitResult(
+            allowed=True, limit=self.burst, remaining=max(0, remaining)
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get limiter configuration and counters."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "shared": self.shared,
+            **self._metrics,
+        }
+
+
+_gcra_limiters: Dict[str, GCRARateLimiter] = {}
+
+
+def get_rate_limiter(name: str, rate: float, burst: int = 1) -> GCRARateLimiter:
+    """
+    Get the process-wide GCRA rate limiter for an integration.
+
+    Environment variables, read on first creation:
+        RATE_LIMIT_<NAME>_PER_SECOND: Overrides rate
+        RATE_LIMIT_<NAME>_BURST: Overrides burst
+        RATE_LIMIT_<NAME>_SHARED: Share the budget across workers through Redis
+            (default: RATE_LIMIT_SHARED, which defaults to false)
+
+    Args:
+        name: Integration name
+        rate: Default average calls per second
+        burst: Default burst size
+
+    Returns:
+        The integration's limiter
+    """
+    if name not in _gcra_limiters:
+        env = f"RATE_LIMIT_{name.upper()}"
+        shared = os.environ.get(
+            f"{env}_SHARED", os.environ.get("RATE_LIMIT_SHARED", "false")
+        )
+        _gcra_limiters[name] = GCRARateLimiter(
+            name,
+            rate=float(os.environ.get(f"{env}_PER_SECOND", rate)),
+            burst=int(os.environ.get(f"{env}_BURST", burst)),
+            shared=shared.lower() == "true",
+        )
+    return _gcra_limiters[name]
+
+
+def get_all_rate_limiters() -> Dict[str, GCRARateLimiter]:
+    """Get every integration's GCRA rate limiter."""
+    return dict(_gcra_limiters)
@@ -0,0 +1,475 @@
+"""
+Compiled condition evaluation for the Advanced Agentic Workflow Engine.
+
+Transition conditions are stored as dictionaries (and routing rules as
+strings) so they can round-trip through Notion. Parsing them on every
+evaluation is wasteful, so this module compiles them once into closures with
+pre-split field paths and operator functions looked up from tables. Compiled
+predicates take the instance context data and short-circuit like the
+interpreted versions in workflow.transitions.
+"""
+
+import json
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from loguru import logger
+
+from workflow.transitions import ConditionGroup, ConditionOperator, TransitionCondition
+
+# A compiled condition: context data -> satisfied
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _always_true(context_data: Dict[str, Any]) -> bool:
+    return True
+
+
+def _always_false(context_data: Dict[str, Any]) -> bool:
+    return False
+
+
+@lru_cache(maxsize=1024)
+def compile_field_getter(field_path: str) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Compile a dot-notation field path into a getter.
+
+    Missing keys and non-dict intermediates resolve to None.
+
+    Args:
+        field_path: Path to the field, e.g. "lead.score"
+
+    Returns:
+        Function returning the field value from a context dictionary
+    """
+    parts = tuple(field_path.split("."))
+
+    if len(parts) == 1:
+        key = parts[0]
+
+        def get_single(data: Dict[str, Any]) -> Any:
+            return data.get(key) if isinstance(data, dict) else None
+
+        return get_single
+
+    def get_nested(data: Dict[str, Any]) -> Any:
+        current = data
+        for part in parts:
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            else:
+                return None
+        return current
+
+    return get_nested
+
+
+def _guard_none(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    """Wrap an ordering comparison so a missing value never satisfies it."""
+
+    def guarded(actual: Any, expected: Any) -> bool:
+        return compare(actual, expected) if actual is not None else False
+
+    return guarded
+
+
+def _contains(actual: Any, expected: Any) -> bool:
+    if isinstance(actual, (list, tuple, set, str, dict)):
+        return expected in actual
+    return False
+
+
+def _not_contains(actual: Any, expected: Any) -> bool:
+    if isinstance(actual, (list, tuple, set, str, dict)):
+        return expected not in actual
+    return True
+
+
+# Operator table for TransitionCondition (mirrors TransitionCondition.is_satisfied)
+CONDITION_OPERATORS: Dict[ConditionOperator, Callable[[Any, Any], bool]] = {
+    ConditionOperator.EQUALS: operator.eq,
+    ConditionOperator.NOT_EQUALS: operator.ne,
+    ConditionOperator.GREATER_THAN: _guard_none(operator.gt),
+    ConditionOperator.LESS_THAN: _guard_none(operator.lt),
+    ConditionOperator.CONTAINS: _contains,
+    ConditionOperator.NOT_CONTAINS: _not_contains,
+    ConditionOperator.EXISTS: lambda actual, expected: actual is not None,
+    ConditionOperator.NOT_EXISTS: lambda actual, expected: actual is None,
+}
+
+# Operator table for conditional routing strings (mirrors StateTransition._compare_values)
+ROUTING_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": _guard_none(operator.gt),
+    "<": _guard_none(operator.lt),
+    ">=": _guard_none(operator.ge),
+    "<=": _guard_none(operator.le),
+    "in": lambda actual, expected: (
+        actual in expected if expected is not None else False
+    ),
+    "not_in": lambda actual, expected: (
+        actual not in expected if expected is not None else True
+    ),
+    "contains": lambda actual, expected: (
+        expected in actual if actual is not None else False
+    ),
+    "not_contains": lambda actual, expected: (
+        expected not in actual if actual is not None else True
+    ),
+}
+
+# Operator table for WorkflowEngine conditions (mirrors ConditionEvaluator)
+ENGINE_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": _guard_none(operator.gt),
+    "lt": _guard_none(operator.lt),
+    "gte": _guard_none(operator.ge),
+    "lte": _guard_none(operator.le),
+    "in": ROUTING_OPERATORS["in"],
+    "not_in": ROUTING_OPERATORS["not_in"],
+    "contains": ROUTING_OPERATORS["contains"],
+    "starts_with": lambda actual, expected: (
+        actual.startswith(expected) if isinstance(actual, str) else False
+    ),
+    "ends_with": lambda actual, expected: (
+        actual.endswith(expected) if isinstance(actual, str) else False
+    ),
+    "exists": lambda actual, expected: actual is not None,
+    "not_exists": lambda actual, expected: actual is None,
+}
+
+
+def _safe(predicate: Predicate, label: str) -> Predicate:
+    """Treat evaluation errors (e.g. comparing incompatible types) as unsatisfied."""
+
+    def evaluate(context_data: Dict[str, Any]) -> bool:
+        try:
+            return predicate(context_data)
+        except Exception as e:
+            logger.error(f"Error evaluating {label}: {e}")
+            return False
+
+    return evaluate
+
+
+def _compile_regex(get: Callable, pattern: Any, case_sensitive: bool) -> Predicate:
+    """Compile a REGEX_MATCH condition, precompiling the pattern."""
+    if not isinstance(pattern, str):
+        return _always_false
+
+    if not case_sensitive:
+        pattern = pattern.lower()
+
+    try:
+        regex = re.compile(pattern)
+    except re.error:
+        return _always_false
+
+    def match(context_data: Dict[str, Any]) -> bool:
+        value = get(context_data)
+        if not isinstance(value, str):
+            return False
+        if not case_sensitive:
+            value = value.lower()
+        return regex.match(value) is not None
+
+    return match
+
+
+def compile_condition(
+    condition: Union[TransitionCondition, Dict[str, Any]]
+) -> Predicate:
+    """
+    Compile a transition condition into a predicate.
+
+    Args:
+        condition: TransitionCondition or its stored dictionary form
+
+    Returns:
+        Predicate over the instance context data
+    """
+    if isinstance(condition, dict):
+        condition = TransitionCondition.from_dict(condition)
+
+    get = compile_field_getter(condition.field_path)
+    expected = condition.expected_value
+
+    if condition.operator == ConditionOperator.REGEX_MATCH:
+        return _compile_regex(get, expected, condition.case_sensitive)
+
+    compare = CONDITION_OPERATORS[condition.operator]
+
+    if isinstance(expected, str) and not condition.case_sensitive:
+        expected_lower = expected.lower()
+
+        def evaluate_case_insensitive(context_data: Dict[str, Any]) -> bool:
+            value = get(context_data)
+            if isinstance(value, str):
+                return compare(value.lower(), expected_lower)
+            return compare(value, expected)
+
+        return _safe(evaluate_case_insensitive, f"condition '{condition.name}'")
+
+    def evaluate(context_data: Dict[str, Any]) -> bool:
+        return compare(get(context_data), expected)
+
+    return _safe(evaluate, f"condition '{condition.name}'")
+
+
+def compile_all(predicates: Sequence[Predicate]) -> Predicate:
+    """Combine predicates with short-circuiting AND."""
+    predicates = tuple(predicates)
+
+    if not predicates:
+        return _always_true
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def evaluate_all(context_data: Dict[str, Any]) -> bool:
+        for predicate in predicates:
+            if not predicate(context_data):
+                return False
+        return True
+
+    return evaluate_all
+
+
+def compile_any(predicates: Sequence[Predicate]) -> Predicate:
+    """Combine predicates with short-circuiting OR."""
+    predicates = tuple(predicates)
+
+    if not predicates:
+        return _always_true
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def evaluate_any(context_data: Dict[str, Any]) -> bool:
+        for predicate in predicates:
+            if predicate(context_data):
+                return True
+        return False
+
+    return evaluate_any
+
+
+def compile_condition_group(group: Union[ConditionGroup, Dict[str, Any]]) -> Predicate:
+    """
+    Compile a condition group into a predicate.
+
+    Args:
+        group: ConditionGroup or its stored dictionary form
+
+    Returns:
+        Predicate over the instance context data
+    """
+    if isinstance(group, dict):
+        group = ConditionGroup.from_dict(group)
+
+    predicates = [compile_condition(c) for c in group.conditions]
+
+    if group.operator == "AND":
+        return compile_all(predicates)
+    return compile_any(predicates)
+
+
+def parse_condition_string(condition_str: str) -> Tuple[str, str, Any]:
+    """
+    Parse a routing condition string into field path, operator and expected value.
+
+    The format is "<field_path> <operator> <value>", e.g. "lead.score >= 80".
+
+    Args:
+        condition_str: Routing condition
+
+    Returns:
+        Tuple of (field_path, operator, expected_value)
+    """
+    parts = condition_str.split()
+    if len(parts) < 3:
+        raise ValueError(f"Invalid condition format: {condition_str}")
+
+    field_path = parts[0]
+    operator_name = parts[1]
+    # Join the rest as the expected value
+    expected_value: Any = " ".join(parts[2:])
+
+    # Convert expected value to the appropriate type
+    if expected_value.lower() == "true":
+        expected_value = True
+    elif expected_value.lower() == "false":
+        expected_value = False
+    elif expected_value.isdigit():
+        expected_value = int(expected_value)
+    elif expected_value.replace(".", "", 1).isdigit():
+        expected_value = float(expected_value)
+
+    return field_path, operator_name, expected_value
+
+
+@lru_cache(maxsize=1024)
+def compile_routing_condition(condition_str: str) -> Predicate:
+    """
+    Compile a conditional routing string into a predicate.
+
+    Args:
+        condition_str: Routing condition, e.g. "lead.score >= 80"
+
+    Returns:
+        Predicate over the instance context data
+    """
+    field_path, operator_name, expected = parse_condition_string(condition_str)
+
+    compare = ROUTING_OPERATORS.get(operator_name)
+    if compare is None:
+        logger.warning(f"Unknown operator: {operator_name}")
+        return _always_false
+
+    get = compile_field_getter(field_path)
+
+    def evaluate(context_data: Dict[str, Any]) -> bool:
+        return compare(get(context_data), expected)
+
+    return _safe(evaluate, f"conditional routing '{condition_str}'")
+
+
+def compile_engine_condition(condition: Dict[str, Any]) -> Predicate:
+    """
+    Compile a WorkflowEngine condition ({"field", "operator", "value"}).
+
+    Compiled predicates are cached by the condition's canonical JSON form, so
+    the same condition is only compiled once per process.
+
+    Args:
+        condition: Condition definition
+
+    Returns:
+        Predicate over the context data
+    """
+    if not isinstance(condition, dict):
+        return _always_false
+
+    try:
+        key = json.dumps(condition, sort_keys=True)
+    except (TypeError, ValueError):
+        # Values that cannot be serialized are compiled without caching
+        return _compile_engine_condition(condition)
+
+    return _compile_engine_condition_cached(key)
+
+
+@lru_cache(maxsize=1024)
+def _compile_engine_condition_cached(key: str) -> Predicate:
+    return _compile_engine_condition(json.loads(key))
+
+
+def _compile_engine_condition(condition: Dict[str, Any]) -> Predicate:
+    field = condition.get("field")
+    compare = ENGINE_OPERATORS.get(condition.get("operator"))
+
+    if not field or compare is None:
+        return _always_false
+
+    get = compile_field_getter(field)
+    expected = condition.get("value")
+
+    def evaluate(context_data: Dict[str, Any]) -> bool:
+        if not context_data:
+            return compare(None, expected)
+        return compare(get(context_data), expected)
+
+    return _safe(evaluate, f"engine condition '{field}'")
+
+
+class CompiledTransition:
+    """
+    Compiled form of a StateTransition's conditions and conditional routing.
+
+    Attributes:
+        conditions: Predicate that is True when all conditions and groups hold
+        routes: Ordered (predicate, target_state) pairs for conditional routing
+    """
+
+    __slots__ = ("conditions", "routes", "has_conditions")
+
+    def __init__(
+        self,
+        conditions: Predicate,
+        routes: List[Tuple[Predicate, str]],
+        has_conditions: bool,
+    ):
+        self.conditions = conditions
+        self.routes = routes
+        self.has_conditions = has_conditions
+
+    def route(self, context_data: Dict[str, Any]) -> Optional[str]:
+        """Return the first matching routing target, or None."""
+        for predicate, target_state in self.routes:
+            if predicate(context_data):
+                return target_state
+        return None
+
+
+def compile_transition(
+    name: str,
+    conditions: Sequence[Union[Dict[str, Any], str]],
+    condition_groups: Sequence[Dict[str, Any]],
+    conditional_routing: Dict[str, str],
+) -> CompiledTransition:
+    """
+    Compile the conditions and routing rules of a transition.
+
+    Conditions that cannot be compiled (string references, malformed
+    dictionaries) are logged once here and evaluate to False, matching the
+    interpreted behavior.
+
+    Args:
+        name: Transition name, for log messages
+        conditions: Individual conditions
+        condition_groups: Condition groups
+        conditional_routing: Mapping of routing condition string to target state
+
+    Returns:
+        CompiledTransition
+    """
+    predicates: List[Predicate] = []
+
+    for condition in conditions:
+        if isinstance(condition, str):
+            logger.warning(
+                f"String condition reference '{condition}' in transition '{name}' "
+                "cannot be evaluated directly"
+            )
+            predicates.append(_always_false)
+            continue
+
+        try:
+            predicates.append(compile_condition(condition))
+        except Exception as e:
+            logger.error(f"Error compiling condition for transition '{name}': {e}")
+            predicates.append(_always_false)
+
+    for group in condition_groups:
+        try:
+            predicates.append(compile_condition_group(group))
+        except Exception as e:
+            logger.error(
+                f"Error compiling condition group for transition '{name}': {e}"
+            )
+            predicates.append(_always_false)
+
+    routes: List[Tuple[Predicate, str]] = []
+    for condition_str, target_state in conditional_routing.items():
+        try:
+            routes.append((compile_routing_condition(condition_str), target_state))
+        except Exception as e:
+            logger.error(f"Error compiling conditional routing '{condition_str}': {e}")
+
+    return CompiledTransition(
+        conditions=compile_all(predicates),
+        routes=routes,
+        has_conditions=bool(predicates),
+    )
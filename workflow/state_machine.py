@@ -2,8 +2,9 @@
 State Machine implementation for the Advanced Agentic Workflow Engine.
 
 This module provides a LangGraph-inspired state machine for orchestrating
-complex workflows between specialized agents. All state data is persisted
-in Notion databases, maintaining it as the central hub for all workflow data.
+complex workflows between specialized agents. Instance state lives in a
+durable state store shared by all workers and is mirrored to Notion
+asynchronously, keeping Notion the central hub for all workflow data.
 """
 
 import asyncio
@@ -27,11 +28,24 @@ from typing import (
 )
 
 from loguru import logger
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 from knowledge import SemanticSearch, get_semantic_search
 from models.notion_db_models import WorkflowInstance
 from services.notion_service import NotionService
+from workflow.compiled_conditions import (
+    ROUTING_OPERATORS,
+    CompiledTransition,
+    compile_transition,
+    parse_condition_string,
+)
+from workflow.state_store import (
+    NotionMirror,
+    WorkflowStateRecord,
+    WorkflowStateStore,
+    WorkflowVersionConflict,
+    get_state_store,
+)
 from workflow.transitions import ConditionGroup, TransitionCondition, TransitionTrigger
 
 # Type variable for state data
@@ -218,6 +232,26 @@ class StateTransition(BaseModel):
             "conditional_routing": self.conditional_routing,
         }
 
+    _compiled: Optional[CompiledTransition] = PrivateAttr(default=None)
+
+    def compile(self) -> CompiledTransition:
+        """
+        Compile the conditions and conditional routing of this transition.
+
+        The result is cached, so conditions are parsed only once per transition.
+
+        Returns:
+            CompiledTransition
+        """
+        if self._compiled is None:
+            self._compiled = compile_transition(
+                self.name,
+                self.conditions,
+                self.condition_groups,
+                self.conditional_routing,
+            )
+        return self._compiled
+
     async def evaluate_conditions(
         self, instance: WorkflowInstance, condition_evaluator: Optional[Callable] = None
     ) -> bool:
@@ -239,48 +273,8 @@ class StateTransition(BaseModel):
             # Use custom evaluator if provided
             return await condition_evaluator(self, instance)
 
-        # Default condition evaluation
-        context_data = instance.context_data
-
-        # Process individual conditions
-        condition_results = []
-        for condition in self.conditions:
-            if isinstance(condition, str):
-                # String reference to condition - would need to be looked up
-                # For now, just log that we can't evaluate it
-                logger.warning(
-                    f"String condition reference '{condition}' cannot be evaluated directly"
-                )
-                condition_results.append(False)
-            elif isinstance(condition, dict):
-                # Convert dict to TransitionCondition
-                try:
-                    from workflow.transitions import TransitionCondition
-
-                    cond = TransitionCondition.from_dict(condition)
-                    condition_results.append(cond.is_satisfied(context_data))
-                except Exception as e:
-                    logger.error(f"Error evaluating condition: {e}")
-                    condition_results.append(False)
-
-        # Process condition groups
-        group_results = []
-        for group in self.condition_groups:
-            try:
-                from workflow.transitions import ConditionGroup
-
-                group_obj = ConditionGroup.from_dict(group)
-                group_results.append(group_obj.is_satisfied(context_data))
-            except Exception as e:
-                logger.error(f"Error evaluating condition group: {e}")
-                group_results.append(False)
-
-        # Both individual conditions and condition groups must be satisfied
-        # If either list is empty, its result is True
-        conditions_satisfied = all(condition_results) if condition_results else True
-        groups_satisfied = all(group_results) if group_results else True
-
-        return conditions_satisfied and groups_satisfied
+        # Individual conditions and condition groups must all be satisfied
+        return self.compile().conditions(instance.context_data)
 
     def get_dynamic_target_state(self, instance: WorkflowInstance) -> Optional[str]:
         """
@@ -295,55 +289,11 @@ class StateTransition(BaseModel):
         if not self.conditional_routing:
             return None
 
-        context_data = instance.context_data
-
-        # Try each condition in the conditional routing
-        for condition_str, target_state in self.conditional_routing.items():
-            try:
-                # Parse condition as a field path and expected value
-                field_path, operator, expected_value = self._parse_condition_string(
-                    condition_str
-                )
-
-                # Get the actual value
-                actual_value = self._get_field_value(context_data, field_path)
-
-                # Compare based on operator
-                if self._compare_values(actual_value, operator, expected_value):
-                    return target_state
-            except Exception as e:
-                logger.error(
-                    f"Error evaluating conditional routing '{condition_str}': {e}"
-                )
-
-        return None
+        return self.compile().route(instance.context_data)
 
     def _parse_condition_string(self, condition_str: str) -> Tuple[str, str, Any]:
         """Parse a condition string into field path, operator, and expected value."""
-        # Very simple parser - in production, use a more robust solution
-        parts = condition_str.split()
-        if len(parts) < 3:
-            raise ValueError(f"Invalid condition format: {condition_str}")
-
-        field_path = parts[0]
-        operator = parts[1]
-        # Join the rest as the expected value
-        expected_value = " ".join(parts[2:])
-
-        # Try to convert expected value to appropriate type
-        try:
-            if expected_value.lower() == "true":
-                expected_value = True
-            elif expected_value.lower() == "false":
-                expected_value = False
-            elif expected_value.isdigit():
-                expected_value = int(expected_value)
-            elif expected_value.replace(".", "", 1).isdigit():
-                expected_value = float(expected_value)
-        except:
-            pass
-
-        return field_path, operator, expected_value
+        return parse_condition_string(condition_str)
 
     def _get_field_value(self, data: Dict[str, Any], field_path: str) -> Any:
         """Get the value from a nested dictionary using dot notation."""
@@ -360,29 +310,11 @@ class StateTransition(BaseModel):
 
     def _compare_values(self, actual: Any, operator: str, expected: Any) -> bool:
         """Compare values based on operator."""
-        if operator == "==":
-            return actual == expected
-        elif operator == "!=":
-            return actual != expected
-        elif operator == ">":
-            return actual > expected if actual is not None else False
-        elif operator == "<":
-            return actual < expected if actual is not None else False
-        elif operator == ">=":
-            return actual >= expected if actual is not None else False
-        elif operator == "<=":
-            return actual <= expected if actual is not None else False
-        elif operator == "in":
-            return actual in expected if expected is not None else False
-        elif operator == "not_in":
-            return actual not in expected if expected is not None else True
-        elif operator == "contains":
-            return expected in actual if actual is not None else False
-        elif operator == "not_contains":
-            return expected not in actual if actual is not None else True
-        else:
+        compare = ROUTING_OPERATORS.get(operator)
+        if compare is None:
             logger.warning(f"Unknown operator: {operator}")
             return False
+        return compare(actual, expected)
 
 
 class WorkflowStateMachine:
@@ -400,6 +332,7 @@ class WorkflowStateMachine:
         transitions: List[StateTransition],
         initial_state: str,
         notion_service: Optional[NotionService] = None,
+        state_store: Optional[WorkflowStateStore] = None,
     ):
         """
         Initialize the workflow state machine.
@@ -412,6 +345,7 @@ class WorkflowStateMachine:
             transitions: List of state transitions
             initial_state: Name of the initial state
             notion_service: Optional NotionService instance or None to create from environment
+            state_store: Optional state store, defaults to the process-wide store
         """
         self.workflow_id = workflow_id
         self.name = name
@@ -421,9 +355,21 @@ class WorkflowStateMachine:
         self.initial_state = initial_state
         self._notion_service = notion_service
 
+        # The state store is the source of truth; Notion is an async mirror
+        self.state_store = state_store or get_state_store()
+        self.mirror = NotionMirror()
+        self.max_conflict_retries = 3
+
         # Validate the state machine structure
         self._validate()
 
+        # Index transitions by name and compile their conditions up front
+        self.transitions_by_name: Dict[str, StateTransition] = {
+            t.name: t for t in transitions
+        }
+        for transition in transitions:
+            transition.compile()
+
         # Track all running instances of this workflow
         self.active_instances: Dict[str, str] = {}  # instance_id -> current_state
 
@@ -453,9 +399,10 @@ class WorkflowStateMachine:
                 )
 
         # Check that all states have valid available transitions
+        transition_names = {t.name for t in self.transitions}
         for state_name, state in self.states.items():
             for transition_name in state.available_transitions:
-                if not any(t.name == transition_name for t in self.transitions):
+                if transition_name not in transition_names:
                     raise ValueError(
                         f"State '{state_name}' references unknown transition '{transition_name}'"
                     )
@@ -474,7 +421,7 @@ class WorkflowStateMachine:
         instance_id: Optional[str] = None,
     ) -> WorkflowInstance:
         """
-        Create a new instance of this workflow in Notion.
+        Create a new instance of this workflow in Notion and the state store.
 
         Args:
             business_entity_id: Associated business entity ID
@@ -506,6 +453,18 @@ class WorkflowStateMachine:
         instance_page_id = await notion_svc.create_page(instance)
         instance.page_id = instance_page_id
 
+        await self.state_store.save(
+            instance_id,
+            self.workflow_id,
+            instance.model_dump(mode="json"),
+            expected_version=0,
+            transition={
+                "to_state": self.initial_state,
+                "action": "created",
+                "timestamp": now.isoformat(),
+            },
+        )
+
         # Add to active instances
         self.active_instances[instance_id] = self.initial_state
 
@@ -514,16 +473,20 @@ class WorkflowStateMachine:
         )
         return instance
 
-    async def get_instance(self, instance_id: str) -> Optional[WorkflowInstance]:
+    async def _load_record(self, instance_id: str) -> Optional[WorkflowStateRecord]:
         """
-        Retrieve a workflow instance from Notion.
+        Load an instance from the state store, seeding it from Notion if missing.
 
         Args:
             instance_id: Workflow instance ID
 
         Returns:
-            WorkflowInstance if found, None otherwise
+            Stored record, or None if the instance is unknown
         """
+        record = await self.state_store.load(instance_id)
+        if record:
+            return record
+
         notion_svc = await self.notion_service
 
         # Query for the instance
@@ -535,16 +498,58 @@ class WorkflowStateMachine:
         results = await notion_svc.query_database(WorkflowInstance, filter_conditions)
 
         if not results:
+            return None
+
+        try:
+            await self.state_store.save(
+                instance_id,
+                self.workflow_id,
+                results[0].model_dump(mode="json"),
+                expected_version=0,
+            )
+        except WorkflowVersionConflict:
+            # Another worker seeded it first
+            pass
+
+        return await self.state_store.load(instance_id)
+
+    async def get_instance(self, instance_id: str) -> Optional[WorkflowInstance]:
+        """
+        Retrieve a workflow instance from the state store.
+
+        Instances not yet in the store are loaded from Notion once.
+
+        Args:
+            instance_id: Workflow instance ID
+
+        Returns:
+            WorkflowInstance if found, None otherwise
+        """
+        record = await self._load_record(instance_id)
+
+        if not record:
             self.logger.warning(f"Workflow instance {instance_id} not found")
             return None
 
-        instance = results[0]
+        instance = WorkflowInstance(**record.data)
 
         # Update active instances cache
         self.active_instances[instance_id] = instance.current_state
 
         return instance
 
+    async def get_transition_log(self, instance_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the append-only transition log of an instance.
+
+        Args:
+            instance_id: Workflow instance ID
+
+        Returns:
+            Transition log entries, oldest first
+        """
+        return await self.state_store.get_transition_log(instance_id)
+
     async def transition(
         self,
         instance_id: str,
@@ -554,7 +559,11 @@ class WorkflowStateMachine:
         transition_data: Dict[str, Any] = None,
     ) -> Tuple[bool, WorkflowInstance]:
         """
-        Transition a workflow instance to a new state in Notion.
+        Transition a workflow instance to a new state.
+
+        The state store is updated with optimistic concurrency; if another
+        worker changed the instance in between, the transition is re-validated
+        against the fresh state and retried. Notion is updated asynchronously.
 
         Args:
             instance_id: Workflow instance ID
@@ -566,13 +575,85 @@ class WorkflowStateMachine:
         Returns:
             Tuple of (success, updated instance)
         """
+        for attempt in range(self.max_conflict_retries + 1):
+            record = await self._load_record(instance_id)
+            if not record:
+                self.logger.warning(f"Workflow instance {instance_id} not found")
+                return False, None
+
+            instance = WorkflowInstance(**record.data)
+            result = self._apply_transition(
+                instance, transition_name, agent_id, action_description, transition_data
+            )
+            if result is None:
+                return False, instance
+
+            current_state_name, target_state = result
+            entry = {
+                "transition": transition_name,
+                "from_state": current_state_name,
+                "to_state": target_state.name,
+                "agent_id": agent_id,
+                "data": transition_data or {},
+                "timestamp": instance.last_transition_date.isoformat(),
+            }
+
+            try:
+                await self.state_store.save(
+                    instance_id,
+                    self.workflow_id,
+                    instance.model_dump(mode="json"),
+                    expected_version=record.version,
+                    transition=entry,
+                )
+                break
+            except WorkflowVersionConflict:
+                self.logger.info(
+                    f"Concurrent update of instance {instance_id}, retrying "
+                    f"(attempt {attempt + 1})"
+                )
+        else:
+            self.logger.error(
+                f"Failed to transition instance {instance_id}: too many concurrent updates"
+            )
+            return False, instance
+
+        # Mirror to Notion in the background
         notion_svc = await self.notion_service
+        self.mirror.submit(
+            lambda: notion_svc.update_page(instance),
+            f"instance {instance_id}",
+            key=instance_id,
+        )
+
+        # Update active instances cache
+        self.active_instances[instance_id] = target_state.name
 
-        # Get the instance
-        instance = await self.get_instance(instance_id)
-        if not instance:
-            return False, None
+        self.logger.info(
+            f"Transitioned instance {instance_id} from {current_state_name} to {target_state.name}"
+        )
 
+        # If terminal state, remove from active instances
+        if target_state.is_terminal:
+            self.active_instances.pop(instance_id, None)
+            self.logger.info(f"Workflow instance {instance_id} completed")
+
+        return True, instance
+
+    def _apply_transition(
+        self,
+        instance: WorkflowInstance,
+        transition_name: str,
+        agent_id: str,
+        action_description: Optional[str],
+        transition_data: Optional[Dict[str, Any]],
+    ) -> Optional[Tuple[str, WorkflowState]]:
+        """
+        Validate a transition and apply it to an instance in place.
+
+        Returns:
+            Tuple of (previous state name, target state), or None if invalid
+        """
         # Get current state
         current_state_name = instance.current_state
         current_state = self.states.get(current_state_name)
@@ -581,24 +662,22 @@ class WorkflowStateMachine:
             self.logger.error(
                 f"Current state '{current_state_name}' not found in workflow definition"
             )
-            return False, instance
+            return None
 
         # Check if transition is valid from current state
         if transition_name not in current_state.available_transitions:
             self.logger.error(
                 f"Transition '{transition_name}' not available from state '{current_state_name}'"
             )
-            return False, instance
+            return None
 
         # Find the transition
-        transition = next(
-            (t for t in self.transitions if t.name == transition_name), None
-        )
+        transition = self.transitions_by_name.get(transition_name)
         if not transition:
             self.logger.error(
                 f"Transition '{transition_name}' not found in workflow definition"
             )
-            return False, instance
+            return None
 
         # Get target state
         target_state = self.states.get(transition.to_state)
@@ -606,13 +685,12 @@ class WorkflowStateMachine:
             self.logger.error(
                 f"Target state '{transition.to_state}' not found in workflow definition"
             )
-            return False, instance
+            return None
 
         # Prepare the transition description
         if not action_description:
             action_description = f"Transitioned from {current_state_name} to {transition.to_state} via {transition_name}"
 
-        # Update the instance state in Notion
         instance.current_state = transition.to_state
         instance.last_transition_date = datetime.now()
         instance.add_history_entry(
@@ -628,25 +706,7 @@ class WorkflowStateMachine:
             for key, value in transition_data.items():
                 instance.context_data[key] = value
 
-        # Update in Notion
-        success = await notion_svc.update_page(instance)
-
-        if success:
-            # Update active instances cache
-            self.active_instances[instance_id] = transition.to_state
-
-            self.logger.info(
-                f"Transitioned instance {instance_id} from {current_state_name} to {transition.to_state}"
-            )
-
-            # If terminal state, remove from active instances
-            if target_state.is_terminal:
-                self.active_instances.pop(instance_id, None)
-                self.logger.info(f"Workflow instance {instance_id} completed")
-        else:
-            self.logger.error(f"Failed to transition instance {instance_id}")
-
-        return success, instance
+        return current_state_name, target_state
 
     async def get_active_instances(self) -> List[WorkflowInstance]:
         """
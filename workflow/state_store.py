@@ -0,0 +1,668 @@
+"""
+Durable workflow state store for the Advanced Agentic Workflow Engine.
+
+The state store is the source of truth for workflow instances. Every write
+carries the version the writer last read (optimistic concurrency), so several
+workers can share instances without overwriting each other's transitions, and
+every transition is appended to a per-instance log. Notion is updated
+asynchronously as a mirror through NotionMirror, so a transition completes as
+soon as the store accepts it.
+
+Backends:
+- InMemoryWorkflowStateStore: single-process, for development and tests
+- RedisWorkflowStateStore: Redis hashes and lists, updated atomically by Lua
+- SQLiteWorkflowStateStore: SQLite in WAL mode, for single-host deployments
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from utils.error_handling import WorkflowException
+
+
+class WorkflowVersionConflict(WorkflowException):
+    """Raised when an instance was modified since the writer last read it."""
+
+    def __init__(self, instance_id: str, expected_version: int):
+        super().__init__(
+            message=(
+                f"Workflow instance {instance_id} was modified concurrently "
+                f"(expected version {expected_version})"
+            ),
+            workflow_name="state_store",
+            workflow_id=instance_id,
+            details={"expected_version": expected_version},
+        )
+        self.instance_id = instance_id
+        self.expected_version = expected_version
+
+
+class WorkflowStateRecord(BaseModel):
+    """A stored workflow instance and its version."""
+
+    instance_id: str
+    workflow_id: str
+    version: int
+    data: Dict[str, Any]
+    updated_at: float = Field(default_factory=time.time)
+
+
+class WorkflowStateStore(ABC):
+    """
+    Abstract base class for workflow state stores.
+
+    Versions start at 1 when an instance is created. Saving with
+    expected_version=0 creates the instance and fails if it already exists.
+    """
+
+    @abstractmethod
+    async def load(self, instance_id: str) -> Optional[WorkflowStateRecord]:
+        """
+        Load a workflow instance.
+
+        Args:
+            instance_id: Workflow instance ID
+
+        Returns:
+            Stored record, or None if the instance is unknown
+        """
+        pass
+
+    @abstractmethod
+    async def save(
+        self,
+        instance_id: str,
+        workflow_id: str,
+        data: Dict[str, Any],
+        expected_version: int,
+        transition: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Save a workflow instance if its version is still expected_version.
+
+        Args:
+            instance_id: Workflow instance ID
+            workflow_id: Workflow definition ID the instance belongs to
+            data: Serialized instance
+            expected_version: Version the caller read (0 to create)
+            transition: Optional entry appended to the transition log
+
+        Returns:
+            The new version
+
+        Raises:
+            WorkflowVersionConflict: If the stored version differs
+        """
+        pass
+
+    @abstractmethod
+    async def get_transition_log(self, instance_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the append-only transition log of an instance, oldest first.
+
+        Args:
+            instance_id: Workflow instance ID
+
+        Returns:
+            Transition log entries
+        """
+        pass
+
+    @abstractmethod
+    async def list_instance_ids(self, workflow_id: Optional[str] = None) -> List[str]:
+        """
+        List stored instance IDs, optionally for one workflow.
+
+        Args:
+            workflow_id: Optional workflow definition ID
+
+        Returns:
+            Instance IDs
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, instance_id: str) -> None:
+        """
+        Delete an instance and its transition log.
+
+        Args:
+            instance_id: Workflow instance ID
+        """
+        pass
+
+
+class InMemoryWorkflowStateStore(WorkflowStateStore):
+    """Process-local state store. Not shared between workers."""
+
+    def __init__(self):
+        self._records: Dict[str, WorkflowStateRecord] = {}
+        self._logs: Dict[str, List[Dict[str, Any]]] = {}
+
+    async def load(self, instance_id: str) -> Optional[WorkflowStateRecord]:
+        record = self._records.get(instance_id)
+        return record.model_copy(deep=True) if record else None
+
+    async def save(
+        self,
+        instance_id: str,
+        workflow_id: str,
+        data: Dict[str, Any],
+        expected_version: int,
+        transition: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        current = self._records.get(instance_id)
+        current_version = current.version if current else 0
+
+        if current_version != expected_version:
+            raise WorkflowVersionConflict(instance_id, expected_version)
+
+        version = current_version + 1
+        self._records[instance_id] = WorkflowStateRecord(
+            instance_id=instance_id,
+            workflow_id=workflow_id,
+            version=version,
+            data=json.loads(json.dumps(data)),
+        )
+        if transition is not None:
+            self._logs.setdefault(instance_id, []).append(transition)
+
+        return version
+
+    async def get_transition_log(self, instance_id: str) -> List[Dict[str, Any]]:
+        return list(self._logs.get(instance_id, []))
+
+    async def list_instance_ids(self, workflow_id: Optional[str] = None) -> List[str]:
+        return [
+            record.instance_id
+            for record in self._records.values()
+            if workflow_id is None or record.workflow_id == workflow_id
+        ]
+
+    async def delete(self, instance_id: str) -> None:
+        self._records.pop(instance_id, None)
+        self._logs.pop(instance_id, None)
+
+
+class RedisWorkflowStateStore(WorkflowStateStore):
+    """
+    Redis-backed state store shared by all workers.
+
+    Each instance is a hash (workflow_id, version, data, updated_at) and its
+    transition log is a list. A Lua script checks the version, writes the hash
+    and appends the log entry in one atomic round trip.
+    """
+
+    # KEYS: state hash, log list, instance index set, per-workflow index set
+    # ARGV: expected version, workflow id, data, transition entry ('' for none),
+    #       instance id, timestamp
+    SAVE_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'version') or '0')
+if current ~= tonumber(ARGV[1]) then
+    return -1
+end
+local version = current + 1
+redis.call('HSET', KEYS[1], 'workflow_id', ARGV[2], 'version', version,
+           'data', ARGV[3], 'updated_at', ARGV[6])
+if ARGV[4] ~= '' then
+    redis.call('RPUSH', KEYS[2], ARGV[4])
+end
+redis.call('SADD', KEYS[3], ARGV[5])
+redis.call('SADD', KEYS[4], ARGV[5])
+return version
+"""
+
+    def __init__(self, prefix: str = "workflow"):
+        """
+        Initialize the Redis state store.
+
+        Args:
+            prefix: Prefix for all Redis keys
+        """
+        self.prefix = prefix
+        self._redis = None
+        self._save_script = None
+
+    async def _get_redis(self):
+        if self._redis is None:
+            from services.redis_service import redis_service
+
+            self._redis = await redis_service.get_async_client()
+            self._save_script = self._redis.register_script(self.SAVE_SCRIPT)
+        return self._redis
+
+    def _state_key(self, instance_id: str) -> str:
+        return f"{self.prefix}:state:{instance_id}"
+
+    def _log_key(self, instance_id: str) -> str:
+        return f"{self.prefix}:log:{instance_id}"
+
+    @property
+    def _index_key(self) -> str:
+        return f"{self.prefix}:instances"
+
+    async def load(self, instance_id: str) -> Optional[WorkflowStateRecord]:
+        redis = await self._get_redis()
+        fields = await redis.hgetall(self._state_key(instance_id))
+        if not fields:
+            return None
+
+        return WorkflowStateRecord(
+            instance_id=instance_id,
+            workflow_id=fields["workflow_id"],
+            version=int(fields["version"]),
+            data=json.loads(fields["data"]),
+            updated_at=float(fields.get("updated_at", 0)),
+        )
+
+    async def save(
+        self,
+        instance_id: str,
+        workflow_id: str,
+        data: Dict[str, Any],
+        expected_version: int,
+        transition: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        await self._get_redis()
+        version = await self._save_script(
+            keys=[
+                self._state_key(instance_id),
+                self._log_key(instance_id),
+                self._index_key,
+                f"{self._index_key}:{workflow_id}",
+            ],
+            args=[
+                expected_version,
+                workflow_id,
+                json.dumps(data),
+                json.dumps(transition) if transition is not None else "",
+                instance_id,
+                time.time(),
+            ],
+        )
+
+        if int(version) < 0:
+            raise WorkflowVersionConflict(instance_id, expected_version)
+
+        return int(version)
+
+    async def get_transition_log(self, instance_id: str) -> List[Dict[str, Any]]:
+        redis = await self._get_redis()
+        entries = await redis.lrange(self._log_key(instance_id), 0, -1)
+        return [json.loads(entry) for entry in entries]
+
+    async def list_instance_ids(self, workflow_id: Optional[str] = None) -> List[str]:
+        redis = await self._get_redis()
+        key = (
+            self._index_key
+            if workflow_id is None
+            else f"{self._index_key}:{workflow_id}"
+        )
+        return list(await redis.smembers(key))
+
+    async def delete(self, instance_id: str) -> None:
+        redis = await self._get_redis()
+        record = await self.load(instance_id)
+
+        pipe = redis.pipeline(transaction=True)
+        pipe.delete(self._state_key(instance_id), self._log_key(instance_id))
+        pipe.srem(self._index_key, instance_id)
+        if record:
+            pipe.srem(f"{self._index_key}:{record.workflow_id}", instance_id)
+        await pipe.execute()
+
+
+class SQLiteWorkflowStateStore(WorkflowStateStore):
+    """
+    SQLite-backed state store for single-host deployments.
+
+    WAL mode lets worker processes on the same host read concurrently while
+    writes are serialized by SQLite. Calls run in a worker thread.
+    """
+
+    def __init__(self, path: str = "workflow_state.db"):
+        """
+        Initialize the SQLite state store.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS workflow_instances (
+                instance_id TEXT PRIMARY KEY,
+                workflow_id TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_workflow_instances_workflow
+                ON workflow_instances (workflow_id);
+            CREATE TABLE IF NOT EXISTS workflow_transitions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                instance_id TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                entry TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_workflow_transitions_instance
+                ON workflow_transitions (instance_id, id);
+            """
+        )
+
+    def _load(self, instance_id: str) -> Optional[WorkflowStateRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT workflow_id, version, data, updated_at "
+                "FROM workflow_instances WHERE instance_id = ?",
+                (instance_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return WorkflowStateRecord(
+            instance_id=instance_id,
+            workflow_id=row[0],
+            version=row[1],
+            data=json.loads(row[2]),
+            updated_at=row[3],
+        )
+
+    def _save(
+        self,
+        instance_id: str,
+        workflow_id: str,
+        data: Dict[str, Any],
+        expected_version: int,
+        transition: Optional[Dict[str, Any]],
+    ) -> int:
+        version = expected_version + 1
+        now = time.time()
+
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                if expected_version == 0:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO workflow_instances "
+                        "(instance_id, workflow_id, version, data, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (instance_id, workflow_id, version, json.dumps(data), now),
+                    )
+                else:
+                    cursor = self._conn.execute(
+                        "UPDATE workflow_instances "
+                        "SET version = ?, data = ?, updated_at = ? "
+                        "WHERE instance_id = ? AND version = ?",
+                        (version, json.dumps(data), now, instance_id, expected_version),
+                    )
+
+                if cursor.rowcount != 1:
+                    self._conn.rollback()
+                    raise WorkflowVersionConflict(instance_id, expected_version)
+
+                if transition is not None:
+                    self._conn.execute(
+                        "INSERT INTO workflow_transitions "
+                        "(instance_id, version, entry, created_at) VALUES (?, ?, ?, ?)",
+                        (instance_id, version, json.dumps(transition), now),
+                    )
+
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+        return version
+
+    def _get_transition_log(self, instance_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entry FROM workflow_transitions "
+                "WHERE instance_id = ? ORDER BY id",
+                (instance_id,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _list_instance_ids(self, workflow_id: Optional[str]) -> List[str]:
+        with self._lock:
+            if workflow_id is None:
+                rows = self._conn.execute(
+                    "SELECT instance_id FROM workflow_instances"
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT instance_id FROM workflow_instances WHERE workflow_id = ?",
+                    (workflow_id,),
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    def _delete(self, instance_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM workflow_instances WHERE instance_id = ?", (instance_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM workflow_transitions WHERE instance_id = ?", (instance_id,)
+            )
+
+    async def load(self, instance_id: str) -> Optional[WorkflowStateRecord]:
+        return await asyncio.to_thread(self._load, instance_id)
+
+    async def save(
+        self,
+        instance_id: str,
+        workflow_id: str,
+        data: Dict[str, Any],
+        expected_version: int,
+        transition: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        return await asyncio.to_thread(
+            self._save, instance_id, workflow_id, data, expected_version, transition
+        )
+
+    async def get_transition_log(self, instance_id: str) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get_transition_log, instance_id)
+
+    async def list_instance_ids(self, workflow_id: Optional[str] = None) -> List[str]:
+        return await asyncio.to_thread(self._list_instance_ids, workflow_id)
+
+    async def delete(self, instance_id: str) -> None:
+        await asyncio.to_thread(self._delete, instance_id)
+
+
+class NotionMirror:
+    """
+    Runs Notion mirror writes in the background.
+
+    Writes submitted with a key (the instance ID) run one at a time in
+    submission order, and writes queued behind a running one are coalesced to
+    the latest, so an older state can never overwrite a newer one in Notion.
+
+    Failed writes are retried with exponential backoff, unless a newer write
+    for the same key arrives in the meantime and replaces them. Failures never
+    affect the transition that triggered them; the state store remains the
+    source of truth.
+    """
+
+    def __init__(self, max_attempts: int = 5, retry_backoff: float = 1.0):
+        """
+        Initialize the mirror.
+
+        Args:
+            max_attempts: Attempts per write before it is given up
+            retry_backoff: Base delay in seconds between attempts (doubled each time)
+        """
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._tasks: Set[asyncio.Task] = set()
+        self._latest: Dict[str, Tuple[Callable[[], Awaitable[Any]], str]] = {}
+        self._runners: Dict[str, asyncio.Task] = {}
+        self.failures = 0
+        self.retries = 0
+        self.coalesced = 0
+        _mirrors.add(self)
+
+    @property
+    def pending(self) -> int:
+        """Number of mirror writes still in flight."""
+        return len(self._tasks)
+
+    def submit(
+        self,
+        write: Callable[[], Awaitable[Any]],
+        description: str,
+        key: Optional[str] = None,
+    ) -> None:
+        """
+        Schedule a mirror write.
+
+        Args:
+            write: Coroutine function performing the Notion write
+            description: Description used in log messages
+            key: Orders and coalesces writes sharing the key, e.g. an instance ID
+        """
+        if key is None:
+            self._track(asyncio.create_task(self._run(write, description)))
+            return
+
+        if key in self._latest:
+            self.coalesced += 1
+        self._latest[key] = (write, description)
+
+        if key not in self._runners:
+            self._runners[key] = self._track(asyncio.create_task(self._run_key(key)))
+
+    def _track(self, task: asyncio.Task) -> asyncio.Task:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run_key(self, key: str) -> None:
+        """Run the latest write for a key until none is left."""
+        try:
+            while key in self._latest:
+                write, description = self._latest.pop(key)
+                await self._run(write, description, key)
+        finally:
+            self._runners.pop(key, None)
+
+    async def _run(
+        self,
+        write: Callable[[], Awaitable[Any]],
+        description: str,
+        key: Optional[str] = None,
+    ) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = await write()
+                if result is False:
+                    raise RuntimeError("Notion write returned False")
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.failures += 1
+                    logger.error(
+                        f"Failed to mirror {description} to Notion after "
+                        f"{attempt} attempts: {e}"
+                    )
+                    return
+                self.retries += 1
+                logger.warning(
+                    f"Failed to mirror {description} to Notion "
+                    f"(attempt {attempt}), retrying: {e}"
+                )
+
+            await asyncio.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+            if key is not None and key in self._latest:
+                # A newer state for the key was submitted; write that instead
+                return
+
+    async def drain(self) -> None:
+        """Wait for all in-flight mirror writes to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+# Every mirror in the process, so shutdown can drain them
+_mirrors: "weakref.WeakSet[NotionMirror]" = weakref.WeakSet()
+
+
+async def drain_notion_mirrors() -> None:
+    """Wait for the pending Notion mirror writes of every workflow engine."""
+    for mirror in list(_mirrors):
+        await mirror.drain()
+
+
+_default_store: Optional[WorkflowStateStore] = None
+
+
+def get_state_store() -> WorkflowStateStore:
+    """Get the process-wide state store, creating it from the environment."""
+    global _default_store
+    if _default_store is None:
+        _default_store = create_state_store_from_env()
+    return _default_store
+
+
+def create_state_store_from_env() -> WorkflowStateStore:
+    """
+    Create a workflow state store from environment variables.
+
+    The in-memory store is not shared between processes, so it is refused
+    when the server runs more than one worker.
+
+    Environment variables:
+        WORKFLOW_STATE_STORE: redis, sqlite or memory (default: redis)
+        WORKFLOW_STATE_DB_PATH: SQLite database path (default: workflow_state.db)
+        WORKFLOW_STATE_REDIS_PREFIX: Redis key prefix (default: workflow)
+        SERVER_WORKERS: Number of server worker processes (default: 1)
+
+    Returns:
+        WorkflowStateStore instance
+
+    Raises:
+        WorkflowException: If the in-memory store is selected with several workers
+    """
+    backend = os.environ.get("WORKFLOW_STATE_STORE", "redis").lower()
+
+    if backend == "sqlite":
+        return SQLiteWorkflowStateStore(
+            path=os.environ.get("WORKFLOW_STATE_DB_PATH", "workflow_state.db")
+        )
+    if backend == "memory":
+        workers = int(os.environ.get("SERVER_WORKERS", "1"))
+        if workers > 1:
+            raise WorkflowException(
+                message=(
+                    "WORKFLOW_STATE_STORE=memory cannot be shared by "
+                    f"{workers} workers; use redis or sqlite"
+                ),
+                workflow_name="state_store",
+                details={"workers": workers},
+            )
+        return InMemoryWorkflowStateStore()
+    if backend != "redis":
+        logger.warning(f"Unknown WORKFLOW_STATE_STORE '{backend}', using redis")
+
+    return RedisWorkflowStateStore(
+        prefix=os.environ.get("WORKFLOW_STATE_REDIS_PREFIX", "workflow")
+    )
@@ -17,6 +17,19 @@ from pydantic import BaseModel, Field, model_validator
 
 # Import needed services and models
 from services.notion_service import NotionService
+from workflow.compiled_conditions import (
+    ENGINE_OPERATORS,
+    Predicate,
+    compile_all,
+    compile_engine_condition,
+    compile_field_getter,
+)
+from workflow.state_store import (
+    NotionMirror,
+    WorkflowStateStore,
+    WorkflowVersionConflict,
+    get_state_store,
+)
 
 
 class WorkflowState(str, Enum):
@@ -46,6 +59,8 @@ class WorkflowDefinition(BaseModel):
     states: List[str]
     initial_state: str
     transitions: Dict[str, List[str]]  # from_state -> [to_states]
+    # "from_state:to_state" -> conditions on the instance data, all must hold
+    conditions: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
 
     def validate(self) -> bool:
         """Validate workflow definition integrity."""
@@ -62,6 +77,12 @@ class WorkflowDefinition(BaseModel):
                 if to_state not in self.states:
                     return False
 
+        # Conditions can only guard allowed transitions
+        for transition_key in self.conditions:
+            from_state, _, to_state = transition_key.partition(":")
+            if to_state not in self.transitions.get(from_state, []):
+                return False
+
         return True
 
 
@@ -87,6 +108,7 @@ class WorkflowInstance(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     notion_page_id: Optional[str] = None
+    version: int = 0
 
     def record_transition(
         self,
@@ -154,13 +176,19 @@ class WorkflowEngine:
         self,
         notion_client: Optional[NotionService] = None,
         logger: Optional[logging.Logger] = None,
+        state_store: Optional[WorkflowStateStore] = None,
     ):
         self.notion_client = notion_client
         self.workflow_definitions: Dict[str, WorkflowDefinition] = {}
         self.transition_handlers: Dict[str, Dict[str, Callable]] = {}
+        self.transition_conditions: Dict[str, Dict[str, Predicate]] = {}
         self.logger = logger or logging.getLogger("workflow.engine")
         self.active_workflows: Dict[str, WorkflowInstance] = {}
 
+        # Durable state shared by all workers; Notion is mirrored asynchronously
+        self.state_store = state_store or get_state_store()
+        self.mirror = NotionMirror()
+
         # Database IDs for Notion integration
         self.active_workflows_db_id = "active_workflows_database_id"
 
@@ -172,6 +200,14 @@ class WorkflowEngine:
 
         self.workflow_definitions[definition.name] = definition
         self.transition_handlers[definition.name] = {}
+
+        # Compile transition conditions once instead of on every transition
+        self.transition_conditions[definition.name] = {
+            transition_key: compile_all(
+                [ConditionEvaluator.compile_condition(c) for c in conditions]
+            )
+            for transition_key, conditions in definition.conditions.items()
+        }
         self.logger.info(f"Registered workflow definition: {definition.name}")
         return True
 
@@ -258,6 +294,18 @@ class WorkflowEngine:
             except Exception as e:
                 self.logger.error(f"Failed to create workflow in Notion: {str(e)}")
 
+        instance.version = await self.state_store.save(
+            instance.id,
+            definition_name,
+            self._serialize(instance),
+            expected_version=0,
+            transition={
+                "to_state": instance.current_state,
+                "action": "created",
+                "timestamp": now.isoformat(),
+            },
+        )
+
         # Add to active workflows
         self.active_workflows[instance.id] = instance
         self.logger.info(
@@ -274,7 +322,13 @@ class WorkflowEngine:
         agent: str,
         transition_data: Dict[str, Any] = None,
     ) -> WorkflowTransitionResult:
-        """Transition a workflow to a new state."""
+        """
+        Transition a workflow to a new state.
+
+        The new state is saved to the state store only if the instance has not
+        been changed by another worker since it was loaded; otherwise the
+        transition fails and the caller should reload the workflow.
+        """
         definition_name = instance.definition_name
 
         if definition_name not in self.workflow_definitions:
@@ -292,8 +346,18 @@ class WorkflowEngine:
                 error=f"Invalid transition from {from_state} to {to_state}",
             )
 
-        # Execute transition handler if registered
+        # Check the compiled transition conditions against the resulting data
         transition_key = f"{from_state}:{to_state}"
+        conditions = self.transition_conditions.get(definition_name, {}).get(
+            transition_key
+        )
+        if conditions and not conditions({**instance.data, **(transition_data or {})}):
+            return WorkflowTransitionResult(
+                success=False,
+                error=f"Conditions not met for transition from {from_state} to {to_state}",
+            )
+
+        # Execute transition handler if registered
         handler = self.transition_handlers.get(definition_name, {}).get(transition_key)
 
         if handler:
@@ -320,26 +384,55 @@ class WorkflowEngine:
                     success=False, error=f"Transition handler failed: {str(e)}"
                 )
 
-        # Record the transition
-        instance.record_transition(from_state, to_state, reason, agent, transition_data)
+        # Record the transition on a copy so a rejected save leaves the caller's
+        # instance untouched
+        updated = instance.model_copy(deep=True)
+        updated.record_transition(from_state, to_state, reason, agent, transition_data)
 
         # Update data if provided
         if transition_data:
-            instance.data.update(transition_data)
+            updated.data.update(transition_data)
 
-        # Update in Notion
+        try:
+            version = await self.state_store.save(
+                instance.id,
+                definition_name,
+                self._serialize(updated),
+                expected_version=instance.version,
+                transition={
+                    "from_state": from_state,
+                    "to_state": to_state,
+                    "reason": reason,
+                    "agent": agent,
+                    "data": transition_data or {},
+                    "timestamp": updated.updated_at.isoformat(),
+                },
+            )
+        except WorkflowVersionConflict as e:
+            self.logger.warning(str(e))
+            self.active_workflows.pop(instance.id, None)
+            return WorkflowTransitionResult(success=False, error=str(e))
+
+        instance.current_state = updated.current_state
+        instance.history = updated.history
+        instance.data = updated.data
+        instance.updated_at = updated.updated_at
+        instance.version = version
+
+        # Mirror to Notion in the background
         if self.notion_client and instance.notion_page_id:
-            try:
-                await self.notion_client.update_page(
-                    page_id=instance.notion_page_id,
-                    properties={
-                        "Status": to_state,
-                        "Data": json.dumps(instance.data),
-                        "Last Updated": instance.updated_at.isoformat(),
-                    },
-                )
-            except Exception as e:
-                self.logger.warning(f"Failed to update workflow in Notion: {str(e)}")
+            properties = {
+                "Status": to_state,
+                "Data": json.dumps(instance.data),
+                "Last Updated": instance.updated_at.isoformat(),
+            }
+            self.mirror.submit(
+                lambda: self.notion_client.queue_page_update(
+                    instance.notion_page_id, properties
+                ),
+                f"workflow {instance.id}",
+                key=instance.id,
+            )
 
         # Update active workflows cache
         self.active_workflows[instance.id] = instance
@@ -354,6 +447,13 @@ class WorkflowEngine:
         if workflow_id in self.active_workflows:
             return self.active_workflows[workflow_id]
 
+        # Then the shared state store
+        record = await self.state_store.load(workflow_id)
+        if record:
+            instance = WorkflowInstance(**record.data, version=record.version)
+            self.active_workflows[workflow_id] = instance
+            return instance
+
         # Otherwise try to fetch from Notion if client is available
         if self.notion_client:
             try:
@@ -415,6 +515,18 @@ class WorkflowEngine:
                         ),
                     )
 
+                    # Seed the state store so later reads skip Notion
+                    try:
+                        instance.version = await self.state_store.save(
+                            workflow_id,
+                            definition_name,
+                            self._serialize(instance),
+                            expected_version=0,
+                        )
+                    except WorkflowVersionConflict:
+                        # Another worker seeded it first
+                        return await self.get_workflow(workflow_id)
+
                     # Add to cache
                     self.active_workflows[workflow_id] = instance
                     return instance
@@ -469,9 +581,11 @@ class WorkflowEngine:
         Note: This will remove it from active workflows, but history may be retained
         in Notion depending on configuration.
         """
-        # Remove from in-memory cache
-        if workflow_id in self.active_workflows:
-            instance = self.active_workflows.pop(workflow_id)
+        instance = await self.get_workflow(workflow_id)
+        if instance:
+            # Remove from the state store and in-memory cache
+            await self.state_store.delete(workflow_id)
+            self.active_workflows.pop(workflow_id, None)
 
             # Delete from Notion if available
             if self.notion_client and instance.notion_page_id:
@@ -487,6 +601,11 @@ class WorkflowEngine:
 
         return False
 
+    @staticmethod
+    def _serialize(instance: WorkflowInstance) -> Dict[str, Any]:
+        """Serialize an instance for the state store; the version is kept by the store."""
+        return instance.model_dump(mode="json", exclude={"version"})
+
     def get_workflow_definition(
         self, definition_name: str
     ) -> Optional[WorkflowDefinition]:
@@ -554,6 +673,20 @@ class WorkflowEngine:
                 for entry_data in data["history"]:
                     instance.history.append(WorkflowHistoryEntry(**entry_data))
 
+            # Save to the state store, replacing any existing copy
+            existing = await self.state_store.load(instance.id)
+            instance.version = await self.state_store.save(
+                instance.id,
+                instance.definition_name,
+                self._serialize(instance),
+                expected_version=existing.version if existing else 0,
+                transition={
+                    "to_state": instance.current_state,
+                    "action": "imported",
+                    "timestamp": datetime.now().isoformat(),
+                },
+            )
+
             # Add to active workflows
             self.active_workflows[instance.id] = instance
 
@@ -589,32 +722,34 @@ class ConditionEvaluator:
     """Utility class for evaluating workflow conditions."""
 
     @staticmethod
-    def evaluate_condition(condition: Dict[str, Any], context: Dict[str, Any]) -> bool:
+    def compile_condition(condition: Dict[str, Any]) -> Predicate:
         """
-        Evaluate a single condition against context data.
+        Compile a condition into a reusable predicate.
 
         Args:
             condition: Condition definition with field, operator, value
-            context: Context data to evaluate against
 
         Returns:
-            True if condition is satisfied, False otherwise
+            Predicate taking the context data
         """
-        if not isinstance(condition, dict):
-            return False
+        return compile_engine_condition(condition)
 
-        field = condition.get("field")
-        operator = condition.get("operator")
-        expected_value = condition.get("value")
+    @staticmethod
+    def evaluate_condition(condition: Dict[str, Any], context: Dict[str, Any]) -> bool:
+        """
+        Evaluate a single condition against context data.
 
-        if not field or not operator:
-            return False
+        The compiled predicate is cached per condition, so repeated
+        evaluations of the same condition do not recompile it.
 
-        # Get actual value from context using dot notation
-        actual_value = ConditionEvaluator.get_field_value(context, field)
+        Args:
+            condition: Condition definition with field, operator, value
+            context: Context data to evaluate against
 
-        # Compare values
-        return ConditionEvaluator.compare_values(actual_value, operator, expected_value)
+        Returns:
+            True if condition is satisfied, False otherwise
+        """
+        return compile_engine_condition(condition)(context)
 
     @staticmethod
     def get_field_value(data: Dict[str, Any], field_path: str) -> Any:
@@ -622,45 +757,12 @@ class ConditionEvaluator:
         if not data or not field_path:
             return None
 
-        parts = field_path.split(".")
-        current = data
-
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return None
-
-        return current
+        return compile_field_getter(field_path)(data)
 
     @staticmethod
     def compare_values(actual: Any, operator: str, expected: Any) -> bool:
         """Compare values based on operator."""
-        if operator == "eq":
-            return actual == expected
-        elif operator == "ne":
-            return actual != expected
-        elif operator == "gt":
-            return actual > expected if actual is not None else False
-        elif operator == "lt":
-            return actual < expected if actual is not None else False
-        elif operator == "gte":
-            return actual >= expected if actual is not None else False
-        elif operator == "lte":
-            return actual <= expected if actual is not None else False
-        elif operator == "in":
-            return actual in expected if expected is not None else False
-        elif operator == "not_in":
-            return actual not in expected if expected is not None else True
-        elif operator == "contains":
-            return expected in actual if actual is not None else False
-        elif operator == "starts_with":
-            return actual.startswith(expected) if isinstance(actual, str) else False
-        elif operator == "ends_with":
-            return actual.endswith(expected) if isinstance(actual, str) else False
-        elif operator == "exists":
-            return actual is not None
-        elif operator == "not_exists":
-            return actual is None
-        else:
+        compare = ENGINE_OPERATORS.get(operator)
+        if compare is None:
             return False
+        return compare(actual, expected)